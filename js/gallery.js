@@ -42,10 +42,16 @@ let displayedNFTs = [];
 let currentPage = 0;
 let collectionMintAddresses = new Set(); // Store collection mint addresses for filtering
 let collectionNFTDataMap = new Map(); // Map mint address to NFT data from JSON for quick lookup
+let mintSetPromise = null; // Resolves to the parsed data/mint-set.bin (or null) for wallet filtering
 let founderMetadataMap = new Map(); // Map mint address to full founder metadata for modal display
 let popupImageMapByName = new Map(); // Map NFT name to popup image URL (from CSV column F)
 let popupImageMapByMint = new Map(); // Map mint address to popup image URL (from CSV column F)
+let popupDriveURLs = { byName: {}, byMint: {} }; // Drive URLs kept by generate-popup-images.py as fallbacks
+let popupPyramid = null; // { root, default, levels } of the local popup renditions (img/popup/<level>/)
+let zoomTiles = null; // { root, tileSize, byName, byMint } of the Deep Zoom pyramids (generate-zoom-tiles.py)
+let zoomViewerObserver = null; // ResizeObserver of the zoom viewer in the open modal
 let arweaveImageMap = new Map(); // Map filename to Arweave URL (from arweave_image_mapping.json)
+let arweaveImageMapFolded = new Map(); // Lowercased filename -> Arweave URL, for case-insensitive lookups
 let arweaveMintMap = new Map(); // Map mint ID to Arweave URL (from merged_mindfolk_data.json)
 let mainGalleryView = localStorage.getItem('mainGalleryView') || '6col'; // View mode for main gallery only
 
@@ -56,6 +62,12 @@ const DEFAULT_COLLECTION = '4169793782b418e3dbb9fd36b364388ceb63321a743009b9dfc2
 document.addEventListener('DOMContentLoaded', async () => {
   setupEventListeners();
   
+  // Start loading the mint membership artifact right away; wallet filtering can use it
+  // before the full catalog has been downloaded
+  mintSetPromise = loadMintSet();
+  
+  registerServiceWorker();
+  
   // Load founder metadata for modal display
   try {
     const response = await fetch('data/founder-metadata.json');
@@ -92,6 +104,12 @@ document.addEventListener('DOMContentLoaded', async () => {
           }
         });
       }
+      if (popupData.drive && typeof popupData.drive === 'object') {
+        popupDriveURLs = { byName: popupData.drive.byName || {}, byMint: popupData.drive.byMint || {} };
+      }
+      if (popupData.pyramid && popupData.pyramid.root) {
+        popupPyramid = popupData.pyramid;
+      }
       console.log(`✓ Loaded ${popupImageMapByName.size} popup image URLs by name`);
       console.log(`✓ Loaded ${popupImageMapByMint.size} popup image URLs by mint`);
     }
@@ -99,6 +117,20 @@ document.addEventListener('DOMContentLoaded', async () => {
     console.warn('Could not load popup image URLs:', error);
   }
   
+  // Load the Deep Zoom tile pyramids for the modal (optional)
+  try {
+    const response = await fetch('data/zoom-tiles.json');
+    if (response.ok) {
+      const zoomData = await response.json();
+      if (zoomData.byName && typeof zoomData.byName === 'object') {
+        zoomTiles = { tileSize: 256, byMint: {}, ...zoomData };
+        console.log(`✓ Loaded ${Object.keys(zoomTiles.byName).length} zoom pyramids`);
+      }
+    }
+  } catch (error) {
+    console.warn('Could not load zoom tiles:', error);
+  }
+  
   // Load Arweave image mappings
   try {
     const response = await fetch('arweave_image_mapping.json');
@@ -108,6 +140,9 @@ document.addEventListener('DOMContentLoaded', async () => {
       Object.entries(arweaveData).forEach(([filename, url]) => {
         if (filename && url) {
           arweaveImageMap.set(filename.trim(), url.trim());
+          if (!arweaveImageMapFolded.has(filename.trim().toLowerCase())) {
+            arweaveImageMapFolded.set(filename.trim().toLowerCase(), url.trim());
+          }
         }
       });
       console.log(`✓ Loaded ${arweaveImageMap.size} Arweave image mappings`);
@@ -116,38 +151,25 @@ document.addEventListener('DOMContentLoaded', async () => {
     console.warn('Could not load Arweave image mappings:', error);
   }
   
-  // Load merged Mindfolk data (mint ID -> Arweave URL)
-  // Note: This file uses JavaScript object notation, so we need to parse it carefully
+  // Load mint ID -> Arweave metadata URL map.
+  // data/mint-metadata.json is strict JSON built by scripts/build-merged-data.py;
+  // merged_mindfolk_data.json (a JavaScript literal) is only a fallback for trees
+  // where that build step has not been run.
   try {
-    const response = await fetch('merged_mindfolk_data.json');
+    const response = await fetch('data/mint-metadata.json');
     if (response.ok) {
-      const text = await response.text();
-      // Try to parse as JSON first (in case it's valid JSON)
-      let mergedData;
-      try {
-        mergedData = JSON.parse(text);
-      } catch (parseError) {
-        // If JSON parsing fails, try to evaluate as JavaScript (not recommended but needed for this format)
-        // We'll use Function constructor to safely evaluate
-        try {
-          mergedData = new Function('return ' + text)();
-        } catch (evalError) {
-          console.warn('Could not parse merged Mindfolk data:', evalError);
-          mergedData = null;
-        }
-      }
-      
-      if (mergedData && Array.isArray(mergedData)) {
-        mergedData.forEach(item => {
-          if (item.mintid && item.metadata) {
-            arweaveMintMap.set(item.mintid.trim(), item.metadata.trim());
-          }
-        });
-        console.log(`✓ Loaded ${arweaveMintMap.size} Arweave URLs by mint ID`);
-      }
+      const mintMetadata = await response.json();
+      Object.entries(mintMetadata).forEach(([mint, url]) => {
+        arweaveMintMap.set(mint, url);
+      });
+      console.log(`✓ Loaded ${arweaveMintMap.size} Arweave URLs by mint ID`);
     }
   } catch (error) {
-    console.warn('Could not load merged Mindfolk data:', error);
+    console.warn('Could not load mint metadata map:', error);
+  }
+  
+  if (arweaveMintMap.size === 0) {
+    await loadMergedMindfolkData();
   }
   
   // Check if collection address is in URL params, otherwise use default
@@ -339,6 +361,11 @@ async function fetchNFTsFromCollection(collectionAddress) {
             image: originalImageUrl, // Original image URL (for modal popup)
             originalImage: originalImageUrl, // Keep original for modal
             thumbnailURLs: thumbnailURLs, // Thumbnails for gallery cards (190x190, 100x100, 30x30)
+            thumbnailSrcset: nft.thumbnailSrcset, // 1x/2x/3x variants per size, for high-DPI screens
+            // Arweave assets resolved by scripts/resolve-arweave-assets.py (null = none; undefined = not resolved)
+            gifURL: nft.gifURL,
+            pngURL: nft.pngURL,
+            similar: nft.similar, // Mints of the most similar NFTs (scripts/build-similar-index.py)
             attributes: [
               { trait_type: 'Type', value: nft.Type || '' },
               { trait_type: 'Filetype', value: nft.Filetype || '' }
@@ -858,6 +885,294 @@ function applyMainGalleryView() {
   });
 }
 
+// Thumbnail set matching the active theme. generate-thumbnails-from-local.py --both-themes
+// stores the light-background set under thumbnailURLs.light; the size keys are the dark set.
+function themedThumbnailURLs(thumbnailURLs) {
+  const classic = document.body && document.body.classList.contains('theme-classic');
+  if (classic && thumbnailURLs && thumbnailURLs.light && typeof thumbnailURLs.light === 'object') {
+    return thumbnailURLs.light;
+  }
+  return thumbnailURLs;
+}
+
+// srcset string ("url 1x, url 2x, ...") for one thumbnail size, from the {url, width, bytes}
+// variants generate-thumbnails-from-local.py stores in thumbnailSrcset ('' when only 1x exists)
+function thumbnailSrcsetFor(thumbnailSrcset, sizeKey) {
+  const variants = (themedThumbnailURLs(thumbnailSrcset) || {})[sizeKey];
+  if (!Array.isArray(variants) || variants.length < 2) return '';
+  const baseWidth = variants[0].width;
+  return variants.map(variant => `${variant.url} ${+(variant.width / baseWidth).toFixed(2)}x`).join(', ');
+}
+
+// Point an <img> at a srcset, or drop a stale one so src is used as-is
+function applyThumbnailSrcset(img, srcset) {
+  if (srcset) {
+    if (img.getAttribute('srcset') !== srcset) img.srcset = srcset;
+  } else if (img.hasAttribute('srcset')) {
+    img.removeAttribute('srcset');
+  }
+}
+
+// Local popup rendition (img/popup/<default level>/...) written by generate-popup-images.py, or ''
+function localPopupImage(name, mint) {
+  if (!popupPyramid) return '';
+  const url = (mint && popupImageMapByMint.get(mint)) || (name && popupImageMapByName.get(name)) || '';
+  return url.startsWith(`${popupPyramid.root}/`) ? url : '';
+}
+
+// Another level of a local popup rendition ('380', '760', 'full')
+function popupLevelUrl(url, level) {
+  const prefix = `${popupPyramid.root}/${popupPyramid.default}/`;
+  return url.startsWith(prefix) ? `${popupPyramid.root}/${level}/${url.slice(prefix.length)}` : url;
+}
+
+// srcset over the square levels of a local popup, so small screens fetch the 380
+function popupSrcset(url) {
+  if (!popupPyramid || !url.startsWith(`${popupPyramid.root}/`)) return '';
+  return Object.entries(popupPyramid.levels || {})
+    .filter(([, width]) => width)
+    .map(([level, width]) => `${encodeURI(popupLevelUrl(url, level))} ${width}w`)
+    .join(', ');
+}
+
+// Drive URL to try when a local popup fails to load
+function drivePopupImage(name, mint) {
+  return (mint && popupDriveURLs.byMint[mint]) || (name && popupDriveURLs.byName[name]) || '';
+}
+
+// Deep Zoom pyramid of an NFT's original ({ dzi, width, height, format, tileSize }), or null
+function zoomPyramidFor(name, mint) {
+  if (!zoomTiles) return null;
+  const key = (mint && zoomTiles.byMint[mint]) || name;
+  const entry = key && zoomTiles.byName[key];
+  return entry ? { ...entry, tileSize: zoomTiles.tileSize } : null;
+}
+
+// Top (full-resolution) level of a pyramid; level 0 is 1x1
+function zoomMaxLevel(pyramid) {
+  return Math.ceil(Math.log2(Math.max(pyramid.width, pyramid.height, 1)));
+}
+
+function zoomTileUrl(pyramid, level, col, row) {
+  return encodeURI(`${pyramid.dzi.replace(/\.dzi$/, '')}_files/${level}/${col}_${row}.${pyramid.format || 'jpg'}`);
+}
+
+// The single-tile level: a small image that shows at once while sharper tiles load
+function zoomPreviewUrl(pyramid) {
+  const maxLevel = zoomMaxLevel(pyramid);
+  const steps = Math.max(0, Math.ceil(Math.log2(Math.max(pyramid.width, pyramid.height) / pyramid.tileSize)));
+  return zoomTileUrl(pyramid, maxLevel - steps, 0, 0);
+}
+
+// Animated originals keep their animation in the modal; tiles only appear once zoomed in
+function isAnimatedImage(url, nft) {
+  return /\.gif(\?|#|$)/i.test(url) || url === findArweaveGifUrl(nft);
+}
+
+// Turn the modal image into a pan/zoom viewer over the pyramid. The existing <img> stays
+// underneath as the preview; only the tiles of the level matching the current zoom that
+// intersect the view are requested. tilesAtFit: false keeps the preview alone until zoomed.
+// Collection NFTs listed in the record's "similar" mints (build-similar-index.py), nearest first
+function similarNFTsFor(nft) {
+  const mint = (nft.mint || '').trim();
+  const similar = nft.similar || (collectionNFTDataMap.get(mint) || {}).similar;
+  if (!Array.isArray(similar)) return [];
+  return similar.map(similarMint => collectionNFTDataMap.get(similarMint)).filter(Boolean);
+}
+
+// Stop refitting a zoom viewer whose modal content was replaced or closed
+function detachZoomViewer() {
+  if (zoomViewerObserver) {
+    zoomViewerObserver.disconnect();
+    zoomViewerObserver = null;
+  }
+}
+
+function attachZoomViewer(holder, pyramid, { tilesAtFit = true } = {}) {
+  detachZoomViewer();
+  const preview = holder && holder.querySelector('img');
+  if (!preview) return;
+  const link = preview.closest('a');
+  const { width, height, tileSize } = pyramid;
+  const maxLevel = zoomMaxLevel(pyramid);
+
+  const viewport = document.createElement('div');
+  viewport.className = 'nft-zoom';
+  viewport.style.aspectRatio = `${width} / ${height}`;
+  const stage = document.createElement('div');
+  stage.className = 'nft-zoom-stage';
+  stage.style.width = `${width}px`;
+  stage.style.height = `${height}px`;
+  const tileLayer = document.createElement('div');
+  tileLayer.className = 'nft-zoom-tiles';
+  preview.removeAttribute('sizes');
+  preview.classList.add('nft-zoom-preview');
+  stage.append(preview, tileLayer);
+  viewport.append(stage);
+  holder.prepend(viewport);
+  if (link) {
+    link.textContent = 'Open original';
+    link.classList.add('nft-zoom-original');
+  }
+
+  const tiles = new Map(); // 'level/col_row' -> <img>
+  let scale = 0;
+  let fitScale = 0;
+  let x = 0;
+  let y = 0;
+  let userMoved = false;
+  let currentLevel = -1;
+
+  function clamp() {
+    const vw = viewport.clientWidth;
+    const vh = viewport.clientHeight;
+    scale = Math.min(Math.max(scale, fitScale), Math.max(fitScale, 1));
+    x = width * scale <= vw ? (vw - width * scale) / 2 : Math.min(0, Math.max(vw - width * scale, x));
+    y = height * scale <= vh ? (vh - height * scale) / 2 : Math.min(0, Math.max(vh - height * scale, y));
+  }
+
+  function update() {
+    const vw = viewport.clientWidth;
+    const vh = viewport.clientHeight;
+    if (!vw || !vh) return;
+    clamp();
+    stage.style.transform = `translate(${x}px, ${y}px) scale(${scale})`;
+    viewport.classList.toggle('zoomed', scale > fitScale * 1.01);
+    if (!tilesAtFit && scale <= fitScale * 1.01) {
+      tileLayer.hidden = true;
+      return;
+    }
+    tileLayer.hidden = false;
+
+    // Lowest level with at least one tile pixel per device pixel
+    const level = Math.min(maxLevel, Math.max(0, maxLevel + Math.ceil(Math.log2(scale * (window.devicePixelRatio || 1)))));
+    const factor = 2 ** (maxLevel - level); // Full-resolution pixels per level pixel
+    const span = tileSize * factor;
+    const levelWidth = Math.ceil(width / factor);
+    const levelHeight = Math.ceil(height / factor);
+    const firstCol = Math.max(0, Math.floor(-x / scale / span));
+    const lastCol = Math.min(Math.ceil(levelWidth / tileSize) - 1, Math.floor((vw - x) / scale / span));
+    const firstRow = Math.max(0, Math.floor(-y / scale / span));
+    const lastRow = Math.min(Math.ceil(levelHeight / tileSize) - 1, Math.floor((vh - y) / scale / span));
+
+    for (let row = firstRow; row <= lastRow; row++) {
+      for (let col = firstCol; col <= lastCol; col++) {
+        const key = `${level}/${col}_${row}`;
+        let tile = tiles.get(key);
+        if (!tile) {
+          tile = document.createElement('img');
+          tile.alt = '';
+          tile.decoding = 'async';
+          tile.style.left = `${col * span}px`;
+          tile.style.top = `${row * span}px`;
+          tile.style.width = `${Math.min(tileSize, levelWidth - col * tileSize) * factor}px`;
+          tile.style.height = `${Math.min(tileSize, levelHeight - row * tileSize) * factor}px`;
+          tile.style.zIndex = level;
+          tile.onload = () => { tile.dataset.loaded = '1'; pruneTiles(level); };
+          tile.onerror = () => tile.remove();
+          tile.src = zoomTileUrl(pyramid, level, col, row);
+          tileLayer.append(tile);
+          tiles.set(key, tile);
+        }
+      }
+    }
+    currentLevel = level;
+    pruneTiles(level);
+  }
+
+  // Once the visible tiles of the current level have loaded, drop the other levels
+  function pruneTiles(level) {
+    if (level !== currentLevel) return;
+    const prefix = `${level}/`;
+    const pending = [...tiles].some(([key, tile]) => key.startsWith(prefix) && !tile.dataset.loaded && tile.isConnected);
+    if (pending) return;
+    for (const [key, tile] of tiles) {
+      if (!key.startsWith(prefix)) {
+        tile.remove();
+        tiles.delete(key);
+      }
+    }
+  }
+
+  function fit() {
+    const vw = viewport.clientWidth;
+    const vh = viewport.clientHeight;
+    if (!vw || !vh) return;
+    const wasFit = scale <= fitScale;
+    fitScale = Math.min(vw / width, vh / height);
+    if (!userMoved || wasFit) scale = fitScale;
+    update();
+  }
+
+  function zoomAt(factor, clientX, clientY) {
+    const rect = viewport.getBoundingClientRect();
+    const px = clientX - rect.left;
+    const py = clientY - rect.top;
+    const next = Math.min(Math.max(scale * factor, fitScale), Math.max(fitScale, 1));
+    x = px - (px - x) * (next / scale);
+    y = py - (py - y) * (next / scale);
+    scale = next;
+    userMoved = true;
+    update();
+  }
+
+  viewport.addEventListener('wheel', (event) => {
+    event.preventDefault();
+    zoomAt(Math.exp(-event.deltaY * 0.002), event.clientX, event.clientY);
+  }, { passive: false });
+
+  viewport.addEventListener('dblclick', (event) => {
+    if (scale >= Math.max(fitScale, 1) * 0.99) {
+      scale = fitScale;
+      update();
+    } else {
+      zoomAt(2, event.clientX, event.clientY);
+    }
+  });
+
+  // Drag to pan, two fingers to pinch
+  const pointers = new Map();
+  let pinchDistance = 0;
+  viewport.addEventListener('pointerdown', (event) => {
+    viewport.setPointerCapture(event.pointerId);
+    pointers.set(event.pointerId, { x: event.clientX, y: event.clientY });
+  });
+  viewport.addEventListener('pointermove', (event) => {
+    const last = pointers.get(event.pointerId);
+    if (!last) return;
+    const current = { x: event.clientX, y: event.clientY };
+    pointers.set(event.pointerId, current);
+    if (pointers.size === 2) {
+      const [a, b] = [...pointers.values()];
+      const distance = Math.hypot(a.x - b.x, a.y - b.y);
+      if (pinchDistance) zoomAt(distance / pinchDistance, (a.x + b.x) / 2, (a.y + b.y) / 2);
+      pinchDistance = distance;
+    } else {
+      x += current.x - last.x;
+      y += current.y - last.y;
+      userMoved = true;
+      update();
+    }
+  });
+  const release = (event) => {
+    pointers.delete(event.pointerId);
+    pinchDistance = 0;
+  };
+  viewport.addEventListener('pointerup', release);
+  viewport.addEventListener('pointercancel', release);
+
+  // The modal is laid out after this runs (and may resize): fit whenever the viewport changes
+  if (window.ResizeObserver) {
+    zoomViewerObserver = new ResizeObserver(fit);
+    zoomViewerObserver.observe(viewport);
+  } else {
+    requestAnimationFrame(fit);
+  }
+}
+
+// Re-pick card thumbnails when theme-switcher.js changes the theme
+document.addEventListener('themechange', () => updateCardImagesForView(mainGalleryView));
+
 function updateCardImagesForView(view) {
   // Update all image sources in gallery cards based on the new view
   const cards = document.querySelectorAll('#galleryGrid .nft-card');
@@ -871,7 +1186,7 @@ function updateCardImagesForView(view) {
     if (!thumbnailURLsJson) return;
     
     try {
-      const thumbnailURLs = JSON.parse(thumbnailURLsJson);
+      const thumbnailURLs = themedThumbnailURLs(JSON.parse(thumbnailURLsJson));
       if (!thumbnailURLs || typeof thumbnailURLs !== 'object') return;
       
       // Get original image as fallback
@@ -879,9 +1194,12 @@ function updateCardImagesForView(view) {
       
       // Select appropriate thumbnail based on view
       let imageUrl = '';
+      let sizeKey = '190x190';
       if (view === 'list') {
+        sizeKey = '30x30';
         imageUrl = thumbnailURLs['30x30'] || thumbnailURLs['small'] || '';
       } else if (view === '12col') {
+        sizeKey = '100x100';
         imageUrl = thumbnailURLs['100x100'] || thumbnailURLs['medium'] || '';
       } else {
         // Default 6-col view
@@ -891,8 +1209,12 @@ function updateCardImagesForView(view) {
       // Fallback to original image if thumbnail not available
       if (!imageUrl || imageUrl.trim() === '') {
         imageUrl = originalImage || '';
+        sizeKey = null;
       }
       
+      const srcsetJson = card.getAttribute('data-thumbnail-srcset');
+      applyThumbnailSrcset(img, sizeKey && srcsetJson ? thumbnailSrcsetFor(JSON.parse(srcsetJson), sizeKey) : '');
+      
       // Only update if the URL is different to avoid unnecessary reloads
       if (imageUrl && imageUrl !== img.src) {
         img.src = imageUrl;
@@ -931,6 +1253,9 @@ function createNFTCard(nft, isMainGallery = true) {
   if (nft.thumbnailURLs && typeof nft.thumbnailURLs === 'object') {
     card.setAttribute('data-thumbnail-urls', JSON.stringify(nft.thumbnailURLs));
   }
+  if (nft.thumbnailSrcset && typeof nft.thumbnailSrcset === 'object') {
+    card.setAttribute('data-thumbnail-srcset', JSON.stringify(nft.thumbnailSrcset));
+  }
   if (nft.originalImage && nft.originalImage.trim()) {
     card.setAttribute('data-original-image', nft.originalImage.trim());
   } else if (nft.image && nft.image.trim()) {
@@ -957,27 +1282,34 @@ function createNFTCard(nft, isMainGallery = true) {
   
   // Select thumbnail based on view mode (for main gallery only)
   let imageUrl = '';
+  let sizeKey = null; // Thumbnail size picked, for the matching high-DPI srcset
   const currentView = typeof mainGalleryView !== 'undefined' ? mainGalleryView : '6col';
   
-  // Try to get thumbnail from thumbnailURLs object
-  if (nft.thumbnailURLs && typeof nft.thumbnailURLs === 'object' && Object.keys(nft.thumbnailURLs).length > 0) {
+  // Try to get thumbnail from thumbnailURLs object (the set for the active theme)
+  const thumbnailURLs = themedThumbnailURLs(nft.thumbnailURLs);
+  if (thumbnailURLs && typeof thumbnailURLs === 'object' && Object.keys(thumbnailURLs).length > 0) {
     // Both main gallery and MY GALLERY use the same thumbnail selection logic
     // Main gallery selects based on view, MY GALLERY uses default 6-col size (190x190)
     if (isMainGallery) {
       // Main gallery - select based on view
       if (currentView === 'list') {
-        imageUrl = nft.thumbnailURLs['30x30'] || nft.thumbnailURLs['small'] || '';
+        sizeKey = '30x30';
+        imageUrl = thumbnailURLs['30x30'] || thumbnailURLs['small'] || '';
       } else if (currentView === '12col') {
-        imageUrl = nft.thumbnailURLs['100x100'] || nft.thumbnailURLs['medium'] || '';
+        sizeKey = '100x100';
+        imageUrl = thumbnailURLs['100x100'] || thumbnailURLs['medium'] || '';
       } else {
         // Default 6-col view
-        imageUrl = nft.thumbnailURLs['190x190'] || nft.thumbnailURLs['large'] || '';
+        sizeKey = '190x190';
+        imageUrl = thumbnailURLs['190x190'] || thumbnailURLs['large'] || '';
       }
     } else {
       // MY GALLERY uses same default size as 6-col view (190x190)
-      imageUrl = nft.thumbnailURLs['190x190'] || nft.thumbnailURLs['large'] || '';
+      sizeKey = '190x190';
+      imageUrl = thumbnailURLs['190x190'] || thumbnailURLs['large'] || '';
     }
   }
+  if (!imageUrl) sizeKey = null;
   
   // Fallback to thumbnailURL if thumbnailURLs didn't work
   if (!imageUrl && nft.thumbnailURL && nft.thumbnailURL.trim()) {
@@ -995,6 +1327,7 @@ function createNFTCard(nft, isMainGallery = true) {
   }
   
   img.src = imageUrl;
+  if (sizeKey) applyThumbnailSrcset(img, thumbnailSrcsetFor(nft.thumbnailSrcset, sizeKey));
   img.alt = nft.name || 'NFT';
   img.loading = 'lazy';
   
@@ -1005,6 +1338,7 @@ function createNFTCard(nft, isMainGallery = true) {
     // Only try placeholder once to avoid infinite loop
     if (errorCount === 1 && !this.src.startsWith('data:image/svg+xml')) {
       console.warn(`Failed to load image for NFT "${nft.name}": ${nft.image}`);
+      this.removeAttribute('srcset');
       this.src = createPlaceholderImage(nft.name || 'NFT');
     }
   };
@@ -1057,133 +1391,70 @@ function createNFTCard(nft, isMainGallery = true) {
 }
 
 /**
- * Find .gif URL from Arweave by matching NFT name to filename
- * @param {string} nftName - The NFT name
- * @param {string} nftMint - The NFT mint address (optional, for fallback)
- * @returns {string|null} - The .gif URL from Arweave, or null if not found
+ * Find an Arweave asset URL for an NFT by matching its name to a filename
+ * Catalog records carry the result resolved at build time (scripts/resolve-arweave-assets.py),
+ * so name matching only runs for NFTs that did not come from data/mindfolk-nfts.json.
+ * @param {Object} nft - The NFT (uses name, mint and the resolved gifURL/pngURL)
+ * @param {string} extension - 'gif' or 'png'
+ * @returns {string|null} - The Arweave URL, or null if not found
  */
-function findArweaveGifUrl(nftName, nftMint = '') {
-  if (!nftName) return null;
-  
-  // Try direct name match first (e.g., "Foster Mountain Elder" -> "Foster Mountain Elder.gif")
-  const directMatch = `${nftName}.gif`;
-  if (arweaveImageMap.has(directMatch)) {
-    return arweaveImageMap.get(directMatch);
+function findArweaveAssetUrl(nft, extension) {
+  const resolvedUrl = nft[`${extension}URL`];
+  if (resolvedUrl !== undefined) {
+    return resolvedUrl;
   }
   
-  // Try with sanitized name (replace # with _)
-  const sanitizedName = nftName.replace(/#/g, '_');
-  const sanitizedMatch = `${sanitizedName}.gif`;
-  if (arweaveImageMap.has(sanitizedMatch)) {
-    return arweaveImageMap.get(sanitizedMatch);
-  }
+  const nftName = (nft.name && nft.name.trim()) ? nft.name.trim() : '';
+  if (!nftName) return null;
   
-  // Handle "Mindfolk Founder #N" -> "Mindfolk_Founder_000N.gif"
+  // Same filename rules as scripts/arweave_assets.py: raw name, '#' -> '_', then numbered files
+  const candidates = [nftName, nftName.replace(/#/g, '_')];
+  
+  // "Mindfolk Founder #N" -> "Mindfolk_Founder_000N"
   if (nftName.startsWith('Mindfolk Founder #')) {
     const number = nftName.replace('Mindfolk Founder #', '').trim();
-    const paddedNumber = number.padStart(4, '0');
-    const founderMatch = `Mindfolk_Founder_${paddedNumber}.gif`;
-    if (arweaveImageMap.has(founderMatch)) {
-      return arweaveImageMap.get(founderMatch);
-    }
+    candidates.push(`Mindfolk_Founder_${number.padStart(4, '0')}`);
   }
   
-  // Handle "Mindfolk Elder #N" (Mushroom Heads) -> "Mindfolk_Mushroom_00NN.gif"
+  // "Mindfolk Elder #N" (Mushroom Heads) -> "Mindfolk_Mushroom_00NN"
   if (nftName.startsWith('Mindfolk Elder #')) {
     const number = nftName.replace('Mindfolk Elder #', '').trim();
-    const paddedNumber = number.padStart(4, '0');
-    const mushroomMatch = `Mindfolk_Mushroom_${paddedNumber}.gif`;
-    if (arweaveImageMap.has(mushroomMatch)) {
-      return arweaveImageMap.get(mushroomMatch);
-    }
+    candidates.push(`Mindfolk_Mushroom_${number.padStart(4, '0')}`);
   }
   
-  // Try case-insensitive search through all Arweave keys
-  for (const [filename, url] of arweaveImageMap.entries()) {
-    if (filename.toLowerCase().endsWith('.gif')) {
-      // Remove .gif extension and compare
-      const nameWithoutExt = filename.replace(/\.gif$/i, '');
-      if (nameWithoutExt.toLowerCase() === nftName.toLowerCase() ||
-          nameWithoutExt.toLowerCase() === sanitizedName.toLowerCase()) {
-        return url;
-      }
+  for (const candidate of candidates) {
+    const filename = `${candidate}.${extension}`;
+    const url = arweaveImageMap.get(filename) || arweaveImageMapFolded.get(filename.toLowerCase());
+    if (url) {
+      return url;
     }
   }
   
-  // Fallback: Try to get from merged data by mint ID (if it's a .gif URL)
+  // Fallback: Try to get from merged data by mint ID
+  const nftMint = (nft.mint && nft.mint.trim()) ? nft.mint.trim() : '';
   if (nftMint && arweaveMintMap.has(nftMint)) {
-    const url = arweaveMintMap.get(nftMint);
-    // Check if URL points to a .gif (we can't verify file type, but if it's from merged data, it should be correct)
-    // For now, we'll trust the merged data
-    return url;
+    return arweaveMintMap.get(nftMint);
   }
   
   return null;
 }
 
 /**
- * Find .png URL from Arweave by matching NFT name to filename
- * @param {string} nftName - The NFT name
- * @param {string} nftMint - The NFT mint address (optional, for fallback)
+ * Find .gif URL from Arweave for an NFT
+ * @param {Object} nft - The NFT
+ * @returns {string|null} - The .gif URL from Arweave, or null if not found
+ */
+function findArweaveGifUrl(nft) {
+  return findArweaveAssetUrl(nft, 'gif');
+}
+
+/**
+ * Find .png URL from Arweave for an NFT
+ * @param {Object} nft - The NFT
  * @returns {string|null} - The .png URL from Arweave, or null if not found
  */
-function findArweavePngUrl(nftName, nftMint = '') {
-  if (!nftName) return null;
-  
-  // Try direct name match first (e.g., "Mindfolk Founder #8" -> "Mindfolk_Founder_0008.png")
-  const directMatch = `${nftName}.png`;
-  if (arweaveImageMap.has(directMatch)) {
-    return arweaveImageMap.get(directMatch);
-  }
-  
-  // Try with sanitized name (replace # with _)
-  const sanitizedName = nftName.replace(/#/g, '_');
-  const sanitizedMatch = `${sanitizedName}.png`;
-  if (arweaveImageMap.has(sanitizedMatch)) {
-    return arweaveImageMap.get(sanitizedMatch);
-  }
-  
-  // Handle "Mindfolk Founder #N" -> "Mindfolk_Founder_000N.png"
-  if (nftName.startsWith('Mindfolk Founder #')) {
-    const number = nftName.replace('Mindfolk Founder #', '').trim();
-    const paddedNumber = number.padStart(4, '0');
-    const founderMatch = `Mindfolk_Founder_${paddedNumber}.png`;
-    if (arweaveImageMap.has(founderMatch)) {
-      return arweaveImageMap.get(founderMatch);
-    }
-  }
-  
-  // Handle "Mindfolk Elder #N" (Mushroom Heads) -> "Mindfolk_Mushroom_00NN.png"
-  if (nftName.startsWith('Mindfolk Elder #')) {
-    const number = nftName.replace('Mindfolk Elder #', '').trim();
-    const paddedNumber = number.padStart(4, '0');
-    const mushroomMatch = `Mindfolk_Mushroom_${paddedNumber}.png`;
-    if (arweaveImageMap.has(mushroomMatch)) {
-      return arweaveImageMap.get(mushroomMatch);
-    }
-  }
-  
-  // Try case-insensitive search through all Arweave keys
-  for (const [filename, url] of arweaveImageMap.entries()) {
-    if (filename.toLowerCase().endsWith('.png')) {
-      // Remove .png extension and compare
-      const nameWithoutExt = filename.replace(/\.png$/i, '');
-      if (nameWithoutExt.toLowerCase() === nftName.toLowerCase() ||
-          nameWithoutExt.toLowerCase() === sanitizedName.toLowerCase()) {
-        return url;
-      }
-    }
-  }
-  
-  // Fallback: Try to get from merged data by mint ID
-  if (nftMint && arweaveMintMap.has(nftMint)) {
-    const url = arweaveMintMap.get(nftMint);
-    // For .png, we'll check if the URL doesn't end with .gif (merged data might have either)
-    // Actually, let's just return it and trust the merged data
-    return url;
-  }
-  
-  return null;
+function findArweavePngUrl(nft) {
+  return findArweaveAssetUrl(nft, 'png');
 }
 
 function handleSearch(e) {
@@ -1283,7 +1554,7 @@ function showNFTModal(nft) {
   
   // For OG types, use .png from Arweave for the left image
   if (isOGType) {
-    const pngUrl = findArweavePngUrl(nftName, nftMint);
+    const pngUrl = findArweavePngUrl(nft);
     if (pngUrl) {
       modalImageUrl = pngUrl;
       console.log(`✓ Found .png for OG left image: ${nftName} -> ${pngUrl.substring(0, 50)}...`);
@@ -1300,20 +1571,20 @@ function showNFTModal(nft) {
   // For Elder types, use Arweave links (prefer .gif, fallback to .png)
   else if (isElderType) {
     // Try .gif first
-    const gifUrl = findArweaveGifUrl(nftName, nftMint);
+    const gifUrl = findArweaveGifUrl(nft);
     if (gifUrl) {
       modalImageUrl = gifUrl;
       console.log(`✓ Found .gif for Elder: ${nftName} -> ${gifUrl.substring(0, 50)}...`);
     } else {
       // Fallback to .png
-      const pngUrl = findArweavePngUrl(nftName, nftMint);
+      const pngUrl = findArweavePngUrl(nft);
       if (pngUrl) {
         modalImageUrl = pngUrl;
         console.log(`✓ Found .png for Elder (fallback): ${nftName} -> ${pngUrl.substring(0, 50)}...`);
       } else {
-        // Final fallback to local image
+        // Final fallback to the local popup rendition, then the old local Elder image
         const sanitizedName = nftName.replace(/#/g, '_');
-        modalImageUrl = `img/Elders/${sanitizedName}.jpg`;
+        modalImageUrl = localPopupImage(nftName, nftMint) || `img/Elders/${sanitizedName}.jpg`;
         console.warn(`⚠ Could not find Arweave link for Elder: ${nftName}, using local image`);
       }
     }
@@ -1326,19 +1597,21 @@ function showNFTModal(nft) {
   // For Founder types, use Arweave links (prefer .gif, fallback to .png)
   else if (isFounderType) {
     // Try .gif first
-    const gifUrl = findArweaveGifUrl(nftName, nftMint);
+    const gifUrl = findArweaveGifUrl(nft);
     if (gifUrl) {
       modalImageUrl = gifUrl;
       console.log(`✓ Found .gif for Founder: ${nftName} -> ${gifUrl.substring(0, 50)}...`);
     } else {
       // Fallback to .png
-      const pngUrl = findArweavePngUrl(nftName, nftMint);
+      const pngUrl = findArweavePngUrl(nft);
       if (pngUrl) {
         modalImageUrl = pngUrl;
         console.log(`✓ Found .png for Founder (fallback): ${nftName} -> ${pngUrl.substring(0, 50)}...`);
       } else {
-        // Final fallback to original image
-        if (nft.originalImage && nft.originalImage.trim()) {
+        // Final fallback to the local popup rendition, then the original image
+        if (localPopupImage(nftName, nftMint)) {
+          modalImageUrl = localPopupImage(nftName, nftMint);
+        } else if (nft.originalImage && nft.originalImage.trim()) {
           modalImageUrl = nft.originalImage.trim();
         } else if (nft.image && nft.image.trim()) {
           modalImageUrl = nft.image.trim();
@@ -1348,8 +1621,12 @@ function showNFTModal(nft) {
     }
   } else {
     // For non-Elder, non-OG types, use original priority order
+    // Priority 0: local popup rendition (generate-popup-images.py), instead of a 1920px Drive fetch
+    if (localPopupImage(nftName, nftMint)) {
+      modalImageUrl = localPopupImage(nftName, nftMint);
+    }
     // Priority 1: Use originalImage
-    if (nft.originalImage && nft.originalImage.trim()) {
+    else if (nft.originalImage && nft.originalImage.trim()) {
       modalImageUrl = nft.originalImage.trim();
     }
     // Priority 2: Try to get from collection data map
@@ -1392,6 +1669,12 @@ function showNFTModal(nft) {
   } else {
     originalImageUrl = modalImageUrl && !modalImageUrl.startsWith('data:') ? modalImageUrl : (nft.originalImage || nft.image || '');
   }
+  // A local popup rendition links to its full-size level
+  const modalSrcset = popupSrcset(modalImageUrl);
+  const modalFallbackUrl = modalSrcset ? drivePopupImage(nftName, nftMint) : '';
+  if (modalSrcset && originalImageUrl === modalImageUrl) {
+    originalImageUrl = popupLevelUrl(modalImageUrl, 'full');
+  }
   
   // List of specific NFTs that should show a second image (by name or mint address)
   const secondImageNFTs = [
@@ -1421,13 +1704,13 @@ function showNFTModal(nft) {
   // For NFTs that need a second image, find the .gif version from Arweave (or .png if .gif not available)
   let secondImageUrl = null;
   if (shouldShowSecondImage) {
-    const gifUrl = findArweaveGifUrl(nftName, nftMint);
+    const gifUrl = findArweaveGifUrl(nft);
     if (gifUrl) {
       secondImageUrl = gifUrl;
       console.log(`✓ Found .gif for second image: ${nftName} -> ${gifUrl.substring(0, 50)}...`);
     } else {
       // If .gif not found, try .png from Arweave (for cases like Metto Space Elder)
-      const pngUrl = findArweavePngUrl(nftName, nftMint);
+      const pngUrl = findArweavePngUrl(nft);
       if (pngUrl) {
         secondImageUrl = pngUrl;
         console.log(`✓ Found .png for second image (fallback): ${nftName} -> ${pngUrl.substring(0, 50)}...`);
@@ -1439,15 +1722,28 @@ function showNFTModal(nft) {
     }
   }
   
+  // Deep Zoom tiles (generate-zoom-tiles.py): a still original is shown from its tiles, starting
+  // with a one-tile preview, instead of waiting for the whole multi-megabyte file
+  const zoomPyramid = zoomPyramidFor(nftName, nftMint);
+  const zoomAnimated = zoomPyramid ? isAnimatedImage(modalImageUrl, nft) : false;
+  if (zoomPyramid && !zoomAnimated && !modalSrcset) {
+    modalImageUrl = zoomPreviewUrl(zoomPyramid);
+  }
+  
+  const similarNFTs = similarNFTsFor(nft);
+  
+  detachZoomViewer(); // The previous NFT's viewer, when browsing similar NFTs
   modalContent.innerHTML = `
     <div class="nft-modal-images" ${shouldShowSecondImage ? 'style="grid-column: 1 / -1;"' : ''}>
       <div class="nft-modal-image">
         <a href="${originalImageUrl}" target="_blank" rel="noopener noreferrer" ${!originalImageUrl || originalImageUrl.startsWith('data:') ? 'onclick="return false;"' : ''}>
           <img src="${modalImageUrl}" 
+               ${modalSrcset ? `srcset="${modalSrcset}" sizes="(max-width: 576px) 90vw, 380px"` : ''}
+               ${modalFallbackUrl ? `data-fallback="${escapeHtml(modalFallbackUrl)}"` : ''}
                alt="${escapeHtml(nft.name || 'NFT')}" 
                crossorigin="anonymous"
                referrerpolicy="no-referrer"
-               onerror="if(!this.src.startsWith('data:')){this.src='data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNTAwIiBoZWlnaHQ9IjUwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iNTAwIiBoZWlnaHQ9IjUwMCIgZmlsbD0iIzFhMWExYSIvPjx0ZXh0IHg9IjUwJSIgeT0iNDUlIiBmb250LWZhbWlseT0iQXJpYWwiIGZvbnQtc2l6ZT0iMzIiIGZpbGw9IiNmZmMxMDciIHRleHQtYW5jaG9yPSJtaWRkbGUiIGRvbWluYW50LWJhc2VsaW5lPSJtaWRkbGUiPk5vIEltYWdlPC90ZXh0Pjwvc3ZnPg==';}" />
+               onerror="this.removeAttribute('srcset');if(this.dataset.fallback){this.src=this.dataset.fallback;delete this.dataset.fallback;}else if(!this.src.startsWith('data:')){this.src='data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNTAwIiBoZWlnaHQ9IjUwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iNTAwIiBoZWlnaHQ9IjUwMCIgZmlsbD0iIzFhMWExYSIvPjx0ZXh0IHg9IjUwJSIgeT0iNDUlIiBmb250LWZhbWlseT0iQXJpYWwiIGZvbnQtc2l6ZT0iMzIiIGZpbGw9IiNmZmMxMDciIHRleHQtYW5jaG9yPSJtaWRkbGUiIGRvbWluYW50LWJhc2VsaW5lPSJtaWRkbGUiPk5vIEltYWdlPC90ZXh0Pjwvc3ZnPg==';}" />
         </a>
       </div>
       ${shouldShowSecondImage && secondImageUrl ? `
@@ -1489,11 +1785,47 @@ function showNFTModal(nft) {
           </div>
         </div>
       ` : ''}
+
+      ${similarNFTs.length > 0 ? `
+        <div class="detail-item">
+          <div class="detail-label">Similar</div>
+          <div class="nft-similar">
+            ${similarNFTs.map(similar => {
+              const thumbnails = themedThumbnailURLs(similar.thumbnailURLs) || {};
+              const src = thumbnails['100x100'] || thumbnails['190x190'] || similar.image || '';
+              const srcset = thumbnailSrcsetFor(similar.thumbnailSrcset, '100x100');
+              return `
+              <button type="button" class="nft-similar-item" data-mint="${escapeHtml(similar.mint)}" title="${escapeHtml(similar.name)}">
+                <img src="${src}" ${srcset ? `srcset="${srcset}"` : ''} alt="${escapeHtml(similar.name)}" loading="lazy" width="64" height="64" />
+              </button>
+            `;
+            }).join('')}
+          </div>
+        </div>
+      ` : ''}
     </div>
   `;
 
+  // Browse to a similar NFT in the same modal
+  modalContent.querySelectorAll('.nft-similar-item').forEach(button => {
+    button.addEventListener('click', () => {
+      const similar = collectionNFTDataMap.get(button.dataset.mint);
+      if (similar) showNFTModal(similar);
+    });
+  });
+
+  // Pan/zoom over the tiles; the local popup and animations stay as they are until zoomed in
+  if (zoomPyramid) {
+    attachZoomViewer(modalContent.querySelector('.nft-modal-image'), zoomPyramid,
+      { tilesAtFit: !zoomAnimated && !modalSrcset });
+  }
+
+  // Already open (browsing similar NFTs): the content has been replaced, nothing to show
+  if (modalEl.classList.contains('show')) return;
+
   // Use MDB modal if available, otherwise bootstrap
   function closeModal() {
+    detachZoomViewer();
     if (window.mdb && window.mdb.Modal) {
       const mdbModal = window.mdb.Modal.getInstance(modalEl);
       if (mdbModal) mdbModal.hide();
@@ -1508,6 +1840,9 @@ function showNFTModal(nft) {
     }
   }
   
+  // Same function each time, so opening the modal again doesn't stack listeners
+  modalEl.addEventListener('hidden.mdb.modal', detachZoomViewer);
+  modalEl.addEventListener('hidden.bs.modal', detachZoomViewer);
   if (window.mdb && window.mdb.Modal) {
     const mdbModal = new window.mdb.Modal(modalEl);
     mdbModal.show();
@@ -1615,6 +1950,165 @@ async function handleViewWalletNFTs() {
   }
 }
 
+/**
+ * Register sw.js, which serves data/precache-manifest.json entries from cache
+ * (built by scripts/build-precache-manifest.py). Once the page has loaded, the
+ * worker is asked to cache the background tier (remaining thumbnails) as well.
+ */
+function registerServiceWorker() {
+  if (!('serviceWorker' in navigator) || !location.protocol.startsWith('http')) return;
+  navigator.serviceWorker.register('sw.js').catch(error => {
+    console.warn('Service worker not registered:', error);
+  });
+  const requestBackground = () => {
+    const connection = navigator.connection;
+    if (connection && connection.saveData) return;
+    navigator.serviceWorker.ready.then(registration => {
+      if (registration.active) {
+        registration.active.postMessage({ type: 'precache-background' });
+      }
+    });
+  };
+  if (document.readyState === 'complete') {
+    requestBackground();
+  } else {
+    window.addEventListener('load', requestBackground, { once: true });
+  }
+}
+
+/**
+ * Load data/mint-set.bin (built by scripts/build-mint-set.py)
+ * Layout: 20-byte header, bloom filter, then sorted raw 32-byte mints
+ * @returns {Promise<Object|null>} - Parsed mint set, or null if unavailable
+ */
+async function loadMintSet() {
+  try {
+    const response = await fetch('data/mint-set.bin');
+    if (!response.ok) return null;
+    const buffer = await response.arrayBuffer();
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== 'MFMS' || view.getUint8(4) !== 1) {
+      console.warn('Unsupported mint set file');
+      return null;
+    }
+    const hashes = view.getUint8(5);
+    const count = view.getUint32(8, true);
+    const bits = view.getUint32(12, true);
+    const shardSize = view.getUint32(16, true);
+    const bloom = new Uint8Array(buffer, 20, bits / 8);
+    const mints = new Uint8Array(buffer, 20 + bits / 8, count * 32);
+    console.log(`✓ Loaded mint set (${count} mints)`);
+    return { hashes, count, bits, shardSize, bloom, mints };
+  } catch (error) {
+    console.warn('Could not load mint set:', error);
+    return null;
+  }
+}
+
+const BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz';
+
+/**
+ * Decode a base58 mint address to its 32 raw bytes
+ * @param {string} mint - The mint address
+ * @returns {Uint8Array|null} - The raw bytes, or null if it is not a valid mint
+ */
+function decodeMintAddress(mint) {
+  const bytes = new Uint8Array(32);
+  let length = 0;
+  for (const char of mint) {
+    let carry = BASE58_ALPHABET.indexOf(char);
+    if (carry < 0) return null;
+    // bytes holds the value little-endian while decoding
+    for (let i = 0; i < length; i++) {
+      carry += bytes[i] * 58;
+      bytes[i] = carry & 0xff;
+      carry >>= 8;
+    }
+    while (carry > 0) {
+      if (length === 32) return null;
+      bytes[length++] = carry & 0xff;
+      carry >>= 8;
+    }
+  }
+  // Leading '1's are leading zero bytes
+  let zeros = 0;
+  while (zeros < mint.length && mint[zeros] === '1') zeros++;
+  if (length + zeros !== 32) return null;
+  return bytes.slice(0, 32).reverse();
+}
+
+/**
+ * Position of a mint in the mint set (bloom filter first, then binary search)
+ * @param {Object} mintSet - Result of loadMintSet()
+ * @param {string} mint - The mint address
+ * @returns {number} - Index in the sorted mint array, or -1 if not in the collection
+ */
+function mintSetPosition(mintSet, mint) {
+  const raw = decodeMintAddress(mint);
+  if (!raw) return -1;
+  
+  // Double hashing over the key bytes, same as scripts/mint_set.py
+  const rawView = new DataView(raw.buffer);
+  const h1 = rawView.getUint32(0, true);
+  const h2 = (rawView.getUint32(4, true) | 1) >>> 0;
+  for (let i = 0; i < mintSet.hashes; i++) {
+    const position = (h1 + i * h2) % mintSet.bits;
+    if (!(mintSet.bloom[position >> 3] & (1 << (position & 7)))) {
+      return -1;
+    }
+  }
+  
+  let low = 0;
+  let high = mintSet.count;
+  while (low < high) {
+    const middle = (low + high) >> 1;
+    const offset = middle * 32;
+    let order = 0;
+    for (let i = 0; i < 32 && order === 0; i++) {
+      order = mintSet.mints[offset + i] - raw[i];
+    }
+    if (order === 0) return middle;
+    if (order < 0) {
+      low = middle + 1;
+    } else {
+      high = middle;
+    }
+  }
+  return -1;
+}
+
+/**
+ * Fetch catalog records for mints from their shards (data/catalog-shards/shard-NNN.json)
+ * @param {Object} mintSet - Result of loadMintSet()
+ * @param {string[]} mints - Mint addresses in the collection
+ * @returns {Promise<Map>} - Map mint address -> catalog record
+ */
+async function fetchCatalogShardRecords(mintSet, mints) {
+  const shards = new Set();
+  mints.forEach(mint => {
+    const position = mintSetPosition(mintSet, mint);
+    if (position !== -1) {
+      shards.add(Math.floor(position / mintSet.shardSize));
+    }
+  });
+  
+  const records = new Map();
+  await Promise.all(Array.from(shards).map(async shard => {
+    try {
+      const response = await fetch(`data/catalog-shards/shard-${String(shard).padStart(3, '0')}.json`);
+      if (!response.ok) return;
+      const shardRecords = await response.json();
+      shardRecords.forEach(record => {
+        records.set((record.mintAddress || '').trim(), record);
+      });
+    } catch (error) {
+      console.warn(`Could not load catalog shard ${shard}:`, error);
+    }
+  }));
+  return records;
+}
+
 async function fetchNFTsFromWallet(walletAddress) {
   try {
     // Try Helius DAS API (Digital Asset Standard) - more reliable for wallet NFTs
@@ -1691,15 +2185,19 @@ async function fetchNFTsFromWallet(walletAddress) {
             console.log('Sample collection mint addresses:', sampleCollectionMints);
           }
           
-          // Filter to only show NFTs from the Mindfolk collection and enhance with JSON data
-          const mindfolkNFTs = allWalletNFTs
+          // Use the mint set artifact when the catalog has not been loaded (yet)
+          const mintSet = collectionMintAddresses.size === 0 && mintSetPromise ? await mintSetPromise : null;
+          
+          // Filter to only show NFTs from the Mindfolk collection
+          const walletCollectionNFTs = allWalletNFTs
             .filter(nft => {
               const mint = nft.mint && nft.mint.trim();
               if (!mint) {
                 console.warn('Wallet NFT has no mint address:', nft);
                 return false;
               }
-              const isInCollection = collectionMintAddresses.has(mint);
+              const isInCollection = collectionMintAddresses.has(mint) ||
+                (mintSet !== null && mintSetPosition(mintSet, mint) !== -1);
               if (!isInCollection) {
                 // Log first few non-matching mints for debugging
                 if (allWalletNFTs.indexOf(nft) < 3) {
@@ -1707,7 +2205,15 @@ async function fetchNFTsFromWallet(walletAddress) {
                 }
               }
               return isInCollection;
-            })
+            });
+          
+          // Records for mints the catalog has not provided come from their catalog shards only
+          const shardRecords = mintSet
+            ? await fetchCatalogShardRecords(mintSet, walletCollectionNFTs.map(nft => nft.mint.trim()))
+            : new Map();
+          
+          // Enhance with JSON data
+          const mindfolkNFTs = walletCollectionNFTs
             .map(nft => {
               const mint = nft.mint.trim();
               // Enhance with data from JSON file if available
@@ -1719,10 +2225,27 @@ async function fetchNFTsFromWallet(walletAddress) {
                   image: jsonData.image || nft.image, // Original image URL (for modal)
                   originalImage: jsonData.originalImage || jsonData.image || nft.image, // Keep original for modal
                   thumbnailURLs: jsonData.thumbnailURLs || {}, // Thumbnails for gallery cards
+                  thumbnailSrcset: jsonData.thumbnailSrcset,
+                  gifURL: jsonData.gifURL,
+                  pngURL: jsonData.pngURL,
                   attributes: jsonData.attributes || nft.attributes,
                   description: jsonData.description || nft.description
                 };
               }
+              const record = shardRecords.get(mint);
+              if (record) {
+                const recordImage = (record.URL && record.URL.trim()) ? record.URL.trim() : '';
+                return {
+                  ...nft,
+                  name: record.Name || nft.name,
+                  image: recordImage || nft.image,
+                  originalImage: recordImage || nft.image,
+                  thumbnailURLs: record.thumbnailURLs || {},
+                  thumbnailSrcset: record.thumbnailSrcset,
+                  gifURL: record.gifURL,
+                  pngURL: record.pngURL
+                };
+              }
               return nft;
             });
           
@@ -1872,3 +2395,38 @@ function formatNFTDataFromHelius(item) {
   };
 }
 
+// Fallback: load merged Mindfolk data (mint ID -> Arweave URL) from the JavaScript literal file
+async function loadMergedMindfolkData() {
+  // Note: This file uses JavaScript object notation, so we need to parse it carefully
+  try {
+    const response = await fetch('merged_mindfolk_data.json');
+    if (response.ok) {
+      const text = await response.text();
+      // Try to parse as JSON first (in case it's valid JSON)
+      let mergedData;
+      try {
+        mergedData = JSON.parse(text);
+      } catch (parseError) {
+        // If JSON parsing fails, try to evaluate as JavaScript (not recommended but needed for this format)
+        // We'll use Function constructor to safely evaluate
+        try {
+          mergedData = new Function('return ' + text)();
+        } catch (evalError) {
+          console.warn('Could not parse merged Mindfolk data:', evalError);
+          mergedData = null;
+        }
+      }
+      
+      if (mergedData && Array.isArray(mergedData)) {
+        mergedData.forEach(item => {
+          if (item.mintid && item.metadata) {
+            arweaveMintMap.set(item.mintid.trim(), item.metadata.trim());
+          }
+        });
+        console.log(`✓ Loaded ${arweaveMintMap.size} Arweave URLs by mint ID`);
+      }
+    }
+  } catch (error) {
+    console.warn('Could not load merged Mindfolk data:', error);
+  }
+}
@@ -39,6 +39,8 @@ function switchTheme(theme) {
   currentTheme = theme;
   localStorage.setItem('theme', theme);
   initTheme();
+  // Let the gallery swap thumbnails to the set rendered for this theme's background
+  document.dispatchEvent(new CustomEvent('themechange', { detail: { theme } }));
 }
 
 // Initialize theme on page load
@@ -1,37 +1,30 @@
 """Add missing thumbnail URLs to JSON based on NFT names"""
+import argparse
 import json
-import re
 import os
+import sys
 
-INPUT_JSON = 'data/mindfolk-nfts.json'
-OUTPUT_JSON = 'data/mindfolk-nfts.json'
+from mindfolk_config import CONFIG, thumbnail_dirs
+from mindfolk_scripts import fix_urls, has_hash, sanitize_filename
+from run_report import RunReport, add_report_arguments, stage
 
-THUMBNAIL_DIRS = {
-    '190x190': 'img/thumbnails/190x190',
-    '100x100': 'img/thumbnails/100x100',
-    '30x30': 'img/thumbnails/30x30'
-}
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json
 
-def sanitize_filename(name):
-    """Create a safe filename from NFT name (remove # and other invalid chars)"""
-    invalid_chars = '<>:"/\\|?*#'
-    filename = name
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    # Remove multiple underscores
-    filename = re.sub(r'_+', '_', filename)
-    # Limit length
-    if len(filename) > 200:
-        filename = filename[:200]
-    return filename.strip('_')
+THUMBNAIL_DIRS = thumbnail_dirs()
+
+def run(report):
+    if not os.path.exists(INPUT_JSON):
+        print(f"ERROR: Catalog not found: {INPUT_JSON}")
+        return False
 
-def main():
     # Load JSON
     print(f"Loading {INPUT_JSON}...")
-    with open(INPUT_JSON, 'r', encoding='utf-8') as f:
+    with stage('json_load'), open(INPUT_JSON, 'r', encoding='utf-8') as f:
         nfts = json.load(f)
     
     print(f"Found {len(nfts)} NFTs")
+    report.total = len(nfts)
     print()
     
     updated_count = 0
@@ -65,13 +58,8 @@ def main():
                 print(f"    thumbnailURL: {nft['thumbnailURL']}")
         else:
             # Check if URLs have # in them
-            needs_fix = False
             thumbnail_urls = nft.get('thumbnailURLs', {})
-            
-            for size_key, url in thumbnail_urls.items():
-                if url and '#' in url:
-                    needs_fix = True
-                    break
+            needs_fix = has_hash(thumbnail_urls)
             
             if needs_fix or (nft.get('thumbnailURL') and '#' in nft.get('thumbnailURL', '')):
                 # Fix URLs
@@ -81,13 +69,13 @@ def main():
                 if nft.get('thumbnailURL') and '#' in nft.get('thumbnailURL', ''):
                     nft['thumbnailURL'] = nft['thumbnailURL'].replace(f"/{old_filename}", f"/{new_filename}")
                 
-                for size_key, url in thumbnail_urls.items():
-                    if url and '#' in url:
-                        thumbnail_urls[size_key] = url.replace(f"/{old_filename}", f"/{new_filename}")
+                fix_urls(thumbnail_urls, old_filename, new_filename)
                 
                 nft['thumbnailURLs'] = thumbnail_urls
                 updated_count += 1
     
+    report.tick('all NFTs', count=len(nfts))
+    
     # Save updated JSON
     print()
     print("=" * 60)
@@ -98,10 +86,21 @@ def main():
     print()
     
     print(f"Saving updated JSON to {OUTPUT_JSON}...")
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
+    with stage('json_dump'), open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
         json.dump(nfts, f, indent=2, ensure_ascii=False)
     
     print("Done!")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Add missing thumbnail URLs to JSON based on NFT names')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    
+    with RunReport('add-missing-thumbnail-urls', args=args) as report:
+        ok = run(report)
+    if not ok:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
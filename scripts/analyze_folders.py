@@ -2,7 +2,9 @@
 from pathlib import Path
 import os
 
-img_dir = Path(r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Mindfolk Images')
+from mindfolk_config import CONFIG
+
+img_dir = Path(CONFIG.image_dir)
 thumb_dir = Path('img/thumbnails')
 
 print('=== SOURCE FOLDER STRUCTURE ===')
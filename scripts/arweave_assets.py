@@ -0,0 +1,71 @@
+"""Resolve NFT names to uploaded Arweave assets (arweave_image_mapping.json).
+
+Applies the same filename rules the gallery used to try per card -- the raw
+name, '#' replaced by '_', Mindfolk_Founder_%04d and Mindfolk_Mushroom_%04d --
+against a case-folded index, so every lookup is a couple of dict hits
+instead of a scan over all ~10k keys.
+
+Usage:
+    from arweave_assets import ArweaveAssetIndex
+
+    assets = ArweaveAssetIndex.from_file()
+    gif_url = assets.resolve('Mindfolk Founder #8', '.gif')
+"""
+import json
+
+from name_matching import number_key
+
+ARWEAVE_MAPPING_JSON = 'arweave_image_mapping.json'
+
+NUMBERED_FILENAMES = {
+    'founder': 'Mindfolk_Founder_{:04d}',
+    'mushroom': 'Mindfolk_Mushroom_{:04d}',
+}
+
+def candidate_stems(nft_name):
+    """Filename stems to try for an NFT name, in priority order"""
+    name = nft_name.strip()
+    stems = [name, name.replace('#', '_')]
+    key = number_key(name)
+    if key:
+        stems.append(NUMBERED_FILENAMES[key[0]].format(key[1]))
+    return list(dict.fromkeys(stems))
+
+class ArweaveAssetIndex:
+    """Filename -> URL map with exact and case-folded lookups"""
+
+    def __init__(self, mapping):
+        self.exact = {}
+        self.folded = {}
+        for filename, url in mapping.items():
+            filename, url = filename.strip(), (url or '').strip()
+            if not filename or not url:
+                continue
+            self.exact[filename] = url
+            # First spelling wins when two filenames differ only in case
+            self.folded.setdefault(filename.casefold(), url)
+
+    @classmethod
+    def from_file(cls, path=ARWEAVE_MAPPING_JSON):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.exact)
+
+    def lookup(self, filename):
+        """URL for a filename, exact spelling first, then case-insensitive"""
+        url = self.exact.get(filename)
+        if url is None:
+            url = self.folded.get(filename.casefold())
+        return url
+
+    def resolve(self, nft_name, extension):
+        """URL of the first candidate filename with this extension, or None"""
+        if not nft_name:
+            return None
+        for stem in candidate_stems(nft_name):
+            url = self.lookup(stem + extension)
+            if url:
+                return url
+        return None
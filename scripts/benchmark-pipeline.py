@@ -0,0 +1,222 @@
+"""
+Benchmark the thumbnail pipeline on a synthetic 10k-NFT collection.
+
+Builds a deterministic fake collection in a temp directory (see
+synthetic_corpus.py), then times each stage over several repetitions:
+index, match, decode, resize, encode, write, JSON dump/load, plus the real
+generate_thumbnail end to end. Results are saved as JSON so runs can be
+compared; --compare exits non-zero when a stage got slower than the
+threshold allows.
+
+Requirements:
+    pip install Pillow
+
+Usage:
+    python scripts/benchmark-pipeline.py
+    python scripts/benchmark-pipeline.py --repeat 5 --rendered 100
+    python scripts/benchmark-pipeline.py --compare bench-results/previous.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from compositing import Composite, load_composite
+from mindfolk_scripts import load_script
+from name_matching import NameIndex
+from synthetic_corpus import build_corpus, corpus_size
+
+RESULTS_DIR = 'bench-results'
+REGRESSION_THRESHOLD = 0.10  # Fail --compare when a stage is >10% slower
+
+def time_stage(func, repeat):
+    """Run func() repeat times; return (seconds per run, items from last run)"""
+    runs = []
+    items = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = func()
+        runs.append(time.perf_counter() - started)
+    return runs, items
+
+def run_benchmarks(corpus, thumbs, repeat, work_dir):
+    """Time every stage; returns {stage: {'runs': [...], 'items': n}}"""
+    results = {}
+    sources = [p for p in corpus.image_files if p.suffix.lower() == '.png']
+    sizes = list(thumbs.THUMBNAIL_SIZES.values())
+
+    def record(stage, func):
+        runs, items = time_stage(func, repeat)
+        results[stage] = {'runs': runs, 'items': items}
+        median = statistics.median(runs)
+        rate = items / median if median else 0
+        print(f"  {stage:<16} median {median * 1000:9.1f} ms  ({items} items, {rate:,.0f}/s)")
+
+    index_holder = {}
+
+    def index_stage():
+        index_holder['index'] = NameIndex.from_directory(corpus.image_dir, thumbs.FOLDERS_TO_PROCESS)
+        return len(index_holder['index'])
+    record('index', index_stage)
+
+    def match_stage():
+        index = index_holder['index']
+        for nft in corpus.nfts:
+            thumbs.find_image_file(index, nft['Name'])
+        return len(corpus.nfts)
+    record('match', match_stage)
+
+    decoded = {}
+
+    def decode_stage():
+        for path in sources:
+            with Image.open(path) as img:
+                img.load()
+                decoded[path] = img.copy()
+        return len(sources)
+    record('decode', decode_stage)
+
+    resized = {}
+
+    def resize_stage():
+        # generate_thumbnail's path: premultiply once, fit the premultiplied pixels, flatten per size
+        for path, img in decoded.items():
+            source = Composite(img)
+            for size in sizes:
+                resized[(path, size)] = source.fit_square(size).flatten((0, 0, 0))
+        return len(resized)
+    record('resize', resize_stage)
+
+    encoded = {}
+
+    def encode_stage():
+        for key, thumb in resized.items():
+            buffer = io.BytesIO()
+            thumb.save(buffer, 'JPEG', quality=thumbs.QUALITY, optimize=True)
+            encoded[key] = buffer.getvalue()
+        return len(encoded)
+    record('encode', encode_stage)
+
+    out_dir = Path(work_dir) / 'thumbs'
+    out_dir.mkdir(exist_ok=True)
+
+    def write_stage():
+        for i, data in enumerate(encoded.values()):
+            with open(out_dir / f'{i}.jpg', 'wb') as f:
+                f.write(data)
+        return len(encoded)
+    record('write', write_stage)
+
+    def thumbnail_stage():
+        for i, path in enumerate(sources):
+            source = load_composite(path)  # One decode per NFT, as render_nft_thumbnails does
+            for size in sizes:
+                thumbs.generate_thumbnail(source, out_dir / f'e2e_{i}_{size[0]}.jpg', size)
+        return len(sources) * len(sizes)
+    record('generate_thumbnail', thumbnail_stage)
+
+    catalog_out = Path(work_dir) / 'catalog-out.json'
+
+    def json_dump_stage():
+        with open(catalog_out, 'w', encoding='utf-8') as f:
+            json.dump(corpus.nfts, f, indent=2, ensure_ascii=False)
+        return len(corpus.nfts)
+    record('json_dump', json_dump_stage)
+
+    def json_load_stage():
+        with open(catalog_out, 'r', encoding='utf-8') as f:
+            return len(json.load(f))
+    record('json_load', json_load_stage)
+
+    return results
+
+def summarize(results):
+    """Add min/median/mean and throughput to each stage"""
+    for stage in results.values():
+        runs = stage['runs']
+        stage['min'] = min(runs)
+        stage['median'] = statistics.median(runs)
+        stage['mean'] = statistics.mean(runs)
+        stage['items_per_sec'] = stage['items'] / stage['median'] if stage['median'] else 0
+    return results
+
+def compare(current, previous_path, threshold):
+    """Print per-stage change against a previous results file; return regressed stages"""
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)['stages']
+    regressions = []
+    print()
+    print(f"Compared with {previous_path}:")
+    for name, stage in current.items():
+        if name not in previous:
+            continue
+        old, new = previous[name]['median'], stage['median']
+        change = (new - old) / old if old else 0
+        flag = ''
+        if change > threshold:
+            flag = '  <-- REGRESSION'
+            regressions.append(name)
+        print(f"  {name:<16} {old * 1000:9.1f} ms -> {new * 1000:9.1f} ms ({change:+.1%}){flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the thumbnail pipeline on a synthetic collection')
+    parser.add_argument('--founders', type=int, default=9000)
+    parser.add_argument('--mushrooms', type=int, default=912)
+    parser.add_argument('--elders', type=int, default=40)
+    parser.add_argument('--rendered', type=int, default=200,
+                        help='how many source files get real pixels (decode/resize/encode stages)')
+    parser.add_argument('--image-size', type=int, default=1024, help='master edge length in px')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help=f'results JSON (default: {RESULTS_DIR}/bench-<timestamp>.json)')
+    parser.add_argument('--compare', help='previous results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    thumbs = load_script('generate-thumbnails-from-local.py', 'thumbnails_from_local')
+
+    with tempfile.TemporaryDirectory(prefix='mindfolk-bench-') as work_dir:
+        print(f"Building synthetic collection in {work_dir}...")
+        started = time.perf_counter()
+        corpus = build_corpus(work_dir, founders=args.founders, mushrooms=args.mushrooms,
+                              elders=args.elders, image_size=args.image_size,
+                              rendered=args.rendered, seed=args.seed)
+        print(f"  {len(corpus.nfts)} NFTs, {len(corpus.image_files)} rendered masters, "
+              f"{corpus_size(corpus) / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s")
+        print()
+        print(f"Running {args.repeat} repetitions per stage:")
+        stages = summarize(run_benchmarks(corpus, thumbs, args.repeat, work_dir))
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pillow': Image.__version__,
+        'config': vars(args),
+        'stages': stages,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print()
+    print(f"Saved results to {output}")
+
+    if args.compare:
+        regressions = compare(stages, args.compare, args.threshold)
+        if regressions:
+            print(f"Regressed stages: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
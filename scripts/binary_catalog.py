@@ -0,0 +1,322 @@
+"""Memory-mapped binary form of data/mindfolk-nfts.json for the Python tools.
+
+json.load of the whole catalog costs a full parse and tens of MB of dicts
+even to read one field. This format stores the catalog column by column:
+every field is an array of fixed-width (offset, length) pairs into one
+deduplicated UTF-8 string table, so a reader maps the file and decodes a
+value only when it is asked for. mintAddress and Name also get a sorted
+index for binary-search lookups.
+
+Layout (little-endian):
+    magic 'MFCT' | version u8 | reserved u8 | field count u16 |
+    record count u32 | string table offset u32 | string table size u32 |
+    field count * (name offset u32, name length u32, column offset u32,
+                   index offset u32, index count u32) |
+    per field: record count * (value offset u32, value length u32) |
+    per indexed field: index count * record number u32, sorted by value |
+    string table
+
+A value length of 0xFFFFFFFF means the record has no such field; the top
+bit of the length marks values stored as compact JSON (dicts, lists,
+numbers, null) rather than plain strings.
+
+Usage:
+    from binary_catalog import Catalog
+
+    with Catalog('data/mindfolk-nfts.bin') as catalog:
+        nft = catalog.get(mint)               # point lookup, ~microseconds
+        print(nft.Name, nft.thumbnailURLs)    # each field decoded on first access
+        for name in catalog.values('Name'):   # streaming pass over one column
+            ...
+"""
+import json
+import keyword
+import mmap
+import os
+import struct
+
+from mindfolk_config import CONFIG
+
+MAGIC = b'MFCT'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHIII')
+FIELD = struct.Struct('<IIIII')
+VALUE = struct.Struct('<II')
+RECORD_NUMBER = struct.Struct('<I')
+
+MISSING = 0xFFFFFFFF
+JSON_FLAG = 0x80000000
+INDEXED_FIELDS = ('mintAddress', 'Name')
+
+CATALOG_JSON = CONFIG.catalog_json
+CATALOG_BIN = os.path.splitext(CATALOG_JSON)[0] + '.bin'
+
+_ABSENT = object()
+_cached = {}
+
+def build_catalog(records, indexed=INDEXED_FIELDS):
+    """Serialize a list of catalog dicts"""
+    fields = list(dict.fromkeys(field for record in records for field in record))
+    strings = bytearray()
+    offsets = {}
+
+    def intern(data):
+        offset = offsets.get(data)
+        if offset is None:
+            offset = offsets[data] = len(strings)
+            strings.extend(data)
+        return offset
+
+    name_refs = [(intern(field.encode('utf-8')), len(field.encode('utf-8'))) for field in fields]
+    columns = []
+    indexes = []
+    for field in fields:
+        column = bytearray(VALUE.size * len(records))
+        sortable = []
+        for number, record in enumerate(records):
+            value = record.get(field, _ABSENT)
+            if value is _ABSENT:
+                VALUE.pack_into(column, number * VALUE.size, 0, MISSING)
+                continue
+            if isinstance(value, str):
+                data, flag = value.encode('utf-8'), 0
+                sortable.append((data, number))
+            else:
+                data, flag = json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), JSON_FLAG
+            if len(data) >= JSON_FLAG:
+                raise ValueError(f"value of {field!r} in record {number} is too large")
+            VALUE.pack_into(column, number * VALUE.size, intern(data), len(data) | flag)
+        columns.append(bytes(column))
+        indexes.append(b''.join(RECORD_NUMBER.pack(number) for _, number in sorted(sortable))
+                       if field in indexed else b'')
+
+    position = HEADER.size + FIELD.size * len(fields)
+    directory = bytearray()
+    for (name_offset, name_length), column, index in zip(name_refs, columns, indexes):
+        column_offset = position
+        position += len(column)
+        index_offset = position if index else 0
+        position += len(index)
+        directory += FIELD.pack(name_offset, name_length, column_offset, index_offset,
+                                len(index) // RECORD_NUMBER.size)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(fields), len(records), position, len(strings))
+    body = b''.join(column + index for column, index in zip(columns, indexes))
+    return header + bytes(directory) + body + bytes(strings)
+
+class CatalogRecord:
+    """One catalog record; each field is decoded on first access and kept in a slot.
+
+    Catalog makes a subclass with a slot per field, so records stay small
+    and the ones never touched cost nothing beyond this object. Read them
+    like the JSON dicts: record.get('URL'), record['Name'], or record.Name
+    (None when the record has no such field).
+    """
+    __slots__ = ('_catalog', '_number')
+
+    def __init__(self, catalog, number):
+        self._catalog = catalog
+        self._number = number
+
+    def __getattr__(self, field):
+        # Only reached while the field's slot is still empty
+        if field.startswith('_') or field not in self._catalog.field_set:
+            raise AttributeError(field)
+        value = self._catalog.value(field, self._number, None)
+        if field in type(self).__slots__:
+            object.__setattr__(self, field, value)
+        return value
+
+    def get(self, field, default=None):
+        if field in type(self).__slots__:
+            value = getattr(self, field)
+            if value is not None or self._catalog.has_value(field, self._number):
+                return value
+            return default
+        return self._catalog.value(field, self._number, default)
+
+    def __getitem__(self, field):
+        value = self.get(field, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(field)
+        return value
+
+    def __contains__(self, field):
+        return field in self._catalog.field_set and self._catalog.has_value(field, self._number)
+
+    def keys(self):
+        return [field for field in self._catalog.fields if self._catalog.has_value(field, self._number)]
+
+    def items(self):
+        return [(field, self[field]) for field in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"<CatalogRecord {self._number}: {self.get('Name')!r}>"
+
+class Catalog:
+    """Read side: maps the file and decodes values on demand"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self._file.close()
+            raise ValueError(f"not a binary catalog: {path}")
+        magic, version, _, field_count, self.count, self._strings, strings_size = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"not a binary catalog (or an unsupported version): {path}")
+        if len(self._map) != self._strings + strings_size:
+            self.close()
+            raise ValueError(f"truncated binary catalog: {path}")
+
+        self._columns = {}
+        self._indexes = {}
+        for number in range(field_count):
+            name_offset, name_length, column, index, index_count = FIELD.unpack_from(
+                self._map, HEADER.size + number * FIELD.size)
+            name = self._string(name_offset, name_length)
+            self._columns[name] = column
+            if index:
+                self._indexes[name] = (index, index_count)
+        self.fields = tuple(self._columns)
+        self.field_set = frozenset(self.fields)
+        slots = tuple(field for field in self.fields
+                      if field.isidentifier() and not keyword.iskeyword(field) and not field.startswith('_')
+                      and not hasattr(CatalogRecord, field))
+        self.Record = type('CatalogRecord', (CatalogRecord,), {'__slots__': slots})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, offset, length):
+        start = self._strings + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def _ref(self, field, number):
+        return VALUE.unpack_from(self._map, self._columns[field] + number * VALUE.size)
+
+    def _decode(self, offset, length):
+        if length & JSON_FLAG:
+            return json.loads(self._string(offset, length & ~JSON_FLAG))
+        return self._string(offset, length)
+
+    def has_value(self, field, number):
+        return field in self._columns and self._ref(field, number)[1] != MISSING
+
+    def value(self, field, number, default=None):
+        """Decoded value of one field of record number, or default when absent"""
+        if field not in self._columns:
+            return default
+        offset, length = self._ref(field, number)
+        return default if length == MISSING else self._decode(offset, length)
+
+    def __getitem__(self, number):
+        if not -self.count <= number < self.count:
+            raise IndexError(number)
+        return self.Record(self, number % self.count)
+
+    def __iter__(self):
+        """Lazy records in catalog order"""
+        Record = self.Record
+        for number in range(self.count):
+            yield Record(self, number)
+
+    def values(self, field, default=None):
+        """Stream one column: the decoded value of field for every record, in order"""
+        if field not in self._columns:
+            yield from (default for _ in range(self.count))
+            return
+        start = self._columns[field]
+        for offset, length in VALUE.iter_unpack(self._map[start:start + self.count * VALUE.size]):
+            yield default if length == MISSING else self._decode(offset, length)
+
+    def lookup(self, field, value):
+        """First record whose field equals value (binary search on indexed fields), or None"""
+        if field not in self._columns:
+            return None
+        target = value.encode('utf-8')
+        if field in self._indexes:
+            index, index_count = self._indexes[field]
+            low, high = 0, index_count
+            while low < high:
+                middle = (low + high) // 2
+                number, = RECORD_NUMBER.unpack_from(self._map, index + middle * RECORD_NUMBER.size)
+                offset, length = self._ref(field, number)
+                start = self._strings + offset
+                found = self._map[start:start + length]
+                if found < target:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low < index_count:
+                number, = RECORD_NUMBER.unpack_from(self._map, index + low * RECORD_NUMBER.size)
+                if self.value(field, number) == value:
+                    return self.Record(self, number)
+            return None
+        for number, found in enumerate(self.values(field)):
+            if found == value:
+                return self.Record(self, number)
+        return None
+
+    def get(self, mint):
+        """Record for a mint address, or None"""
+        return self.lookup('mintAddress', mint.strip())
+
+def write_catalog(records, path=CATALOG_BIN, indexed=INDEXED_FIELDS):
+    """Build and write atomically; returns the file size"""
+    data = build_catalog(records, indexed)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+def open_catalog(json_path=CATALOG_JSON, bin_path=CATALOG_BIN):
+    """The binary catalog if it is at least as new as the JSON, otherwise the parsed JSON list.
+
+    Both give records with .get() and [field], so read-only tools can take
+    either without caring which one they got.
+    """
+    if os.path.exists(bin_path) and (not os.path.exists(json_path)
+                                     or os.path.getmtime(bin_path) >= os.path.getmtime(json_path)):
+        return Catalog(bin_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def cached_catalog(json_path=CATALOG_JSON, bin_path=CATALOG_BIN):
+    """open_catalog, kept for the rest of the process until either file changes.
+
+    mindfolk.py chains several read-only commands in one process; they all
+    get the same parsed (or mapped) catalog. Don't mutate what it returns.
+    """
+    key = (json_path, bin_path)
+    stamp = (_stamp(json_path), _stamp(bin_path))
+    hit = _cached.get(key)
+    if hit is None or hit[0] != stamp:
+        _cached[key] = hit = (stamp, open_catalog(json_path, bin_path))
+    return hit[1]
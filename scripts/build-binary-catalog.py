@@ -0,0 +1,85 @@
+"""
+Build the memory-mapped binary catalog (see binary_catalog.py).
+
+Converts data/mindfolk-nfts.json into data/mindfolk-nfts.bin, which the
+read-only Python tools open instead of parsing the JSON (open_catalog falls
+back to the JSON whenever the .bin is older). Rerun after anything rewrites
+the catalog.
+
+--lookup prints records by mint address (or --field Name) straight from
+the .bin, with the time the open and lookup took.
+
+Usage:
+    python scripts/build-binary-catalog.py
+    python scripts/build-binary-catalog.py --lookup <mint> [<mint> ...]
+    python scripts/build-binary-catalog.py --lookup "Ace Pilot Elder" --field Name
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from binary_catalog import CATALOG_BIN, CATALOG_JSON, Catalog, write_catalog
+from run_report import RunReport, add_report_arguments, stage
+
+def run(report, args):
+    if not os.path.exists(args.input):
+        print(f"ERROR: Catalog not found: {args.input}")
+        return False
+
+    with stage('json_load'), open(args.input, 'r', encoding='utf-8') as f:
+        nfts = json.load(f)
+    report.total = len(nfts)
+    with stage('build'):
+        size = write_catalog(nfts, args.output)
+    report.tick(args.output, count=len(nfts))
+
+    with Catalog(args.output) as catalog:
+        fields = catalog.fields
+
+    print(f"\n{'='*60}")
+    print(f"Records: {len(nfts)}")
+    print(f"Fields: {len(fields)} ({', '.join(fields)})")
+    print(f"Size: {os.path.getsize(args.input) / 1e6:.1f} MB JSON -> {size / 1e6:.1f} MB binary")
+    print(f"Saved to: {args.output}")
+    print(f"{'='*60}")
+    return True
+
+def lookup(args):
+    if not os.path.exists(args.output):
+        print(f"ERROR: Binary catalog not found: {args.output} (run without --lookup first)")
+        return False
+    started = time.perf_counter()
+    with Catalog(args.output) as catalog:
+        opened = time.perf_counter()
+        records = [catalog.lookup(args.field, value) for value in args.lookup]
+        finished = time.perf_counter()
+        for value, record in zip(args.lookup, records):
+            if record is None:
+                print(f"{value}: not in catalog")
+            else:
+                print(json.dumps(record.to_dict(), indent=2, ensure_ascii=False))
+    print(f"Open {1000 * (opened - started):.2f} ms, {len(args.lookup)} lookups {1000 * (finished - opened):.2f} ms")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Build data/mindfolk-nfts.bin from the catalog JSON')
+    parser.add_argument('--input', default=CATALOG_JSON)
+    parser.add_argument('--output', default=CATALOG_BIN)
+    parser.add_argument('--lookup', nargs='+', metavar='VALUE', help='print the records with these values')
+    parser.add_argument('--field', default='mintAddress', help='field --lookup matches (default: mintAddress)')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    if args.lookup:
+        ok = lookup(args)
+    else:
+        with RunReport('binary-catalog', args=args) as report:
+            ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
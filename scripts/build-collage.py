@@ -0,0 +1,269 @@
+"""
+Build a collage/mosaic of the collection from the existing thumbnails.
+
+Replaces hand-assembling img/collage.png and img/bigcollage.png. Tiles are
+ordered by type, rarity (statistical, from the attributes in
+data/founder-metadata.json), average colour or name, and the image is
+written one row of tiles at a time (strip_png.py), with the next rows
+already being decoded by a thread pool. Memory stays at a few strips even
+for the full 10k-tile collection.
+
+Large mosaics also get a Deep Zoom tile pyramid (tile_pyramid.py) built in
+the same pass, so they can be shown zoomable instead of as one huge PNG.
+A layout JSON next to the image lists the NFT in every cell.
+
+Requirements:
+    pip install Pillow numpy
+
+Usage:
+    python scripts/build-collage.py
+    python scripts/build-collage.py --order colour --size 190x190 --pyramid
+    python scripts/build-collage.py --type Elder --columns 8 --output img/elders-collage.png
+"""
+
+import argparse
+import colorsys
+import json
+import math
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from mindfolk_config import CONFIG, thumbnail_dirs
+from name_matching import normalize_name, number_key
+from run_report import RunReport, add_report_arguments, stage
+from strip_png import StripPNGWriter
+from tile_pyramid import StreamingPyramid
+
+CATALOG_JSON = CONFIG.catalog_json
+METADATA_JSON = 'data/founder-metadata.json'
+THUMBNAIL_DIRS = thumbnail_dirs()
+COLOUR_SIZE = '30x30'  # Average colours are taken from the smallest thumbnails
+OUTPUT_PNG = 'img/mosaic/mosaic.png'
+
+ORDERS = ('type', 'rarity', 'colour', 'name')
+TYPE_ORDER = ['Elder', 'Mushroom Head', 'Founder']  # Rarest first, as the catalog's Type values
+NUMBERED_TYPES = {'founder': 'Founder', 'mushroom': 'Mushroom Head'}  # number_key kind -> Type
+BACKGROUND = (0, 0, 0)  # Empty cells in the last row; matches the thumbnails' black padding
+WORKERS = min(32, (os.cpu_count() or 4) * 2)  # JPEG decoding releases the GIL
+PREFETCH_STRIPS = 4  # Rows of tiles decoded ahead of the one being written
+PYRAMID_MIN_PIXELS = 50_000_000  # Build the zoom pyramid automatically above this size
+
+def infer_type(name):
+    """Type of an NFT known only by name: numbered Founders and Mushroom Heads, else the named Elders"""
+    key = number_key(name)
+    if key:
+        return NUMBERED_TYPES[key[0]]
+    return 'Elder' if 'elder' in normalize_name(name).split() else ''
+
+def collect_tiles(size, catalog_path, type_filter=None):
+    """[{'name', 'mint', 'type', 'path'}] from the catalog, or the thumbnail folder without one"""
+    tiles = []
+    if os.path.exists(catalog_path):
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            for nft in json.load(f):
+                path = (nft.get('thumbnailURLs') or {}).get(size)
+                name = (nft.get('Name') or '').strip()
+                if path and name:
+                    tiles.append({'name': name, 'mint': (nft.get('mintAddress') or '').strip(),
+                                  'type': (nft.get('Type') or '').strip() or infer_type(name), 'path': path})
+    else:
+        for path in sorted(Path(THUMBNAIL_DIRS[size]).glob('*.jpg')):
+            tiles.append({'name': path.stem, 'mint': '', 'type': infer_type(path.stem),
+                          'path': path.as_posix()})
+    if type_filter:
+        tiles = [tile for tile in tiles if tile['type'].lower() == type_filter.lower()]
+    return tiles
+
+def name_sort_key(tile):
+    key = number_key(tile['name'])
+    return (key[1], tile['name']) if key else (math.inf, tile['name'])
+
+def type_sort_key(tile):
+    ranks = [nft_type.lower() for nft_type in TYPE_ORDER]
+    nft_type = tile['type'].lower()
+    rank = ranks.index(nft_type) if nft_type in ranks else len(TYPE_ORDER)
+    return (rank, *name_sort_key(tile))
+
+def rarity_scores(metadata_path):
+    """{mint: score}, the sum of -log(frequency) over each NFT's attribute values"""
+    if not os.path.exists(metadata_path):
+        return {}
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    traits = {}
+    for entry in entries:
+        attributes = entry['metadata'].get('attributes') or []
+        traits[entry['mintAddress']] = [(a.get('trait_type'), str(a.get('value')))
+                                        for a in attributes if isinstance(a, dict)]
+    counts = Counter(trait for values in traits.values() for trait in values)
+    total = len(traits)
+    return {mint: sum(-math.log(counts[trait] / total) for trait in values) for mint, values in traits.items()}
+
+def average_colours(tiles, workers):
+    """Average RGB of each tile, read from the 30x30 thumbnail next to it"""
+    def average(tile):
+        path = Path(THUMBNAIL_DIRS[COLOUR_SIZE]) / Path(tile['path']).name
+        try:
+            with Image.open(path if path.exists() else tile['path']) as img:
+                img.draft('RGB', (32, 32))
+                return img.convert('RGB').resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+        except OSError:
+            return BACKGROUND
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(average, tiles))
+
+def colour_sort_key(rgb):
+    """Hue bands first, greys last (by lightness), so the mosaic reads as a gradient"""
+    hue, lightness, saturation = colorsys.rgb_to_hls(*(channel / 255 for channel in rgb))
+    if saturation < 0.15 or lightness < 0.08 or lightness > 0.92:
+        return (1, 0, lightness)
+    return (0, round(hue * 12), lightness)
+
+def order_tiles(tiles, order, workers, metadata_path):
+    if order == 'name':
+        return sorted(tiles, key=name_sort_key)
+    if order == 'type':
+        return sorted(tiles, key=type_sort_key)
+    if order == 'rarity':
+        scores = rarity_scores(metadata_path)
+        if not scores:
+            print(f"[WARNING] No attributes in {metadata_path} (run scripts/fetch-metadata.py); ordering by type")
+            return sorted(tiles, key=type_sort_key)
+        # Rarest first; NFTs without metadata (Elders, Mushrooms) keep type order after them
+        return sorted(tiles, key=lambda tile: (-scores.get(tile['mint'], -math.inf), type_sort_key(tile)))
+    colours = average_colours(tiles, workers)
+    for tile, rgb in zip(tiles, colours):
+        tile['colour'] = '#%02x%02x%02x' % rgb
+    return [tile for _, tile in sorted(zip(colours, tiles), key=lambda item: colour_sort_key(item[0]))]
+
+def load_tile(path, tile_px):
+    """Tile as a (tile_px, tile_px, 3) array, or None when unreadable"""
+    try:
+        with Image.open(path) as img:
+            if img.size != (tile_px, tile_px):
+                img.draft('RGB', (tile_px, tile_px))  # JPEG DCT scaling, much cheaper than a full decode
+                img = img.convert('RGB').resize((tile_px, tile_px), Image.Resampling.LANCZOS)
+            return np.asarray(img.convert('RGB'))
+    except OSError:
+        return None
+
+def iter_strips(tiles, columns, tile_px, workers, on_row):
+    """Yield each row of tiles as one (tile_px, columns * tile_px, 3) array, decoding ahead"""
+    rows = [tiles[start:start + columns] for start in range(0, len(tiles), columns)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        queued = deque()
+
+        def submit(row):
+            queued.append([pool.submit(load_tile, tile['path'], tile_px) for tile in row])
+
+        for row in rows[:PREFETCH_STRIPS]:
+            submit(row)
+        for index, row in enumerate(rows):
+            if index + PREFETCH_STRIPS < len(rows):
+                submit(rows[index + PREFETCH_STRIPS])
+            strip = np.empty((tile_px, columns * tile_px, 3), dtype=np.uint8)
+            strip[:] = BACKGROUND
+            missing = []
+            for column, future in enumerate(queued.popleft()):
+                pixels = future.result()
+                if pixels is None:
+                    missing.append(row[column]['name'])
+                else:
+                    strip[:, column * tile_px:(column + 1) * tile_px] = pixels
+            on_row(row, missing)
+            yield strip
+
+def run(report, args):
+    with stage('collect'):
+        tiles = collect_tiles(args.size, args.catalog, args.type)
+    if not tiles:
+        print(f"ERROR: No thumbnails found for size {args.size} (catalog: {args.catalog})")
+        return False
+    if args.limit:
+        tiles = tiles[:args.limit]
+
+    with stage('order'):
+        tiles = order_tiles(tiles, args.order, args.workers, args.metadata)
+
+    tile_px = args.tile or int(args.size.split('x')[0])
+    columns = args.columns or math.ceil(math.sqrt(len(tiles)))
+    rows = math.ceil(len(tiles) / columns)
+    width, height = columns * tile_px, rows * tile_px
+    pyramid = args.pyramid if args.pyramid is not None else width * height >= PYRAMID_MIN_PIXELS
+    print(f"{len(tiles)} tiles ordered by {args.order}: {columns} x {rows} grid, "
+          f"{width} x {height} px{' + zoom pyramid' if pyramid else ''}")
+    report.total = len(tiles)
+
+    missing = []
+
+    def on_row(row, row_missing):
+        missing.extend(row_missing)
+        report.tick(row[-1]['name'], count=len(row), Missing=len(missing))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    base_path = os.path.splitext(args.output)[0]
+    tmp_path = args.output + '.tmp'
+    zoom = StreamingPyramid(base_path, width, height) if pyramid else nullcontext()
+    with stage('render'), StripPNGWriter(tmp_path, width, height, args.compress_level) as png, zoom:
+        for strip in iter_strips(tiles, columns, tile_px, args.workers, on_row):
+            png.write(strip)
+            if pyramid:
+                zoom.push(strip)
+    os.replace(tmp_path, args.output)
+
+    layout = {
+        'image': args.output.replace(os.sep, '/'),
+        'pyramid': f"{base_path}.dzi".replace(os.sep, '/') if pyramid else None,
+        'order': args.order,
+        'tileSize': tile_px,
+        'columns': columns,
+        'rows': rows,
+        'cells': [{key: tile[key] for key in ('name', 'mint', 'colour') if tile.get(key)} for tile in tiles],
+    }
+    with stage('json_dump'), open(f"{base_path}.json", 'w', encoding='utf-8') as f:
+        json.dump(layout, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"\n{'='*60}")
+    print(f"Collage: {args.output} ({os.path.getsize(args.output) / (1024 * 1024):.1f} MB)")
+    print(f"Tiles: {len(tiles)} ({len(missing)} unreadable, left blank)")
+    if pyramid:
+        print(f"Zoom pyramid: {base_path}.dzi ({zoom.levels} levels, {zoom.tiles_written} tiles)")
+    print(f"Layout: {base_path}.json")
+    print(f"{'='*60}")
+    for name in missing[:20]:
+        print(f"  [WARNING] Unreadable thumbnail: {name}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a collage of the collection from the thumbnails')
+    parser.add_argument('--size', choices=['190x190', '100x100'], default='100x100', help='thumbnail set to tile')
+    parser.add_argument('--tile', type=int, help='tile size in px (default: the thumbnail size)')
+    parser.add_argument('--order', choices=ORDERS, default='type')
+    parser.add_argument('--type', help="only NFTs of this type (Founder, Elder, 'Mushroom Head')")
+    parser.add_argument('--columns', type=int, help='tiles per row (default: square grid)')
+    parser.add_argument('--limit', type=int, help='only the first N NFTs (before ordering)')
+    parser.add_argument('--output', default=OUTPUT_PNG)
+    parser.add_argument('--pyramid', action=argparse.BooleanOptionalAction,
+                        help=f'write a Deep Zoom pyramid (default: above {PYRAMID_MIN_PIXELS // 1_000_000} MP)')
+    parser.add_argument('--compress-level', type=int, default=6, help='PNG zlib level (1 = fastest)')
+    parser.add_argument('--catalog', default=CATALOG_JSON)
+    parser.add_argument('--metadata', default=METADATA_JSON)
+    parser.add_argument('--workers', type=int, default=WORKERS, help='tile decoding threads')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('collage', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""
+Build an offline snapshot of the collection from the DAS API.
+
+Fetches every page of getAssetsByGroup with a few requests in flight over
+one pooled session, normalizes the assets into the data/mindfolk-nfts.json
+record shape and writes the snapshot plus a diff against the previous one.
+Fields the snapshot does not own (thumbnailURLs, gifURL, ...) are carried
+over from the previous record with the same mint.
+
+The endpoint is pluggable, so the builder can run against the local stand-in
+in mock_services.py.
+
+Requirements:
+    pip install requests   (listed in requirements.txt)
+
+Usage:
+    set HELIUS_API_KEY=...
+    python scripts/build-collection-snapshot.py
+    python scripts/build-collection-snapshot.py --endpoint http://127.0.0.1:8899/ --output snapshot.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from mindfolk_config import CONFIG
+from run_report import RunReport, add_report_arguments, stage
+
+COLLECTION_ADDRESS = '5QLnLVMudoP82jJaMP78Sk9GJxesiFaCQNovWyvZ4VJk'
+HELIUS_RPC = 'https://mainnet.helius-rpc.com/?api-key={api_key}'
+OUTPUT_JSON = CONFIG.catalog_json
+DIFF_JSON = 'data/snapshot-diff.json'
+
+PAGE_LIMIT = 1000   # DAS maximum page size
+CONCURRENCY = 4     # Pages in flight
+RETRIES = 4
+BACKOFF_SECONDS = 0.5  # Doubled after every failed attempt
+TIMEOUT_SECONDS = 60
+
+# Keys the snapshot writes; everything else in a record is kept from the previous file
+SNAPSHOT_FIELDS = ('mintAddress', 'Name', 'URL', 'Type', 'Filetype', 'metadataURL')
+
+def make_session(concurrency):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def fetch_page(session, endpoint, collection, page, limit=PAGE_LIMIT):
+    """Items of one getAssetsByGroup page, retrying rate limits and server errors"""
+    body = {
+        'jsonrpc': '2.0',
+        'id': f'page-{page}',
+        'method': 'getAssetsByGroup',
+        'params': {'groupKey': 'collection', 'groupValue': collection, 'page': page, 'limit': limit},
+    }
+    delay = BACKOFF_SECONDS
+    for attempt in range(1, RETRIES + 1):
+        try:
+            response = session.post(endpoint, json=body, timeout=TIMEOUT_SECONDS)
+            if response.status_code == 429 or response.status_code >= 500:
+                raise requests.HTTPError(f"HTTP {response.status_code}")
+            response.raise_for_status()
+            data = response.json()
+            if data.get('error'):
+                raise RuntimeError(f"DAS error on page {page}: {data['error'].get('message')}")
+            return (data.get('result') or {}).get('items') or []
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            if attempt == RETRIES:
+                raise RuntimeError(f"page {page} failed after {RETRIES} attempts: {e}") from e
+            print(f"  [WARNING] Page {page}: {e}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            delay *= 2
+
+def fetch_all_pages(endpoint, collection, concurrency=CONCURRENCY, limit=PAGE_LIMIT, report=None):
+    """All assets of the collection, in page order.
+
+    Keeps `concurrency` pages in flight; the first short page marks the end,
+    so at most concurrency - 1 requests go past it. Once it has arrived the
+    asset count is exact and replaces the report's estimate.
+    """
+    pages = {}
+    last_page = None
+    next_page = 1
+    with make_session(concurrency) as session, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        in_flight = {}
+        while True:
+            while len(in_flight) < concurrency and (last_page is None or next_page <= last_page):
+                future = pool.submit(fetch_page, session, endpoint, collection, next_page, limit)
+                in_flight[future] = next_page
+                next_page += 1
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = in_flight.pop(future)
+                items = future.result()
+                pages[page] = items
+                if len(items) < limit and (last_page is None or page < last_page):
+                    last_page = page
+                    if report:
+                        report.total = (page - 1) * limit + len(items)
+                if report:
+                    report.tick(f'page {page}', count=len(items), Pages=len(pages))
+    return [item for page in sorted(pages) if page <= last_page for item in pages[page]]
+
+def normalize_asset(item):
+    """data/mindfolk-nfts.json record for a DAS asset (same lookups as gallery.js)"""
+    content = item.get('content') or {}
+    metadata = content.get('metadata') or {}
+    files = content.get('files') or []
+    mint = item.get('id') or item.get('mint') or ''
+
+    image = ''
+    mime = ''
+    if files:
+        image = files[0].get('cdn_uri') or files[0].get('uri') or files[0].get('file') or ''
+        mime = files[0].get('mime') or ''
+    image = image or metadata.get('image') or ''
+
+    nft_type = ''
+    for attribute in metadata.get('attributes') or []:
+        if str(attribute.get('trait_type', '')).lower() == 'type':
+            nft_type = str(attribute.get('value', ''))
+            break
+
+    filetype = mime.split('/')[-1] if mime else os.path.splitext(image.split('?')[0])[1].lstrip('.')
+    return {
+        'mintAddress': mint,
+        'Name': metadata.get('name') or '',
+        'URL': image,
+        'Type': nft_type,
+        'Filetype': filetype.lower(),
+        'metadataURL': content.get('json_uri') or '',
+    }
+
+def merge_snapshot(records, previous):
+    """Order like the previous file (new mints last) and keep non-snapshot fields"""
+    previous_by_mint = {record.get('mintAddress'): record for record in previous}
+    by_mint = {}
+    for record in records:
+        old = previous_by_mint.get(record['mintAddress'], {})
+        by_mint[record['mintAddress']] = {**old, **record}
+    ordered = [by_mint.pop(mint) for mint in previous_by_mint if mint in by_mint]
+    return ordered + list(by_mint.values())
+
+def diff_snapshots(previous, current):
+    """Added/removed mints and per-field changes of the snapshot fields"""
+    previous_by_mint = {record.get('mintAddress'): record for record in previous}
+    current_by_mint = {record['mintAddress']: record for record in current}
+    changed = []
+    for mint, record in current_by_mint.items():
+        old = previous_by_mint.get(mint)
+        if old is None:
+            continue
+        fields = {key: [old.get(key), record.get(key)] for key in SNAPSHOT_FIELDS
+                  if old.get(key, '') != record.get(key, '')}
+        if fields:
+            changed.append({'mintAddress': mint, 'Name': record.get('Name'), 'fields': fields})
+    return {
+        'added': [{'mintAddress': m, 'Name': r.get('Name')} for m, r in current_by_mint.items() if m not in previous_by_mint],
+        'removed': [{'mintAddress': m, 'Name': r.get('Name')} for m, r in previous_by_mint.items() if m not in current_by_mint],
+        'changed': changed,
+    }
+
+def save_json(data, path):
+    """Write JSON atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def run(report, args):
+    endpoint = args.endpoint
+    if not endpoint:
+        api_key = args.api_key or os.environ.get('HELIUS_API_KEY')
+        if not api_key:
+            print("ERROR: Set HELIUS_API_KEY, or pass --api-key or --endpoint")
+            return False
+        endpoint = HELIUS_RPC.format(api_key=api_key)
+
+    previous = []
+    if os.path.exists(args.output):
+        with stage('json_load'), open(args.output, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    print(f"Fetching collection {args.collection} ({args.concurrency} pages in flight)...")
+    report.total = len(previous)  # Estimate until the last page is known
+    with stage('fetch'):
+        items = fetch_all_pages(endpoint, args.collection, args.concurrency, args.limit, report)
+
+    with stage('normalize'):
+        records = [normalize_asset(item) for item in items if not item.get('burnt')]
+        unique = {}
+        for record in records:
+            if record['mintAddress']:
+                unique.setdefault(record['mintAddress'], record)
+        snapshot = merge_snapshot(list(unique.values()), previous)
+        diff = diff_snapshots(previous, snapshot)
+
+    with stage('json_dump'):
+        save_json(snapshot, args.output)
+        save_json(diff, args.diff)
+
+    print(f"\n{'='*60}")
+    print(f"Assets fetched: {len(items)}")
+    print(f"Snapshot records: {len(snapshot)}")
+    print(f"Added: {len(diff['added'])}, removed: {len(diff['removed'])}, changed: {len(diff['changed'])}")
+    print(f"Saved to: {args.output}")
+    print(f"Diff: {args.diff}")
+    print(f"{'='*60}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Snapshot the collection from the DAS API')
+    parser.add_argument('--endpoint', help='JSON-RPC endpoint URL (default: Helius mainnet with HELIUS_API_KEY)')
+    parser.add_argument('--api-key')
+    parser.add_argument('--collection', default=COLLECTION_ADDRESS)
+    parser.add_argument('--output', default=OUTPUT_JSON)
+    parser.add_argument('--diff', default=DIFF_JSON)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--limit', type=int, default=PAGE_LIMIT, help='assets per page')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('collection-snapshot', args=args) as report:
+        try:
+            ok = run(report, args)
+        except RuntimeError as e:
+            print(f"ERROR: {e}")
+            ok = False
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
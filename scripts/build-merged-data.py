@@ -0,0 +1,133 @@
+"""
+Normalize merged_mindfolk_data.json into strict, compact JSON.
+
+merged_mindfolk_data.json is a JavaScript literal ({ mintid: '...', metadata: '...' }),
+which the browser could only read via eval. This streams it through the
+tolerant parser in js_literal.py, validates every mint (base58, 32 bytes) and
+metadata URL (arweave transaction id), and writes data/mint-metadata.json as
+a plain {mint: metadataURL} object that gallery.js loads with response.json().
+
+With --shards, the map is also split by the first character of the mint into
+data/mint-metadata/<hex code of the character>.json ('A' -> 41.json,
+'a' -> 61.json, so the names don't collide on case-insensitive filesystems)
+plus an index.json listing each shard's file and entry count.
+
+Usage:
+    python scripts/build-merged-data.py
+    python scripts/build-merged-data.py --shards
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from js_literal import LiteralSyntaxError, iter_literal_items
+from mint_utils import is_arweave_url, is_valid_mint
+from run_report import RunReport, add_report_arguments, stage
+
+INPUT_FILE = 'merged_mindfolk_data.json'
+OUTPUT_JSON = 'data/mint-metadata.json'
+SHARD_DIR = 'data/mint-metadata'
+LEGACY_SHARD = re.compile(r'^[1-9A-HJ-NP-Za-km-z]\.json$')  # <char>.json, from before hex names
+
+def write_json(data, path):
+    """Write compact JSON atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def shard_filename(mint):
+    """Shard of a mint: its first character as hex, which is case-safe ('A' -> 41.json)"""
+    return f'{ord(mint[0]):02x}.json'
+
+def write_shards(mint_map, shard_dir):
+    """Split the map by first mint character; returns {char: entry count}"""
+    shards = {}
+    for mint, url in mint_map.items():
+        shards.setdefault(mint[0], {})[mint] = url
+    for char, shard in shards.items():
+        write_json(shard, os.path.join(shard_dir, shard_filename(char)))
+    if os.path.isdir(shard_dir):
+        for name in os.listdir(shard_dir):
+            if LEGACY_SHARD.match(name):
+                os.remove(os.path.join(shard_dir, name))
+    counts = {char: len(shards[char]) for char in sorted(shards)}
+    index = {char: {'file': shard_filename(char), 'count': count} for char, count in counts.items()}
+    write_json({'count': len(mint_map), 'shards': index}, os.path.join(shard_dir, 'index.json'))
+    return counts
+
+def run(report, args):
+    if not os.path.exists(args.input):
+        print(f"ERROR: Input file not found: {args.input}")
+        return False
+
+    mint_map = {}
+    invalid = []
+    duplicates = 0
+    conflicts = []
+
+    print(f"Reading {args.input}...")
+    try:
+        with stage('parse'), open(args.input, 'r', encoding='utf-8') as f:
+            for position, item in enumerate(iter_literal_items(f), 1):
+                if not isinstance(item, dict):
+                    invalid.append((position, repr(item)[:60], 'not an object'))
+                    continue
+                mint = str(item.get('mintid') or '').strip()
+                url = str(item.get('metadata') or '').strip()
+                if not is_valid_mint(mint):
+                    invalid.append((position, mint, 'invalid mint address'))
+                elif not is_arweave_url(url):
+                    invalid.append((position, mint, f"invalid metadata URL {url!r}"))
+                elif mint in mint_map:
+                    duplicates += 1
+                    if mint_map[mint] != url:
+                        conflicts.append((mint, mint_map[mint], url))
+                else:
+                    mint_map[mint] = url
+                report.tick(mint or None)
+    except LiteralSyntaxError as e:
+        print(f"ERROR: Could not parse {args.input}: {e}")
+        return False
+
+    with stage('json_dump'):
+        write_json(mint_map, args.output)
+        shard_counts = write_shards(mint_map, args.shard_dir) if args.shards else None
+
+    print(f"\n{'='*60}")
+    print(f"Valid entries: {len(mint_map)}")
+    print(f"Invalid entries: {len(invalid)}")
+    print(f"Duplicate mints: {duplicates} ({len(conflicts)} with a different URL)")
+    print(f"Saved to: {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)")
+    if shard_counts:
+        print(f"Shards: {len(shard_counts)} files in {args.shard_dir}")
+    print(f"{'='*60}")
+
+    for position, mint, reason in invalid[:20]:
+        print(f"  [WARNING] Entry {position} ({mint or 'no mint'}): {reason}")
+    if len(invalid) > 20:
+        print(f"  ... and {len(invalid) - 20} more")
+    for mint, first, second in conflicts[:20]:
+        print(f"  [WARNING] {mint}: kept {first}, ignored {second}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Write merged_mindfolk_data.json as strict {mint: metadataURL} JSON')
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--output', default=OUTPUT_JSON)
+    parser.add_argument('--shards', action='store_true', help='also write per-first-character shards')
+    parser.add_argument('--shard-dir', default=SHARD_DIR)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('merged-data', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Build the mint membership artifact and per-shard catalog files.
+
+Writes data/mint-set.bin (bloom filter + sorted raw mints, see mint_set.py)
+and splits the catalog into data/catalog-shards/shard-NNN.json in the same
+sorted-mint order, so the gallery can filter wallet NFTs and fetch their
+records without loading the full catalog first.
+
+--lookup prints where a mint lives (membership, position, shard file)
+without rebuilding anything.
+
+Usage:
+    python scripts/build-mint-set.py
+    python scripts/build-mint-set.py --lookup <mint> [<mint> ...]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from mindfolk_config import CONFIG
+from mint_set import SHARD_SIZE, MintSet, build_mint_set, shard_filename
+from mint_utils import mint_bytes
+from run_report import RunReport, add_report_arguments, stage
+
+INPUT_JSON = CONFIG.catalog_json
+MINT_SET_FILE = 'data/mint-set.bin'
+SHARD_DIR = 'data/catalog-shards'
+
+def write_file(data, path):
+    """Write bytes atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def run(report, args):
+    if not os.path.exists(args.input):
+        print(f"ERROR: Catalog not found: {args.input}")
+        return False
+
+    with stage('json_load'), open(args.input, 'r', encoding='utf-8') as f:
+        nfts = json.load(f)
+    print(f"Found {len(nfts)} NFTs")
+
+    records = {}
+    invalid = []
+    for nft in nfts:
+        mint = (nft.get('mintAddress') or '').strip()
+        raw = mint_bytes(mint)
+        if raw is None:
+            invalid.append(nft.get('Name') or mint)
+        else:
+            records.setdefault(raw, nft)
+
+    with stage('build'):
+        data = build_mint_set((nft['mintAddress'].strip() for nft in records.values()), shard_size=args.shard_size)
+        mint_set = MintSet(data)
+    write_file(data, args.output)
+
+    with stage('shards'):
+        ordered = [records[mint_set.mint_at(i)] for i in range(len(mint_set))]
+        report.total = len(ordered)
+        shard_count = 0
+        for start in range(0, len(ordered), mint_set.shard_size):
+            shard = start // mint_set.shard_size
+            body = json.dumps(ordered[start:start + mint_set.shard_size], separators=(',', ':'), ensure_ascii=False)
+            write_file(body.encode('utf-8'), os.path.join(args.shard_dir, shard_filename(shard)))
+            shard_count += 1
+            report.tick(shard_filename(shard), count=len(ordered[start:start + mint_set.shard_size]))
+
+    print(f"\n{'='*60}")
+    print(f"Mints: {len(mint_set)}")
+    print(f"Artifact: {args.output} ({len(data) / 1024:.0f} KB, bloom {mint_set.bits // 8 / 1024:.1f} KB)")
+    print(f"Shards: {shard_count} files of up to {mint_set.shard_size} records in {args.shard_dir}")
+    if invalid:
+        print(f"Skipped {len(invalid)} records with an invalid mint address")
+    print(f"{'='*60}")
+    for name in invalid[:20]:
+        print(f"  [WARNING] Invalid mint: {name}")
+    return True
+
+def lookup(args):
+    if not os.path.exists(args.output):
+        print(f"ERROR: Mint set not found: {args.output} (run without --lookup first)")
+        return False
+    mint_set = MintSet.load(args.output)
+    for mint in args.lookup:
+        position = mint_set.position(mint)
+        if position is None:
+            print(f"{mint}: not in collection")
+        else:
+            shard = position // mint_set.shard_size
+            print(f"{mint}: position {position}, shard {shard} "
+                  f"({os.path.join(args.shard_dir, shard_filename(shard))})")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Build data/mint-set.bin and catalog shards')
+    parser.add_argument('--input', default=INPUT_JSON)
+    parser.add_argument('--output', default=MINT_SET_FILE)
+    parser.add_argument('--shard-dir', default=SHARD_DIR)
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+    parser.add_argument('--lookup', nargs='+', metavar='MINT', help='print position and shard of these mints')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    if args.lookup:
+        ok = lookup(args)
+    else:
+        with RunReport('mint-set', args=args) as report:
+            ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
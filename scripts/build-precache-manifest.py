@@ -0,0 +1,210 @@
+"""
+Build the service-worker precache manifest.
+
+Lists every local file the gallery needs, each with a content revision and
+an SRI integrity value, in two tiers:
+
+    core        index.html, local stylesheets, scripts and fonts, the
+                startup data files, the catalog shards and the first
+                BATCH_SIZE thumbnails of each --view; cached when the
+                service worker installs
+    background  the remaining thumbnails of each --view; cached once the
+                page has loaded (sw.js, on the page's request)
+
+The service worker keys its cache on url + revision, so after a rebuild only
+entries whose content changed are downloaded again. sw.js gets the manifest
+version stamped in, which is what makes browsers install the new build.
+
+The previous manifest is diffed against the new one and the invalidation
+volume (entries and bytes each returning visitor re-downloads) is printed
+per tier. Hashes are cached in data/hash-store.json by size and mtime, so
+only changed files are re-read.
+
+Usage:
+    python scripts/build-precache-manifest.py
+    python scripts/build-precache-manifest.py --view 6col --view list
+    python scripts/build-precache-manifest.py --catalog E:/mindfolk/mindfolk-nfts.json --dry-run
+"""
+
+import argparse
+import base64
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from check_page_weight import (CATALOG_URL, STARTUP_DATA, VIEW_SIZES, document_resources, is_remote,
+                               load_catalog, read_batch_size, site_path, thumbnail_url)
+from file_hashes import HASH_STORE_JSON, HashStore
+from run_report import RunReport, add_report_arguments, stage
+
+MANIFEST_JSON = 'data/precache-manifest.json'
+SERVICE_WORKER = 'sw.js'
+SHARD_GLOB = 'data/catalog-shards/*.json'
+TIERS = ('core', 'background')
+DEFAULT_VIEWS = ['6col']  # gallery.js mainGalleryView default
+REVISION_LENGTH = 16
+VERSION_PATTERN = re.compile(r"(const PRECACHE_VERSION = ')[^']*(';)")
+
+def integrity(sha256_hex):
+    """SRI value for a sha256 hex digest"""
+    return 'sha256-' + base64.b64encode(bytes.fromhex(sha256_hex)).decode('ascii')
+
+def collect(root, nfts, views, batch_size, theme, dpr):
+    """[(url, tier)] in load order, each local URL once"""
+    entries = {}
+
+    def add(url, tier):
+        if url and not is_remote(url) and url not in entries:
+            entries[url] = tier
+
+    for url, kind in document_resources(root):
+        add(url, 'core')
+    for url, fallback in STARTUP_DATA:
+        if fallback and not os.path.isfile(os.path.join(root, url)):
+            url = fallback  # What gallery.js loads once the primary 404s
+        add(url, 'core')
+    for path in sorted(glob.glob(os.path.join(root, SHARD_GLOB))):
+        add(os.path.relpath(path, root).replace(os.sep, '/'), 'core')
+    for view in views:
+        for number, nft in enumerate(nfts):
+            url = thumbnail_url(nft, VIEW_SIZES[view], theme, dpr)
+            if url and not is_remote(url):
+                add(site_path(url), 'core' if number < batch_size else 'background')
+    return list(entries.items())
+
+def manifest_version(entries):
+    digest = hashlib.sha256()
+    for entry in entries:
+        digest.update(f"{entry['url']}\0{entry['revision']}\0{entry['tier']}\n".encode('utf-8'))
+    return digest.hexdigest()[:REVISION_LENGTH]
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def diff_manifests(previous, entries):
+    """{tier: {'added', 'changed', 'unchanged', 'removed', 'invalidated_bytes'}}"""
+    old = {entry['url']: entry for entry in (previous or {}).get('entries', [])}
+    diff = {tier: {'added': 0, 'changed': 0, 'unchanged': 0, 'removed': 0, 'invalidated_bytes': 0} for tier in TIERS}
+    for entry in entries:
+        counts = diff[entry['tier']]
+        before = old.pop(entry['url'], None)
+        if before is None:
+            counts['added'] += 1
+        elif before['revision'] != entry['revision']:
+            counts['changed'] += 1
+        else:
+            counts['unchanged'] += 1
+            continue
+        counts['invalidated_bytes'] += entry['bytes']
+    for entry in old.values():
+        diff.get(entry.get('tier'), diff['background'])['removed'] += 1
+    return diff
+
+def stamp_service_worker(path, version):
+    """Write the manifest version into sw.js; False if it has no PRECACHE_VERSION line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    stamped, count = VERSION_PATTERN.subn(lambda match: match.group(1) + version + match.group(2), source)
+    if not count:
+        return False
+    if stamped != source:
+        write_text(stamped, path)
+    return True
+
+def write_text(text, path):
+    """Write a text file atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def run(report, args):
+    catalog = args.catalog or os.path.join(args.root, CATALOG_URL)
+    with stage('json_load'):
+        nfts = load_catalog(catalog)
+    if nfts is None:
+        print(f"[WARNING] Catalog not found: {catalog}: no thumbnails in the manifest")
+        nfts = []
+    batch_size = read_batch_size(args.root)
+    views = args.view or DEFAULT_VIEWS
+
+    listed = collect(args.root, nfts, views, batch_size, args.theme, args.dpr)
+    present = [(url, tier) for url, tier in listed if os.path.isfile(os.path.join(args.root, url))]
+    missing = [url for url, tier in listed if not os.path.isfile(os.path.join(args.root, url))]
+    print(f"Found {len(present)} files to precache ({len(missing)} listed but missing)")
+
+    store = HashStore(args.hash_store)
+    report.total = len(present)
+    with stage('hash'):
+        digests = store.hash_files([os.path.join(args.root, url) for url, tier in present],
+                                   on_hashed=lambda path: report.tick(path))
+    entries = []
+    for url, tier in present:
+        path = os.path.join(args.root, url)
+        digest = digests[path]
+        entries.append({'url': url, 'revision': digest[:REVISION_LENGTH], 'integrity': integrity(digest),
+                        'bytes': os.path.getsize(path), 'tier': tier})
+    version = manifest_version(entries)
+
+    previous = load_manifest(args.previous or args.output)
+    diff = diff_manifests(previous, entries)
+
+    if not args.dry_run:
+        manifest = {'version': version, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'batchSize': batch_size, 'views': views, 'theme': args.theme, 'entries': entries}
+        write_text(json.dumps(manifest, separators=(',', ':'), ensure_ascii=False), args.output)
+        store.save()
+        sw_path = os.path.join(args.root, SERVICE_WORKER)
+        if not os.path.exists(sw_path) or not stamp_service_worker(sw_path, version):
+            print(f"[WARNING] {sw_path} has no PRECACHE_VERSION line: browsers won't pick up this build")
+
+    print(f"\n{'='*60}")
+    print(f"Manifest: {args.output}{' (dry run, not written)' if args.dry_run else ''}")
+    print(f"Version: {version}" + (f" (was {previous['version']})" if previous else " (no previous build)"))
+    print(f"Hashed: {store.rehashed} new or changed files, {len(present) - store.rehashed} from the hash store")
+    print(f"  {'tier':<12}{'entries':>9}{'size':>13}{'added':>8}{'changed':>9}{'removed':>9}{'invalidated':>14}")
+    for tier in TIERS:
+        tier_entries = [entry for entry in entries if entry['tier'] == tier]
+        counts = diff[tier]
+        print(f"  {tier:<12}{len(tier_entries):>9,}{sum(e['bytes'] for e in tier_entries) / 1e6:>10.2f} MB"
+              f"{counts['added']:>8,}{counts['changed']:>9,}{counts['removed']:>9,}"
+              f"{counts['invalidated_bytes'] / 1e6:>11.2f} MB")
+    invalidated = sum(counts['added'] + counts['changed'] for counts in diff.values())
+    print(f"Returning visitors re-download {invalidated:,} entries "
+          f"({sum(counts['invalidated_bytes'] for counts in diff.values()) / 1e6:.2f} MB)")
+    print(f"{'='*60}")
+    for url in missing[:20]:
+        print(f"  [WARNING] Missing: {url}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Build data/precache-manifest.json for the service worker')
+    parser.add_argument('--root', default='.', help='site root (default: current directory)')
+    parser.add_argument('--catalog', help=f'catalog to take the thumbnails from (default: <root>/{CATALOG_URL})')
+    parser.add_argument('--view', choices=list(VIEW_SIZES), action='append',
+                        help=f"views whose thumbnails are precached (default: {', '.join(DEFAULT_VIEWS)})")
+    parser.add_argument('--theme', choices=('dark', 'light'), default='dark', help='thumbnail set (default: dark)')
+    parser.add_argument('--dpr', type=float, default=1.0, help='device pixel ratio for srcset (default: 1)')
+    parser.add_argument('--output', help=f'manifest path (default: <root>/{MANIFEST_JSON})')
+    parser.add_argument('--previous', help='manifest to diff against (default: the one being replaced)')
+    parser.add_argument('--hash-store', default=HASH_STORE_JSON)
+    parser.add_argument('--dry-run', action='store_true', help='report the diff without writing anything')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    args.output = args.output or os.path.join(args.root, MANIFEST_JSON)
+
+    with RunReport('precache-manifest', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
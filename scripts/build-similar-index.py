@@ -0,0 +1,310 @@
+"""
+Precompute "similar NFTs" for the detail modal.
+
+Every NFT gets a feature vector from its 100x100 thumbnail: a 4x4x4 RGB
+colour histogram (square-rooted, so one dominant colour doesn't swamp the
+rest) and an 8x8 luminance thumbnail with its mean removed, each half scaled
+to unit length. All vectors sit in one float32 matrix and the k nearest
+neighbours (squared Euclidean distance) are found a block of rows at a time,
+so memory stays at block_rows x N distances however large the catalog gets.
+The neighbours' mints are written into the catalog as "similar".
+
+Features and neighbours are kept in data/similar-index.npz. On a rerun only
+thumbnails whose size or mtime changed are decoded again, and only the rows
+that can have changed are recomputed:
+- changed NFTs, and NFTs that had a changed or removed NFT as a neighbour,
+  are searched against the whole matrix again
+- every other NFT keeps its old neighbours and is only compared with the
+  changed vectors, which is exact: nothing else moved
+
+Requirements:
+    pip install Pillow numpy
+
+Usage:
+    python scripts/build-similar-index.py
+    python scripts/build-similar-index.py --k 12 --full
+    python scripts/build-similar-index.py --lookup <mint>
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from mindfolk_config import CONFIG, thumbnail_dirs
+from run_report import RunReport, add_report_arguments, stage
+
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json
+INDEX_FILE = 'data/similar-index.npz'
+THUMBNAIL_SIZE = '100x100'
+THUMBNAIL_DIRS = thumbnail_dirs()
+
+NEIGHBOURS = 8
+HISTOGRAM_BINS = 4  # Per channel: 64 colour bins
+LUMINANCE_SIZE = 8  # 8x8 downsampled luminance
+FEATURE_VERSION = 1  # Bump when the features change; forces a full rebuild
+BLOCK_ROWS = 1024  # Rows of the distance matrix computed at once (N * 4 bytes each)
+WORKERS = min(32, (os.cpu_count() or 4) * 2)  # JPEG decoding releases the GIL
+
+def save_json(data, path, indent=2):
+    """Write JSON atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def thumbnail_path(nft, size):
+    """Local thumbnail of one size, preferring the configured thumbnail folder"""
+    url = (nft.get('thumbnailURLs') or {}).get(size)
+    if not url:
+        return None
+    path = Path(THUMBNAIL_DIRS[size]) / Path(url).name
+    return str(path) if path.exists() else url
+
+def unit(vector):
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+def image_features(path):
+    """Colour histogram + luminance layout of one thumbnail, or None if it can't be read"""
+    try:
+        with Image.open(path) as img:
+            rgb = np.asarray(img.convert('RGB'), dtype=np.uint8)
+    except OSError:
+        return None
+    bins = (rgb // (256 // HISTOGRAM_BINS)).astype(np.int32)
+    codes = (bins[..., 0] * HISTOGRAM_BINS + bins[..., 1]) * HISTOGRAM_BINS + bins[..., 2]
+    histogram = np.bincount(codes.ravel(), minlength=HISTOGRAM_BINS ** 3).astype(np.float32)
+    histogram = np.sqrt(histogram / histogram.sum())
+    luminance = Image.fromarray(rgb).convert('L').resize((LUMINANCE_SIZE, LUMINANCE_SIZE), Image.Resampling.BOX)
+    layout = np.asarray(luminance, dtype=np.float32).ravel()
+    return np.concatenate([unit(histogram), unit(layout - layout.mean())]).astype(np.float32)
+
+def collect_items(nfts, size):
+    """[(mint, path)] of the first record of each mint that has a local thumbnail"""
+    items = []
+    seen = set()
+    for nft in nfts:
+        mint = (nft.get('mintAddress') or '').strip()
+        path = thumbnail_path(nft, size)
+        if mint and mint not in seen and path and os.path.exists(path):
+            seen.add(mint)
+            items.append((mint, path))
+    return items
+
+def load_index(path):
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+def save_index(path, **arrays):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+def top_k(features, rows, k, block_rows):
+    """(indices, distances) of the k nearest other rows for each of `rows`, nearest first"""
+    norms = np.einsum('ij,ij->i', features, features)
+    indices = np.empty((len(rows), k), dtype=np.int32)
+    distances = np.empty((len(rows), k), dtype=np.float32)
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        d = norms[block, None] + norms[None, :] - 2 * (features[block] @ features.T)
+        d[np.arange(len(block)), block] = np.inf  # Not its own neighbour
+        nearest = np.argpartition(d, k, axis=1)[:, :k]
+        nearest_d = np.take_along_axis(d, nearest, axis=1)
+        order = np.argsort(nearest_d, axis=1, kind='stable')
+        indices[start:start + len(block)] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:start + len(block)] = np.take_along_axis(nearest_d, order, axis=1)
+    return indices, distances
+
+def merge_changed(features, rows, old_indices, old_distances, changed, k, block_rows):
+    """Top k of each row's old neighbours (none of them changed) plus the changed rows"""
+    norms = np.einsum('ij,ij->i', features, features)
+    changed_features = features[changed]
+    indices = np.empty((len(rows), k), dtype=np.int32)
+    distances = np.empty((len(rows), k), dtype=np.float32)
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        d = norms[block, None] + norms[None, changed] - 2 * (features[block] @ changed_features.T)
+        candidates = np.concatenate([old_indices[start:start + len(block)],
+                                     np.broadcast_to(changed, (len(block), len(changed)))], axis=1)
+        candidate_d = np.concatenate([old_distances[start:start + len(block)], d], axis=1)
+        order = np.argsort(candidate_d, axis=1, kind='stable')[:, :k]
+        indices[start:start + len(block)] = np.take_along_axis(candidates, order, axis=1)
+        distances[start:start + len(block)] = np.take_along_axis(candidate_d, order, axis=1)
+    return indices, distances
+
+def run(report, args):
+    if not os.path.exists(args.input):
+        print(f"ERROR: Catalog not found: {args.input}")
+        return False
+    with stage('json_load'), open(args.input, 'r', encoding='utf-8') as f:
+        nfts = json.load(f)
+
+    items = collect_items(nfts, args.size)
+    if len(items) <= args.k:
+        print(f"ERROR: Only {len(items)} NFTs have a {args.size} thumbnail, need more than --k {args.k}")
+        return False
+    print(f"Found {len(nfts)} NFTs, {len(items)} with a {args.size} thumbnail")
+    report.total = len(items)
+
+    mints = np.array([mint for mint, path in items])
+    stamps = np.array([(os.stat(path).st_size, os.stat(path).st_mtime_ns) for mint, path in items], dtype=np.int64)
+    previous = None if args.full else load_index(args.index)
+    if previous is not None and (int(previous['version']) != FEATURE_VERSION or previous['indices'].shape[1] != args.k):
+        previous = None
+
+    # Reuse the features of unchanged thumbnails
+    features = np.zeros((len(items), HISTOGRAM_BINS ** 3 + LUMINANCE_SIZE ** 2), dtype=np.float32)
+    fresh = np.ones(len(items), dtype=bool)
+    old_position = {}
+    if previous is not None:
+        old_position = {mint: i for i, mint in enumerate(previous['mints'].tolist())}
+        for i, mint in enumerate(mints.tolist()):
+            j = old_position.get(mint)
+            if j is not None and (previous['stamps'][j] == stamps[i]).all():
+                features[i] = previous['features'][j]
+                fresh[i] = False
+
+    readable = np.ones(len(items), dtype=bool)
+    with stage('features'), ThreadPoolExecutor(max_workers=args.workers) as pool:
+        stale = np.flatnonzero(fresh)
+        for i, vector in zip(stale, pool.map(image_features, [items[i][1] for i in stale])):
+            if vector is None:
+                readable[i] = False
+            else:
+                features[i] = vector
+            report.tick(items[i][0])
+    unreadable = [items[i][1] for i in np.flatnonzero(~readable)]
+    if unreadable:
+        items = [item for item, ok in zip(items, readable) if ok]
+        mints, stamps, features, fresh = mints[readable], stamps[readable], features[readable], fresh[readable]
+        if len(items) <= args.k:
+            print(f"ERROR: Only {len(items)} readable {args.size} thumbnails ({len(unreadable)} unreadable), "
+                  f"need more than --k {args.k}")
+            return False
+
+    # Rows to search in full: everything without a usable previous result
+    started = time.perf_counter()
+    with stage('neighbours'):
+        indices = np.empty((len(items), args.k), dtype=np.int32)
+        distances = np.empty((len(items), args.k), dtype=np.float32)
+        full_rows = np.arange(len(items))
+        merged_rows = np.array([], dtype=np.int64)
+        if previous is not None:
+            # Old neighbour lists in the new row order; -1 where the neighbour is gone
+            remap = np.full(len(previous['mints']), -1, dtype=np.int64)
+            for i, mint in enumerate(mints.tolist()):
+                j = old_position.get(mint)
+                if j is not None:
+                    remap[j] = i
+            kept = np.array([old_position.get(mint, -1) for mint in mints.tolist()])
+            affected = fresh | (kept < 0)
+            old_indices = np.zeros((len(items), args.k), dtype=np.int64)
+            old_distances = np.zeros((len(items), args.k), dtype=np.float32)
+            has_old = kept >= 0
+            old_indices[has_old] = remap[previous['indices'][kept[has_old]]]
+            old_distances[has_old] = previous['distances'][kept[has_old]]
+            # A neighbour that changed or disappeared may leave a gap only a full search can fill
+            lost = (old_indices < 0) | fresh[np.maximum(old_indices, 0)]
+            affected |= lost.any(axis=1)
+            full_rows = np.flatnonzero(affected)
+            merged_rows = np.flatnonzero(~affected)
+            changed = np.flatnonzero(fresh)
+            if len(merged_rows):
+                if len(changed):
+                    indices[merged_rows], distances[merged_rows] = merge_changed(
+                        features, merged_rows, old_indices[merged_rows], old_distances[merged_rows],
+                        changed, args.k, args.block_rows)
+                else:
+                    indices[merged_rows], distances[merged_rows] = old_indices[merged_rows], old_distances[merged_rows]
+        if len(full_rows):
+            indices[full_rows], distances[full_rows] = top_k(features, full_rows, args.k, args.block_rows)
+    elapsed = time.perf_counter() - started
+
+    similar = {mint: [mints[j] for j in row] for mint, row in zip(mints.tolist(), indices.tolist())}
+    updated = 0
+    for nft in nfts:
+        mint = (nft.get('mintAddress') or '').strip()
+        value = similar.get(mint)
+        if value is not None and nft.get('similar') != value:
+            nft['similar'] = value
+            updated += 1
+        elif value is None and 'similar' in nft:
+            del nft['similar']
+            updated += 1
+
+    if updated or args.output != args.input:
+        with stage('json_dump'):
+            save_json(nfts, args.output)
+    save_index(args.index, version=np.array(FEATURE_VERSION), mints=mints, stamps=stamps,
+               features=features, indices=indices, distances=distances)
+
+    print(f"\n{'='*60}")
+    print(f"NFTs indexed: {len(items)} ({features.shape[1]} features each, k={args.k})")
+    print(f"Features: {int(fresh.sum())} extracted, {len(items) - int(fresh.sum())} reused")
+    print(f"Rows: {len(full_rows)} searched in full, {len(merged_rows)} "
+          f"{'updated from the changed vectors' if fresh.any() else 'unchanged'} "
+          f"({elapsed:.2f}s, blocks of {args.block_rows} rows)")
+    print(f"Catalog records updated: {updated}{f' -> {args.output}' if updated else ''}")
+    print(f"Index: {args.index}")
+    if unreadable:
+        print(f"Unreadable thumbnails: {len(unreadable)}")
+    print(f"{'='*60}")
+    for path in unreadable[:20]:
+        print(f"  [WARNING] Unreadable: {path}")
+    return True
+
+def lookup(args):
+    index = load_index(args.index)
+    if index is None:
+        print(f"ERROR: Index not found: {args.index} (run without --lookup first)")
+        return False
+    position = {mint: i for i, mint in enumerate(index['mints'].tolist())}
+    for mint in args.lookup:
+        i = position.get(mint)
+        if i is None:
+            print(f"{mint}: not indexed")
+            continue
+        print(f"{mint}:")
+        for j, distance in zip(index['indices'][i], index['distances'][i]):
+            print(f"  {distance:8.4f}  {index['mints'][j]}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Write each NFT\'s most similar NFTs into the catalog')
+    parser.add_argument('--input', default=INPUT_JSON)
+    parser.add_argument('--output', default=OUTPUT_JSON)
+    parser.add_argument('--index', default=INDEX_FILE, help=f'feature and neighbour cache (default: {INDEX_FILE})')
+    parser.add_argument('--size', default=THUMBNAIL_SIZE, choices=list(THUMBNAIL_DIRS),
+                        help=f'thumbnails to take features from (default: {THUMBNAIL_SIZE})')
+    parser.add_argument('--k', type=int, default=NEIGHBOURS, help=f'neighbours per NFT (default: {NEIGHBOURS})')
+    parser.add_argument('--block-rows', type=int, default=BLOCK_ROWS,
+                        help=f'distance rows computed at once (default: {BLOCK_ROWS})')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--full', action='store_true', help='ignore the cache and rebuild everything')
+    parser.add_argument('--lookup', nargs='+', metavar='MINT', help='print the stored neighbours of these mints')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    if args.lookup:
+        ok = lookup(args)
+    else:
+        with RunReport('similar-index', args=args) as report:
+            ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,7 @@
-import json
+from binary_catalog import cached_catalog
 
-# Load JSON
-with open('data/mindfolk-nfts.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+# Load the catalog (data/mindfolk-nfts.bin when current; shared across mindfolk.py audits)
+data = cached_catalog()
 
 # Check for Bladesong NFTs
 bladesong_left = [n for n in data if 'Bladesong Left' in n.get('Name', '')]
@@ -1,9 +1,9 @@
-import json
 from collections import defaultdict
 
-# Load JSON
-with open('data/mindfolk-nfts.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+from binary_catalog import cached_catalog
+
+# Load the catalog (data/mindfolk-nfts.bin when current; shared across mindfolk.py audits)
+data = cached_catalog()
 
 # Check for duplicates by name
 names_dict = defaultdict(list)
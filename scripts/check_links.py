@@ -0,0 +1,252 @@
+"""
+Check every image/metadata link of the collection and report broken ones per NFT.
+
+Collects the arweave, Google Drive, IPFS and thumbnail links from the
+catalog, data/mindfolk-popup-images.json and data/mint-metadata.json, checks
+each unique URL once with HEAD (falling back to a one-byte ranged GET for
+hosts that reject HEAD), with a concurrency limit per host over keep-alive
+connections. Local thumbnail paths are checked on disk.
+
+Results are cached with a TTL in data/link-check-cache.json, so a daily run
+only re-checks stale entries; broken links are always re-checked.
+Exits non-zero when any link is broken, so a scheduled run can alert on it.
+
+Requirements:
+    pip install aiohttp
+
+Usage:
+    python scripts/check_links.py
+    python scripts/check_links.py --ttl-hours 0        # re-check everything
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import unquote, urlsplit
+
+import aiohttp
+
+from mindfolk_config import CONFIG
+from run_report import RunReport, add_report_arguments, stage
+
+CATALOG_JSON = CONFIG.catalog_json
+POPUP_JSON = CONFIG.popup_json
+MINT_METADATA_JSON = 'data/mint-metadata.json'
+CACHE_JSON = 'data/link-check-cache.json'
+REPORT_JSON = 'data/link-report.json'
+
+TTL_HOURS = 24
+DEFAULT_HOST_LIMIT = 8
+HOST_LIMITS = {
+    'arweave.net': 32,
+    'ipfs.io': 16,
+    'drive.google.com': 4,  # Drive rate-limits aggressively
+}
+RETRIES = 3
+BACKOFF_SECONDS = 1.0
+TIMEOUT_SECONDS = 30
+
+HEAD_FALLBACK_STATUSES = {403, 405, 501}  # Hosts that refuse HEAD but serve GET
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+CATALOG_FIELDS = ('URL', 'gifURL', 'pngURL', 'metadataURL', 'thumbnailURL')
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def collect_links(catalog, popup, mint_metadata):
+    """{url: [(nft_key, field), ...]} where nft_key is the mint (or name)"""
+    links = defaultdict(list)
+    mint_by_name = {}
+
+    def add(url, key, field):
+        if isinstance(url, str) and url.strip():
+            links[url.strip()].append((key, field))
+
+    for nft in catalog:
+        mint = (nft.get('mintAddress') or '').strip()
+        name = (nft.get('Name') or '').strip()
+        key = mint or name
+        if name and mint:
+            mint_by_name[name] = mint
+        for field in CATALOG_FIELDS:
+            add(nft.get(field), key, field)
+        for size, url in (nft.get('thumbnailURLs') or {}).items():
+            if isinstance(url, dict):  # Theme sets: {'light': {size: url}}
+                for theme_size, theme_url in url.items():
+                    add(theme_url, key, f'thumbnailURLs.{size}.{theme_size}')
+            else:
+                add(url, key, f'thumbnailURLs.{size}')
+        for size, variants in (nft.get('thumbnailSrcset') or {}).items():
+            # Theme sets nest like thumbnailURLs: {'light': {size: variants}}
+            sets = variants.items() if isinstance(variants, dict) else [(None, variants)]
+            for theme_size, theme_variants in sets:
+                field = f'thumbnailSrcset.{size}' if theme_size is None else f'thumbnailSrcset.{size}.{theme_size}'
+                for variant in theme_variants[1:]:  # 1x is already listed under thumbnailURLs
+                    add(variant.get('url'), key, f"{field}@{variant.get('width')}w")
+    for mint, url in (popup.get('byMint') or {}).items():
+        add(url, mint, 'popup')
+    for name, url in (popup.get('byName') or {}).items():
+        add(url, mint_by_name.get(name, name), 'popup (by name)')
+    for mint, url in mint_metadata.items():
+        add(url, mint, 'metadata')
+    return links
+
+def is_fresh(entry, ttl_seconds, now):
+    return bool(entry) and entry.get('ok') and now - entry.get('checked', 0) < ttl_seconds
+
+def check_local(url):
+    path = unquote(url.split('?')[0])
+    exists = os.path.exists(path)
+    return {'ok': exists, 'status': 200 if exists else 404, 'method': 'FILE', 'error': None}
+
+async def check_url(session, url):
+    """HEAD, then ranged GET where HEAD is refused; retries transient failures"""
+    delay = BACKOFF_SECONDS
+    result = None
+    for attempt in range(1, RETRIES + 1):
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                status, method = response.status, 'HEAD'
+            if status in HEAD_FALLBACK_STATUSES:
+                async with session.get(url, headers={'Range': 'bytes=0-0'}, allow_redirects=True) as response:
+                    status, method = response.status, 'GET'
+            result = {'ok': status < 400, 'status': status, 'method': method, 'error': None}
+            if status not in RETRY_STATUSES:
+                return result
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            result = {'ok': False, 'status': None, 'method': 'HEAD', 'error': str(e) or type(e).__name__}
+        if attempt < RETRIES:
+            await asyncio.sleep(delay)
+            delay *= 2
+    return result
+
+async def check_all(urls, cache, report, host_limits):
+    """Check remote URLs with per-host limits; results go into cache"""
+    semaphores = {}
+
+    def semaphore_for(host):
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(host_limits.get(host, DEFAULT_HOST_LIMIT))
+        return semaphores[host]
+
+    async def check(session, url):
+        async with semaphore_for(urlsplit(url).hostname or ''):
+            result = await check_url(session, url)
+        result['checked'] = time.time()
+        cache[url] = result
+        report.tick(url)
+
+    # Limits are enforced per host above; the connector only pools and keeps connections alive
+    connector = aiohttp.TCPConnector(limit=0, ttl_dns_cache=600)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_SECONDS)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(check(session, url) for url in urls))
+
+def save_json(data, path, indent=None):
+    """Write JSON atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def run(report, args):
+    with stage('json_load'):
+        catalog = load_json(args.catalog, [])
+        popup = load_json(args.popup, {})
+        mint_metadata = load_json(args.mint_metadata, {})
+        cache = load_json(args.cache, {})
+    names = {(nft.get('mintAddress') or '').strip(): nft.get('Name', '') for nft in catalog}
+
+    links = collect_links(catalog, popup, mint_metadata)
+    if not links:
+        print("ERROR: No links found (catalog, popup and metadata files are all missing or empty)")
+        return False
+
+    now = time.time()
+    ttl_seconds = args.ttl_hours * 3600
+    stale = [url for url in links if not is_fresh(cache.get(url), ttl_seconds, now)]
+    remote = [url for url in stale if url.startswith(('http://', 'https://'))]
+    local = [url for url in stale if not url.startswith(('http://', 'https://'))]
+    print(f"{len(links)} unique links, {len(links) - len(stale)} fresh in cache, "
+          f"{len(remote)} remote and {len(local)} local to check")
+    report.total = len(stale)
+
+    with stage('local'):
+        for url in local:
+            cache[url] = {**check_local(url), 'checked': now}
+            report.tick(url)
+    if remote:
+        with stage('remote'):
+            try:
+                asyncio.run(check_all(remote, cache, report, {**HOST_LIMITS, **args.host_limit}))
+            finally:
+                save_json(cache, args.cache)
+    else:
+        save_json(cache, args.cache)
+
+    broken_by_nft = defaultdict(list)
+    broken_by_host = defaultdict(int)
+    for url, owners in links.items():
+        result = cache.get(url, {})
+        if result.get('ok'):
+            continue
+        broken_by_host[urlsplit(url).hostname or 'local'] += 1
+        for key, field in owners:
+            broken_by_nft[key].append({'field': field, 'url': url, 'status': result.get('status'),
+                                       'error': result.get('error')})
+    broken_report = [{'mintAddress': key, 'Name': names.get(key, key), 'links': entries}
+                     for key, entries in sorted(broken_by_nft.items(), key=lambda item: names.get(item[0], item[0]))]
+    with stage('json_dump'):
+        save_json(broken_report, args.output, indent=2)
+
+    print(f"\n{'='*60}")
+    print(f"Links checked this run: {len(stale)}")
+    print(f"Broken links: {sum(broken_by_host.values())}")
+    for host, count in sorted(broken_by_host.items(), key=lambda item: -item[1]):
+        print(f"  {host}: {count}")
+    print(f"NFTs with broken links: {len(broken_report)}")
+    print(f"Report: {args.output}")
+    print(f"{'='*60}")
+    for entry in broken_report[:20]:
+        fields = ', '.join(f"{link['field']} ({link['status'] or link['error']})" for link in entry['links'])
+        print(f"  [ERROR] {entry['Name']}: {fields}")
+    if len(broken_report) > 20:
+        print(f"  ... and {len(broken_report) - 20} more")
+    return not broken_report
+
+def parse_host_limit(value):
+    host, _, limit = value.partition('=')
+    if not host or not limit.isdigit():
+        raise argparse.ArgumentTypeError("expected HOST=N")
+    return host, int(limit)
+
+def main():
+    parser = argparse.ArgumentParser(description='Check image/metadata links and report broken ones per NFT')
+    parser.add_argument('--catalog', default=CATALOG_JSON)
+    parser.add_argument('--popup', default=POPUP_JSON)
+    parser.add_argument('--mint-metadata', default=MINT_METADATA_JSON)
+    parser.add_argument('--cache', default=CACHE_JSON)
+    parser.add_argument('--output', default=REPORT_JSON)
+    parser.add_argument('--ttl-hours', type=float, default=TTL_HOURS, help='re-check working links older than this')
+    parser.add_argument('--host-limit', type=parse_host_limit, action='append', default=[], metavar='HOST=N',
+                        help='concurrent requests for a host (repeatable)')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    args.host_limit = dict(args.host_limit)
+
+    with RunReport('check-links', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
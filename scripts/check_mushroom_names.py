@@ -1,7 +1,6 @@
-import json
+from binary_catalog import cached_catalog
 
-with open('data/mindfolk-nfts.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = cached_catalog()
 
 mushrooms = [n for n in data if n.get('Type', '').strip().lower() == 'mushroom head']
 print(f'Mushroom Head NFTs: {len(mushrooms)}')
@@ -0,0 +1,351 @@
+"""
+Page-weight and request budgets for a first visit, per gallery view.
+
+Replays what the browser fetches when index.html loads, from the local
+files only (no server, no network):
+
+    document      index.html, then its local stylesheets, scripts, icon and
+                  the woff2 fonts of the local @font-face rules
+    startup data  the JSON/binary files gallery.js fetches before the first
+                  card (mint-set.bin, founder metadata, popup images, zoom
+                  tiles, arweave mapping, mint metadata - or its
+                  merged_mindfolk_data.json fallback - and the catalog)
+    thumbnails    one per NFT at the view's size (6col: 190x190,
+                  12col: 100x100, list: 30x30), picked from srcset at --dpr
+
+"first paint" is everything up to the first BATCH_SIZE cards (read from
+gallery.js); "full scroll" adds every remaining card. Each resource is
+counted once, as raw bytes and as transfer bytes: the .br/.gz sibling when
+one exists (serve-site.py --precompress), gzip -6 for other text files,
+and raw for images and fonts. Missing optional files still cost a request
+(the 404). Remote URLs are counted as requests with unknown size.
+
+Exits non-zero when a budget is exceeded. Budgets are keys
+<view>.<phase>.<metric> (view '*' for all, phase first_paint/full_scroll,
+metric requests/raw_bytes/transfer_bytes); --budget and --budget-file
+override DEFAULT_BUDGETS.
+
+Usage:
+    python scripts/check_page_weight.py
+    python scripts/check_page_weight.py --view list --dpr 2
+    python scripts/check_page_weight.py --catalog E:/mindfolk/mindfolk-nfts.json
+    python scripts/check_page_weight.py --budget '*.first_paint.transfer_bytes=3000000'
+    python scripts/check_page_weight.py --budget-file perf-budget.json --output bench-results/page-weight.json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+RESULTS_DIR = 'bench-results'
+GALLERY_JS = 'js/gallery.js'
+DEFAULT_BATCH_SIZE = 36  # gallery.js CONFIG.BATCH_SIZE, if it can't be read
+
+# Fetched by gallery.js on DOMContentLoaded, in order; (url, fallback when missing)
+STARTUP_DATA = [
+    ('data/mint-set.bin', None),
+    ('data/founder-metadata.json', None),
+    ('data/mindfolk-popup-images.json', None),
+    ('data/zoom-tiles.json', None),
+    ('arweave_image_mapping.json', None),
+    ('data/mint-metadata.json', 'merged_mindfolk_data.json'),
+    ('data/mindfolk-nfts.json', None),
+]
+CATALOG_URL = 'data/mindfolk-nfts.json'
+
+VIEW_SIZES = {'6col': '190x190', '12col': '100x100', 'list': '30x30'}
+PHASES = ('first_paint', 'full_scroll')
+METRICS = ('requests', 'raw_bytes', 'transfer_bytes')
+
+DEFAULT_BUDGETS = {
+    '*.first_paint.requests': 64,
+    '*.first_paint.transfer_bytes': 4_000_000,
+    '*.full_scroll.requests': 10_100,
+    '6col.full_scroll.transfer_bytes': 110_000_000,
+    '12col.full_scroll.transfer_bytes': 45_000_000,
+    'list.full_scroll.transfer_bytes': 12_000_000,
+}
+
+COMPRESSIBLE = ('.html', '.js', '.css', '.json', '.svg', '.dzi', '.xml', '.txt', '.csv')
+PRECOMPRESSED = ('.br', '.gz')  # Preferred order, as serve-site.py
+GZIP_LEVEL = 6  # What a typical server applies on the fly
+
+class DocumentAssets(HTMLParser):
+    """Local stylesheets, scripts and icons referenced by index.html, in document order"""
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'script' and attrs.get('src'):
+            self.urls.append(attrs['src'])
+        elif tag == 'link' and attrs.get('href'):
+            rel = (attrs.get('rel') or '').lower()
+            if 'stylesheet' in rel or 'icon' in rel.split():
+                self.urls.append(attrs['href'])
+
+def is_remote(url):
+    return bool(urlsplit(url).scheme) or url.startswith('//')
+
+def site_path(url, base=''):
+    """Site-relative path of a local URL (resolved against the referencing file's folder)"""
+    path = unquote(urlsplit(url).path)
+    if path.startswith('/'):
+        return path.lstrip('/')
+    return os.path.normpath(os.path.join(base, path)).replace(os.sep, '/')
+
+def font_urls(css_text, css_path):
+    """First woff2 (else first) source of every @font-face rule"""
+    urls = []
+    base = os.path.dirname(css_path)
+    for block in re.findall(r'@font-face\s*{([^}]*)}', css_text):
+        sources = re.findall(r'url\([\'"]?([^\'")]+)[\'"]?\)', block)
+        if sources:
+            chosen = next((source for source in sources if source.lower().endswith('.woff2')), sources[0])
+            urls.append(chosen if is_remote(chosen) else site_path(chosen, base))
+    return urls
+
+def read_batch_size(root):
+    try:
+        with open(os.path.join(root, GALLERY_JS), 'r', encoding='utf-8') as f:
+            match = re.search(r'BATCH_SIZE:\s*(\d+)', f.read())
+    except FileNotFoundError:
+        match = None
+    return int(match.group(1)) if match else DEFAULT_BATCH_SIZE
+
+class ResourceSizer:
+    """Raw and transfer size of site files, each measured once"""
+
+    def __init__(self, root):
+        self.root = root
+        self.sizes = {}
+
+    def measure(self, path):
+        """(raw bytes, transfer bytes), or None when the file is missing"""
+        if path in self.sizes:
+            return self.sizes[path]
+        full = os.path.join(self.root, path)
+        if not os.path.isfile(full):
+            self.sizes[path] = None
+            return None
+        raw = os.path.getsize(full)
+        transfer = raw
+        if path.lower().endswith(COMPRESSIBLE):
+            sibling = next((full + suffix for suffix in PRECOMPRESSED
+                            if os.path.isfile(full + suffix) and os.path.getmtime(full + suffix) >= os.path.getmtime(full)), None)
+            if sibling:
+                transfer = os.path.getsize(sibling)
+            else:
+                with open(full, 'rb') as f:
+                    transfer = len(gzip.compress(f.read(), GZIP_LEVEL))
+        self.sizes[path] = (raw, transfer)
+        return self.sizes[path]
+
+class Phase:
+    """Requests of one phase; each URL counts once per page load"""
+
+    def __init__(self, sizer, seen):
+        self.sizer = sizer
+        self.seen = seen  # Shared across phases of one view: cached resources aren't refetched
+        self.requests = 0
+        self.raw_bytes = 0
+        self.transfer_bytes = 0
+        self.missing = []
+        self.remote = 0
+        self.resources = []
+
+    def fetch(self, url, kind):
+        if url in self.seen:
+            return
+        self.seen.add(url)
+        self.requests += 1
+        if is_remote(url):
+            self.remote += 1
+            return
+        size = self.sizer.measure(url)
+        if size is None:
+            self.missing.append(url)
+            return
+        self.raw_bytes += size[0]
+        self.transfer_bytes += size[1]
+        self.resources.append((size[1], size[0], kind, url))
+
+    def totals(self):
+        return {'requests': self.requests, 'raw_bytes': self.raw_bytes,
+                'transfer_bytes': self.transfer_bytes, 'remote': self.remote, 'missing': len(self.missing)}
+
+def document_resources(root):
+    """[(url, kind)] the document pulls in before gallery.js runs"""
+    resources = [('index.html', 'document')]
+    index_path = os.path.join(root, 'index.html')
+    if not os.path.isfile(index_path):
+        return resources
+    parser = DocumentAssets()
+    with open(index_path, 'r', encoding='utf-8') as f:
+        parser.feed(f.read())
+    for url in parser.urls:
+        if is_remote(url):
+            resources.append((url, 'remote'))
+            continue
+        path = site_path(url)
+        resources.append((path, 'asset'))
+        if path.endswith('.css') and os.path.isfile(os.path.join(root, path)):
+            with open(os.path.join(root, path), 'r', encoding='utf-8') as f:
+                resources.extend((font, 'font') for font in font_urls(f.read(), path))
+    return resources
+
+def load_catalog(path):
+    """Catalog records as gallery.js keeps them: first occurrence of each mint"""
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        nfts = json.load(f)
+    seen = set()
+    unique = []
+    for nft in nfts:
+        mint = (nft.get('mintAddress') or '').strip()
+        if mint and mint in seen:
+            continue
+        seen.add(mint)
+        unique.append(nft)
+    return unique
+
+def thumbnail_url(nft, size_key, theme, dpr):
+    """URL the card's <img> ends up loading: the srcset candidate for dpr, else the plain thumbnail"""
+    urls = nft.get('thumbnailURLs') or {}
+    srcset = nft.get('thumbnailSrcset') or {}
+    if theme == 'light':
+        urls = urls.get('light') if isinstance(urls.get('light'), dict) else urls
+        srcset = srcset.get('light') if isinstance(srcset.get('light'), dict) else srcset
+    variants = srcset.get(size_key)
+    if isinstance(variants, list) and len(variants) >= 2:
+        base = variants[0]['width']
+        # Browsers take the smallest candidate at or above the device density
+        for variant in sorted(variants, key=lambda variant: variant['width']):
+            if variant['width'] / base >= dpr - 1e-9:
+                return variant['url']
+        return max(variants, key=lambda variant: variant['width'])['url']
+    return urls.get(size_key) or (nft.get('URL') or '').strip() or None
+
+def replay(root, view, nfts, batch_size, theme, dpr, sizer):
+    """{phase: Phase} for one view"""
+    seen = set()
+    first_paint = Phase(sizer, seen)
+    for url, kind in document_resources(root):
+        first_paint.fetch(url, kind)
+    for url, fallback in STARTUP_DATA:
+        if fallback and sizer.measure(url) is None:
+            first_paint.fetch(url, 'data')  # The 404, then the fallback
+            url = fallback
+        first_paint.fetch(url, 'data')
+
+    full_scroll = Phase(sizer, seen)
+    size_key = VIEW_SIZES[view]
+    for number, nft in enumerate(nfts or []):
+        url = thumbnail_url(nft, size_key, theme, dpr)
+        if url:
+            (first_paint if number < batch_size else full_scroll).fetch(url if is_remote(url) else site_path(url), 'thumbnail')
+    return {'first_paint': first_paint, 'full_scroll': full_scroll}
+
+def cumulative(phases):
+    """Phase totals, with full_scroll including first_paint"""
+    first = phases['first_paint'].totals()
+    rest = phases['full_scroll'].totals()
+    return {'first_paint': first, 'full_scroll': {key: first[key] + rest[key] for key in first}}
+
+def parse_budget(text):
+    key, separator, value = text.partition('=')
+    parts = key.strip().split('.')
+    if not separator or len(parts) != 3 or parts[1] not in PHASES or parts[2] not in METRICS:
+        raise argparse.ArgumentTypeError(f"expected <view|*>.<{'|'.join(PHASES)}>.<{'|'.join(METRICS)}>=N, got {text!r}")
+    return key.strip(), int(float(value))
+
+def budget_for(budgets, view, phase, metric):
+    return budgets.get(f'{view}.{phase}.{metric}', budgets.get(f'*.{phase}.{metric}'))
+
+def format_bytes(count):
+    return f"{count / 1e6:,.2f} MB"
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the gallery's first-visit page weight and request count against budgets")
+    parser.add_argument('--root', default='.', help='built site root (default: current directory)')
+    parser.add_argument('--catalog', help=f'catalog to take the cards from (default: <root>/{CATALOG_URL})')
+    parser.add_argument('--view', choices=list(VIEW_SIZES), action='append', help='only these views (default: all)')
+    parser.add_argument('--theme', choices=('dark', 'light'), default='dark', help='thumbnail set (default: dark)')
+    parser.add_argument('--dpr', type=float, default=1.0, help='device pixel ratio for srcset (default: 1)')
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[], metavar='KEY=N',
+                        help='override a budget, e.g. list.full_scroll.transfer_bytes=10000000')
+    parser.add_argument('--budget-file', help='JSON object of budget keys to override the defaults')
+    parser.add_argument('--top', type=int, default=5, help='heaviest first-paint resources to list (default: 5)')
+    parser.add_argument('--output', help='write the measurements as JSON')
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    if args.budget_file:
+        with open(args.budget_file, 'r', encoding='utf-8') as f:
+            budgets.update(parse_budget(f'{key}={value}') for key, value in json.load(f).items())
+    budgets.update(args.budget)
+
+    catalog = args.catalog or os.path.join(args.root, CATALOG_URL)
+    nfts = load_catalog(catalog)
+    if nfts is None:
+        print(f"[WARNING] Catalog not found: {catalog}: counting startup files only, no thumbnails")
+    batch_size = read_batch_size(args.root)
+    sizer = ResourceSizer(args.root)
+
+    results = {}
+    failures = []
+    for view in args.view or list(VIEW_SIZES):
+        phases = replay(args.root, view, nfts, batch_size, args.theme, args.dpr, sizer)
+        totals = cumulative(phases)
+        results[view] = totals
+
+        print(f"\n{'='*60}")
+        print(f"View {view} ({VIEW_SIZES[view]} thumbnails, {len(nfts or [])} cards, first {batch_size} at first paint)")
+        print(f"  {'phase':<12}{'requests':>10}{'raw':>16}{'transfer':>16}{'missing':>9}{'remote':>8}")
+        for phase in PHASES:
+            total = totals[phase]
+            print(f"  {phase:<12}{total['requests']:>10,}{format_bytes(total['raw_bytes']):>16}"
+                  f"{format_bytes(total['transfer_bytes']):>16}{total['missing']:>9}{total['remote']:>8}")
+            for metric in METRICS:
+                limit = budget_for(budgets, view, phase, metric)
+                if limit is not None and total[metric] > limit:
+                    failures.append((view, phase, metric, total[metric], limit))
+        heaviest = sorted(phases['first_paint'].resources, reverse=True)[:args.top]
+        if heaviest:
+            print("  Heaviest at first paint:")
+            for transfer, raw, kind, url in heaviest:
+                print(f"    {format_bytes(transfer):>12} ({format_bytes(raw)} raw) {kind:<9} {url}")
+        missing = phases['first_paint'].missing
+        if missing:
+            print(f"  Missing at first paint (404): {', '.join(missing[:8])}{' ...' if len(missing) > 8 else ''}")
+
+    print(f"\n{'='*60}")
+    if failures:
+        for view, phase, metric, value, limit in failures:
+            print(f"[ERROR] {view}.{phase}.{metric}: {value:,} > budget {limit:,} (+{(value - limit) / limit:.1%})")
+    else:
+        print("[OK] All views within budget")
+    print(f"{'='*60}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'dpr': args.dpr, 'theme': args.theme,
+                       'batchSize': batch_size, 'budgets': budgets, 'views': results,
+                       'failures': [dict(zip(('view', 'phase', 'metric', 'value', 'budget'), failure))
+                                    for failure in failures]}, f, indent=2)
+        print(f"Saved results to {args.output}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
-import json
+from binary_catalog import cached_catalog
 
-with open('data/mindfolk-nfts.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+# data/mindfolk-nfts.bin when it is current (no full JSON parse), else the JSON
+data = cached_catalog()
 
 sample = data[0]
 print('Sample NFT:')
@@ -9,10 +9,3 @@ print(f'  Name: {sample.get("Name")}')
 print(f'  thumbnailURL: {sample.get("thumbnailURL", "N/A")}')
 print(f'  thumbnailURLs: {sample.get("thumbnailURLs", {})}')
 print(f'  URL: {sample.get("URL", "N/A")}')
-
-
-
-
-
-
-
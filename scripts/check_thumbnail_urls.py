@@ -1,7 +1,7 @@
-import json
+from binary_catalog import cached_catalog
 
-with open('data/mindfolk-nfts.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+# data/mindfolk-nfts.bin when it is current (records decode only the fields read), else the JSON
+data = cached_catalog()
 
 # Check a Founder NFT
 founder = [n for n in data if 'Founder' in n.get('Name', '')][0]
@@ -0,0 +1,164 @@
+"""Shared colour-space and alpha-compositing stage for the image scripts.
+
+Every renderer used to build a fresh background with Image.new and paste()
+the RGBA source onto it, once per output size, and each picked its own
+colour (black in the local generator, white in the Mushroom/Elder/popup
+scripts). Here a source is decoded once, converted from its embedded ICC
+profile to sRGB once and premultiplied once. Composite.fit_square resizes
+the premultiplied pixels, so each size is resized once and then flattened
+onto any background with one vectorized NumPy add of a per-alpha lookup
+table. Flattened buffers are cached per background.
+
+Backgrounds are configured per collection type and per theme: 'dark'
+matches the 'modern' theme of js/theme-switcher.js, 'light' the 'classic'.
+
+Requirements:
+    pip install Pillow numpy
+
+Usage:
+    from compositing import background_for, load_composite
+
+    composite = load_composite(path)
+    for size in sizes:
+        fitted = composite.fit_square(size)
+        thumb = fitted.flatten(background_for(nft_type, 'dark'))
+        themed = fitted.variants(nft_type)    # {'dark': image, 'light': image}
+
+    # One background only: flatten the full size once, then fit_square(flat, size, background)
+"""
+import io
+
+import numpy as np
+from PIL import Image
+
+from run_report import stage
+
+try:
+    from PIL import ImageCms
+except ImportError:  # Pillow built without LittleCMS: sources are used as-is
+    ImageCms = None
+
+THEMES = {'dark': 'modern', 'light': 'classic'}  # Background variant -> js/theme-switcher.js theme
+
+# Keyed by lower-cased catalog Type; 'default' covers anything not listed
+TYPE_BACKGROUNDS = {
+    'default': {'dark': (0, 0, 0), 'light': (255, 255, 255)},
+    'founder': {'dark': (0, 0, 0), 'light': (255, 255, 255)},
+    'elder': {'dark': (0, 0, 0), 'light': (255, 255, 255)},
+    'mushroom head': {'dark': (0, 0, 0), 'light': (255, 255, 255)},
+}
+
+_srgb_profile = None
+
+def background_for(nft_type, theme='dark'):
+    """Background RGB for an NFT type in a theme ('dark' or 'light')"""
+    backgrounds = TYPE_BACKGROUNDS.get((nft_type or '').strip().lower(), TYPE_BACKGROUNDS['default'])
+    return backgrounds[theme]
+
+def open_image(path):
+    """Open and fully decode an image (the first frame of an animation)"""
+    with Image.open(path) as img:
+        img.load()
+        return img.copy() if getattr(img, 'is_animated', False) else img
+
+def load_composite(path):
+    """Decode path and premultiply it once (timed as the 'decode' and 'composite' stages)"""
+    with stage('decode'):
+        img = open_image(path)
+    with stage('composite'):
+        return Composite(img)
+
+def to_srgb(img):
+    """Convert an image with an embedded non-sRGB ICC profile to sRGB (RGB/RGBA out)"""
+    global _srgb_profile
+    icc = img.info.get('icc_profile')
+    if not icc or ImageCms is None:
+        return img
+    try:
+        profile = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+        if 'srgb' in ImageCms.getProfileDescription(profile).lower():
+            return img
+        if _srgb_profile is None:
+            _srgb_profile = ImageCms.createProfile('sRGB')
+        if img.mode == 'CMYK':
+            # A CMYK profile describes the ink values, so transform those, not an RGB conversion of them
+            return ImageCms.profileToProfile(img, profile, _srgb_profile, outputMode='RGB')
+        mode = 'RGBA' if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info else 'RGB'
+        if img.mode != mode:
+            img = img.convert(mode)
+        return ImageCms.profileToProfile(img, profile, _srgb_profile, outputMode=mode)
+    except (ImageCms.PyCMSError, OSError, ValueError):
+        return img  # Broken or mismatched profile (e.g. grey profile on RGB data): keep the pixels
+
+class Composite:
+    """A decoded source in sRGB, premultiplied once, flattened onto any background on demand"""
+
+    def __init__(self, img):
+        img = to_srgb(img)
+        self.size = img.size
+        self.has_alpha = img.mode in ('RGBA', 'LA', 'PA', 'RGBa') or 'transparency' in img.info
+        self._flat = {}
+        if self.has_alpha:
+            if img.mode not in ('RGBA', 'RGBa'):
+                img = img.convert('RGBA')
+            self.image = img if img.mode == 'RGBa' else img.convert('RGBa')
+            premultiplied = np.asarray(self.image)
+            self.alpha = premultiplied[..., 3]
+            # Lanczos ringing in a resized RGBa image can leave colour above alpha, which is
+            # not a valid premultiplied pixel and would overflow the uint8 add in flatten()
+            self.premultiplied = np.minimum(premultiplied[..., :3], self.alpha[..., None])
+        else:
+            self.image = self.rgb = img if img.mode == 'RGB' else img.convert('RGB')
+
+    @classmethod
+    def open(cls, path):
+        return cls(open_image(path))
+
+    def flatten(self, background):
+        """RGB image of the source over background; cached, so treat it as read-only"""
+        background = tuple(background)
+        if not self.has_alpha:
+            return self.rgb
+        flat = self._flat.get(background)
+        if flat is None:
+            # out = premultiplied + background * (1 - alpha); the second term comes from a
+            # 256-entry table per channel, and with colour clamped to alpha the sum never
+            # exceeds 255, so it stays uint8
+            cover = np.rint(np.outer(255 - np.arange(256), background) / 255).astype(np.uint8)
+            out = self.premultiplied + np.take(cover, self.alpha, axis=0)
+            flat = self._flat[background] = Image.fromarray(out, 'RGB')
+        return flat
+
+    def fit_square(self, size):
+        """Composite scaled to fit size (never upscaling), centred on a transparent square.
+
+        The premultiplied pixels are resized, which commutes with flattening,
+        so one resize serves every background: fit once, flatten per theme.
+        """
+        img = self.image
+        scale = min(size[0] / img.width, size[1] / img.height, 1.0)
+        fitted = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        if fitted != img.size:
+            img = img.resize(fitted, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        if fitted != tuple(size):
+            canvas = Image.new('RGBa', size, (0, 0, 0, 0))
+            canvas.paste(img if img.mode == 'RGBa' else img.convert('RGBa'),
+                         ((size[0] - fitted[0]) // 2, (size[1] - fitted[1]) // 2))
+            img = canvas
+        return Composite(img)
+
+    def variants(self, nft_type=None):
+        """{'dark': image, 'light': image} flattened on the type's theme backgrounds"""
+        return {theme: self.flatten(background_for(nft_type, theme)) for theme in THEMES}
+
+def fit_square(img, size, background):
+    """Scale img to fit size (never upscaling) and centre it on a background-filled square"""
+    scale = min(size[0] / img.width, size[1] / img.height, 1.0)
+    fitted = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    if fitted != img.size:
+        img = img.resize(fitted, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    if fitted == tuple(size):
+        return img
+    canvas = Image.new('RGB', size, tuple(background))
+    canvas.paste(img, ((size[0] - fitted[0]) // 2, (size[1] - fitted[1]) // 2))
+    return canvas
@@ -0,0 +1,83 @@
+"""Content-addressed on-disk cache for fetched documents.
+
+Bodies are stored once under objects/<sha256[:2]>/<sha256> and an index maps
+each URL to its hash. Arweave content never changes, so an indexed URL never
+needs to be fetched again, and identical documents behind different URLs
+share one object.
+
+Usage:
+    from content_cache import ContentCache
+
+    cache = ContentCache('data/metadata-cache')
+    data = cache.get(url)
+    if data is None:
+        data = download(url)
+        cache.put(url, data)
+    cache.save_index()
+"""
+import hashlib
+import json
+import os
+
+INDEX_FILE = 'index.json'
+
+def sha256_hex(data):
+    return hashlib.sha256(data).hexdigest()
+
+class ContentCache:
+    def __init__(self, root):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        self.dirty = False
+
+    def object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    def __contains__(self, url):
+        digest = self.index.get(url)
+        return digest is not None and os.path.exists(self.object_path(digest))
+
+    def get(self, url):
+        """Cached body for url, or None"""
+        digest = self.index.get(url)
+        if digest is None:
+            return None
+        try:
+            with open(self.object_path(digest), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, url, data):
+        """Store a body and index it under url; returns its sha256"""
+        digest = sha256_hex(data)
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        if self.index.get(url) != digest:
+            self.index[url] = digest
+            self.dirty = True
+        return digest
+
+    def discard(self, url):
+        """Forget url, so it is fetched again; the object stays for any other URL sharing it"""
+        if self.index.pop(url, None) is not None:
+            self.dirty = True
+
+    def save_index(self):
+        if not self.dirty:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+        self.dirty = False
@@ -1,17 +1,21 @@
 """Convert Mindfolk-images.csv to JSON for popup images"""
+import argparse
 import csv
 import json
 import sys
 import os
 
-CSV_FILE = r'e:\Tralha\Stuff\crypto design\MY MINDFOLK\Json and Data\Mindfolk-images.csv'
-OUTPUT_JSON = 'data/mindfolk-popup-images.json'
+from mindfolk_config import CONFIG
+from run_report import RunReport, add_report_arguments, stage
 
-def main():
+CSV_FILE = CONFIG.popup_csv
+OUTPUT_JSON = CONFIG.popup_json
+
+def run(report):
     # Check if CSV file exists
     if not os.path.exists(CSV_FILE):
         print(f"ERROR: CSV file not found: {CSV_FILE}")
-        return
+        return False
     
     popupImageMap = {}
     popupImageMapByName = {}
@@ -19,7 +23,7 @@ def main():
     
     print(f"Reading CSV file: {CSV_FILE}")
     
-    with open(CSV_FILE, 'r', encoding='utf-8') as f:
+    with stage('csv_dictreader'), open(CSV_FILE, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         count = 0
         
@@ -50,7 +54,7 @@ def main():
     popupImageMapByMint = {}
     count = 0
     
-    with open(CSV_FILE, 'r', encoding='utf-8') as f:
+    with stage('csv_parse'), open(CSV_FILE, 'r', encoding='utf-8') as f:
         lines = f.readlines()
         header = lines[0].strip().split(',')
         
@@ -123,6 +127,8 @@ def main():
                     if count <= 5:
                         print(f"Sample: Name='{name}', Type='{nftType}', PopupURL='{popupUrl[:70]}...'")
     
+    report.total = count
+    report.tick('all rows', count=count)
     print(f"\nProcessed {count} entries")
     print(f"Entries by name: {len(popupImageMapByName)}")
     print(f"Entries by mint: {len(popupImageMapByMint)}")
@@ -136,10 +142,22 @@ def main():
         'byMint': popupImageMapByMint
     }
     
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
+    with stage('json_dump'), open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
         json.dump(output_data, f, indent=2, ensure_ascii=False)
     
     print(f"\nSaved to: {OUTPUT_JSON}")
+    print("These are Drive URLs: run scripts/generate-popup-images.py to point popups at local renditions")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert Mindfolk-images.csv to JSON for popup images')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    
+    with RunReport('convert-csv-to-json', args=args) as report:
+        ok = run(report)
+    if not ok:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
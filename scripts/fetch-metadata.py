@@ -0,0 +1,246 @@
+"""
+Fetch and cache the arweave metadata JSON of every NFT.
+
+Reads the {mint: metadataURL} map written by build-merged-data.py, fetches
+the documents with a bounded number of requests in flight over one pooled
+aiohttp session (retrying 429/5xx/timeouts with backoff), and keeps every
+body in a content-addressed cache (content_cache.py). Arweave documents are
+immutable, so reruns only touch the network for URLs not fetched before.
+
+Writes name/description/attributes/image/animation_url per mint to
+data/founder-metadata.json (the file gallery.js reads for the modal) and,
+with --catalog, the attributes and image/animation URIs into the catalog.
+
+--gateway swaps https://arweave.net/ for another base URL, e.g. the local
+stand-in in mock_services.py.
+
+Requirements:
+    pip install aiohttp
+
+Usage:
+    python scripts/fetch-metadata.py
+    python scripts/fetch-metadata.py --concurrency 64 --catalog data/mindfolk-nfts.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+import aiohttp
+
+from content_cache import ContentCache
+from mindfolk_config import CONFIG
+from run_report import RunReport, add_report_arguments, stage
+
+INPUT_JSON = 'data/mint-metadata.json'
+OUTPUT_JSON = 'data/founder-metadata.json'
+CATALOG_JSON = CONFIG.catalog_json
+CACHE_DIR = 'data/metadata-cache'
+ARWEAVE_GATEWAY = 'https://arweave.net/'
+
+CONCURRENCY = 32
+RETRIES = 5
+BACKOFF_SECONDS = 0.5  # Doubled after every failed attempt, plus jitter
+TIMEOUT_SECONDS = 30
+SAVE_INDEX_EVERY = 500  # Fetches between cache index saves, so an interrupted crawl keeps its progress
+
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+class FetchError(Exception):
+    pass
+
+async def fetch_document(session, url):
+    """Body of url, retrying transient failures"""
+    delay = BACKOFF_SECONDS
+    for attempt in range(1, RETRIES + 1):
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.read()
+                if response.status not in RETRY_STATUSES:
+                    raise FetchError(f"HTTP {response.status}")
+                error = f"HTTP {response.status}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = str(e) or type(e).__name__
+        if attempt == RETRIES:
+            raise FetchError(f"{error} after {RETRIES} attempts")
+        await asyncio.sleep(delay + random.uniform(0, delay))
+        delay *= 2
+
+def gateway_url(url, gateway):
+    """url with the arweave.net base swapped for gateway (if given)"""
+    if not gateway:
+        return url
+    return url.replace(ARWEAVE_GATEWAY, gateway.rstrip('/') + '/', 1)
+
+async def crawl(urls, cache, concurrency, report, gateway=None, validate=None):
+    """Fetch URLs into the cache (keyed by the original URL); returns {url: error} for failures.
+
+    validate(body) may return an error message to reject a body, which is then not cached.
+    """
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    failures = {}
+    fetched = 0
+
+    async def worker(session):
+        nonlocal fetched
+        while True:
+            try:
+                url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                body = await fetch_document(session, gateway_url(url, gateway))
+                rejected = validate(body) if validate else None
+                if rejected:
+                    raise FetchError(rejected)
+                cache.put(url, body)
+                fetched += 1
+                if fetched % SAVE_INDEX_EVERY == 0:
+                    cache.save_index()
+            except FetchError as e:
+                failures[url] = str(e)
+            report.tick(url, Fetched=fetched, Failed=len(failures))
+
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_SECONDS)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    return failures
+
+def json_error(body):
+    """None if body is a JSON object, else why not (gateways answer some misses with an HTML page)"""
+    try:
+        document = json.loads(body)
+    except ValueError as e:  # UnicodeDecodeError included
+        return f"not JSON ({body[:15]!r}...): {e}"
+    if not isinstance(document, dict):
+        return f"not a JSON object: {type(document).__name__}"
+    return None
+
+def extract_metadata(document):
+    """The parts of a Metaplex metadata document the gallery uses"""
+    properties = document.get('properties') or {}
+    animation_url = document.get('animation_url') or ''
+    if not animation_url:
+        # Some uploads only list the animation under properties.files
+        for entry in properties.get('files') or []:
+            if isinstance(entry, dict) and str(entry.get('type', '')).startswith(('video/', 'image/gif')):
+                animation_url = entry.get('uri', '')
+                break
+    return {
+        'name': document.get('name', ''),
+        'description': document.get('description', ''),
+        'attributes': document.get('attributes') or [],
+        'image': document.get('image', ''),
+        'animation_url': animation_url,
+    }
+
+def save_json(data, path, indent=None):
+    """Write JSON atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False, separators=None if indent else (',', ':'))
+    os.replace(tmp_path, path)
+
+def update_catalog(path, metadata_by_mint, url_by_mint):
+    """Copy attributes and image/animation URIs into catalog records; returns count"""
+    with open(path, 'r', encoding='utf-8') as f:
+        nfts = json.load(f)
+    updated = 0
+    for nft in nfts:
+        mint = (nft.get('mintAddress') or '').strip()
+        metadata = metadata_by_mint.get(mint)
+        if not metadata:
+            continue
+        nft['metadataURL'] = url_by_mint[mint]
+        nft['attributes'] = metadata['attributes']
+        nft['imageURI'] = metadata['image']
+        nft['animationURI'] = metadata['animation_url']
+        updated += 1
+    save_json(nfts, path, indent=2)
+    return updated
+
+def run(report, args):
+    if not os.path.exists(args.input):
+        print(f"ERROR: {args.input} not found (run scripts/build-merged-data.py first)")
+        return False
+
+    with stage('json_load'), open(args.input, 'r', encoding='utf-8') as f:
+        url_by_mint = json.load(f)
+
+    cache = ContentCache(args.cache_dir)
+    missing = sorted({url for url in url_by_mint.values() if url not in cache})
+    print(f"{len(url_by_mint)} metadata URLs, {len(url_by_mint) - len(missing)} cached, {len(missing)} to fetch")
+    report.total = len(missing)
+
+    failures = {}
+    if missing:
+        with stage('fetch'):
+            try:
+                failures = asyncio.run(crawl(missing, cache, args.concurrency, report, args.gateway,
+                                                   validate=json_error))
+            finally:
+                cache.save_index()
+
+    metadata_by_mint = {}
+    invalid = []
+    with stage('extract'):
+        for mint, url in url_by_mint.items():
+            body = cache.get(url)
+            if body is None:
+                continue
+            try:
+                metadata_by_mint[mint] = extract_metadata(json.loads(body))
+            except (ValueError, AttributeError):
+                invalid.append(mint)
+
+    with stage('json_dump'):
+        save_json([{'mintAddress': mint, 'metadata': metadata} for mint, metadata in metadata_by_mint.items()],
+                  args.output)
+        catalog_updated = None
+        if args.catalog:
+            if os.path.exists(args.catalog):
+                catalog_updated = update_catalog(args.catalog, metadata_by_mint, url_by_mint)
+            else:
+                print(f"[WARNING] Catalog not found: {args.catalog}")
+
+    print(f"\n{'='*60}")
+    print(f"Metadata documents: {len(metadata_by_mint)}")
+    print(f"Fetch failures: {len(failures)}")
+    print(f"Invalid JSON: {len(invalid)}")
+    print(f"Saved to: {args.output}")
+    if catalog_updated is not None:
+        print(f"Catalog records updated: {catalog_updated}")
+    print(f"{'='*60}")
+    for url, error in list(failures.items())[:20]:
+        print(f"  [ERROR] {url}: {error}")
+    for mint in invalid[:20]:
+        print(f"  [WARNING] Not a JSON document: {mint}")
+    return not failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch and cache arweave metadata documents')
+    parser.add_argument('--input', default=INPUT_JSON)
+    parser.add_argument('--output', default=OUTPUT_JSON)
+    parser.add_argument('--catalog', nargs='?', const=CATALOG_JSON,
+                        help=f'also update catalog records (default path: {CATALOG_JSON})')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--gateway', help=f'base URL to use instead of {ARWEAVE_GATEWAY}')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('fetch-metadata', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
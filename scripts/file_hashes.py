@@ -0,0 +1,72 @@
+"""Parallel sha256 of source files with a persistent (path, size, mtime) cache.
+
+A file is only re-read when its size or mtime changed since the last run,
+so re-hashing a 10k-file folder after a small change takes seconds.
+
+Usage:
+    from file_hashes import HashStore
+
+    store = HashStore('data/hash-store.json')
+    digests = store.hash_files(paths)   # {path: sha256}
+    store.save()
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+HASH_STORE_JSON = 'data/hash-store.json'
+READ_SIZE = 1024 * 1024
+WORKERS = min(32, (os.cpu_count() or 4) * 2)  # hashlib releases the GIL on large reads
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class HashStore:
+    """{path: [size, mtime_ns, sha256]} plus arbitrary extra sections saved alongside"""
+
+    def __init__(self, path=HASH_STORE_JSON):
+        self.path = path
+        data = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        self.files = data.get('files', {})
+        self.extra = {key: value for key, value in data.items() if key != 'files'}
+
+    def hash_files(self, paths, workers=WORKERS, on_hashed=None):
+        """sha256 per path, reading only new or changed files; returns {path: sha256}"""
+        results = {}
+        stale = []
+        for path in paths:
+            stat = os.stat(path)
+            key = os.path.abspath(path)
+            entry = self.files.get(key)
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                results[path] = entry[2]
+            else:
+                stale.append((path, key, stat))
+
+        def work(item):
+            path, key, stat = item
+            return path, key, stat, file_sha256(path)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, key, stat, digest in pool.map(work, stale):
+                self.files[key] = [stat.st_size, stat.st_mtime_ns, digest]
+                results[path] = digest
+                if on_hashed:
+                    on_hashed(path)
+        self.rehashed = len(stale)
+        return results
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files, **self.extra}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
@@ -1,30 +1,28 @@
 """Fix JSON thumbnail URLs to remove # characters"""
+import argparse
 import json
-import re
+import os
+import sys
 
-INPUT_JSON = 'data/mindfolk-nfts.json'
-OUTPUT_JSON = 'data/mindfolk-nfts.json'
+from mindfolk_config import CONFIG
+from mindfolk_scripts import fix_urls, sanitize_filename
+from run_report import RunReport, add_report_arguments, stage
 
-def sanitize_filename(name):
-    """Create a safe filename from NFT name (remove # and other invalid chars)"""
-    invalid_chars = '<>:"/\\|?*#'
-    filename = name
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    # Remove multiple underscores
-    filename = re.sub(r'_+', '_', filename)
-    # Limit length
-    if len(filename) > 200:
-        filename = filename[:200]
-    return filename.strip('_')
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json
+
+def run(report):
+    if not os.path.exists(INPUT_JSON):
+        print(f"ERROR: Catalog not found: {INPUT_JSON}")
+        return False
 
-def main():
     # Load JSON
     print(f"Loading {INPUT_JSON}...")
-    with open(INPUT_JSON, 'r', encoding='utf-8') as f:
+    with stage('json_load'), open(INPUT_JSON, 'r', encoding='utf-8') as f:
         nfts = json.load(f)
     
     print(f"Found {len(nfts)} NFTs")
+    report.total = len(nfts)
     print()
     
     fixed_count = 0
@@ -53,11 +51,9 @@ def main():
         
         # Fix thumbnailURLs object
         if nft.get('thumbnailURLs') and isinstance(nft['thumbnailURLs'], dict):
-            for size_key, url in nft['thumbnailURLs'].items():
-                if url and '#' in url:
-                    new_url = url.replace(f"/{old_filename}", f"/{new_filename}")
-                    nft['thumbnailURLs'][size_key] = new_url
-                    fixed_count += 1
+            fixed_count += fix_urls(nft['thumbnailURLs'], old_filename, new_filename)
+    
+    report.tick('all NFTs', count=len(nfts))
     
     # Save updated JSON
     print("=" * 60)
@@ -68,10 +64,21 @@ def main():
     print()
     
     print(f"Saving updated JSON to {OUTPUT_JSON}...")
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
+    with stage('json_dump'), open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
         json.dump(nfts, f, indent=2, ensure_ascii=False)
     
     print("Done!")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Fix JSON thumbnail URLs to remove # characters')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    
+    with RunReport('fix-json-thumbnail-urls', args=args) as report:
+        ok = run(report)
+    if not ok:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
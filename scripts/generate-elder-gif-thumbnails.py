@@ -1,10 +1,14 @@
 """Generate thumbnails for Elder GIF images"""
+import argparse
 import json
 import os
-from PIL import Image
 from pathlib import Path
 import sys
 
+from compositing import Composite, background_for, fit_square, load_composite
+from mindfolk_config import CONFIG, image_subdir, thumbnail_dirs
+from run_report import RunReport, add_report_arguments, stage
+
 # Configuration
 THUMBNAIL_SIZES = {
     '190x190': (190, 190),
@@ -12,57 +16,41 @@ THUMBNAIL_SIZES = {
     '30x30': (30, 30)
 }
 QUALITY = 85  # JPEG quality (1-100)
-INPUT_JSON = 'data/mindfolk-nfts.json'
-OUTPUT_JSON = 'data/mindfolk-nfts.json'
-THUMBNAIL_DIRS = {
-    '190x190': 'img/thumbnails/190x190',
-    '100x100': 'img/thumbnails/100x100',
-    '30x30': 'img/thumbnails/30x30'
-}
-ELDER_IMAGE_DIR = r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Mindfolk Images\Elders'
+THEME = 'light'  # Background variant for transparent areas (see compositing.TYPE_BACKGROUNDS)
+NFT_TYPE = 'Elder'
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json
+THUMBNAIL_DIRS = thumbnail_dirs()
+ELDER_IMAGE_DIR = image_subdir('Elders')
 
 # Configure stdout for UTF-8 on Windows
 if os.name == 'nt':
     sys.stdout.reconfigure(encoding='utf-8')
 
-def generate_thumbnail(image_path, thumbnail_path, size):
-    """Generate a thumbnail from an image file (including GIF)"""
+def generate_thumbnail(source, thumbnail_path, size, nft_type=None):
+    """Generate a thumbnail from an image file (GIFs use the first frame) or a decoded Composite"""
     try:
-        with Image.open(image_path) as img:
-            # For GIFs, get the first frame
-            if img.format == 'GIF':
-                # Convert to RGB for GIF animation
-                img = img.convert('RGB')
-            
-            # Convert to RGB if necessary (for PNG with transparency, etc.)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                # Create a white background
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Generate thumbnail maintaining aspect ratio
-            img.thumbnail(size, Image.Resampling.LANCZOS)
-            
-            # Create a square thumbnail with white background
-            thumbnail = Image.new('RGB', size, (255, 255, 255))
-            # Calculate position to center the image
-            paste_x = (size[0] - img.size[0]) // 2
-            paste_y = (size[1] - img.size[1]) // 2
-            thumbnail.paste(img, (paste_x, paste_y))
-            
-            # Save as JPEG
+        if not isinstance(source, Composite):
+            source = load_composite(source)
+        
+        # Flattened once per source and background; later sizes reuse the cached buffer
+        background = background_for(nft_type, THEME)
+        with stage('composite'):
+            flat = source.flatten(background)
+        
+        # Generate thumbnail maintaining aspect ratio, centred on a square
+        with stage('resize'):
+            thumbnail = fit_square(flat, size, background)
+        
+        # Save as JPEG
+        with stage('encode'):
             thumbnail.save(thumbnail_path, 'JPEG', quality=QUALITY, optimize=True)
-            return True
+        return True
     except Exception as e:
         print(f"    [ERROR] Failed to generate thumbnail: {e}")
         return False
 
-def main():
+def run(report):
     # Create thumbnail directories
     for size_name, dir_path in THUMBNAIL_DIRS.items():
         Path(dir_path).mkdir(parents=True, exist_ok=True)
@@ -70,17 +58,18 @@ def main():
     # Check if elder directory exists
     if not os.path.exists(ELDER_IMAGE_DIR):
         print(f"ERROR: Elder directory not found: {ELDER_IMAGE_DIR}")
-        return
+        return False
     
     # Load JSON
     print(f"Loading {INPUT_JSON}...")
-    with open(INPUT_JSON, 'r', encoding='utf-8') as f:
+    with stage('json_load'), open(INPUT_JSON, 'r', encoding='utf-8') as f:
         nfts = json.load(f)
     
     # Filter for the 4 specific Elders
     target_names = ['Falcon Town Elder', 'Foster Mountain Elder', 'Ock Water Elder', 'Swanson Wood Elder']
     elder_nfts = [nft for nft in nfts if nft.get('Name', '').strip() in target_names]
     print(f"Found {len(elder_nfts)} target Elder NFTs")
+    report.total = len(elder_nfts)
     print()
     
     generated_count = 0
@@ -113,6 +102,7 @@ def main():
         if not gif_file:
             print(f"  [WARNING] GIF file not found for {nft_name}")
             failed_count += 1
+            report.tick(nft_name, Generated=generated_count, Failed=failed_count)
             continue
         
         print(f"  Found GIF: {gif_file.name}")
@@ -130,6 +120,7 @@ def main():
         all_generated = True
         all_exist = True
         thumbnail_urls = {}
+        source = None
         
         for size_name, size in THUMBNAIL_SIZES.items():
             thumbnail_path = Path(THUMBNAIL_DIRS[size_name]) / thumbnail_filename
@@ -142,8 +133,18 @@ def main():
             
             all_exist = False
             
+            # Decode once, on the first size that is missing
+            if source is None:
+                try:
+                    source = load_composite(gif_file)
+                except Exception as e:
+                    print(f"    [ERROR] Failed to read {gif_file.name}: {e}")
+                    all_generated = False
+                    failed_count += 1
+                    break
+            
             # Generate thumbnail
-            if not generate_thumbnail(gif_file, thumbnail_path, size):
+            if not generate_thumbnail(source, thumbnail_path, size, nft_type=NFT_TYPE):
                 all_generated = False
                 failed_count += 1
                 break
@@ -164,6 +165,7 @@ def main():
         else:
             failed_count += 1
         
+        report.tick(nft_name, Generated=generated_count, Failed=failed_count)
         print()
     
     # Save updated JSON
@@ -178,10 +180,21 @@ def main():
     print()
     
     print(f"Saving updated JSON to {OUTPUT_JSON}...")
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
+    with stage('json_dump'), open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
         json.dump(nfts, f, indent=2, ensure_ascii=False)
     
     print("Done!")
+    return failed_count == 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate thumbnails for Elder GIF images')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    
+    with RunReport('elder-gif-thumbnails', args=args) as report:
+        ok = run(report)
+    if not ok:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -1,131 +1,87 @@
 """Generate 380x380 popup images for Elder NFTs"""
+import argparse
 import os
+import sys
 from pathlib import Path
-from PIL import Image
 import json
 
+from compositing import background_for, fit_square, load_composite
+from mindfolk_config import CONFIG, image_subdir
+from mindfolk_scripts import elder_popup_filename
+from name_matching import NameIndex, load_match_cache, save_match_cache
+from run_report import RunReport, add_report_arguments, stage
+
 # Paths
-SOURCE_DIR = r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Mindfolk Images\Elders'
-OUTPUT_DIR = Path(r'C:\Users\44756\mindfolkgallery\img\Elders')
-JSON_FILE = 'data/mindfolk-nfts.json'
+SOURCE_DIR = image_subdir('Elders')
+OUTPUT_DIR = Path(CONFIG.elder_popup_dir)
+JSON_FILE = CONFIG.catalog_json
 POPUP_SIZE = (380, 380)
+THEME = 'light'  # Background variant for transparent areas (see compositing.TYPE_BACKGROUNDS)
+NFT_TYPE = 'Elder'
+SOURCE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.gif', '.webp']
 
-def sanitize_filename(filename):
-    """Sanitize filename for web compatibility"""
-    # Replace # with _ for web compatibility
-    filename = filename.replace('#', '_')
-    return filename
-
-def find_image_file(nft_name, source_dir):
-    """Find the image file for an NFT name"""
-    source_path = Path(source_dir)
-    
-    if not source_path.exists():
-        print(f"ERROR: Source directory not found: {source_dir}")
-        return None
-    
-    # Try different filename variations
-    base_name = nft_name.replace(' ', '_').replace('-', '_')
-    
-    # Search patterns
-    search_patterns = [
-        nft_name,  # Exact name
-        base_name,  # With underscores
-        nft_name.replace(' ', ''),  # No spaces
-        base_name.lower(),  # Lowercase
-        nft_name.lower(),  # Lowercase exact
-    ]
-    
-    # File extensions to try
-    extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp']
-    
-    # Search in source directory
-    for pattern in search_patterns:
-        for ext in extensions:
-            # Try exact match
-            file_path = source_path / f"{pattern}{ext}"
-            if file_path.exists():
-                return file_path
-            
-            # Try with zero-padded numbers (e.g., "Elder_0001.png")
-            if 'Elder' in pattern:
-                # Try to extract number if present
-                import re
-                match = re.search(r'(\d+)$', pattern)
-                if match:
-                    num = match.group(1)
-                    padded_num = num.zfill(4)
-                    pattern_padded = pattern.replace(num, padded_num)
-                    file_path = source_path / f"{pattern_padded}{ext}"
-                    if file_path.exists():
-                        return file_path
-    
-    # List all files for debugging
-    print(f"  Could not find image for: {nft_name}")
-    print(f"  Available files in {source_dir}:")
-    try:
-        files = list(source_path.glob('*'))
-        for f in files[:10]:  # Show first 10
-            print(f"    - {f.name}")
-        if len(files) > 10:
-            print(f"    ... and {len(files) - 10} more files")
-    except Exception as e:
-        print(f"  Error listing files: {e}")
+def find_image_file(nft_name, index, match_cache=None):
+    """Find the image file for an NFT name via the prebuilt source index"""
+    result = index.match(nft_name, match_cache)
+    if result.path:
+        return result.path
     
+    if result.ambiguous:
+        print(f"  Ambiguous match for: {nft_name}")
+    else:
+        print(f"  Could not find image for: {nft_name}")
+    for path, score in result.candidates:
+        print(f"    - {path.name} ({score})")
     return None
 
 def generate_popup_image(source_path, output_path, size):
     """Generate popup image from source"""
     try:
-        # Open image
-        with Image.open(source_path) as img:
-            # Convert RGBA to RGB if necessary (for JPEG output)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                # Create white background
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Resize maintaining aspect ratio, then crop to exact size
-            img.thumbnail(size, Image.Resampling.LANCZOS)
-            
-            # Create new image with exact size and paste resized image centered
-            new_img = Image.new('RGB', size, (255, 255, 255))
-            paste_x = (size[0] - img.width) // 2
-            paste_y = (size[1] - img.height) // 2
-            new_img.paste(img, (paste_x, paste_y))
-            
-            # Save as JPEG
+        source = load_composite(source_path)
+        background = background_for(NFT_TYPE, THEME)
+        with stage('composite'):
+            flat = source.flatten(background)
+        
+        # Resize maintaining aspect ratio, centred on an exact-size square
+        with stage('resize'):
+            new_img = fit_square(flat, size, background)
+        
+        # Save as JPEG
+        with stage('encode'):
             new_img.save(output_path, 'JPEG', quality=90, optimize=True)
-            return True
+        return True
     except Exception as e:
         print(f"  ERROR processing {source_path.name}: {e}")
         return False
 
-def main():
+def run(report):
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
     # Load JSON to get Elder NFTs
     if not os.path.exists(JSON_FILE):
         print(f"ERROR: JSON file not found: {JSON_FILE}")
-        return
+        return False
     
     print(f"Loading NFTs from {JSON_FILE}...")
-    with open(JSON_FILE, 'r', encoding='utf-8') as f:
+    with stage('json_load'), open(JSON_FILE, 'r', encoding='utf-8') as f:
         nfts = json.load(f)
     
     # Filter for Elder type NFTs
     elder_nfts = [nft for nft in nfts if nft.get('Type', '').lower() == 'elder']
     print(f"Found {len(elder_nfts)} Elder NFTs")
+    report.total = len(elder_nfts)
     
     if not elder_nfts:
         print("No Elder NFTs found in JSON file")
-        return
+        return True
+    
+    if not os.path.exists(SOURCE_DIR):
+        print(f"ERROR: Source directory not found: {SOURCE_DIR}")
+        return False
+    
+    index = NameIndex.from_directory(SOURCE_DIR, extensions=SOURCE_EXTENSIONS)
+    match_cache = load_match_cache()
     
     # Process each Elder NFT
     processed = 0
@@ -140,13 +96,15 @@ def main():
         print(f"\nProcessing: {nft_name}")
         
         # Find source image
-        source_path = find_image_file(nft_name, SOURCE_DIR)
+        with stage('match'):
+            source_path = find_image_file(nft_name, index, match_cache)
         if not source_path:
             skipped += 1
+            report.tick(nft_name, Processed=processed, Skipped=skipped, Errors=errors)
             continue
         
         # Generate output filename
-        output_filename = sanitize_filename(f"{nft_name}.jpg")
+        output_filename = elder_popup_filename(nft_name)
         output_path = OUTPUT_DIR / output_filename
         
         # Generate popup image
@@ -155,6 +113,9 @@ def main():
             processed += 1
         else:
             errors += 1
+        report.tick(nft_name, Processed=processed, Skipped=skipped, Errors=errors)
+    
+    save_match_cache(match_cache)
     
     print(f"\n{'='*60}")
     print(f"Summary:")
@@ -162,6 +123,17 @@ def main():
     print(f"  Skipped: {skipped}")
     print(f"  Errors: {errors}")
     print(f"  Output directory: {OUTPUT_DIR}")
+    return errors == 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate 380x380 popup images for Elder NFTs')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    
+    with RunReport('elder-popup-images', args=args) as report:
+        ok = run(report)
+    if not ok:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -1,10 +1,15 @@
 """Generate thumbnails for Mushroom images without renaming"""
+import argparse
 import json
 import os
-from PIL import Image
 from pathlib import Path
 import sys
 
+from compositing import Composite, background_for, fit_square, load_composite
+from mindfolk_config import CONFIG, image_subdir, thumbnail_dirs
+from name_matching import join_by_number
+from run_report import RunReport, add_report_arguments, stage
+
 # Configuration
 THUMBNAIL_SIZES = {
     '190x190': (190, 190),
@@ -12,52 +17,41 @@ THUMBNAIL_SIZES = {
     '30x30': (30, 30)
 }
 QUALITY = 85  # JPEG quality (1-100)
-INPUT_JSON = 'data/mindfolk-nfts.json'
-OUTPUT_JSON = 'data/mindfolk-nfts.json'
-THUMBNAIL_DIRS = {
-    '190x190': 'img/thumbnails/190x190',
-    '100x100': 'img/thumbnails/100x100',
-    '30x30': 'img/thumbnails/30x30'
-}
-MUSHROOM_IMAGE_DIR = r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Mindfolk Images\Mushrooms'
+THEME = 'light'  # Background variant for transparent areas (see compositing.TYPE_BACKGROUNDS)
+NFT_TYPE = 'Mushroom Head'
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json
+THUMBNAIL_DIRS = thumbnail_dirs()
+MUSHROOM_IMAGE_DIR = image_subdir('Mushrooms')
 
 # Configure stdout for UTF-8 on Windows
 if os.name == 'nt':
     sys.stdout.reconfigure(encoding='utf-8')
 
-def generate_thumbnail(image_path, thumbnail_path, size):
-    """Generate a thumbnail from an image file"""
+def generate_thumbnail(source, thumbnail_path, size, nft_type=None):
+    """Generate a thumbnail from an image file or an already decoded Composite"""
     try:
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary (for PNG with transparency, etc.)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                # Create a white background
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Generate thumbnail maintaining aspect ratio
-            img.thumbnail(size, Image.Resampling.LANCZOS)
-            
-            # Create a square thumbnail with white background
-            thumbnail = Image.new('RGB', size, (255, 255, 255))
-            # Calculate position to center the image
-            paste_x = (size[0] - img.size[0]) // 2
-            paste_y = (size[1] - img.size[1]) // 2
-            thumbnail.paste(img, (paste_x, paste_y))
-            
-            # Save as JPEG
+        if not isinstance(source, Composite):
+            source = load_composite(source)
+        
+        # Flattened once per source and background; later sizes reuse the cached buffer
+        background = background_for(nft_type, THEME)
+        with stage('composite'):
+            flat = source.flatten(background)
+        
+        # Generate thumbnail maintaining aspect ratio, centred on a square
+        with stage('resize'):
+            thumbnail = fit_square(flat, size, background)
+        
+        # Save as JPEG
+        with stage('encode'):
             thumbnail.save(thumbnail_path, 'JPEG', quality=QUALITY, optimize=True)
-            return True
+        return True
     except Exception as e:
         print(f"    [ERROR] Failed to generate thumbnail: {e}")
         return False
 
-def main():
+def run(report):
     # Create thumbnail directories
     for size_name, dir_path in THUMBNAIL_DIRS.items():
         Path(dir_path).mkdir(parents=True, exist_ok=True)
@@ -65,11 +59,11 @@ def main():
     # Check if mushroom directory exists
     if not os.path.exists(MUSHROOM_IMAGE_DIR):
         print(f"ERROR: Mushroom directory not found: {MUSHROOM_IMAGE_DIR}")
-        return
+        return False
     
     # Load JSON
     print(f"Loading {INPUT_JSON}...")
-    with open(INPUT_JSON, 'r', encoding='utf-8') as f:
+    with stage('json_load'), open(INPUT_JSON, 'r', encoding='utf-8') as f:
         nfts = json.load(f)
     
     # Filter for Mushroom Head NFTs
@@ -89,16 +83,31 @@ def main():
     print(f"Found {len(mushroom_files)} image files in Mushrooms folder")
     print()
     
+    # Parse numbers once per NFT and once per file, then join on the integer
+    # key (Mindfolk_Mushroom_0038 <-> Mindfolk Elder #38; 38 never matches 138)
+    join = join_by_number(mushroom_nfts, mushroom_files, kind='mushroom')
+    print(f"Matched {len(join.pairs)} image files to NFTs by number")
+    for (_, number), paths in sorted(join.collisions.items()):
+        print(f"  [COLLISION] #{number}: {', '.join(p.name for p in paths)}")
+    for nft in join.unmatched_nfts[:20]:
+        print(f"  [MISS] No image for NFT: {nft.get('Name')}")
+    for path in join.unmatched_files[:20]:
+        print(f"  [MISS] No NFT for image: {path.name}")
+    print()
+    
     generated_count = 0
     skipped_count = 0
     failed_count = 0
     json_updated_count = 0
     
-    # Process each mushroom image file
+    nfts_by_file = dict(join.pairs)
+    report.total = len(mushroom_files)
+    
+    # Process each mushroom image file (unmatched files still get thumbnails)
     for image_file in mushroom_files:
+        matched_nfts = nfts_by_file.get(image_file, [])
         # Get filename without extension
         original_filename = image_file.stem
-        original_ext = image_file.suffix
         
         # Thumbnail will be saved as .jpg
         thumbnail_filename = f"{original_filename}.jpg"
@@ -109,6 +118,7 @@ def main():
         all_generated = True
         all_exist = True
         thumbnail_urls = {}
+        source = None
         
         for size_name, size in THUMBNAIL_SIZES.items():
             thumbnail_path = Path(THUMBNAIL_DIRS[size_name]) / thumbnail_filename
@@ -122,10 +132,18 @@ def main():
             
             all_exist = False
             
+            # Decode once, on the first size that is missing
+            if source is None:
+                try:
+                    source = load_composite(image_file)
+                except Exception as e:
+                    print(f"    [ERROR] Failed to read {image_file.name}: {e}")
+                    all_generated = False
+                    break
+            
             # Generate thumbnail
-            if not generate_thumbnail(image_file, thumbnail_path, size):
+            if not generate_thumbnail(source, thumbnail_path, size, nft_type=NFT_TYPE):
                 all_generated = False
-                failed_count += 1
                 break
         
         if all_generated:
@@ -134,37 +152,7 @@ def main():
             else:
                 generated_count += 1
             
-            # Try to find matching NFT in JSON and update it
-            # Extract number from filename (e.g., "Mindfolk_Mushroom_0038" -> 38)
-            import re
-            number_match = re.search(r'(\d+)', original_filename)
-            matched_nft = None
-            
-            if number_match:
-                image_number = int(number_match.group(1))
-                
-                # Try to match with NFT names that contain this number
-                for nft in mushroom_nfts:
-                    nft_name = nft.get('Name', '')
-                    # Extract number from NFT name
-                    nft_number_match = re.search(r'(\d+)', nft_name)
-                    if nft_number_match:
-                        nft_number = int(nft_number_match.group(1))
-                        if nft_number == image_number:
-                            matched_nft = nft
-                            break
-                
-                # If no exact number match, try partial match
-                if not matched_nft:
-                    image_name_clean = original_filename.replace('_', ' ').replace('-', ' ').lower()
-                    for nft in mushroom_nfts:
-                        nft_name = nft.get('Name', '').lower()
-                        # Try to match by containing the number or similar name
-                        if str(image_number) in nft_name or image_name_clean in nft_name:
-                            matched_nft = nft
-                            break
-            
-            if matched_nft:
+            for matched_nft in matched_nfts:
                 # Update NFT with thumbnail URLs
                 matched_nft['thumbnailURL'] = thumbnail_urls.get('190x190', '')
                 matched_nft['thumbnailURLs'] = thumbnail_urls
@@ -172,12 +160,19 @@ def main():
                 print(f"  ✓ Updated JSON for: {matched_nft.get('Name')}")
         else:
             failed_count += 1
+        
+        report.tick(image_file.name, Generated=generated_count, Skipped=skipped_count,
+                    Failed=failed_count, Updated=json_updated_count)
     
     # Save updated JSON
     print()
     print("=" * 60)
     print("Summary:")
     print(f"  Image files processed: {len(mushroom_files)}")
+    print(f"  Image files matched: {len(join.pairs)}")
+    print(f"  Number collisions: {len(join.collisions)}")
+    print(f"  NFTs without image: {len(join.unmatched_nfts)}")
+    print(f"  Images without NFT: {len(join.unmatched_files)}")
     print(f"  Thumbnails generated: {generated_count}")
     print(f"  Thumbnails skipped (already exist): {skipped_count}")
     print(f"  Failed to generate: {failed_count}")
@@ -186,10 +181,21 @@ def main():
     print()
     
     print(f"Saving updated JSON to {OUTPUT_JSON}...")
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
+    with stage('json_dump'), open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
         json.dump(nfts, f, indent=2, ensure_ascii=False)
     
     print("Done!")
+    return failed_count == 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate thumbnails for Mushroom images')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    
+    with RunReport('mushroom-thumbnails', args=args) as report:
+        ok = run(report)
+    if not ok:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,288 @@
+"""
+Generate local popup (modal) images for every NFT as a small size pyramid.
+
+convert-csv-to-json.py points every popup at a 1920-wide Google Drive
+thumbnail, which is slow, rate-limited and not cacheable. This renders
+380x380, 760x760 and full-size JPEGs for every type from the local
+originals (the same source index the thumbnail generator uses) into
+img/popup/<level>/, and rewrites data/mindfolk-popup-images.json so byName
+and byMint point at the 760 level. NFTs that could not be rendered keep
+their Drive URL, and every Drive URL stays in the file under "drive", so
+the gallery can fall back to it and reruns still know where to look.
+
+NFTs without a local original are mirrored once from Drive: the originals
+are fetched concurrently (fetch-metadata.py's crawler) into an on-disk,
+content-addressed cache (content_cache.py) in data/drive-cache/.
+
+Requirements:
+    pip install Pillow numpy aiohttp
+
+Usage:
+    python scripts/generate-popup-images.py
+    python scripts/generate-popup-images.py --no-mirror      # local originals only, no network
+    python scripts/generate-popup-images.py --type Elder --force
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import re
+import sys
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+from compositing import background_for, load_composite
+from content_cache import ContentCache
+from mindfolk_config import CONFIG
+from mindfolk_scripts import load_script, sanitize_filename
+from name_matching import IMAGE_EXTENSIONS, NameIndex, load_match_cache, save_match_cache
+from run_report import RunReport, add_report_arguments, stage
+
+CATALOG_JSON = CONFIG.catalog_json
+POPUP_JSON = CONFIG.popup_json
+IMAGE_DIR = CONFIG.image_dir
+FOLDERS_TO_PROCESS = ['Elders', 'Mushrooms']
+OUTPUT_ROOT = 'img/popup'  # img/popup/<level>/<name>.jpg
+DRIVE_CACHE_DIR = 'data/drive-cache'
+
+# Pyramid levels: square renditions for the modal, plus the full-size original
+POPUP_LEVELS = {
+    '380': (380, 380),  # Phones, and the old Elder popups
+    '760': (760, 760),  # Modal default (380 CSS px on 2x screens)
+    'full': None,       # Native size, for the "open original" link
+}
+DEFAULT_LEVEL = '760'
+QUALITY = 90  # JPEG quality (1-100)
+THEME = 'light'  # Background variant for transparent areas (see compositing.TYPE_BACKGROUNDS)
+
+DRIVE_DOWNLOAD = 'https://drive.usercontent.google.com/download?id={id}&export=download'
+DRIVE_CONCURRENCY = 8  # Drive rate-limits hard; the crawler backs off on 429 anyway
+DRIVE_ID_PATTERNS = [
+    re.compile(r'/file/d/([\w-]+)'),
+    re.compile(r'/d/([\w-]+)'),
+]
+
+def drive_file_id(url):
+    """Google Drive file id from any of the thumbnail/uc/file/usercontent URL forms, or None"""
+    if not url or 'google.com' not in url:
+        return None
+    query = parse_qs(urlparse(url).query)
+    if query.get('id'):
+        return query['id'][0]
+    for pattern in DRIVE_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+def level_url(level, filename):
+    return f"{OUTPUT_ROOT}/{level}/{filename}"
+
+def load_popup_json(path):
+    """(drive URLs by name, drive URLs by mint), also from a file this script already rewrote"""
+    if not os.path.exists(path):
+        return {}, {}
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    drive = data.get('drive') or {}
+    by_name = {name: url for name, url in (data.get('byName') or {}).items() if drive_file_id(url)}
+    by_mint = {mint: url for mint, url in (data.get('byMint') or {}).items() if drive_file_id(url)}
+    by_name.update(drive.get('byName') or {})
+    by_mint.update(drive.get('byMint') or {})
+    return by_name, by_mint
+
+def render_levels(source, filename, nft_type, force=False):
+    """Write every missing pyramid level of one source (a path or a file object)"""
+    paths = {level: os.path.join(OUTPUT_ROOT, level, filename) for level in POPUP_LEVELS}
+    if not force and all(os.path.exists(path) for path in paths.values()):
+        return False
+    composite = load_composite(source)
+    background = background_for(nft_type, THEME)
+    for level, size in POPUP_LEVELS.items():
+        with stage('resize'):
+            fitted = composite.fit_square(size) if size else composite
+        with stage('composite'):
+            image = fitted.flatten(background)
+        with stage('encode'):
+            buffer = io.BytesIO()
+            image.save(buffer, 'JPEG', quality=QUALITY, optimize=True, progressive=level == 'full')
+        with stage('write'):
+            tmp_path = f"{paths[level]}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(buffer.getbuffer())
+            os.replace(tmp_path, paths[level])
+    return True
+
+def image_error(body):
+    """None if body decodes as an image, else why not (Drive answers quota and virus-scan pages with HTML)"""
+    try:
+        with Image.open(io.BytesIO(body)) as img:
+            img.verify()
+    except Exception as e:
+        return f"not an image ({body[:15]!r}...): {e}"
+    return None
+
+def mirror_drive_originals(urls, cache, concurrency, report):
+    """Fetch Drive originals not in the cache yet; returns {url: error}"""
+    missing = sorted(url for url in urls if url not in cache)
+    print(f"Drive originals: {len(urls)} needed, {len(urls) - len(missing)} cached, {len(missing)} to fetch")
+    if not missing:
+        return {}
+    crawler = load_script('fetch-metadata.py')
+    report.total = report.done + len(missing)
+    with stage('mirror'):
+        try:
+            return asyncio.run(crawler.crawl(missing, cache, concurrency, report, validate=image_error))
+        finally:
+            cache.save_index()
+
+def save_popup_json(path, by_name, by_mint, drive_by_name, drive_by_mint):
+    data = {
+        'byName': by_name,
+        'byMint': by_mint,
+        'drive': {'byName': drive_by_name, 'byMint': drive_by_mint},
+        'pyramid': {'root': OUTPUT_ROOT, 'default': DEFAULT_LEVEL,
+                    'levels': {level: size[0] if size else None for level, size in POPUP_LEVELS.items()}},
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def run(report, args):
+    if not os.path.exists(args.catalog):
+        print(f"ERROR: Catalog not found: {args.catalog}")
+        return False
+    with stage('json_load'):
+        with open(args.catalog, 'r', encoding='utf-8') as f:
+            nfts = json.load(f)
+        drive_by_name, drive_by_mint = load_popup_json(args.popup_json)
+    if args.type:
+        nfts = [nft for nft in nfts if (nft.get('Type') or '').lower() == args.type.lower()]
+    nfts = [nft for nft in nfts if (nft.get('Name') or '').strip()]
+    print(f"{len(nfts)} NFTs, {len(drive_by_name)} Drive popup URLs")
+
+    for level in POPUP_LEVELS:
+        os.makedirs(os.path.join(OUTPUT_ROOT, level), exist_ok=True)
+
+    # Local originals first
+    sources = {}
+    if os.path.exists(args.image_dir):
+        index = NameIndex.from_directory(args.image_dir, FOLDERS_TO_PROCESS, extensions=IMAGE_EXTENSIONS)
+        match_cache = load_match_cache()
+        with stage('match'):
+            for nft in nfts:
+                name = nft['Name'].strip()
+                result = index.match(name, match_cache)
+                if result.path:
+                    sources[name] = result.path
+        save_match_cache(match_cache)
+        print(f"Local originals: {len(sources)} of {len(nfts)} ({len(index)} source images indexed)")
+    else:
+        print(f"[WARNING] Image directory not found: {args.image_dir}")
+
+    # ...then Drive, for whatever has no local original and is not rendered yet
+    cache = ContentCache(args.cache_dir)
+    download_urls = {}
+    for nft in nfts:
+        name = nft['Name'].strip()
+        filename = f"{sanitize_filename(name)}.jpg"
+        rendered = all(os.path.exists(os.path.join(OUTPUT_ROOT, level, filename)) for level in POPUP_LEVELS)
+        if name in sources or (rendered and not args.force):
+            continue
+        mint = (nft.get('mintAddress') or '').strip()
+        file_id = drive_file_id(drive_by_mint.get(mint) or drive_by_name.get(name))
+        if file_id:
+            download_urls[name] = DRIVE_DOWNLOAD.format(id=file_id)
+    failures = {}
+    if download_urls and args.mirror:
+        failures = mirror_drive_originals(set(download_urls.values()), cache, args.concurrency, report)
+    elif download_urls:
+        print(f"Drive originals: {len(download_urls)} not mirrored (--no-mirror)")
+
+    by_name = {}
+    by_mint = {}
+    generated = skipped = fallbacks = errors = 0
+    report.total = report.done + len(nfts)
+    for nft in nfts:
+        name = nft['Name'].strip()
+        mint = (nft.get('mintAddress') or '').strip()
+        filename = f"{sanitize_filename(name)}.jpg"
+        source = sources.get(name)
+        if source is None and name in download_urls:
+            body = cache.get(download_urls[name])
+            source = io.BytesIO(body) if body is not None else None
+        try:
+            if source is not None:
+                if render_levels(source, filename, nft.get('Type'), args.force):
+                    generated += 1
+                else:
+                    skipped += 1
+            elif all(os.path.exists(os.path.join(OUTPUT_ROOT, level, filename)) for level in POPUP_LEVELS):
+                skipped += 1
+            else:
+                raise FileNotFoundError('no local or mirrored original')
+            url = level_url(DEFAULT_LEVEL, filename)
+        except Exception as e:
+            # Not renderable (e.g. Drive answered with an HTML page): keep the Drive URL
+            url = drive_by_mint.get(mint) or drive_by_name.get(name)
+            if url:
+                fallbacks += 1
+            if source is not None:
+                errors += 1
+                print(f"  [ERROR] {name}: {e}")
+            if name in download_urls and name not in sources:
+                cache.discard(download_urls[name])  # Mirror it again next run instead of failing forever
+        if url:
+            by_name[name] = url
+            if mint:
+                by_mint[mint] = url
+        report.tick(name, Generated=generated, Skipped=skipped, DriveFallback=fallbacks, Errors=errors)
+
+    # Keep entries for NFTs outside this run (--type) as they were
+    if args.type and os.path.exists(args.popup_json):
+        with open(args.popup_json, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        by_name = {**(previous.get('byName') or {}), **by_name}
+        by_mint = {**(previous.get('byMint') or {}), **by_mint}
+    cache.save_index()
+    with stage('json_dump'):
+        save_popup_json(args.popup_json, by_name, by_mint, drive_by_name, drive_by_mint)
+
+    print(f"\n{'='*60}")
+    print(f"Popups rendered: {generated}")
+    print(f"Already rendered: {skipped}")
+    print(f"Falling back to Drive: {fallbacks}")
+    print(f"Render errors: {errors}")
+    print(f"Drive fetch failures: {len(failures)}")
+    print(f"Levels: {', '.join(f'{OUTPUT_ROOT}/{level}/' for level in POPUP_LEVELS)}")
+    print(f"Saved to: {args.popup_json}")
+    print(f"{'='*60}")
+    for url, error in list(failures.items())[:20]:
+        print(f"  [ERROR] {url}: {error}")
+    return not errors
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate 380/760/full popup images for every NFT')
+    parser.add_argument('--type', help='only NFTs of this type (Founder, Elder, Mushroom Head, ...)')
+    parser.add_argument('--force', action='store_true', help='re-render popups that already exist')
+    parser.add_argument('--mirror', action=argparse.BooleanOptionalAction, default=True,
+                        help='fetch Drive originals for NFTs without a local one (default: on)')
+    parser.add_argument('--catalog', default=CATALOG_JSON)
+    parser.add_argument('--popup-json', default=POPUP_JSON)
+    parser.add_argument('--image-dir', default=IMAGE_DIR)
+    parser.add_argument('--cache-dir', default=DRIVE_CACHE_DIR)
+    parser.add_argument('--concurrency', type=int, default=DRIVE_CONCURRENCY, help='Drive downloads in flight')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('popup-images', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -7,13 +7,33 @@ Requirements:
 
 Usage:
     python scripts/generate-thumbnails-from-local.py
+    python scripts/generate-thumbnails-from-local.py --watch   # no sweep; re-render NFTs as their sources change
+    python scripts/generate-thumbnails-from-local.py --both-themes   # dark and light backgrounds in one pass
+    python scripts/generate-thumbnails-from-local.py --densities 1,2   # only 1x and 2x variants
+
+Every view size is also rendered at 2x and 3x (img/thumbnails/190x190@2x,
+...) for high-DPI screens, from the same decode. Variants the source is too
+small for are skipped. thumbnailSrcset in the catalog lists URL, width and
+bytes of each variant per view, ready for an <img srcset>.
 """
 
+import argparse
+import io
 import json
 import os
-from PIL import Image
+import sys
+import time
+from collections import defaultdict
 from pathlib import Path
-import re
+
+from PIL import Image
+
+from compositing import THEMES, Composite, background_for, load_composite
+from mindfolk_config import CONFIG, thumbnail_dirs
+from mindfolk_scripts import elder_popup_filename, load_script, sanitize_filename
+from name_matching import IMAGE_EXTENSIONS, MATCH_CACHE_JSON, NameIndex, load_match_cache, save_match_cache
+from run_report import RunReport, add_report_arguments, stage
+from source_watcher import watch_folders
 
 # Configuration
 # Three sizes for three different views
@@ -22,15 +42,14 @@ THUMBNAIL_SIZES = {
     '100x100': (100, 100),  # For 12-column view (smaller cards)
     '30x30': (30, 30)       # For list view (tiny thumbnails)
 }
+DENSITIES = (1, 2, 3)  # Device pixel ratios per view size; 2x of 190x190 is 380x380 in 190x190@2x/
 QUALITY = 85  # JPEG quality (1-100)
-INPUT_JSON = 'data/mindfolk-nfts.json'
-OUTPUT_JSON = 'data/mindfolk-nfts.json'
-THUMBNAIL_DIRS = {
-    '190x190': 'img/thumbnails/190x190',
-    '100x100': 'img/thumbnails/100x100',
-    '30x30': 'img/thumbnails/30x30'
-}
-IMAGE_DIR = r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Mindfolk Images'
+THEME = 'dark'  # Background variant for transparent areas (see compositing.TYPE_BACKGROUNDS)
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json
+THUMBNAIL_DIRS = thumbnail_dirs()
+THEMED_THUMBNAIL_ROOT = CONFIG.thumbnail_root  # Other themes go to img/thumbnails/<theme>/<size>
+IMAGE_DIR = CONFIG.image_dir
 
 # Folders to process (ignore GIFs)
 FOLDERS_TO_PROCESS = ['Elders', 'Mushrooms']
@@ -38,148 +57,288 @@ FOLDERS_TO_PROCESS = ['Elders', 'Mushrooms']
 # Test mode - set to a number to only process that many NFTs (None = process all)
 TEST_MODE = None  # Set to 10 for testing, None to process all
 
-def normalize_name(name):
-    """Normalize name for matching (remove special chars, lowercase, etc.)"""
-    if not name:
-        return ""
-    # Remove special characters, convert to lowercase, strip whitespace
-    normalized = re.sub(r'[^\w\s]', '', name.lower())
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
-    return normalized
+VERBOSE_LOGGING = False  # Log each renamed legacy '#' thumbnail
+
+def find_image_file(index, nft_name, match_cache=None):
+    """Find image file matching NFT name using the prebuilt source index.
+
+    Returns (path, result); path is None when nothing matched or the best
+    candidates were too close to call (result.ambiguous).
+    """
+    result = index.match(nft_name, match_cache)
+    return result.path, result
+
+def generate_thumbnail(source, output_path, size, quality=QUALITY, nft_type=None):
+    """Generate thumbnail from an image file or an already decoded Composite"""
+    return generate_theme_thumbnails(source, size, {THEME: output_path}, quality, nft_type)
+
+def generate_theme_thumbnails(source, size, outputs, quality=QUALITY, nft_type=None):
+    """Write one thumbnail size for several themes ({theme: output_path}).
+
+    The alpha-carrying image is resized once and then flattened onto each
+    theme's background, so extra themes only cost a flatten and an encode.
+    """
+    try:
+        if not isinstance(source, Composite):
+            source = load_composite(source)
+        
+        # Resize maintaining aspect ratio, centred on a transparent square
+        with stage('resize'):
+            fitted = source.fit_square(size)
+        
+        for theme, output_path in outputs.items():
+            with stage('composite'):
+                thumb = fitted.flatten(background_for(nft_type, theme))
+            
+            # Encode in memory, then write, so encode and I/O are timed separately
+            with stage('encode'):
+                buffer = io.BytesIO()
+                thumb.save(buffer, 'JPEG', quality=quality, optimize=True)
+            with stage('write'):
+                with open(output_path, 'wb') as f:
+                    f.write(buffer.getbuffer())
+        
+        return True
+    except Exception as e:
+        print(f"Error processing {source}: {e}")
+        return False
+
+def thumbnail_dir(size_name, theme=THEME):
+    """Folder of one size; the default theme keeps the original img/thumbnails/<size> layout"""
+    return THUMBNAIL_DIRS[size_name] if theme == THEME else f'{THEMED_THUMBNAIL_ROOT}/{theme}/{size_name}'
 
-def find_image_file(image_dir, nft_name):
-    """Find image file matching NFT name in the image directory"""
-    normalized_nft_name = normalize_name(nft_name)
+def variant_dir(size_name, density, theme=THEME):
+    """Folder of one density variant; 1x is the plain size folder"""
+    folder = thumbnail_dir(size_name, theme)
+    return folder if density == 1 else f'{folder}@{density}x'
+
+def source_is_too_small(source_size, size):
+    """True when the source cannot fill size in either dimension (the variant would only be padded)"""
+    return min(size[0] / source_size[0], size[1] / source_size[1]) > 1
+
+def read_image_size(path):
+    """Pixel size from the image header, without decoding"""
+    with Image.open(path) as img:
+        return img.size
+
+def render_nft_thumbnails(nft, nft_name, image_file, force=False, themes=(THEME,), densities=DENSITIES):
+    """Render all thumbnail sizes for one NFT and store the URLs on the record.
+
+    Returns 'generated', 'skipped' (all sizes already existed) or 'failed'.
+    With force=True existing thumbnails are overwritten (watch mode).
+    URLs of the default theme are stored per size in thumbnailURLs, those of
+    other themes under thumbnailURLs[theme]; thumbnailSrcset has the same
+    shape, with a [{url, width, bytes}] list of density variants per size.
+    """
+    # Generate safe filename (remove # and other invalid chars)
+    safe_filename = sanitize_filename(nft_name)
+    thumbnail_filename = f"{safe_filename}.jpg"
     
-    # Check if this is a "Mindfolk Founder #X" pattern
-    founder_match = re.search(r'founder\s*#?\s*(\d+)', nft_name, re.IGNORECASE)
-    if founder_match:
-        founder_num = int(founder_match.group(1))
-        # Try to find file with pattern Mindfolk_Founder_XXXX.png (zero-padded to 4 digits)
-        # Files are named like: Mindfolk_Founder_0008.png
-        padded_num = str(founder_num).zfill(4)  # Pad to 4 digits: 8 -> 0008
-        possible_names = [
-            f"Mindfolk_Founder_{padded_num}",
-            f"Mindfolk_Founder_{founder_num}",  # Also try without padding
-        ]
-        for possible_name in possible_names:
-            for ext in ['.png', '.jpg', '.jpeg', '.PNG', '.JPG', '.JPEG']:
-                file_path = Path(image_dir) / f"{possible_name}{ext}"
-                if file_path.exists() and file_path.is_file():
-                    return file_path
+    # Check if old filename with # exists and needs to be renamed
+    old_filename = f"{nft_name}.jpg"
+    old_thumbnail_paths = {}
+    for size_name in THUMBNAIL_SIZES.keys():
+        old_path = os.path.join(THUMBNAIL_DIRS[size_name], old_filename)
+        if os.path.exists(old_path) and old_filename != thumbnail_filename:
+            old_thumbnail_paths[size_name] = old_path
     
-    # Search in main directory first, then subfolders
-    search_paths = [Path(image_dir)]  # Start with root directory
-    for folder in FOLDERS_TO_PROCESS:
-        folder_path = Path(image_dir) / folder
-        if folder_path.exists():
-            search_paths.append(folder_path)
+    # Generate all three sizes (every density and theme) from a single decode
+    all_exist = True
+    thumbnail_urls = {}
+    theme_urls = {theme: {} for theme in themes if theme != THEME}
+    srcsets = {theme: {} for theme in themes}
+    source = None
+    source_size = None
     
-    for search_path in search_paths:
-        if not search_path.exists():
-            continue
-            
-        # Search for image files (ignore GIFs for now)
-        image_extensions = ['.png', '.jpg', '.jpeg', '.webp', '.PNG', '.JPG', '.JPEG', '.WEBP']
+    for size_name, size in THUMBNAIL_SIZES.items():
+        thumbnail_path = os.path.join(THUMBNAIL_DIRS[size_name], thumbnail_filename)
         
-        try:
-            for file_path in search_path.iterdir():
-                try:
-                    if not file_path.is_file():
-                        continue
-                        
-                    # Skip GIFs and other non-image files
-                    file_ext = file_path.suffix.lower()
-                    if file_ext == '.gif':
-                        continue
-                    
-                    # Check if extension matches
-                    if file_ext not in [ext.lower() for ext in image_extensions]:
-                        continue
-                    
-                    # Get filename without extension
-                    filename_base = file_path.stem
-                    normalized_filename = normalize_name(filename_base)
-                    
-                    # Try exact match first
-                    if normalized_filename == normalized_nft_name:
-                        return file_path
-                    
-                    # Try partial match (filename contains NFT name or vice versa)
-                    if normalized_nft_name in normalized_filename or normalized_filename in normalized_nft_name:
-                        return file_path
-                except Exception as e:
-                    # Skip individual file if there's an error (permissions, etc.)
-                    continue
-        except PermissionError:
-            print(f"Permission denied accessing: {search_path}")
-            continue
-        except Exception as e:
-            print(f"Error accessing {search_path}: {e}")
-            continue
+        # If old thumbnail with # exists, rename it to the sanitized version
+        if size_name in old_thumbnail_paths:
+            old_path = old_thumbnail_paths[size_name]
+            try:
+                if not os.path.exists(thumbnail_path):
+                    os.rename(old_path, thumbnail_path)
+                    if VERBOSE_LOGGING:
+                        print(f"  [RENAMED] {Path(old_path).name} -> {thumbnail_filename}")
+            except Exception as e:
+                print(f"  [WARNING] Could not rename {Path(old_path).name}: {e}")
+        
+        for density in (1, *sorted(d for d in densities if d != 1)):
+            pixels = (size[0] * density, size[1] * density)
+            if density != 1:
+                # Only worth a file when the source has the extra pixels
+                if source_size is None:
+                    try:
+                        source_size = source.size if source is not None else read_image_size(image_file)
+                    except Exception as e:
+                        print(f"  [ERROR] Could not read {image_file} for '{nft_name}': {e}")
+                        return 'failed'
+                if source_is_too_small(source_size, pixels):
+                    break
+            
+            outputs = {}
+            paths = {}
+            for theme in themes:
+                folder = variant_dir(size_name, density, theme)
+                paths[theme] = os.path.join(folder, thumbnail_filename)
+                # Use forward slashes for URLs (web-compatible)
+                theme_url = f"{folder.replace(os.sep, '/')}/{thumbnail_filename}"
+                if density == 1:
+                    if theme == THEME:
+                        thumbnail_urls[size_name] = theme_url
+                    else:
+                        theme_urls[theme][size_name] = theme_url
+                srcsets[theme].setdefault(size_name, []).append({'url': theme_url, 'width': pixels[0]})
+                # Skip if already exists
+                if force or not os.path.exists(paths[theme]):
+                    outputs[theme] = paths[theme]
+            
+            if outputs:
+                all_exist = False
+                
+                # Decode once, on the first variant that is missing
+                if source is None:
+                    try:
+                        source = load_composite(image_file)
+                    except Exception as e:
+                        print(f"  [ERROR] Could not read {image_file} for '{nft_name}': {e}")
+                        return 'failed'
+                    source_size = source.size
+                
+                # Generate thumbnail (one resize, flattened per theme)
+                if not generate_theme_thumbnails(source, pixels, outputs, nft_type=nft.get('Type')):
+                    print(f"  [ERROR] Failed to generate {size_name} @{density}x thumbnail for '{nft_name}'")
+                    return 'failed'
+            
+            for theme in themes:
+                srcsets[theme][size_name][-1]['bytes'] = os.path.getsize(paths[theme])
+    
+    # Keep theme sets rendered by an earlier run that did not ask for them
+    for field, sets in (('thumbnailURLs', theme_urls), ('thumbnailSrcset', srcsets)):
+        for theme, urls in (nft.get(field) or {}).items():
+            if theme in THEMES and theme != THEME and theme not in sets and isinstance(urls, dict):
+                sets[theme] = urls
     
-    return None
+    # Store all thumbnail URLs in JSON
+    nft['thumbnailURL'] = thumbnail_urls.get('190x190', '')  # Default to 190x190 for backward compatibility
+    nft['thumbnailURLs'] = {**thumbnail_urls, **theme_urls}  # All sizes, plus {theme: {size: url}}
+    srcset = srcsets.pop(THEME, {})
+    nft['thumbnailSrcset'] = {**srcset, **srcsets}  # {size: [{url, width, bytes}]}, plus {theme: {...}}
+    return 'skipped' if all_exist else 'generated'
 
-def generate_thumbnail(input_path, output_path, size, quality=QUALITY):
-    """Generate thumbnail from image file"""
+def parse_densities(value):
+    """'1,2,3' -> (1, 2, 3); 1x is always included"""
     try:
-        # Open image
-        img = Image.open(input_path)
-        
-        # Convert to RGB if necessary (for JPEG)
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # Create black background (better for dark theme)
-            background = Image.new('RGB', img.size, (0, 0, 0))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            if img.mode == 'RGBA':
-                background.paste(img, mask=img.split()[-1])
-            else:
-                background.paste(img)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        # Resize maintaining aspect ratio
-        img.thumbnail(size, Image.Resampling.LANCZOS)
+        densities = {int(part) for part in value.split(',') if part.strip()}
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {value!r}")
+    if any(density < 1 for density in densities):
+        raise argparse.ArgumentTypeError('densities must be 1 or more')
+    return tuple(sorted(densities | {1}))
+
+def save_nfts(nfts, path=OUTPUT_JSON):
+    """Write the catalog atomically so the gallery never reads a half-written file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(nfts, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def watch(nfts, index, match_cache, themes=(THEME,), densities=DENSITIES):
+    """Re-render only the NFTs whose source images change, until Ctrl+C"""
+    popup = load_script('generate-elder-popup-images.py', 'elder_popup_images')
+    
+    # Current source -> NFTs mapping, so a changed file maps straight to its records
+    nfts_by_file = defaultdict(list)
+    unmatched = []
+    for nft in nfts:
+        nft_name = nft.get('Name', '').strip()
+        if not nft_name:
+            continue
+        image_file, _ = find_image_file(index, nft_name, match_cache)
+        if image_file:
+            nfts_by_file[Path(image_file)].append(nft)
+        else:
+            unmatched.append(nft)
+    
+    def rematch(affected):
+        """Give unmatched NFTs another try after the index gained a file"""
+        for nft in list(unmatched):
+            image_file, _ = find_image_file(index, nft['Name'].strip(), match_cache)
+            if image_file:
+                nfts_by_file[Path(image_file)].append(nft)
+                unmatched.remove(nft)
+                affected[id(nft)] = (nft, Path(image_file))
+
+    def on_change(paths):
+        started = time.perf_counter()
+        affected = {}
+        # Deleted or renamed away first, so a rename's new name can pick its NFTs up below
+        for path in paths:
+            if path.exists() or path not in index:
+                continue
+            restored = index.remove(path)  # Its sibling in another format, if there is one
+            for nft in nfts_by_file.pop(path, []):
+                unmatched.append(nft)
+                print(f"  [MISSING] {nft['Name'].strip()}: {path.name} is gone")
+            if restored:
+                rematch(affected)
+        for path in sorted(paths):
+            if not path.exists():
+                continue
+            if path not in index:
+                # New file: index it (unless a sibling in a preferred format is indexed already)
+                replaced = index.add(path)
+                if path not in index:
+                    continue
+                if replaced:
+                    nfts_by_file[path].extend(nfts_by_file.pop(replaced, []))
+                rematch(affected)
+            for nft in nfts_by_file.get(path, []):
+                affected[id(nft)] = (nft, path)
         
-        # Create a square thumbnail with padding if needed
-        thumb = Image.new('RGB', size, (0, 0, 0))
-        offset = ((size[0] - img.size[0]) // 2, (size[1] - img.size[1]) // 2)
-        thumb.paste(img, offset)
+        if not affected:
+            return
         
-        # Save thumbnail
-        thumb.save(output_path, 'JPEG', quality=quality, optimize=True)
+        for nft, path in affected.values():
+            nft_name = nft['Name'].strip()
+            status = render_nft_thumbnails(nft, nft_name, path, force=True, themes=themes, densities=densities)
+            if nft.get('Type', '').lower() == 'elder':
+                popup.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+                popup_path = popup.OUTPUT_DIR / elder_popup_filename(nft_name)
+                popup.generate_popup_image(path, popup_path, popup.POPUP_SIZE)
+            print(f"  [{status.upper()}] {nft_name} <- {path.name}")
         
-        return True
-    except Exception as e:
-        print(f"Error processing {input_path}: {e}")
-        return False
-
-def sanitize_filename(name):
-    """Create a safe filename from NFT name"""
-    # Remove or replace invalid filename characters (including # which can cause URL issues)
-    invalid_chars = '<>:"/\\|?*#'
-    filename = name
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    # Remove multiple underscores
-    filename = re.sub(r'_+', '_', filename)
-    # Limit length
-    if len(filename) > 200:
-        filename = filename[:200]
-    return filename.strip('_')
+        save_nfts(nfts)
+        save_match_cache(match_cache)
+        print(f"  Updated {len(affected)} NFTs in {time.perf_counter() - started:.2f}s")
+    
+    folders = [IMAGE_DIR] + [os.path.join(IMAGE_DIR, folder) for folder in FOLDERS_TO_PROCESS]
+    watch_folders(folders, on_change, extensions=IMAGE_EXTENSIONS)
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate thumbnails from local NFT images')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and re-render NFTs whose source images change')
+    parser.add_argument('--both-themes', action='store_true',
+                        help='also render the other theme background (dark and light) from the same decode')
+    parser.add_argument('--densities', type=parse_densities, default=DENSITIES,
+                        help=f"pixel densities per view size (default: {','.join(map(str, DENSITIES))})")
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    themes = (THEME, *(theme for theme in THEMES if theme != THEME)) if args.both_themes else (THEME,)
+    
     # Create thumbnail directories
-    for size_name, dir_path in THUMBNAIL_DIRS.items():
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
+    for size_name in THUMBNAIL_SIZES:
+        for theme in themes:
+            for density in args.densities:
+                Path(variant_dir(size_name, density, theme)).mkdir(parents=True, exist_ok=True)
     
     # Check if image directory exists
     if not os.path.exists(IMAGE_DIR):
         print(f"ERROR: Image directory not found: {IMAGE_DIR}")
-        print("Please update IMAGE_DIR in the script to point to your images folder.")
-        return
+        print("Please set image_dir in mindfolk.toml (or MINDFOLK_IMAGE_DIR) to your images folder.")
+        sys.exit(1)
     
     # Load JSON
     print(f"Loading {INPUT_JSON}...")
@@ -188,9 +347,22 @@ def main():
     
     print(f"Found {len(nfts)} NFTs")
     print(f"Image directory: {IMAGE_DIR}")
-    print(f"Generating thumbnails in 3 sizes:")
+    
+    # Index source filenames once instead of listing the folders per NFT
+    index = NameIndex.from_directory(IMAGE_DIR, FOLDERS_TO_PROCESS)
+    match_cache = load_match_cache()
+    print(f"Indexed {len(index)} source images ({len(match_cache)} confirmed matches)")
+    for key, paths in index.number_collisions.items():
+        print(f"  [WARNING] {key[0].title()} #{key[1]} has {len(paths)} source files: {[p.name for p in paths]}")
+    
+    if args.watch:
+        watch(nfts, index, match_cache, themes, args.densities)
+        return
+    
+    print(f"Generating thumbnails in 3 sizes at {', '.join(f'{d}x' for d in args.densities)}:")
     for size_name, size in THUMBNAIL_SIZES.items():
-        print(f"  - {size_name}: {size[0]}x{size[1]}px -> {THUMBNAIL_DIRS[size_name]}/")
+        folders = ', '.join(f"{thumbnail_dir(size_name, theme)}/" for theme in themes)
+        print(f"  - {size_name}: {size[0]}x{size[1]}px -> {folders}")
     print()
     
     matched_count = 0
@@ -198,6 +370,7 @@ def main():
     skipped_count = 0
     failed_count = 0
     not_found_count = 0
+    ambiguous = []
     
     # Limit to test mode if set
     nfts_to_process = nfts[:TEST_MODE] if TEST_MODE else nfts
@@ -208,97 +381,62 @@ def main():
         print(f"  [TEST MODE: Only processing first {TEST_MODE} NFTs]")
     print()
     
-    for i, nft in enumerate(nfts_to_process):
-        try:
-            if (i + 1) % 100 == 0:
-                print(f"Processing {i + 1}/{len(nfts)}... (Matched: {matched_count}, Generated: {generated_count}, Skipped: {skipped_count}, Not Found: {not_found_count}, Failed: {failed_count})")
-            
-            nft_name = nft.get('Name', '').strip()
-            mint = nft.get('mintAddress', '').strip()
-            
-            if not nft_name:
-                not_found_count += 1
-                continue
-            
-            # Find matching image file
-            image_file = find_image_file(IMAGE_DIR, nft_name)
-            
-            if not image_file:
-                not_found_count += 1
-                if (i + 1) <= 10 or (i + 1) % 500 == 0:  # Log first 10 and then every 500
-                    print(f"  Not found: '{nft_name}'")
-                continue
-            
-            matched_count += 1
-            
-            # Log which folder the image was found in (for debugging first few)
-            if matched_count <= 10:
-                folder_name = image_file.parent.name if image_file.parent.name else 'root'
-                print(f"  [OK] Found '{nft_name}' in {folder_name} folder: {image_file.name}")
-            
-            # Generate safe filename (remove # and other invalid chars)
-            safe_filename = sanitize_filename(nft_name)
-            thumbnail_filename = f"{safe_filename}.jpg"
-            
-            # Check if old filename with # exists and needs to be renamed
-            old_filename = f"{nft_name}.jpg"
-            old_thumbnail_paths = {}
-            for size_name in THUMBNAIL_SIZES.keys():
-                old_path = os.path.join(THUMBNAIL_DIRS[size_name], old_filename)
-                if os.path.exists(old_path) and old_filename != thumbnail_filename:
-                    old_thumbnail_paths[size_name] = old_path
-            
-            # Generate all three sizes
-            all_generated = True
-            all_exist = True
-            thumbnail_urls = {}
-            
-            for size_name, size in THUMBNAIL_SIZES.items():
-                thumbnail_path = os.path.join(THUMBNAIL_DIRS[size_name], thumbnail_filename)
-                # Use forward slashes for URLs (web-compatible)
-                thumbnail_url = f"{THUMBNAIL_DIRS[size_name].replace(os.sep, '/')}/{thumbnail_filename}"
-                thumbnail_urls[size_name] = thumbnail_url
+    with RunReport('thumbnails-from-local', total=total_to_process, args=args) as report:
+        for i, nft in enumerate(nfts_to_process):
+            try:
+                nft_name = nft.get('Name', '').strip()
+                mint = nft.get('mintAddress', '').strip()
                 
-                # If old thumbnail with # exists, rename it to the sanitized version
-                if size_name in old_thumbnail_paths:
-                    old_path = old_thumbnail_paths[size_name]
-                    try:
-                        if not os.path.exists(thumbnail_path):
-                            os.rename(old_path, thumbnail_path)
-                            if VERBOSE_LOGGING:
-                                print(f"  [RENAMED] {Path(old_path).name} -> {thumbnail_filename}")
-                    except Exception as e:
-                        print(f"  [WARNING] Could not rename {Path(old_path).name}: {e}")
+                if not nft_name:
+                    not_found_count += 1
+                    continue
                 
-                # Skip if already exists
-                if os.path.exists(thumbnail_path):
+                # Find matching image file
+                with stage('match'):
+                    image_file, match = find_image_file(index, nft_name, match_cache)
+                
+                if match.ambiguous:
+                    ambiguous.append((nft_name, match.candidates))
+                    not_found_count += 1
                     continue
                 
-                all_exist = False
+                if not image_file:
+                    not_found_count += 1
+                    if (i + 1) <= 10 or (i + 1) % 500 == 0:  # Log first 10 and then every 500
+                        print(f"  Not found: '{nft_name}'")
+                    continue
                 
-                # Generate thumbnail
-                if not generate_thumbnail(image_file, thumbnail_path, size):
-                    all_generated = False
-                    failed_count += 1
-                    print(f"  [ERROR] Failed to generate {size_name} thumbnail for '{nft_name}'")
-                    break
-            
-            if all_generated:
-                # Store all thumbnail URLs in JSON
-                nft['thumbnailURL'] = thumbnail_urls.get('190x190', '')  # Default to 190x190 for backward compatibility
-                nft['thumbnailURLs'] = thumbnail_urls  # Store all sizes
-                if all_exist:
+                matched_count += 1
+                
+                # Log which folder the image was found in (for debugging first few)
+                if matched_count <= 10:
+                    folder_name = image_file.parent.name if image_file.parent.name else 'root'
+                    print(f"  [OK] Found '{nft_name}' in {folder_name} folder: {image_file.name}")
+                
+                status = render_nft_thumbnails(nft, nft_name, image_file, themes=themes, densities=args.densities)
+                if status == 'generated':
+                    generated_count += 1
+                elif status == 'skipped':
                     skipped_count += 1
                 else:
-                    generated_count += 1
-        except Exception as e:
-            print(f"  [ERROR] Error processing NFT {i + 1} ('{nft.get('Name', 'unknown')}'): {e}")
-            import traceback
-            traceback.print_exc()
-            failed_count += 1
-            continue
+                    failed_count += 1
+            except Exception as e:
+                print(f"  [ERROR] Error processing NFT {i + 1} ('{nft.get('Name', 'unknown')}'): {e}")
+                import traceback
+                traceback.print_exc()
+                failed_count += 1
+                continue
+            finally:
+                report.tick(nft.get('Name', ''), Matched=matched_count, Generated=generated_count,
+                            Skipped=skipped_count, NotFound=not_found_count, Failed=failed_count)
+        
+        # Save updated JSON (inside the report so the dump is timed too)
+        print()
+        print(f"Saving updated JSON to {OUTPUT_JSON}...")
+        with stage('json_dump'):
+            save_nfts(nfts)
+        save_match_cache(match_cache)
     
-    # Save updated JSON
     print()
     print("=" * 60)
     print("Summary:")
@@ -309,18 +447,24 @@ def main():
     print(f"  Thumbnails skipped (already exist): {skipped_count}")
     print(f"  Failed to generate: {failed_count}")
     print(f"  Images not found: {not_found_count}")
+    print(f"  Ambiguous matches (skipped): {len(ambiguous)}")
     print("=" * 60)
-    print()
-    print(f"Saving updated JSON to {OUTPUT_JSON}...")
     
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(nfts, f, indent=2, ensure_ascii=False)
+    if ambiguous:
+        print()
+        print(f'Ambiguous matches - confirm one by adding "<NFT name>": "<path>" to {MATCH_CACHE_JSON}:')
+        for nft_name, candidates in ambiguous[:20]:
+            options = ', '.join(f"{path.as_posix()} ({score})" for path, score in candidates)
+            print(f"  '{nft_name}': {options}")
     
+    print()
     print("Done!")
     print()
     print("Next steps:")
     print("1. Check the gallery to ensure thumbnails load correctly")
     print("2. If some images weren't found, check the name matching logic")
+    if failed_count:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
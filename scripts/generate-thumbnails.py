@@ -15,17 +15,23 @@ Usage:
 
 import json
 import os
+import sys
 import requests
 from PIL import Image
 from io import BytesIO
 import hashlib
 from pathlib import Path
 
+from compositing import Composite, fit_square
+from mindfolk_config import CONFIG
+
 # Configuration
 THUMBNAIL_SIZE = (300, 300)  # Size for gallery thumbnails
 QUALITY = 85  # JPEG quality (1-100)
-INPUT_JSON = 'data/mindfolk-nfts.json'
-OUTPUT_JSON = 'data/mindfolk-nfts.json'  # Update in place or create new file
+FLATTEN_BACKGROUND = (255, 255, 255)  # Transparent areas of the source
+PADDING_BACKGROUND = (0, 0, 0)  # Letterbox around non-square sources
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json  # Update in place or create new file
 THUMBNAIL_DIR = 'img/thumbnails'
 FULL_IMAGE_DIR = 'img/full'  # Optional: store full images too
 
@@ -42,27 +48,9 @@ def download_and_resize_image(url, output_path, size=THUMBNAIL_SIZE, quality=QUA
         response = requests.get(url, timeout=30, stream=True)
         response.raise_for_status()
         
-        # Open image
-        img = Image.open(BytesIO(response.content))
-        
-        # Convert to RGB if necessary (for JPEG)
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # Create white background
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        # Resize maintaining aspect ratio
-        img.thumbnail(size, Image.Resampling.LANCZOS)
-        
-        # Create a square thumbnail with padding if needed
-        thumb = Image.new('RGB', size, (0, 0, 0))
-        offset = ((size[0] - img.size[0]) // 2, (size[1] - img.size[1]) // 2)
-        thumb.paste(img, offset)
+        # Open image, flatten transparency onto white and pad to a square with black
+        source = Composite(Image.open(BytesIO(response.content)))
+        thumb = fit_square(source.flatten(FLATTEN_BACKGROUND), size, PADDING_BACKGROUND)
         
         # Save thumbnail
         thumb.save(output_path, 'JPEG', quality=quality, optimize=True)
@@ -132,6 +120,8 @@ def main():
     print("Next steps:")
     print("1. Update js/gallery.js to use 'thumbnailURL' instead of 'URL'")
     print("2. Test the gallery to ensure images load correctly")
+    if failed_count:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,252 @@
+"""
+Cut every large original into a Deep Zoom (DZI) tile pyramid for the modal.
+
+The modal's "full" image is a multi-megabyte original: nothing shows until
+all of it has downloaded. This writes img/zoom/<name>.dzi plus
+img/zoom/<name>_files/<level>/<col>_<row>.jpg (256 px tiles) for each
+original larger than MIN_SIZE, so gallery.js can show a sharp image level
+by level and, when zoomed in, fetch only the tiles in view.
+
+Each original is decoded once and its rows are streamed through
+tile_pyramid.StreamingPyramid, which builds every level from the one below
+it as the rows pass. Originals are tiled in a process pool. data/zoom-tiles.json
+records what each pyramid was cut from (size + mtime of a local file, or
+the content hash of a mirrored Drive original), so reruns only tile new or
+changed originals.
+
+Sources are the local originals (same index as the popups) and, without any
+network access, whatever generate-popup-images.py already mirrored into
+data/drive-cache/.
+
+Requirements:
+    pip install Pillow numpy
+
+Usage:
+    python scripts/generate-zoom-tiles.py
+    python scripts/generate-zoom-tiles.py --type Elder --format webp
+    python scripts/generate-zoom-tiles.py --force --workers 4
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from compositing import background_for, load_composite
+from content_cache import ContentCache
+from mindfolk_config import CONFIG
+from mindfolk_scripts import load_script, sanitize_filename
+from name_matching import IMAGE_EXTENSIONS, NameIndex, load_match_cache, save_match_cache
+from run_report import RunReport, add_report_arguments, stage
+from tile_pyramid import PIL_FORMATS, TILE_SIZE, StreamingPyramid
+
+CATALOG_JSON = CONFIG.catalog_json
+POPUP_JSON = CONFIG.popup_json
+IMAGE_DIR = CONFIG.image_dir
+FOLDERS_TO_PROCESS = ['Elders', 'Mushrooms']
+DRIVE_CACHE_DIR = 'data/drive-cache'
+OUTPUT_ROOT = 'img/zoom'  # img/zoom/<name>.dzi + img/zoom/<name>_files/
+MANIFEST_JSON = 'data/zoom-tiles.json'
+
+MIN_SIZE = 1024  # Longest side; smaller originals are fully covered by the popup levels
+TILE_FORMAT = 'jpg'
+QUALITY = 85
+STRIP_ROWS = TILE_SIZE  # Rows pushed into the pyramid at a time
+THEME = 'light'  # Background for transparent areas, as the popups
+WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+def file_signature(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def load_manifest(path):
+    """(pyramids by name, {name: source signature} of originals too small to tile)"""
+    if not os.path.exists(path):
+        return {}, {}
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('byName') or {}, data.get('tooSmall') or {}
+
+def save_manifest(path, by_name, by_mint, too_small):
+    data = {
+        'root': OUTPUT_ROOT,
+        'tileSize': TILE_SIZE,
+        'byName': by_name,
+        'byMint': by_mint,
+        'tooSmall': too_small,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def tile_original(source, base_path, nft_type, tile_format, quality, min_size):
+    """Cut one original into <base_path>.dzi + <base_path>_files/ (runs in a worker process).
+
+    Returns {'width', 'height', 'levels', 'tiles'}, or None when the original
+    is too small to be worth tiling.
+    """
+    composite = load_composite(source)
+    width, height = composite.size
+    if max(width, height) < min_size:
+        return None
+    with stage('composite'):
+        pixels = np.asarray(composite.flatten(background_for(nft_type, THEME)))
+    # Stale tiles from an earlier, differently sized original would never be overwritten
+    shutil.rmtree(f'{base_path}_files', ignore_errors=True)
+    with stage('tile'), StreamingPyramid(base_path, width, height, tile_format=tile_format,
+                                         quality=quality, workers=1) as pyramid:
+        for top in range(0, height, STRIP_ROWS):
+            pyramid.push(pixels[top:top + STRIP_ROWS])
+    return {'width': width, 'height': height, 'levels': pyramid.levels, 'tiles': pyramid.tiles_written}
+
+def find_sources(nfts, args):
+    """{name: (path, signature)} from the local originals, then the Drive mirror"""
+    sources = {}
+    if os.path.exists(args.image_dir):
+        index = NameIndex.from_directory(args.image_dir, FOLDERS_TO_PROCESS, extensions=IMAGE_EXTENSIONS)
+        match_cache = load_match_cache()
+        with stage('match'):
+            for nft in nfts:
+                name = nft['Name'].strip()
+                result = index.match(name, match_cache)
+                if result.path:
+                    sources[name] = (str(result.path), file_signature(result.path))
+        save_match_cache(match_cache)
+        print(f"Local originals: {len(sources)} of {len(nfts)} ({len(index)} source images indexed)")
+    else:
+        print(f"[WARNING] Image directory not found: {args.image_dir}")
+
+    if os.path.exists(args.popup_json) and os.path.isdir(args.cache_dir):
+        popups = load_script('generate-popup-images.py')
+        drive_by_name, drive_by_mint = popups.load_popup_json(args.popup_json)
+        cache = ContentCache(args.cache_dir)
+        mirrored = 0
+        for nft in nfts:
+            name = nft['Name'].strip()
+            if name in sources:
+                continue
+            mint = (nft.get('mintAddress') or '').strip()
+            file_id = popups.drive_file_id(drive_by_mint.get(mint) or drive_by_name.get(name))
+            digest = file_id and cache.index.get(popups.DRIVE_DOWNLOAD.format(id=file_id))
+            if digest and os.path.exists(cache.object_path(digest)):
+                sources[name] = (cache.object_path(digest), f"sha256:{digest}")
+                mirrored += 1
+        print(f"Mirrored Drive originals: {mirrored}")
+    return sources
+
+def run(report, args):
+    if not os.path.exists(args.catalog):
+        print(f"ERROR: Catalog not found: {args.catalog}")
+        return False
+    with stage('json_load'):
+        with open(args.catalog, 'r', encoding='utf-8') as f:
+            nfts = json.load(f)
+        manifest, too_small = load_manifest(args.manifest)
+    if args.type:
+        nfts = [nft for nft in nfts if (nft.get('Type') or '').lower() == args.type.lower()]
+    nfts = [nft for nft in nfts if (nft.get('Name') or '').strip()]
+    print(f"{len(nfts)} NFTs, {len(manifest)} pyramids already in {args.manifest}")
+
+    sources = find_sources(nfts, args)
+    os.makedirs(OUTPUT_ROOT, exist_ok=True)
+
+    jobs = {}
+    skipped = 0
+    for nft in nfts:
+        name = nft['Name'].strip()
+        if name not in sources:
+            continue
+        path, signature = sources[name]
+        entry = manifest.get(name)
+        base_path = f"{OUTPUT_ROOT}/{sanitize_filename(name)}"
+        if not args.force and too_small.get(name) == signature:
+            skipped += 1
+            continue
+        if (not args.force and entry and entry.get('source') == signature
+                and entry.get('format') == args.format and os.path.exists(f"{base_path}.dzi")):
+            skipped += 1
+            continue
+        jobs[name] = (path, signature, base_path, nft.get('Type'))
+
+    print(f"To tile: {len(jobs)} (unchanged: {skipped})")
+    report.total = report.done + len(jobs)
+    tiled = small = tiles = 0
+    failures = []
+    with stage('tile_pool'), ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(tile_original, path, base_path, nft_type, args.format, args.quality, args.min_size): name
+                   for name, (path, signature, base_path, nft_type) in jobs.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            path, signature, base_path, _ = jobs[name]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures.append((name, str(e)))
+                result = None
+            else:
+                if result is None:
+                    small += 1
+                    manifest.pop(name, None)
+                    too_small[name] = signature
+                else:
+                    tiled += 1
+                    tiles += result['tiles']
+                    too_small.pop(name, None)
+                    manifest[name] = {'dzi': f"{base_path}.dzi", 'width': result['width'],
+                                      'height': result['height'], 'format': args.format, 'source': signature}
+            report.tick(name, Tiled=tiled, TooSmall=small, Failed=len(failures))
+
+    # Pyramids only count if their .dzi is still there
+    by_name = {name: entry for name, entry in manifest.items() if os.path.exists(entry['dzi'])}
+    by_mint = {}
+    for nft in nfts:
+        mint = (nft.get('mintAddress') or '').strip()
+        if mint and nft['Name'].strip() in by_name:
+            by_mint[mint] = nft['Name'].strip()
+    if args.type and os.path.exists(args.manifest):
+        with open(args.manifest, 'r', encoding='utf-8') as f:
+            by_mint = {**(json.load(f).get('byMint') or {}), **by_mint}
+    with stage('json_dump'):
+        save_manifest(args.manifest, by_name, by_mint, too_small)
+
+    print(f"\n{'='*60}")
+    print(f"Pyramids built: {tiled} ({tiles} tiles)")
+    print(f"Unchanged: {skipped}")
+    print(f"Below {args.min_size}px (popup levels suffice): {small}")
+    print(f"No original: {len(nfts) - len(sources)}")
+    print(f"Failed: {len(failures)}")
+    print(f"Saved to: {args.manifest} ({len(by_name)} pyramids)")
+    print(f"{'='*60}")
+    for name, error in failures[:20]:
+        print(f"  [ERROR] {name}: {error}")
+    return not failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Cut large originals into Deep Zoom tile pyramids')
+    parser.add_argument('--type', help='only NFTs of this type (Founder, Elder, Mushroom Head, ...)')
+    parser.add_argument('--force', action='store_true', help='re-tile originals that have not changed')
+    parser.add_argument('--format', choices=sorted(PIL_FORMATS), default=TILE_FORMAT, help='tile format (default: jpg)')
+    parser.add_argument('--quality', type=int, default=QUALITY, help='JPEG/WebP quality (default: 85)')
+    parser.add_argument('--min-size', type=int, default=MIN_SIZE,
+                        help=f'only tile originals with a side at least this long (default: {MIN_SIZE})')
+    parser.add_argument('--workers', type=int, default=WORKERS, help='originals tiled in parallel')
+    parser.add_argument('--catalog', default=CATALOG_JSON)
+    parser.add_argument('--popup-json', default=POPUP_JSON)
+    parser.add_argument('--image-dir', default=IMAGE_DIR)
+    parser.add_argument('--cache-dir', default=DRIVE_CACHE_DIR)
+    parser.add_argument('--manifest', default=MANIFEST_JSON)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('zoom-tiles', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
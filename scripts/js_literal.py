@@ -0,0 +1,181 @@
+"""Streaming, tolerant parser for JavaScript object/array literals.
+
+merged_mindfolk_data.json is written as a JS literal (unquoted keys,
+single-quoted strings, possibly trailing commas), so json.load rejects it.
+This reads the file in chunks and yields the elements of the top-level array
+one at a time, so memory stays flat regardless of file size.
+
+Accepted on top of JSON: unquoted identifier keys, '...' strings, trailing
+commas, // and /* */ comments, and the literals undefined/NaN/Infinity.
+
+Usage:
+    from js_literal import iter_literal_items
+
+    with open('merged_mindfolk_data.json', encoding='utf-8') as f:
+        for item in iter_literal_items(f):
+            ...
+"""
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+LOOKAHEAD = 8  # Keep this many chars past a token so '1e' can't end a chunk as a number
+
+# Leading whitespace/comments are folded into each token match, so every
+# regex match yields exactly one token
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:(?://[^\n]*|/\*.*?\*/)\s*)*
+    (?:
+        (?P<punct>[{}\[\]:,;])
+      | (?P<dq>"(?:[^"\\\n]|\\.)*")
+      | (?P<sq>'(?:[^'\\\n]|\\.)*')
+      | (?P<num>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<ident>[A-Za-z_$][\w$]*)
+      | (?P<end>$)
+    )
+''', re.VERBOSE | re.DOTALL)
+
+INTEGER_PATTERN = re.compile(r'[-+]?\d+')
+
+CONSTANTS = {'true': True, 'false': False, 'null': None, 'undefined': None,
+             'NaN': float('nan'), 'Infinity': float('inf')}
+
+class LiteralSyntaxError(ValueError):
+    """Raised with the line number where the literal stops making sense"""
+
+    def __init__(self, message, line):
+        super().__init__(f"{message} (line {line})")
+        self.line = line
+
+def _single_quoted(body):
+    """Decode the inside of a '...' string via JSON string rules"""
+    def escape(match):
+        char = match.group(1)
+        if char is None:
+            return '\\"'             # bare " inside '...'
+        if char == "'":
+            return "'"
+        return match.group(0)
+    return json.loads('"' + re.sub(r'\\(.)|"', escape, body, flags=re.DOTALL) + '"')
+
+def tokenize(stream, chunk_size=CHUNK_SIZE):
+    """Yield (kind, value, line) tokens, reading the stream in chunks"""
+    buffer = ''
+    pos = 0
+    line = 1
+    eof = False
+    while True:
+        match = TOKEN_PATTERN.match(buffer, pos)
+        # A token near the end of the buffer may continue in the next chunk
+        if not eof and (match is None or len(buffer) - match.end() < LOOKAHEAD):
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        if match is None:
+            rest = buffer[pos:]
+            skipped = len(rest) - len(rest.lstrip())
+            raise LiteralSyntaxError(f"unexpected {rest[skipped:skipped + 20]!r}", line + rest.count('\n', 0, skipped))
+
+        kind = match.lastgroup
+        if kind == 'end':
+            return
+        token_line = line + buffer.count('\n', pos, match.start(kind))
+        text = match.group(kind)
+        if kind == 'dq':
+            yield 'str', json.loads(text), token_line
+        elif kind == 'sq':
+            yield 'str', _single_quoted(text[1:-1]), token_line
+        elif kind == 'num':
+            yield 'value', int(text) if INTEGER_PATTERN.fullmatch(text) else float(text), token_line
+        elif kind == 'ident':
+            yield 'ident', text, token_line
+        else:
+            yield text, text, token_line
+        line = token_line + text.count('\n')
+        pos = match.end()
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.peeked = None
+
+    def next(self):
+        if self.peeked is not None:
+            token, self.peeked = self.peeked, None
+            return token
+        return next(self.tokens, ('eof', None, -1))
+
+    def peek(self):
+        if self.peeked is None:
+            self.peeked = self.next()
+        return self.peeked
+
+    def value(self):
+        kind, value, line = self.next()
+        if kind == '{':
+            return self.object()
+        if kind == '[':
+            return list(self.elements())
+        if kind in ('str', 'value'):
+            return value
+        if kind == 'ident' and value in CONSTANTS:
+            return CONSTANTS[value]
+        raise LiteralSyntaxError(f"unexpected {value!r}", line)
+
+    def object(self):
+        result = {}
+        while True:
+            kind, key, line = self.next()
+            if kind == '}':
+                return result
+            if kind not in ('str', 'ident', 'value'):
+                raise LiteralSyntaxError(f"expected a key, got {key!r}", line)
+            colon, _, line = self.next()
+            if colon != ':':
+                raise LiteralSyntaxError(f"expected ':' after key {key!r}", line)
+            result[str(key)] = self.value()
+            kind, value, line = self.next()
+            if kind == '}':
+                return result
+            if kind != ',':
+                raise LiteralSyntaxError(f"expected ',' or '}}', got {value!r}", line)
+
+    def end(self):
+        """Allow a trailing ';' and nothing else after the top-level value"""
+        kind, value, line = self.next()
+        if kind == ';':
+            kind, value, line = self.next()
+        if kind != 'eof':
+            raise LiteralSyntaxError(f"trailing content {value!r}", line)
+
+    def elements(self):
+        """Yield array elements up to the closing ] (the [ is already consumed)"""
+        while True:
+            if self.peek()[0] == ']':
+                self.next()
+                return
+            yield self.value()
+            kind, value, line = self.next()
+            if kind == ']':
+                return
+            if kind != ',':
+                raise LiteralSyntaxError(f"expected ',' or ']', got {value!r}", line)
+
+def iter_literal_items(stream, chunk_size=CHUNK_SIZE):
+    """Yield each element of a top-level array literal (or the single value)"""
+    parser = _Parser(tokenize(stream, chunk_size))
+    if parser.peek()[0] == '[':
+        parser.next()
+        yield from parser.elements()
+    else:
+        yield parser.value()
+    parser.end()
+
+def load_literal(stream):
+    """Parse a whole literal; arrays come back as lists"""
+    parser = _Parser(tokenize(stream))
+    value = parser.value()
+    parser.end()
+    return value
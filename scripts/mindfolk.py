@@ -0,0 +1,219 @@
+"""
+One entry point for the pipeline scripts.
+
+Every target runs an existing script in this process, with the arguments
+that follow it, exactly as if it had been run on its own. Scripts are only
+loaded when their step runs, so Pillow, NumPy and aiohttp are imported by
+the targets that need them and not at all by `stats` or the catalog audits.
+
+Chain steps with a lone `+`. The whole chain runs in one process: the
+catalog read by the audits and `stats` is opened once (data/mindfolk-nfts.bin
+when it is current, see binary_catalog.py) and reopened only if a step
+rewrites it. The chain stops at the first step that fails.
+
+Paths (catalog, image folders, thumbnail root) come from mindfolk_config:
+mindfolk.toml or mindfolk.json in the repo root, MINDFOLK_* environment
+variables, or --config.
+
+Usage:
+    python scripts/mindfolk.py list
+    python scripts/mindfolk.py stats
+    python scripts/mindfolk.py audit                      # every offline catalog audit
+    python scripts/mindfolk.py audit duplicates + audit names + stats
+    python scripts/mindfolk.py convert csv + convert binary + render thumbnails --densities 1,2
+    python scripts/mindfolk.py --config mindfolk.toml render popups --no-mirror
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import time
+from collections import Counter
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CHAIN_SEPARATOR = '+'
+STATS_FIELDS = ('mintAddress', 'URL', 'thumbnailURLs', 'thumbnailSrcset', 'gifURL', 'arweaveURL')
+
+# command -> target -> (script, description)
+COMMANDS = {
+    'render': {
+        'thumbnails': ('generate-thumbnails-from-local.py', 'Thumbnails (and srcset variants) from local originals'),
+        'arweave-thumbnails': ('generate-thumbnails.py', 'Thumbnails downloaded from the catalog URLs'),
+        'elder-gifs': ('generate-elder-gif-thumbnails.py', 'Animated Elder thumbnails'),
+        'mushrooms': ('generate-mushroom-thumbnails.py', 'Mushroom Head thumbnails'),
+        'elder-popups': ('generate-elder-popup-images.py', '380x380 Elder popups'),
+        'popups': ('generate-popup-images.py', '380/760/full popup pyramid'),
+        'zoom': ('generate-zoom-tiles.py', 'Deep Zoom tiles of large originals for the modal'),
+        'similar': ('build-similar-index.py', '"Similar NFTs" neighbours from thumbnail features'),
+        'collage': ('build-collage.py', 'Colour-sorted collage'),
+        'gifs': ('optimize-gifs.py', 'Shrink oversized animated originals'),
+    },
+    'audit': {
+        'duplicates': ('check_duplicates.py', 'Duplicate mints and names'),
+        'names': ('check_duplicate_names.py', 'Duplicate names'),
+        'mushrooms': ('check_mushroom_names.py', 'Mushroom Head names'),
+        'bladesong': ('check_bladesong_duplicates.py', 'Bladesong twins'),
+        'sample': ('check_sample_nft.py', 'First record'),
+        'thumbnail-urls': ('check_thumbnail_urls.py', 'Founder thumbnail URLs'),
+        'links': ('check_links.py', 'Every URL the gallery requests (network)'),
+        'page-weight': ('check_page_weight.py', 'First-visit bytes and requests per view against budgets'),
+    },
+    'convert': {
+        'csv': ('convert-csv-to-json.py', 'Popup CSV -> data/mindfolk-popup-images.json'),
+        'binary': ('build-binary-catalog.py', 'Catalog JSON -> data/mindfolk-nfts.bin'),
+        'mint-set': ('build-mint-set.py', 'Mint membership set'),
+        'snapshot': ('build-collection-snapshot.py', 'Catalog snapshot from the collection API (network)'),
+        'merged': ('build-merged-data.py', 'merged_mindfolk_data.json -> data/mint-metadata.json'),
+        'metadata': ('fetch-metadata.py', 'Founder metadata (network)'),
+        'arweave': ('resolve-arweave-assets.py', 'Arweave asset URLs into the catalog'),
+        'precache': ('build-precache-manifest.py', 'Service-worker precache manifest with content hashes'),
+        'upload-plan': ('plan-irys-upload.py', 'Irys upload plan for changed originals'),
+    },
+    'fix': {
+        'thumbnail-urls': ('fix_json_thumbnail_urls.py', 'Rewrite thumbnail URLs to sanitized names'),
+        'missing-thumbnails': ('add_missing_thumbnail_urls.py', 'Add URLs for thumbnails already on disk'),
+        'remove-hash': ('rename_thumbnails_remove_hash.py', "Rename thumbnails containing '#'"),
+    },
+    'stats': {},
+}
+# `audit` without a target: the ones that only read the catalog
+OFFLINE_AUDITS = ('duplicates', 'names', 'mushrooms', 'bladesong', 'sample', 'thumbnail-urls')
+
+def split_chain(argv):
+    """['audit', 'names', '+', 'stats'] -> [['audit', 'names'], ['stats']]"""
+    steps = [[]]
+    for arg in argv:
+        if arg == CHAIN_SEPARATOR:
+            steps.append([])
+        else:
+            steps[-1].append(arg)
+    return [step for step in steps if step]
+
+def expand_step(step):
+    """A command line step -> list of (label, script or None, args)"""
+    command, rest = step[0], step[1:]
+    if command == 'list':
+        return [('list', None, rest)]
+    if command not in COMMANDS:
+        raise ValueError(f"unknown command {command!r} (commands: list, {', '.join(COMMANDS)})")
+    if command == 'stats':
+        return [('stats', None, rest)]
+    targets = COMMANDS[command]
+    if not rest:
+        if command == 'audit':
+            return [(f'audit {target}', targets[target][0], []) for target in OFFLINE_AUDITS]
+        raise ValueError(f"{command} needs a target: {', '.join(targets)}")
+    target, args = rest[0], rest[1:]
+    if target not in targets:
+        raise ValueError(f"unknown {command} target {target!r} (targets: {', '.join(targets)})")
+    return [(f'{command} {target}', targets[target][0], args)]
+
+def run_script(script, args):
+    """Run a script as __main__ with its own argv; True unless it exited non-zero"""
+    path = os.path.join(SCRIPTS_DIR, script)
+    saved_argv = sys.argv
+    sys.argv = [path] + list(args)
+    try:
+        runpy.run_path(path, run_name='__main__')
+    except SystemExit as e:
+        return e.code in (None, 0)
+    finally:
+        sys.argv = saved_argv
+    return True
+
+def print_targets():
+    for command, targets in COMMANDS.items():
+        print(command)
+        for target, (script, description) in targets.items():
+            print(f"  {target:<20} {description} ({script})")
+    print("\nChain steps with ' + ', e.g.: audit duplicates + stats")
+    return True
+
+def column(data, field):
+    """All values of one field: streamed from the binary catalog, or read from the JSON dicts"""
+    if hasattr(data, 'values'):
+        return data.values(field)
+    return (nft.get(field) for nft in data)
+
+def print_stats(args):
+    from binary_catalog import cached_catalog
+    from mindfolk_config import CONFIG
+
+    parser = argparse.ArgumentParser(prog='mindfolk.py stats', description='Catalog summary')
+    parser.add_argument('--top', type=int, default=10, help='how many types to list (default: 10)')
+    options = parser.parse_args(args)
+
+    if not os.path.exists(CONFIG.catalog_json) and not os.path.exists(os.path.splitext(CONFIG.catalog_json)[0] + '.bin'):
+        print(f"ERROR: Catalog not found: {CONFIG.catalog_json}")
+        return False
+    data = cached_catalog()
+    total = len(data)
+    types = Counter((value or '').strip() or '(none)' for value in column(data, 'Type'))
+    print(f"\n{'='*60}")
+    print(f"Catalog: {CONFIG.catalog_json} ({type(data).__name__})")
+    print(f"Records: {total}")
+    for field in STATS_FIELDS:
+        present = sum(1 for value in column(data, field) if value)
+        if present:
+            print(f"  {field:<16} {present:>6} ({100 * present / max(total, 1):.1f}%)")
+    print(f"Types: {len(types)}")
+    for name, count in types.most_common(options.top):
+        print(f"  {name:<30} {count:>6}")
+    print(f"{'='*60}")
+    return True
+
+def run_step(label, script, args):
+    if label == 'list':
+        return print_targets()
+    if label == 'stats':
+        return print_stats(args)
+    return run_script(script, args)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run the Mindfolk gallery scripts; chain steps with " + "',
+        usage='%(prog)s [--config FILE] <command> [target] [args...] [+ <command> ...]')
+    parser.add_argument('--config', help='config file (default: mindfolk.toml / mindfolk.json, or $MINDFOLK_CONFIG)')
+    parser.add_argument('--quiet-summary', action='store_true', help="don't print the per-step timing summary")
+    parser.add_argument('chain', nargs=argparse.REMAINDER, help='commands: list, ' + ', '.join(COMMANDS))
+    args = parser.parse_args()
+
+    if args.config:
+        import mindfolk_config
+        mindfolk_config.configure(args.config)
+
+    try:
+        steps = [expanded for step in split_chain(args.chain) for expanded in expand_step(step)]
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(2)
+    if not steps:
+        parser.print_help()
+        sys.exit(2)
+
+    timings = []
+    ok = True
+    for label, script, step_args in steps:
+        if len(steps) > 1:
+            print(f"\n>>> {label} {' '.join(step_args)}".rstrip())
+        started = time.perf_counter()
+        ok = run_step(label, script, step_args)
+        timings.append((label, time.perf_counter() - started, ok))
+        if not ok:
+            print(f"[ERROR] {label} failed, stopping the chain")
+            break
+
+    if len(steps) > 1 and not args.quiet_summary:
+        print(f"\n{'='*60}")
+        for label, elapsed, step_ok in timings:
+            print(f"{'[OK]' if step_ok else '[ERROR]':<8} {label:<30} {elapsed:8.2f}s")
+        skipped = len(steps) - len(timings)
+        if skipped:
+            print(f"Skipped: {skipped}")
+        print(f"{'='*60}")
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
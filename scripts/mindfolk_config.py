@@ -0,0 +1,95 @@
+"""Shared paths and settings for the scripts, parsed once per process.
+
+Defaults match the original machine. Override them in mindfolk.toml (or
+mindfolk.json) in the repo root, in the file named by MINDFOLK_CONFIG, or
+per value with MINDFOLK_<KEY> environment variables, e.g.
+MINDFOLK_IMAGE_DIR=/mnt/art/Mindfolk\\ Images. Environment beats file.
+
+mindfolk.toml:
+    image_dir = "D:/Mindfolk Images"
+    thumbnail_root = "img/thumbnails"
+
+Standard library only, so importing it never pulls in Pillow or NumPy.
+
+Usage:
+    from mindfolk_config import CONFIG, thumbnail_dirs
+
+    IMAGE_DIR = CONFIG.image_dir
+    THUMBNAIL_DIRS = thumbnail_dirs()
+"""
+import json
+import os
+from collections import namedtuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: JSON config files only
+    tomllib = None
+
+Config = namedtuple('Config', [
+    'catalog_json',     # The catalog every tool reads (data/mindfolk-nfts.json)
+    'popup_json',       # Popup image URLs by name/mint
+    'popup_csv',        # Mindfolk-images.csv export that convert-csv-to-json.py reads
+    'image_dir',        # Local "Mindfolk Images" originals (Elders/ and Mushrooms/ inside)
+    'optimized_dir',    # Where optimize-gifs.py writes, outside image_dir
+    'thumbnail_root',   # img/thumbnails/<size>/
+    'elder_popup_dir',  # 380x380 Elder popups (generate-elder-popup-images.py)
+])
+
+DEFAULTS = Config(
+    catalog_json='data/mindfolk-nfts.json',
+    popup_json='data/mindfolk-popup-images.json',
+    popup_csv=r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Json and Data\Mindfolk-images.csv',
+    image_dir=r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Mindfolk Images',
+    optimized_dir=r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Mindfolk Images Optimized',
+    thumbnail_root='img/thumbnails',
+    elder_popup_dir='img/Elders',
+)
+
+CONFIG_FILES = ('mindfolk.toml', 'mindfolk.json')
+CONFIG_ENV = 'MINDFOLK_CONFIG'
+ENV_PREFIX = 'MINDFOLK_'
+THUMBNAIL_SIZE_NAMES = ('190x190', '100x100', '30x30')
+
+def read_config_file(path):
+    """{key: value} from a TOML or JSON config file; unknown keys are an error"""
+    with open(path, 'rb') as f:
+        if path.endswith('.toml'):
+            if tomllib is None:
+                raise ValueError(f"{path}: TOML needs Python 3.11+, use mindfolk.json instead")
+            values = tomllib.load(f)
+        else:
+            values = json.load(f)
+    unknown = set(values) - set(Config._fields)
+    if unknown:
+        raise ValueError(f"{path}: unknown settings {sorted(unknown)} (known: {', '.join(Config._fields)})")
+    return {key: str(value) for key, value in values.items()}
+
+def load_config(path=None):
+    """Defaults, then the config file, then MINDFOLK_<KEY> environment variables"""
+    values = DEFAULTS._asdict()
+    path = path or os.environ.get(CONFIG_ENV) or next((p for p in CONFIG_FILES if os.path.exists(p)), None)
+    if path:
+        values.update(read_config_file(path))
+    for key in Config._fields:
+        override = os.environ.get(ENV_PREFIX + key.upper())
+        if override:
+            values[key] = override
+    return Config(**values)
+
+CONFIG = load_config()
+
+def configure(path=None):
+    """Re-read the configuration (e.g. from mindfolk.py --config) for scripts imported after this"""
+    global CONFIG
+    CONFIG = load_config(path)
+    return CONFIG
+
+def thumbnail_dirs(root=None):
+    """{'190x190': 'img/thumbnails/190x190', ...}"""
+    root = root or CONFIG.thumbnail_root
+    return {size_name: f'{root}/{size_name}' for size_name in THUMBNAIL_SIZE_NAMES}
+
+def image_subdir(name):
+    """A folder inside the originals, e.g. image_subdir('Elders')"""
+    return os.path.join(CONFIG.image_dir, name)
@@ -0,0 +1,54 @@
+"""Helpers shared by the scripts: output file names, catalog thumbnail URLs and
+loading sibling scripts.
+
+Standard library only, like mindfolk_config.
+
+Usage:
+    from mindfolk_scripts import load_script, sanitize_filename
+
+    filename = f"{sanitize_filename(nft['Name'])}.jpg"
+    popups = load_script('generate-popup-images.py')
+"""
+import importlib.util
+import re
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+INVALID_FILENAME_CHARS = '<>:"/\\|?*#'  # '#' too: it would end the URL path in the gallery
+MAX_FILENAME_LENGTH = 200
+
+def sanitize_filename(name):
+    """Safe file name (without extension) for an NFT name: thumbnails, popups, zoom tiles"""
+    filename = name
+    for char in INVALID_FILENAME_CHARS:
+        filename = filename.replace(char, '_')
+    filename = re.sub(r'_+', '_', filename)
+    return filename[:MAX_FILENAME_LENGTH].strip('_')
+
+def elder_popup_filename(nft_name):
+    """img/Elders/ file name of an Elder popup; gallery.js builds it with nftName.replace(/#/g, '_')"""
+    return f"{nft_name.replace('#', '_')}.jpg"
+
+def has_hash(urls):
+    """True if any {size: url} entry, or one in a nested theme set, contains #"""
+    return any(has_hash(url) if isinstance(url, dict) else bool(url and '#' in url) for url in urls.values())
+
+def fix_urls(urls, old_filename, new_filename):
+    """Point {size: url} entries at new_filename, including the nested theme
+    sets ({'light': {size: url}}); returns the number of URLs changed"""
+    fixed = 0
+    for key, url in urls.items():
+        if isinstance(url, dict):
+            fixed += fix_urls(url, old_filename, new_filename)
+        elif url and '#' in url:
+            urls[key] = url.replace(f"/{old_filename}", f"/{new_filename}")
+            fixed += 1
+    return fixed
+
+def load_script(filename, module_name=None):
+    """Load a hyphenated script from scripts/ as a module"""
+    spec = importlib.util.spec_from_file_location(
+        module_name or filename.replace('-', '_').removesuffix('.py'), SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
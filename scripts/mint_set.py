@@ -0,0 +1,120 @@
+"""Compact membership artifact for the collection's mint addresses.
+
+data/mint-set.bin holds a bloom filter for a cheap first-pass reject plus
+the raw 32-byte mints in sorted order for an exact binary search. The
+position of a mint in the sorted array also names its catalog shard
+(data/catalog-shards/shard-NNN.json), so the wallet view can fetch only the
+records it needs instead of the whole catalog.
+
+Layout (little-endian):
+    magic 'MFMS' | version u8 | hashes u8 | reserved u16 |
+    count u32 | bloom bits u32 | shard size u32 |
+    bloom bytes | count * 32 sorted mint bytes
+
+Bloom positions use double hashing over the mint bytes themselves (public
+keys are already uniformly distributed): h1 = bytes 0-3, h2 = bytes 4-7 | 1,
+position i = (h1 + i * h2) mod bits. js/gallery.js implements the same.
+
+Usage:
+    from mint_set import MintSet, build_mint_set
+
+    data = build_mint_set(mints)
+    mint_set = MintSet(data)
+    if mint in mint_set:
+        shard = mint_set.shard_of(mint)
+"""
+import math
+import struct
+
+from mint_utils import MINT_BYTES, mint_bytes
+
+MAGIC = b'MFMS'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHIII')
+BITS_PER_MINT = 10   # ~1% false positives with 7 hashes
+BLOOM_HASHES = 7
+SHARD_SIZE = 256     # Catalog records per shard file
+
+def bloom_positions(raw, bits, hashes=BLOOM_HASHES):
+    h1, h2 = struct.unpack_from('<II', raw)
+    h2 |= 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+def sorted_mint_bytes(mints):
+    """Sorted unique raw mints; raises ValueError on an invalid address"""
+    raw_mints = set()
+    for mint in mints:
+        raw = mint_bytes(mint)
+        if raw is None:
+            raise ValueError(f"invalid mint address {mint!r}")
+        raw_mints.add(raw)
+    return sorted(raw_mints)
+
+def build_mint_set(mints, shard_size=SHARD_SIZE, bits_per_mint=BITS_PER_MINT, hashes=BLOOM_HASHES):
+    """Serialize the artifact for an iterable of base58 mint addresses"""
+    raw_mints = sorted_mint_bytes(mints)
+    # Round up to whole bytes so the JS side can index a Uint8Array directly
+    bits = max(64, math.ceil(len(raw_mints) * bits_per_mint / 8) * 8)
+    bloom = bytearray(bits // 8)
+    for raw in raw_mints:
+        for position in bloom_positions(raw, bits, hashes):
+            bloom[position >> 3] |= 1 << (position & 7)
+    header = HEADER.pack(MAGIC, VERSION, hashes, 0, len(raw_mints), bits, shard_size)
+    return header + bytes(bloom) + b''.join(raw_mints)
+
+class MintSet:
+    """Read side of the artifact: bloom reject, then binary search"""
+
+    def __init__(self, data):
+        magic, version, self.hashes, _, self.count, self.bits, self.shard_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a mint-set file (or an unsupported version)")
+        bloom_start = HEADER.size
+        self.mints_start = bloom_start + self.bits // 8
+        self.data = memoryview(data)
+        self.bloom = self.data[bloom_start:self.mints_start]
+        if len(self.data) != self.mints_start + self.count * MINT_BYTES:
+            raise ValueError("truncated mint-set file")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def __len__(self):
+        return self.count
+
+    def mint_at(self, position):
+        start = self.mints_start + position * MINT_BYTES
+        return bytes(self.data[start:start + MINT_BYTES])
+
+    def might_contain(self, raw):
+        return all(self.bloom[p >> 3] & (1 << (p & 7)) for p in bloom_positions(raw, self.bits, self.hashes))
+
+    def position(self, mint):
+        """Index of the mint in the sorted array, or None if it is not in the set"""
+        raw = mint_bytes(mint)
+        if raw is None or not self.might_contain(raw):
+            return None
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            found = self.mint_at(middle)
+            if found == raw:
+                return middle
+            if found < raw:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __contains__(self, mint):
+        return self.position(mint) is not None
+
+    def shard_of(self, mint):
+        """Catalog shard number holding this mint's record, or None"""
+        position = self.position(mint)
+        return None if position is None else position // self.shard_size
+
+def shard_filename(shard):
+    return f'shard-{shard:03d}.json'
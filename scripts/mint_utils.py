@@ -0,0 +1,47 @@
+"""Validation and encoding helpers for Solana mint addresses and arweave URLs"""
+import re
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+BASE58_INDEX = {char: i for i, char in enumerate(BASE58_ALPHABET)}
+MINT_BYTES = 32
+
+# Arweave transaction ids are 32 bytes as unpadded base64url (43 chars)
+ARWEAVE_URL_PATTERN = re.compile(r'^https://(?:www\.)?arweave\.net/([A-Za-z0-9_-]{43})(?:[/?#].*)?$')
+
+def b58decode(text):
+    """Decode base58 text to bytes (raises ValueError on bad characters)"""
+    value = 0
+    for char in text:
+        try:
+            value = value * 58 + BASE58_INDEX[char]
+        except KeyError:
+            raise ValueError(f"invalid base58 character {char!r}") from None
+    body = value.to_bytes((value.bit_length() + 7) // 8, 'big') if value else b''
+    leading_zeros = len(text) - len(text.lstrip('1'))
+    return b'\x00' * leading_zeros + body
+
+def b58encode(data):
+    """Encode bytes as base58 text"""
+    value = int.from_bytes(data, 'big')
+    encoded = ''
+    while value:
+        value, remainder = divmod(value, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b'\x00'))
+    return '1' * leading_zeros + encoded
+
+def mint_bytes(mint):
+    """Raw 32-byte public key of a mint address, or None if it is not one"""
+    if not mint or not 32 <= len(mint) <= 44:
+        return None
+    try:
+        raw = b58decode(mint)
+    except ValueError:
+        return None
+    return raw if len(raw) == MINT_BYTES else None
+
+def is_valid_mint(mint):
+    return mint_bytes(mint) is not None
+
+def is_arweave_url(url):
+    return bool(url) and ARWEAVE_URL_PATTERN.match(url) is not None
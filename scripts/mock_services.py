@@ -0,0 +1,151 @@
+"""Local stand-ins for the remote services the build scripts talk to.
+
+Serves a Helius-style DAS JSON-RPC endpoint (getAssetsByGroup with
+page/limit paging) over a fixed list of assets, and GET /<id> for static
+documents standing in for arweave.net (HEAD and ranged GET included).
+Per-request latency, transient 503s and hosts that reject HEAD can be
+injected, so the snapshot builder, metadata fetcher and link checker can be
+tested and benchmarked offline.
+
+Usage:
+    python scripts/mock_services.py data/mindfolk-nfts.json --port 8899 --latency 0.2
+    python scripts/build-collection-snapshot.py --endpoint http://127.0.0.1:8899/
+
+    # or from Python
+    server, url = start_server(assets)
+    ...
+    server.shutdown()
+"""
+import argparse
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def das_asset(record):
+    """DAS-shaped asset for a data/mindfolk-nfts.json record"""
+    attributes = [{'trait_type': 'Type', 'value': record['Type']}] if record.get('Type') else []
+    url = record.get('URL', '')
+    return {
+        'id': record.get('mintAddress', ''),
+        'burnt': False,
+        'content': {
+            'json_uri': record.get('metadataURL', ''),
+            'files': [{'uri': url, 'mime': f"image/{record.get('Filetype') or 'png'}"}] if url else [],
+            'metadata': {'name': record.get('Name', ''), 'attributes': attributes},
+        },
+    }
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so clients can reuse connections
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, head=False):
+        data = json.dumps(body).encode('utf-8')
+        byte_range = self.headers.get('Range', '')
+        if status == 200 and byte_range.startswith('bytes=') and not head:
+            start, _, end = byte_range[len('bytes='):].partition('-')
+            start, end = int(start or 0), min(int(end or len(data) - 1), len(data) - 1)
+            status, data, total = 206, data[start:end + 1], len(data)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{total}')
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def serve_document(self, head=False):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.request_count += 1
+        path = self.path.lstrip('/').split('?')[0]
+        if head and self.server.reject_head:
+            self.send_json(405, {'error': 'method not allowed'}, head=True)
+            return
+        if path not in self.server.documents:
+            self.send_json(404, {'error': 'not found'}, head)
+            return
+        # Fail the first request for every Nth document to exercise client retries
+        if self.server.fail_every and zlib.crc32(path.encode()) % self.server.fail_every == 0 and path not in self.server.failed:
+            self.server.failed.add(path)
+            self.send_json(503, {'error': 'try again'}, head)
+            return
+        self.send_json(200, self.server.documents[path], head)
+
+    def do_GET(self):
+        self.serve_document()
+
+    def do_HEAD(self):
+        self.serve_document(head=True)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            request = json.loads(self.rfile.read(length))
+        except ValueError:
+            self.send_json(400, {'error': 'invalid JSON'})
+            return
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.request_count += 1
+
+        params = request.get('params') or {}
+        if request.get('method') != 'getAssetsByGroup':
+            self.send_json(200, {'jsonrpc': '2.0', 'id': request.get('id'),
+                                 'error': {'code': -32601, 'message': 'Method not found'}})
+            return
+        page = int(params.get('page', 1))
+        limit = int(params.get('limit', 1000))
+        # Same for every Nth page, so paging clients retry too
+        if self.server.fail_every and page % self.server.fail_every == 0 and f'page-{page}' not in self.server.failed:
+            self.server.failed.add(f'page-{page}')
+            self.send_json(503, {'error': 'try again'})
+            return
+        items = self.server.assets[(page - 1) * limit:page * limit]
+        self.send_json(200, {'jsonrpc': '2.0', 'id': request.get('id'), 'result': {
+            'total': len(items), 'limit': limit, 'page': page, 'items': items}})
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients closing idle keep-alive connections is expected, not an error
+        pass
+
+def start_server(assets=(), documents=None, port=0, latency=0.0, fail_every=0, reject_head=False):
+    """Serve in a background thread; returns (server, base_url)"""
+    server = MockServer(('127.0.0.1', port), MockHandler)
+    server.assets = list(assets)
+    server.documents = documents or {}
+    server.fail_every = fail_every
+    server.failed = set()
+    server.reject_head = reject_head
+    server.latency = latency
+    server.request_count = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/'
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local DAS JSON-RPC stand-in')
+    parser.add_argument('catalog', help='data/mindfolk-nfts.json-style records to serve as assets')
+    parser.add_argument('--port', type=int, default=8899)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    args = parser.parse_args()
+
+    with open(args.catalog, 'r', encoding='utf-8') as f:
+        assets = [das_asset(record) for record in json.load(f)]
+    server, url = start_server(assets, port=args.port, latency=args.latency)
+    print(f"Serving {len(assets)} assets at {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+"""Ranked matching of NFT names to source image filenames.
+
+Shared by the thumbnail and popup generators. Builds one index over the
+source filenames (number keys for Founders/Mushrooms, a trigram index for
+everything else) and scores candidates instead of taking the first
+substring hit.
+
+Usage:
+    from name_matching import NameIndex, load_match_cache, save_match_cache
+
+    index = NameIndex.from_directory(IMAGE_DIR, ['Elders', 'Mushrooms'])
+    cache = load_match_cache()
+    result = index.match('Ace Pilot Elder', cache)
+    if result.path:
+        ...
+    save_match_cache(cache)
+
+The match cache (data/match-cache.json) holds confirmed pairs keyed by NFT
+name: {"Ace Pilot Elder": "Elders/Ace Pilot Elder.png"}, or a list of paths
+when scripts indexing different formats (.png popups, .gif thumbnails) each
+confirmed one. An index uses the first listed path that it contains and
+that still exists, ahead of any matching, so adding an entry by hand
+settles an ambiguous name. Paths that no longer exist are dropped.
+"""
+import json
+import os
+import re
+from collections import Counter, defaultdict, namedtuple
+from pathlib import Path
+
+IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.webp']
+MATCH_CACHE_JSON = 'data/match-cache.json'
+
+# A fuzzy candidate needs at least this score to be accepted...
+MIN_SCORE = 0.72
+# ...and must beat the runner-up by this much, otherwise it is ambiguous
+AMBIGUITY_MARGIN = 0.04
+
+# "Mindfolk Founder #8", "Mindfolk_Founder_0008"
+FOUNDER_PATTERN = re.compile(r'\bfounder\s*(\d+)\b')
+# "Mindfolk_Mushroom_0038", and the Mushroom Head NFTs named "Mindfolk Elder #38"
+MUSHROOM_PATTERN = re.compile(r'\bmushroom\s*(\d+)\b|^mindfolk elder\s*(\d+)$')
+
+FIRST_NUMBER = re.compile(r'\d+')
+
+MatchResult = namedtuple('MatchResult', ['path', 'score', 'ambiguous', 'candidates'])
+MatchResult.__doc__ = """Outcome of NameIndex.match.
+
+path is None when nothing scored high enough or the match is ambiguous;
+candidates holds the top (path, score) pairs for reporting.
+"""
+
+def normalize_name(name):
+    """Normalize name for matching (lowercase, '_'/'-' as spaces, no punctuation)"""
+    if not name:
+        return ""
+    normalized = name.lower().replace('_', ' ').replace('-', ' ')
+    normalized = re.sub(r'[^\w\s]', '', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    return normalized
+
+def number_key(name, kind=None):
+    """Return ('founder', N) or ('mushroom', N) for numbered names, else None.
+
+    Numbers are compared as integers so 0038 == 38 but 38 != 138. When the
+    caller already knows the kind (e.g. filtered by Type), the first number
+    in the name is used.
+    """
+    normalized = normalize_name(name)
+    if kind:
+        match = FIRST_NUMBER.search(normalized)
+        return (kind, int(match.group())) if match else None
+    match = FOUNDER_PATTERN.search(normalized)
+    if match:
+        return ('founder', int(match.group(1)))
+    match = MUSHROOM_PATTERN.search(normalized)
+    if match:
+        return ('mushroom', int(match.group(1) or match.group(2)))
+    return None
+
+def trigrams(text):
+    """Character trigrams of a normalized name, padded so word edges count"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    """Index over source image files for ranked name lookups"""
+
+    def __init__(self, files, extensions=IMAGE_EXTENSIONS):
+        self.files = []
+        self.file_ids = {}
+        self.priority = {ext.lower(): rank for rank, ext in enumerate(extensions)}
+        self.by_stem = {}
+        self.by_exact = defaultdict(list)
+        self.by_number = defaultdict(list)
+        self.postings = defaultdict(list)
+        self.gram_counts = []
+        self.number_collisions = {}
+
+        for file_path in files:
+            self.add(file_path)
+
+    def _rank(self, file_path):
+        return self.priority.get(file_path.suffix.lower(), len(self.priority))
+
+    def add(self, file_path):
+        """Add one source file (e.g. a new file picked up in watch mode).
+
+        Keeps one file per name and folder, like from_directory: a file whose
+        sibling in a preferred format is indexed is skipped, and a file in a
+        preferred format replaces its sibling. Returns the replaced path, if any.
+        """
+        file_path = Path(file_path)
+        if file_path in self.file_ids:
+            return None
+        stem_key = (file_path.parent, file_path.stem.lower())
+        sibling = self.by_stem.get(stem_key)
+        if sibling is not None:
+            if self._rank(sibling) <= self._rank(file_path):
+                return None
+            self._remove(sibling)
+        self._add(file_path)
+        return sibling
+
+    def _add(self, file_path):
+        file_id = len(self.files)
+        self.by_stem[(file_path.parent, file_path.stem.lower())] = file_path
+        self.files.append(file_path)
+        self.file_ids[file_path] = file_id
+
+        normalized = normalize_name(file_path.stem)
+        self.by_exact[normalized].append(file_id)
+
+        key = number_key(file_path.stem)
+        if key:
+            self.by_number[key].append(file_id)
+            if len(self.by_number[key]) > 1:
+                self.number_collisions[key] = [self.files[i] for i in self.by_number[key]]
+
+        grams = trigrams(normalized)
+        self.gram_counts.append(len(grams))
+        for gram in grams:
+            self.postings[gram].append(file_id)
+
+    def remove(self, file_path):
+        """Drop a source file (deleted or renamed away in watch mode); file ids stay stable.
+
+        A sibling in the next preferred format that exists on disk takes its
+        place; returns that sibling, if any.
+        """
+        file_path = Path(file_path)
+        if file_path not in self.file_ids:
+            return None
+        self._remove(file_path)
+        for ext in sorted(self.priority, key=self.priority.get):
+            sibling = file_path.with_suffix(ext)
+            if sibling != file_path and sibling.is_file():
+                self._add(sibling)
+                return sibling
+        return None
+
+    def _remove(self, file_path):
+        file_id = self.file_ids.pop(file_path)
+        self.by_stem.pop((file_path.parent, file_path.stem.lower()), None)
+        normalized = normalize_name(file_path.stem)
+        self.by_exact[normalized].remove(file_id)
+
+        key = number_key(file_path.stem)
+        if key:
+            self.by_number[key].remove(file_id)
+            if len(self.by_number[key]) > 1:
+                self.number_collisions[key] = [self.files[i] for i in self.by_number[key]]
+            else:
+                self.number_collisions.pop(key, None)
+
+        for gram in trigrams(normalized):
+            self.postings[gram].remove(file_id)
+
+    @classmethod
+    def from_directory(cls, image_dir, folders=(), extensions=IMAGE_EXTENSIONS):
+        """Index image files in image_dir and the given subfolders (one listing each).
+
+        When the same name exists in several formats (Elder .png and .gif),
+        only the one whose extension comes first in `extensions` is kept.
+        """
+        search_paths = [Path(image_dir)] + [Path(image_dir) / folder for folder in folders]
+        priority = {ext.lower(): rank for rank, ext in enumerate(extensions)}
+        preferred = {}
+        for search_path in search_paths:
+            try:
+                with os.scandir(search_path) as entries:
+                    for entry in entries:
+                        file_path = search_path / entry.name
+                        rank = priority.get(file_path.suffix.lower())
+                        if rank is None or not entry.is_file():
+                            continue
+                        key = (search_path, file_path.stem.lower())
+                        if key not in preferred or rank < preferred[key][0]:
+                            preferred[key] = (rank, file_path)
+            except FileNotFoundError:
+                continue
+            except PermissionError:
+                print(f"Permission denied accessing: {search_path}")
+        return cls((file_path for _, file_path in preferred.values()), extensions)
+
+    def __len__(self):
+        return len(self.file_ids)
+
+    def __contains__(self, file_path):
+        return Path(file_path) in self.file_ids
+
+    def cached_match(self, nft_name, cache):
+        """The confirmed path for nft_name that belongs to this index, dropping paths that are gone"""
+        paths = cache.get(nft_name)
+        if not paths:
+            return None
+        if isinstance(paths, str):
+            paths = cache[nft_name] = [paths]
+        for path in list(paths):
+            if not Path(path).exists():
+                paths.remove(path)
+            elif Path(path) in self:
+                return Path(path)
+        if not paths:
+            del cache[nft_name]
+        return None
+
+    def _ranked(self, normalized, limit):
+        """Score files sharing trigrams with the query by Dice similarity"""
+        query_grams = trigrams(normalized)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+        scored = [
+            (2.0 * count / (len(query_grams) + self.gram_counts[file_id]), file_id)
+            for file_id, count in shared.items()
+        ]
+        scored.sort(key=lambda item: (-item[0], str(self.files[item[1]])))
+        return scored[:limit]
+
+    def match(self, nft_name, cache=None, limit=3):
+        """Find the best source file for nft_name.
+
+        Checks the match cache, then number keys (Founder/Mushroom), then an
+        exact normalized name, then trigram similarity. Numbered names never
+        fall through to fuzzy matching, so "#38" cannot pick up "0138".
+        A confirmed pair in the cache wins even where matching is ambiguous.
+        """
+        if cache is not None:
+            cached = self.cached_match(nft_name, cache)
+            if cached is not None:
+                return MatchResult(cached, 1.0, False, [(cached, 1.0)])
+
+        result = self._match_uncached(nft_name, limit)
+        if cache is not None and result.path and not result.ambiguous:
+            cache.setdefault(nft_name, []).append(str(result.path).replace(os.sep, '/'))
+        return result
+
+    def _match_uncached(self, nft_name, limit):
+        key = number_key(nft_name)
+        if key:
+            ids = self.by_number.get(key, [])
+            candidates = [(self.files[i], 1.0) for i in ids]
+            if len(ids) == 1:
+                return MatchResult(self.files[ids[0]], 1.0, False, candidates)
+            return MatchResult(None, 1.0 if ids else 0.0, len(ids) > 1, candidates)
+
+        normalized = normalize_name(nft_name)
+        if not normalized:
+            return MatchResult(None, 0.0, False, [])
+
+        ids = self.by_exact.get(normalized, [])
+        if len(ids) == 1:
+            return MatchResult(self.files[ids[0]], 1.0, False, [(self.files[ids[0]], 1.0)])
+        if len(ids) > 1:
+            return MatchResult(None, 1.0, True, [(self.files[i], 1.0) for i in ids])
+
+        ranked = self._ranked(normalized, limit)
+        candidates = [(self.files[file_id], round(score, 3)) for score, file_id in ranked]
+        if not ranked or ranked[0][0] < MIN_SCORE:
+            return MatchResult(None, ranked[0][0] if ranked else 0.0, False, candidates)
+
+        best_score = ranked[0][0]
+        if len(ranked) > 1 and best_score - ranked[1][0] < AMBIGUITY_MARGIN:
+            return MatchResult(None, best_score, True, candidates)
+        return MatchResult(self.files[ranked[0][1]], best_score, False, candidates)
+
+NumberJoin = namedtuple('NumberJoin', ['pairs', 'collisions', 'unmatched_nfts', 'unmatched_files'])
+NumberJoin.__doc__ = """Outcome of join_by_number.
+
+pairs is a list of (file path, [nfts]); collisions maps a number key to the
+files that share it (those are left out of pairs).
+"""
+
+def join_by_number(nfts, files, kind=None):
+    """Join NFTs to source files on their integer number key in linear time.
+
+    Each NFT name and each filename is parsed once into a dict keyed by
+    (kind, number). Several NFTs may share a number (they share thumbnails);
+    several files sharing a number are a collision and are not joined.
+    """
+    nfts_by_key = defaultdict(list)
+    unkeyed_nfts = []
+    for nft in nfts:
+        key = number_key(nft.get('Name', ''), kind)
+        if key:
+            nfts_by_key[key].append(nft)
+        else:
+            unkeyed_nfts.append(nft)
+
+    files_by_key = defaultdict(list)
+    unmatched_files = []
+    for file_path in files:
+        key = number_key(Path(file_path).stem, kind)
+        if key:
+            files_by_key[key].append(file_path)
+        else:
+            unmatched_files.append(file_path)
+
+    pairs = []
+    collisions = {}
+    for key, key_files in files_by_key.items():
+        if len(key_files) > 1:
+            collisions[key] = key_files
+        elif key in nfts_by_key:
+            pairs.append((key_files[0], nfts_by_key[key]))
+        else:
+            unmatched_files.append(key_files[0])
+
+    unmatched_nfts = unkeyed_nfts + [
+        nft for key, key_nfts in nfts_by_key.items()
+        if key not in files_by_key for nft in key_nfts
+    ]
+    return NumberJoin(pairs, collisions, unmatched_nfts, unmatched_files)
+
+def load_match_cache(path=MATCH_CACHE_JSON):
+    """Load confirmed {nft name: source path or [paths]} pairs (empty if missing)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    cache = {}
+    for name, paths in data.items():
+        if isinstance(paths, dict):
+            # Per-file-set sections written by earlier versions: merge them back by name
+            for nft_name, nft_path in paths.items():
+                if nft_path not in cache.setdefault(nft_name, []):
+                    cache[nft_name].append(nft_path)
+        elif paths:
+            cache.setdefault(name, []).extend(p for p in ([paths] if isinstance(paths, str) else paths)
+                                              if p not in cache.get(name, []))
+    return cache
+
+def save_match_cache(cache, path=MATCH_CACHE_JSON):
+    """Write confirmed pairs back so later runs skip matching"""
+    data = {}
+    for name, paths in sorted(cache.items()):
+        paths = [paths] if isinstance(paths, str) else paths
+        if paths:
+            data[name] = paths[0] if len(paths) == 1 else paths
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
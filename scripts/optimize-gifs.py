@@ -0,0 +1,384 @@
+"""
+Shrink oversized Founder/Elder GIF animations without visible changes.
+
+The big Mindfolk_Founder_*.gif files are what keeps failing in
+upload-to-irys.js (see failed_uploads.txt) and what makes the modal slow
+(findArweaveGifUrl). Each animation is streamed frame by frame -- only the
+displayed canvas, the frame waiting to be written and the incoming frame are
+held in memory -- and rewritten with:
+
+- identical consecutive frames merged into one longer frame
+- every frame cropped to the rectangle that changed, with unchanged pixels
+  inside it made transparent when that compresses better
+- one global palette taken from the first frame, and a local palette only
+  for frames that use colours outside it (exact colours; only a changed
+  rectangle that needs more than 255 colours is quantized)
+- files that come out no smaller are copied unchanged
+- with --max-bytes, frames dropped evenly (their time added to the frame
+  before) until the file fits the budget
+
+A before/after size report goes to data/gif-optimization-report.json.
+--verify re-decodes both files and compares what is on screen over time.
+
+Requirements:
+    pip install Pillow numpy
+
+Usage:
+    python scripts/optimize-gifs.py                          # every GIF listed in failed_uploads.txt
+    python scripts/optimize-gifs.py path/to/a.gif path/to/b.gif --verify
+    python scripts/optimize-gifs.py --all --max-bytes 15000000
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from mindfolk_config import CONFIG
+from run_report import RunReport, add_report_arguments, stage
+
+IMAGE_DIR = CONFIG.image_dir
+OUTPUT_DIR = CONFIG.optimized_dir  # Outside IMAGE_DIR, so uploads don't pick up duplicates
+FAILED_UPLOADS_TXT = 'failed_uploads.txt'
+REPORT_JSON = 'data/gif-optimization-report.json'
+
+TRANSPARENT = 1 << 24  # Pixel key for transparent pixels (opaque pixels are 0xRRGGBB)
+ALPHA_THRESHOLD = 128  # GIF transparency is on/off
+DISPOSE_NONE = 1
+DISPOSE_BACKGROUND = 2
+DROP_STEPS = (8, 6, 4, 3, 2)  # With --max-bytes: drop every Nth frame, trying these N in turn
+WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+def encode_frame(frame, offset, include_color_table, **params):
+    """GIF bytes of one 'P' frame (control extension, image descriptor, LZW data) at offset.
+
+    Pillow only writes whole files publicly, so the frame is saved on its own
+    and its blocks are lifted out; the file's global table becomes the
+    frame's local table when include_color_table is set.
+    """
+    buffer = io.BytesIO()
+    frame.save(buffer, 'GIF', optimize=False, interlace=False, **params)
+    data = buffer.getvalue()
+    flags = data[10]
+    table_end = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+    table = data[13:table_end]
+    descriptor = table_end
+    while data[descriptor] == 0x21:  # Extensions (the graphic control one): label, then sub-blocks
+        descriptor += 2
+        while data[descriptor]:
+            descriptor += data[descriptor] + 1
+        descriptor += 1
+    packed = (0x80 | (flags & 7)) if include_color_table and table else 0
+    header = b'\x2c' + struct.pack('<HHHHB', offset[0], offset[1], frame.width, frame.height, packed)
+    return data[table_end:descriptor] + header + (table if packed else b'') + data[descriptor + 10:-1]
+
+def frame_keys(frame):
+    """Current frame as an (h, w) uint32 array of exact pixel keys"""
+    rgba = np.asarray(frame.convert('RGBA'))
+    keys = (rgba[..., 0].astype(np.uint32) << 16) | (rgba[..., 1].astype(np.uint32) << 8) | rgba[..., 2]
+    keys[rgba[..., 3] < ALPHA_THRESHOLD] = TRANSPARENT
+    return keys
+
+def reduce_colours(crop):
+    """Bring a crop with more than 256 entries (a canvas mixing several local palettes) to 255 colours + transparent"""
+    opaque = crop != TRANSPARENT
+    rgb = np.stack([(crop >> 16) & 255, (crop >> 8) & 255, crop & 255], axis=-1).astype(np.uint8)
+    quantized = np.asarray(Image.fromarray(rgb, 'RGB')
+                           .quantize(255, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+                           .convert('RGB'))
+    crop = (quantized[..., 0].astype(np.uint32) << 16) | (quantized[..., 1].astype(np.uint32) << 8) | quantized[..., 2]
+    crop[~opaque] = TRANSPARENT
+    return crop, np.unique(crop)
+
+def palette_bytes(keys):
+    """RGB palette bytes for sorted pixel keys (transparent entries are black)"""
+    keys = np.where(keys == TRANSPARENT, 0, keys).astype(np.uint32)
+    return np.stack([(keys >> 16) & 255, (keys >> 8) & 255, keys & 255], axis=1).astype(np.uint8).tobytes()
+
+def iter_frames(path, drop_step=None):
+    """Yield (keys, duration_ms) per distinct frame.
+
+    Identical consecutive frames come out as one frame with the summed
+    duration; with drop_step, every Nth frame is folded into the one before.
+    """
+    with Image.open(path) as img:
+        frame_count = getattr(img, 'n_frames', 1)
+        pending = None
+        for index in range(frame_count):
+            img.seek(index)
+            duration = img.info.get('duration', 100)
+            if drop_step and pending is not None and index % drop_step == drop_step - 1 and index != frame_count - 1:
+                pending = (pending[0], pending[1] + duration)
+                continue
+            keys = frame_keys(img)
+            if pending is not None and np.array_equal(keys, pending[0]):
+                pending = (pending[0], pending[1] + duration)
+                continue
+            if pending is not None:
+                yield pending
+            pending = (keys, duration)
+        if pending is not None:
+            yield pending
+
+class GifWriter:
+    """Writes the optimized animation one frame at a time, one frame behind the input"""
+
+    def __init__(self, fp, size, loop, global_keys):
+        self.fp = fp
+        self.width, self.height = size
+        self.global_keys = global_keys
+        self.canvas = np.full((self.height, self.width), TRANSPARENT, dtype=np.uint32)
+        self.frames = 0
+        self.local_palettes = 0
+        self.quantized = 0  # Frames that needed more than 256 colours
+
+        table = palette_bytes(global_keys)
+        size_bits = max(0, (len(global_keys) - 1).bit_length() - 1)
+        table += b'\0' * (3 * (2 << size_bits) - len(table))
+        fp.write(b'GIF89a' + struct.pack('<HHBBB', self.width, self.height, 0xF0 | size_bits, 0, 0) + table)
+        if loop is not None:
+            fp.write(b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', loop) + b'\0')
+
+    def write(self, keys, duration, next_keys):
+        # Frames that make pixels transparent again need the canvas cleared before them
+        clear_after = next_keys is not None and bool(np.any((next_keys == TRANSPARENT) & (keys != TRANSPARENT)))
+        if clear_after:
+            y0, y1, x0, x1 = 0, self.height, 0, self.width
+        else:
+            changed = keys != self.canvas
+            rows = np.flatnonzero(changed.any(axis=1))
+            cols = np.flatnonzero(changed.any(axis=0))
+            if len(rows):
+                y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+            else:
+                y0, y1, x0, x1 = 0, 1, 0, 1  # Nothing changed (a dropped-frame boundary): keep a 1x1 frame for the delay
+
+        on_screen = self.canvas[y0:y1, x0:x1]
+        crop = keys[y0:y1, x0:x1]
+        params = {'duration': min(duration, 655350), 'disposal': DISPOSE_BACKGROUND if clear_after else DISPOSE_NONE}
+        # Pixels already on screen can be transparent, showing through unchanged. That usually
+        # gives longer LZW runs, but not always (dithering, anti-aliased text), so both are tried
+        unchanged = crop == on_screen
+        candidates = [self._encode(np.where(unchanged, TRANSPARENT, crop), (x0, y0), params),
+                      self._encode(crop, (x0, y0), params)]
+        if candidates[0][3]:
+            # 256 new colours leave no index for transparency: only mask colours the frame lacks
+            lacking = unchanged & ~np.isin(crop, crop[~unchanged])
+            candidates.append(self._encode(np.where(lacking, TRANSPARENT, crop), (x0, y0), params))
+        # Exact candidates win over quantized ones, then the smaller
+        data, shown, local, quantized = min(candidates, key=lambda c: (c[3], len(c[0])))
+        self.fp.write(data)
+        self.canvas[y0:y1, x0:x1] = np.where(shown == TRANSPARENT, on_screen, shown)
+        if clear_after:
+            self.canvas[:] = TRANSPARENT
+        self.frames += 1
+        self.local_palettes += local
+        self.quantized += quantized
+
+    def _encode(self, crop, offset, params):
+        """(frame bytes, keys as written, used a local table, was quantized) for one candidate crop"""
+        used = np.unique(crop)
+        quantized = len(used) > 256  # Transparency, when used, takes one of the 256 indices
+        if quantized:
+            crop, used = reduce_colours(crop)
+        local = not bool(np.isin(used, self.global_keys, assume_unique=True).all())
+        palette_keys = used if local else self.global_keys
+        frame = Image.fromarray(np.searchsorted(palette_keys, crop).astype(np.uint8), 'P')
+        frame.putpalette(palette_bytes(palette_keys))
+        params = dict(params)
+        if palette_keys[-1] == TRANSPARENT:
+            params['transparency'] = len(palette_keys) - 1
+        data = encode_frame(frame, (int(offset[0]), int(offset[1])), local, **params)
+        return data, crop, local, quantized
+
+    def close(self):
+        self.fp.write(b';')
+
+def write_optimized(source, output, drop_step=None):
+    """One streaming pass; returns (frames written, local palettes used, frames quantized)"""
+    with Image.open(source) as img:
+        size = img.size
+        loop = img.info.get('loop')
+
+    frames = iter_frames(source, drop_step)
+    first = next(frames, None)
+    if first is None:
+        raise ValueError('no frames')
+    global_keys = np.union1d(first[0], [TRANSPARENT]).astype(np.uint32)  # Sorted, so TRANSPARENT is last
+    if len(global_keys) > 256:
+        global_keys = np.array([TRANSPARENT], dtype=np.uint32)  # Every frame gets its own table
+
+    tmp_path = f'{output}.tmp'
+    with open(tmp_path, 'wb') as fp:
+        writer = GifWriter(fp, size, loop, global_keys)
+        pending = first
+        for incoming in frames:
+            writer.write(pending[0], pending[1], incoming[0])
+            pending = incoming
+        writer.write(pending[0], pending[1], None)
+        writer.close()
+    os.replace(tmp_path, output)
+    return writer.frames, writer.local_palettes, writer.quantized
+
+def displayed_frames(path):
+    """Yield (start_ms, end_ms, keys) of what a viewer shows"""
+    elapsed = 0
+    for keys, duration in iter_frames(path):
+        yield elapsed, elapsed + duration, keys
+        elapsed += duration
+
+def verify(source, output):
+    """Largest per-channel difference between the two animations over time (0 = identical)"""
+    worst = 0
+    optimized = displayed_frames(output)
+    current = next(optimized, None)
+    for start, _, keys in displayed_frames(source):
+        while current is not None and current[1] <= start:
+            current = next(optimized, None)
+        if current is None:
+            return 255
+        if not np.array_equal(keys, current[2]):
+            mismatch = (keys == TRANSPARENT) != (current[2] == TRANSPARENT)
+            if mismatch.any():
+                return 255
+            a = np.stack([(keys >> shift) & 255 for shift in (16, 8, 0)]).astype(np.int16)
+            b = np.stack([(current[2] >> shift) & 255 for shift in (16, 8, 0)]).astype(np.int16)
+            worst = max(worst, int(np.abs(a - b).max()))
+    return worst
+
+def optimize_file(source, output, max_bytes=None, check=False):
+    """Optimize one GIF; returns its report entry"""
+    before = os.path.getsize(source)
+    with Image.open(source) as img:
+        frames_in = getattr(img, 'n_frames', 1)
+    frames_out, local_palettes, quantized = write_optimized(source, output)
+    dropped_step = None
+    for step in DROP_STEPS:
+        if not max_bytes or os.path.getsize(output) <= max_bytes:
+            break
+        dropped_step = step
+        frames_out, local_palettes, quantized = write_optimized(source, output, drop_step=step)
+    kept_original = not dropped_step and os.path.getsize(output) >= before
+    if kept_original:
+        # Already well packed (e.g. by an encoder with smarter palettes): never make a file bigger
+        shutil.copyfile(source, output)
+        frames_out, local_palettes, quantized = frames_in, 0, 0
+    after = os.path.getsize(output)
+    entry = {
+        'source': str(source),
+        'output': str(output),
+        'bytesBefore': before,
+        'bytesAfter': after,
+        'framesBefore': frames_in,
+        'framesAfter': frames_out,
+        'localPalettes': local_palettes,
+        'quantizedFrames': quantized,
+        'dropEvery': dropped_step,
+        'keptOriginal': kept_original,
+        'overBudget': bool(max_bytes and after > max_bytes),
+    }
+    if check and not dropped_step and not kept_original:
+        entry['maxPixelDifference'] = verify(source, output)
+    return entry
+
+def gifs_from_failed_uploads(path, image_dir):
+    """GIFs named in failed_uploads.txt, found anywhere under image_dir"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        names = {line.strip() for line in f if line.strip().lower().endswith('.gif')}
+    return sorted(p for p in Path(image_dir).rglob('*.gif') if p.name in names)
+
+def run(report, args):
+    if args.files:
+        sources = [Path(p) for p in args.files]
+    elif args.all:
+        sources = sorted(Path(args.image_dir).rglob('*.gif'))
+    else:
+        sources = gifs_from_failed_uploads(args.failed_uploads, args.image_dir)
+    missing = [p for p in sources if not p.exists()]
+    sources = [p for p in sources if p.exists()]
+    if not sources:
+        print(f"ERROR: No GIFs to optimize (image dir: {args.image_dir})")
+        return False
+    print(f"Optimizing {len(sources)} GIFs -> {args.output_dir}")
+    os.makedirs(args.output_dir, exist_ok=True)
+    report.total = len(sources)
+
+    entries = []
+    failures = []
+    with stage('optimize'), ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(optimize_file, source, Path(args.output_dir) / source.name,
+                               args.max_bytes, args.verify): source for source in sources}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                entries.append(future.result())
+            except Exception as e:
+                failures.append((source, str(e)))
+            report.tick(source.name, Optimized=len(entries), Failed=len(failures))
+
+    entries.sort(key=lambda entry: entry['source'])
+    before = sum(entry['bytesBefore'] for entry in entries)
+    after = sum(entry['bytesAfter'] for entry in entries)
+    with stage('json_dump'):
+        os.makedirs(os.path.dirname(args.report_json) or '.', exist_ok=True)
+        with open(args.report_json, 'w', encoding='utf-8') as f:
+            json.dump({'bytesBefore': before, 'bytesAfter': after, 'files': entries}, f, indent=2)
+
+    print(f"\n{'='*60}")
+    print(f"{'file':<34}{'before MB':>10}{'after MB':>10}{'frames':>12}")
+    for entry in entries:
+        frames = f"{entry['framesBefore']}->{entry['framesAfter']}"
+        flags = ''
+        if entry['dropEvery']:
+            flags += f" [dropped every {entry['dropEvery']}]"
+        if entry['keptOriginal']:
+            flags += ' [kept original]'
+        if entry['quantizedFrames']:
+            flags += f" [{entry['quantizedFrames']} frames quantized]"
+        if entry['overBudget']:
+            flags += ' [OVER BUDGET]'
+        if entry.get('maxPixelDifference'):
+            flags += f" [max diff {entry['maxPixelDifference']}]"
+        print(f"{Path(entry['source']).name:<34}{entry['bytesBefore'] / 1e6:>10.2f}"
+              f"{entry['bytesAfter'] / 1e6:>10.2f}{frames:>12}{flags}")
+    if before:
+        print(f"Total: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB ({100 * (1 - after / before):.0f}% smaller)")
+    print(f"Report: {args.report_json}")
+    print(f"{'='*60}")
+    for path in missing:
+        print(f"  [WARNING] Not found: {path}")
+    for source, error in failures:
+        print(f"  [ERROR] {source.name}: {error}")
+    return not failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Losslessly shrink GIF animations (frame merging, cropping, palettes)')
+    parser.add_argument('files', nargs='*', help=f'GIFs to optimize (default: those in {FAILED_UPLOADS_TXT})')
+    parser.add_argument('--all', action='store_true', help='every GIF under --image-dir')
+    parser.add_argument('--image-dir', default=IMAGE_DIR)
+    parser.add_argument('--failed-uploads', default=FAILED_UPLOADS_TXT)
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--max-bytes', type=int, help='drop frames evenly until each file fits this size')
+    parser.add_argument('--verify', action='store_true', help='compare the displayed frames of input and output')
+    parser.add_argument('--report-json', default=REPORT_JSON)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('optimize-gifs', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Plan the next Irys upload by file content instead of filename.
+
+Hashes every image under IMAGES_FOLDER (in parallel, cached by path, size
+and mtime), groups identical bytes, and compares them with
+arweave_image_mapping.json. Content that is already on Arweave -- under
+any name, including files that were renamed since (known from the hash
+store or the previous plan) -- becomes an alias of the existing URL
+instead of a new upload; duplicates among new files are
+uploaded once and the other names become aliases of that upload.
+
+The plan (data/upload-plan.json) lists the unique new blobs with their byte
+total for cost estimation. upload-to-irys.js uploads only those when the
+plan exists and then writes the alias entries into the mapping. It refuses
+a plan that no longer matches IMAGES_FOLDER (new, modified or deleted
+files), so re-run this after changing the folder.
+
+Usage:
+    python scripts/plan-irys-upload.py
+    python scripts/plan-irys-upload.py --images-folder path/to/images
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from file_hashes import HASH_STORE_JSON, WORKERS, HashStore
+from mindfolk_config import CONFIG
+from run_report import RunReport, add_report_arguments, stage
+
+IMAGES_FOLDER = CONFIG.image_dir
+ARWEAVE_MAPPING_JSON = 'arweave_image_mapping.json'
+PLAN_JSON = 'data/upload-plan.json'
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp'}  # Same list as upload-to-irys.js
+
+CONTENT_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
+def find_images(folder):
+    """All image files under folder, recursively, in a stable order"""
+    return sorted(p for p in Path(folder).rglob('*') if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS)
+
+def recorded_digests(store, folder, previous_plan):
+    """{file name: sha256} recorded for files under folder: by the hash store
+    (which other scripts share) and by the previous plan"""
+    root = os.path.join(os.path.abspath(folder), '')
+    digests = {os.path.basename(key): entry[2] for key, entry in store.files.items() if key.startswith(root)}
+    for entry in (previous_plan or {}).get('uploads', []) + (previous_plan or {}).get('aliases', []):
+        digests.setdefault(entry['fileName'], entry['sha256'])
+    return digests
+
+def build_plan(files, digests, sizes, mapping, known_content, recorded=None):
+    """Group files by content and decide upload vs alias.
+
+    known_content maps sha256 -> Arweave URL for content seen uploaded on an
+    earlier run (it survives renames, since the old name may be gone).
+    recorded maps file names to a sha256 hashed before; it covers mapped
+    files renamed away before any plan saw them under their uploaded name.
+    """
+    groups = defaultdict(list)
+    for path in files:
+        groups[digests[path]].append(path)
+
+    # Content uploaded under a name that still exists locally
+    for digest, paths in groups.items():
+        for path in paths:
+            if path.name in mapping:
+                known_content.setdefault(digest, mapping[path.name])
+    # ...or under a name that is gone, if its content was hashed while it existed
+    local_names = {path.name for path in files}
+    for name, digest in (recorded or {}).items():
+        if name in mapping and name not in local_names:
+            known_content.setdefault(digest, mapping[name])
+
+    uploads = []
+    aliases = []
+    for digest, paths in groups.items():
+        unmapped = [path for path in paths if path.name not in mapping]
+        if not unmapped:
+            continue
+        url = known_content.get(digest)
+        if url is None:
+            canonical, unmapped = unmapped[0], unmapped[1:]
+            uploads.append({
+                'path': str(canonical),
+                'fileName': canonical.name,
+                'sha256': digest,
+                'size': sizes[canonical],
+                'contentType': CONTENT_TYPES.get(canonical.suffix.lower(), 'application/octet-stream'),
+            })
+        for path in unmapped:
+            aliases.append({'fileName': path.name, 'sha256': digest, 'url': url, 'path': str(path)})
+    return uploads, aliases, groups
+
+def run(report, args):
+    if not os.path.isdir(args.images_folder):
+        print(f"ERROR: Images folder not found: {args.images_folder}")
+        return False
+
+    mapping = {}
+    if os.path.exists(args.mapping):
+        with open(args.mapping, 'r', encoding='utf-8') as f:
+            mapping = json.load(f)
+
+    with stage('scan'):
+        files = find_images(args.images_folder)
+        sizes = {path: path.stat().st_size for path in files}
+    print(f"Found {len(files)} image files, {len(mapping)} already in {args.mapping}")
+    report.total = len(files)
+
+    store = HashStore(args.hash_store)
+    with stage('hash'):
+        digests = store.hash_files(files, workers=args.workers, on_hashed=lambda path: report.tick(path.name))
+    print(f"Hashed {store.rehashed} new or changed files ({len(files) - store.rehashed} from cache)")
+
+    previous_plan = None
+    if os.path.exists(args.output):
+        with open(args.output, 'r', encoding='utf-8') as f:
+            previous_plan = json.load(f)
+
+    known_content = store.extra.setdefault('uploaded', {})
+    with stage('plan'):
+        recorded = recorded_digests(store, args.images_folder, previous_plan)
+        uploads, aliases, groups = build_plan(files, digests, sizes, mapping, known_content, recorded)
+    store.save()
+
+    upload_bytes = sum(entry['size'] for entry in uploads)
+    duplicate_bytes = sum(sizes[path] for paths in groups.values() for path in paths[1:])
+    plan = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'imagesFolder': str(args.images_folder),
+        'totals': {
+            'files': len(files),
+            'uniqueContents': len(groups),
+            'uploads': len(uploads),
+            'uploadBytes': upload_bytes,
+            'aliases': len(aliases),
+            'duplicateBytesSkipped': duplicate_bytes,
+        },
+        'uploads': uploads,
+        'aliases': aliases,
+    }
+    with stage('json_dump'):
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        tmp_path = args.output + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(plan, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, args.output)
+
+    print(f"\n{'='*60}")
+    print(f"Files: {len(files)} ({len(groups)} unique contents)")
+    print(f"New uploads: {len(uploads)} ({upload_bytes / (1024 * 1024):.1f} MB)")
+    print(f"Aliases of existing or planned uploads: {len(aliases)}")
+    print(f"  of which already on Arweave: {sum(1 for a in aliases if a['url'])}")
+    print(f"Duplicate bytes not uploaded: {duplicate_bytes / (1024 * 1024):.1f} MB")
+    print(f"Plan saved to: {args.output}")
+    print(f"{'='*60}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a content-deduplicated Irys upload plan')
+    parser.add_argument('--images-folder', default=IMAGES_FOLDER)
+    parser.add_argument('--mapping', default=ARWEAVE_MAPPING_JSON)
+    parser.add_argument('--hash-store', default=HASH_STORE_JSON)
+    parser.add_argument('--output', default=PLAN_JSON)
+    parser.add_argument('--workers', type=int, default=WORKERS, help='hashing threads')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('upload-plan', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
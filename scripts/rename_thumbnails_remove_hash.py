@@ -1,29 +1,15 @@
 """Rename all thumbnails to remove # characters and update JSON"""
 import os
 import json
-import re
+import sys
 from pathlib import Path
 
-THUMBNAIL_DIRS = {
-    '190x190': 'img/thumbnails/190x190',
-    '100x100': 'img/thumbnails/100x100',
-    '30x30': 'img/thumbnails/30x30'
-}
-INPUT_JSON = 'data/mindfolk-nfts.json'
-OUTPUT_JSON = 'data/mindfolk-nfts.json'
+from mindfolk_config import CONFIG, thumbnail_dirs
+from mindfolk_scripts import sanitize_filename
 
-def sanitize_filename(name):
-    """Create a safe filename from NFT name (remove # and other invalid chars)"""
-    invalid_chars = '<>:"/\\|?*#'
-    filename = name
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    # Remove multiple underscores
-    filename = re.sub(r'_+', '_', filename)
-    # Limit length
-    if len(filename) > 200:
-        filename = filename[:200]
-    return filename.strip('_')
+THUMBNAIL_DIRS = thumbnail_dirs()
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json
 
 def main():
     # Load JSON
@@ -36,6 +22,7 @@ def main():
     
     renamed_count = 0
     updated_json_count = 0
+    failed_count = 0
     
     # Process each NFT
     for i, nft in enumerate(nfts):
@@ -70,6 +57,7 @@ def main():
                 except Exception as e:
                     print(f"  [ERROR] Could not rename {old_path}: {e}")
                     all_renamed = False
+                    failed_count += 1
                     continue
             elif os.path.exists(new_path):
                 # Already renamed or was created with correct name
@@ -85,7 +73,9 @@ def main():
         # Update JSON if we renamed any files
         if thumbnail_urls:
             nft['thumbnailURL'] = thumbnail_urls.get('190x190', '')
-            nft['thumbnailURLs'] = thumbnail_urls
+            # Keep the theme sets ({'light': {size: url}}); only the default set is renamed here
+            theme_urls = {theme: urls for theme, urls in (nft.get('thumbnailURLs') or {}).items() if isinstance(urls, dict)}
+            nft['thumbnailURLs'] = {**thumbnail_urls, **theme_urls}
             updated_json_count += 1
     
     # Save updated JSON
@@ -95,6 +85,7 @@ def main():
     print(f"  Total NFTs processed: {len(nfts)}")
     print(f"  Thumbnails renamed: {renamed_count}")
     print(f"  JSON entries updated: {updated_json_count}")
+    print(f"  Failed renames: {failed_count}")
     print("=" * 60)
     print()
     
@@ -103,6 +94,8 @@ def main():
         json.dump(nfts, f, indent=2, ensure_ascii=False)
     
     print("Done!")
+    if failed_count:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,110 @@
+"""
+Resolve each NFT's Arweave .gif/.png once at build time.
+
+Looks every catalog record up in arweave_image_mapping.json (see
+arweave_assets.py for the filename rules) and stores the results as
+gifURL/pngURL, so the gallery reads them from the record instead of trying
+name variants and scanning the whole mapping on every modal open. A record
+with no asset gets null, which tells the gallery not to search.
+
+NFTs with neither a .gif nor a .png are listed in the missing-asset report.
+
+Usage:
+    python scripts/resolve-arweave-assets.py
+    python scripts/resolve-arweave-assets.py --missing-report data/arweave-missing.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from arweave_assets import ARWEAVE_MAPPING_JSON, ArweaveAssetIndex
+from mindfolk_config import CONFIG
+from run_report import RunReport, add_report_arguments, stage
+
+INPUT_JSON = CONFIG.catalog_json
+OUTPUT_JSON = CONFIG.catalog_json
+MISSING_REPORT_JSON = 'data/arweave-missing-assets.json'
+
+def save_json(data, path, indent=2):
+    """Write JSON atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def run(report, args):
+    for path in (args.input, args.mapping):
+        if not os.path.exists(path):
+            print(f"ERROR: File not found: {path}")
+            return False
+
+    with stage('json_load'):
+        with open(args.input, 'r', encoding='utf-8') as f:
+            nfts = json.load(f)
+        assets = ArweaveAssetIndex.from_file(args.mapping)
+    print(f"Found {len(nfts)} NFTs and {len(assets)} Arweave files")
+    report.total = len(nfts)
+
+    gif_count = 0
+    png_count = 0
+    changed_count = 0
+    missing = []
+
+    with stage('resolve'):
+        for nft in nfts:
+            name = (nft.get('Name') or '').strip()
+            gif_url = assets.resolve(name, '.gif')
+            png_url = assets.resolve(name, '.png')
+            if nft.get('gifURL', '') != gif_url or nft.get('pngURL', '') != png_url:
+                changed_count += 1
+            nft['gifURL'] = gif_url
+            nft['pngURL'] = png_url
+            gif_count += gif_url is not None
+            png_count += png_url is not None
+            if not gif_url and not png_url:
+                missing.append({'Name': name, 'mintAddress': nft.get('mintAddress', ''),
+                                'Type': nft.get('Type', '')})
+            report.tick(name, GIF=gif_count, PNG=png_count)
+
+    with stage('json_dump'):
+        if changed_count and not args.dry_run:
+            save_json(nfts, args.output)
+        save_json(missing, args.missing_report)
+
+    print(f"\n{'='*60}")
+    print(f"With .gif: {gif_count}")
+    print(f"With .png: {png_count}")
+    print(f"No Arweave asset: {len(missing)}")
+    print(f"Records changed: {changed_count}")
+    if args.dry_run:
+        print("Dry run: catalog not written")
+    elif changed_count:
+        print(f"Saved to: {args.output}")
+    print(f"Missing-asset report: {args.missing_report}")
+    print(f"{'='*60}")
+    for entry in missing[:20]:
+        print(f"  [WARNING] No .gif/.png for: {entry['Name'] or entry['mintAddress']}")
+    if len(missing) > 20:
+        print(f"  ... and {len(missing) - 20} more")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Write resolved Arweave gifURL/pngURL into the NFT catalog')
+    parser.add_argument('--input', default=INPUT_JSON)
+    parser.add_argument('--output', default=OUTPUT_JSON)
+    parser.add_argument('--mapping', default=ARWEAVE_MAPPING_JSON)
+    parser.add_argument('--missing-report', default=MISSING_REPORT_JSON)
+    parser.add_argument('--dry-run', action='store_true', help='only write the missing-asset report')
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('arweave-assets', args=args) as report:
+        ok = run(report, args)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""Per-stage timing, live progress and JSON-lines run reports for the scripts.
+
+Wrap a run in RunReport, the expensive steps in stage('decode') /
+stage('encode') etc., and call report.tick() after each NFT. stage() is a
+no-op when no report is active, so helpers like generate_thumbnail can be
+instrumented unconditionally.
+
+Usage:
+    parser = argparse.ArgumentParser()
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    with RunReport('thumbnails', total=len(nfts), args=args) as report:
+        for nft in nfts:
+            with stage('decode'):
+                ...
+            report.tick(nft['Name'], Generated=generated_count)
+
+The report (one JSON object per line: run header, one line per item, final
+summary with p50/p95/p99 per stage) goes to run-reports/<name>-<timestamp>.jsonl.
+With --profile a cProfile dump is written next to it.
+"""
+import cProfile
+import json
+import math
+import os
+import pstats
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+REPORT_DIR = 'run-reports'
+PROGRESS_EVERY = 100      # Items between progress lines when stdout is not a terminal
+LIVE_REFRESH_SECONDS = 0.2  # Redraw interval of the live progress line
+
+_active = None
+
+def add_report_arguments(parser):
+    """Add --report and --profile to a script's argument parser"""
+    parser.add_argument('--report', help=f'JSON-lines run report path (default: {REPORT_DIR}/<script>-<timestamp>.jsonl)')
+    parser.add_argument('--profile', action='store_true', help='also write cProfile stats next to the report')
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+@contextmanager
+def _timed(report, name):
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    try:
+        yield
+    finally:
+        report.record(name, time.perf_counter() - wall_started, time.process_time() - cpu_started)
+
+def stage(name):
+    """Time a block as stage `name` in the active report (no-op without one)"""
+    return _timed(_active, name) if _active else nullcontext()
+
+class RunReport:
+    """Collects stage/item timings for one script run and writes the report"""
+
+    def __init__(self, name, total=0, args=None, report_path=None, profile=False):
+        self.name = name
+        self.total = total
+        self.report_path = report_path or getattr(args, 'report', None) or os.path.join(
+            REPORT_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+        self.profile = profile or getattr(args, 'profile', False)
+        self.stage_wall = defaultdict(list)
+        self.stage_cpu = defaultdict(float)
+        self.item_walls = []
+        self.item_stages = {}
+        self.done = 0
+        self.live = sys.stdout.isatty()
+        self.last_refresh = 0.0
+        self.profiler = None
+        self.file = None
+
+    def __enter__(self):
+        global _active
+        os.makedirs(os.path.dirname(self.report_path) or '.', exist_ok=True)
+        self.file = open(self.report_path, 'w', encoding='utf-8')
+        self._write({'type': 'run', 'script': self.name, 'total': self.total,
+                     'started': time.strftime('%Y-%m-%dT%H:%M:%S'), 'argv': sys.argv})
+        self.wall_started = self.item_started = time.perf_counter()
+        self.cpu_started = self.item_cpu_started = time.process_time()
+        if self.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        _active = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        _active = None
+        if self.profiler:
+            self.profiler.disable()
+        if self.live and self.done:
+            print()
+        summary = self.summary()
+        self._write(summary)
+        self.file.close()
+        self.print_summary(summary)
+        if self.profiler:
+            profile_path = os.path.splitext(self.report_path)[0] + '.prof'
+            self.profiler.dump_stats(profile_path)
+            print(f"cProfile stats: {profile_path} (top functions by cumulative time below)")
+            pstats.Stats(self.profiler).sort_stats('cumulative').print_stats(15)
+        return False
+
+    def _write(self, record):
+        self.file.write(json.dumps(record) + '\n')
+
+    def record(self, name, wall, cpu):
+        self.stage_wall[name].append(wall)
+        self.stage_cpu[name] += cpu
+        self.item_stages[name] = self.item_stages.get(name, 0.0) + wall
+
+    def tick(self, item=None, count=1, **counters):
+        """Finish one item and update the progress line.
+
+        The item's wall/CPU time is measured since the previous tick, and the
+        stages run in between are attributed to it.
+        """
+        now = time.perf_counter()
+        cpu_now = time.process_time()
+        entry = {'type': 'item', 'item': item, 'wall': now - self.item_started,
+                 'cpu': cpu_now - self.item_cpu_started, 'stages': self.item_stages}
+        self.item_walls.append(entry['wall'])
+        self._write(entry)
+        self.item_stages = {}
+        self.item_started = now
+        self.item_cpu_started = cpu_now
+
+        self.done += count
+        if self.done != self.total:
+            if not self.live and self.done % PROGRESS_EVERY:
+                return
+            if self.live and now - self.last_refresh < LIVE_REFRESH_SECONDS:
+                return
+        self.last_refresh = now
+        elapsed = now - self.wall_started
+        rate = self.done / elapsed if elapsed else 0.0
+        remaining = (self.total - self.done) / rate if rate and self.total else 0.0
+        extra = ', '.join(f"{key}: {value}" for key, value in counters.items())
+        if self.total:
+            line = f"Processing {self.done}/{self.total}... {rate:.1f}/s, ETA {format_duration(remaining)}"
+        else:  # Streaming input: the count isn't known up front
+            line = f"Processing {self.done}... {rate:.1f}/s"
+        line += f" ({extra})" if extra else ''
+        if self.live:
+            print(f"\r{line}\033[K", end='', flush=True)
+        else:
+            print(line)
+
+    def summary(self):
+        wall = time.perf_counter() - self.wall_started
+        cpu = time.process_time() - self.cpu_started
+        stages = {}
+        for name, walls in self.stage_wall.items():
+            ordered = sorted(walls)
+            stages[name] = {
+                'count': len(ordered),
+                'wall_total': sum(ordered),
+                'cpu_total': self.stage_cpu[name],
+                'p50': percentile(ordered, 0.50),
+                'p95': percentile(ordered, 0.95),
+                'p99': percentile(ordered, 0.99),
+            }
+        items = sorted(self.item_walls)
+        return {
+            'type': 'summary',
+            'items': self.done or len(items),
+            'wall': wall,
+            'cpu': cpu,
+            'items_per_sec': (self.done or len(items)) / wall if wall else 0.0,
+            'peak_rss_mb': peak_rss_mb(),
+            'item_p50': percentile(items, 0.50),
+            'item_p95': percentile(items, 0.95),
+            'item_p99': percentile(items, 0.99),
+            'stages': stages,
+        }
+
+    def print_summary(self, summary):
+        print()
+        print(f"Run report: {self.report_path}")
+        rss = summary['peak_rss_mb']
+        print(f"  Wall {summary['wall']:.1f}s, CPU {summary['cpu']:.1f}s, "
+              f"{summary['items_per_sec']:.1f} items/s"
+              + (f", peak RSS {rss:.0f} MB" if rss is not None else ''))
+        if summary['stages']:
+            print(f"  {'stage':<14}{'count':>8}{'total s':>10}{'cpu s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+            for name, s in sorted(summary['stages'].items(), key=lambda item: -item[1]['wall_total']):
+                print(f"  {name:<14}{s['count']:>8}{s['wall_total']:>10.2f}{s['cpu_total']:>10.2f}"
+                      f"{s['p50'] * 1000:>10.1f}{s['p95'] * 1000:>10.1f}{s['p99'] * 1000:>10.1f}")
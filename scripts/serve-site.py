@@ -0,0 +1,408 @@
+"""
+Static server for testing the gallery locally with production-like caching.
+
+`python -m http.server` sends no validators, no Cache-Control, no
+compression and no ranges, so load timings measured against it say little
+about the deployed site. This server:
+
+- serves a precompressed sibling (index.html.br, data/mindfolk-nfts.json.gz)
+  when the client accepts that encoding, with Vary: Accept-Encoding
+  (--precompress writes the .gz siblings, and .br ones when the brotli
+  module is installed, for text files that are missing or out of date)
+- sends a strong ETag per representation (a content hash, cached per file
+  size + mtime) and Last-Modified, and answers If-None-Match /
+  If-Modified-Since with 304
+- answers single byte ranges with 206 (If-Range aware), 416 when unsatisfiable
+- applies Cache-Control by path, first matching rule wins (CACHE_RULES;
+  add rules with --cache-rule 'img/thumbnails/*=public, max-age=86400')
+- logs every request (status, bytes sent, encoding, milliseconds) and prints
+  totals and latency percentiles on Ctrl+C; --log-jsonl keeps them per request
+
+One thread per connection with HTTP/1.1 keep-alive and a deep listen
+backlog, so a browser pulling thousands of 30x30 thumbnails at once is
+not refused or serialized.
+
+Usage:
+    python scripts/serve-site.py
+    python scripts/serve-site.py --port 8080 --precompress --quiet
+    python scripts/serve-site.py --cache-rule 'img/*=public, max-age=600' --log-jsonl run-reports/serve.jsonl
+"""
+
+import argparse
+import email.utils
+import fnmatch
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:  # Optional: only --precompress uses it, .gz siblings still work
+    brotli = None
+
+DEFAULT_PORT = 8000
+LISTEN_BACKLOG = 1024
+
+# Cache-Control by site path (fnmatch, '*' crosses '/'); first match wins
+CACHE_RULES = [
+    ('img/zoom/*', 'no-cache'),  # generate-zoom-tiles.py re-tiles in place when a source changes
+    ('img/*', 'public, max-age=86400'),
+    ('fonts/*', 'public, max-age=31536000, immutable'),
+    ('css/*', 'public, max-age=3600'),
+    ('js/*', 'public, max-age=3600'),
+    ('*', 'no-cache'),  # Catalog JSON and HTML: always revalidate (cheap 304 with the ETag)
+]
+
+# Precompressed siblings, in order of preference
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+COMPRESSIBLE = ('.html', '.js', '.css', '.json', '.svg', '.dzi', '.xml', '.txt', '.csv', '.md')
+MIN_COMPRESS_BYTES = 1024
+SKIP_DIRS = {'.git', 'node_modules', 'run-reports', 'bench-results', '__pycache__', 'scripts'}
+
+EXTRA_TYPES = {
+    '.json': 'application/json',
+    '.js': 'text/javascript',
+    '.dzi': 'application/xml',
+    '.webp': 'image/webp',
+    '.bin': 'application/octet-stream',
+    '.jsonl': 'application/x-ndjson',
+}
+
+RANGE_PATTERN = re.compile(r'bytes=(\d*)-(\d*)$')
+
+class ETagCache:
+    """Strong ETags from content hashes, recomputed only when size or mtime change"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tags = {}
+
+    def get(self, path, stat):
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self.tags.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        tag = f'"{digest.hexdigest()[:32]}"'
+        with self.lock:
+            self.tags[path] = (key, tag)
+        return tag
+
+class RequestLog:
+    """Per-request records, totals on shutdown"""
+
+    def __init__(self, quiet=False, jsonl_path=None):
+        self.quiet = quiet
+        self.lock = threading.Lock()
+        self.records = []
+        self.file = None
+        if jsonl_path:
+            os.makedirs(os.path.dirname(jsonl_path) or '.', exist_ok=True)
+            self.file = open(jsonl_path, 'a', encoding='utf-8')
+
+    def add(self, record):
+        with self.lock:
+            self.records.append(record)
+            if self.file:
+                self.file.write(json.dumps(record) + '\n')
+        if not self.quiet:
+            print(f"{record['status']} {record['method']:<4} {record['path']} "
+                  f"{record['bytes']:>9} B {record['encoding'] or '-':<4} {record['ms']:7.2f} ms")
+
+    def summary(self):
+        if self.file:
+            self.file.close()
+        records = self.records
+        if not records:
+            return
+        by_status = {}
+        for record in records:
+            by_status[record['status']] = by_status.get(record['status'], 0) + 1
+        times = sorted(record['ms'] for record in records)
+        sent = sum(record['bytes'] for record in records)
+        percentile = lambda p: times[min(len(times) - 1, int(p * len(times)))]
+        print(f"\n{'='*60}")
+        print(f"Requests: {len(records)} ({', '.join(f'{status}: {count}' for status, count in sorted(by_status.items()))})")
+        print(f"Bytes sent: {sent / 1e6:.2f} MB")
+        print(f"Compressed responses: {sum(1 for record in records if record['encoding'])}")
+        print(f"Latency ms: p50 {percentile(0.5):.2f}, p95 {percentile(0.95):.2f}, p99 {percentile(0.99):.2f}, max {times[-1]:.2f}")
+        print(f"{'='*60}")
+
+def parse_cache_rule(text):
+    pattern, separator, value = text.partition('=')
+    if not separator or not pattern.strip() or not value.strip():
+        raise argparse.ArgumentTypeError(f"expected PATTERN=CACHE-CONTROL, got {text!r}")
+    return pattern.strip(), value.strip()
+
+def cache_control_for(site_path, rules):
+    for pattern, value in rules:
+        if fnmatch.fnmatchcase(site_path, pattern):
+            return value
+    return None
+
+def content_type_for(path):
+    extension = os.path.splitext(path)[1].lower()
+    content_type = EXTRA_TYPES.get(extension) or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/json', 'application/xml'):
+        content_type += '; charset=utf-8'
+    return content_type
+
+def accepted_encodings(header):
+    """Encodings the client accepts (q=0 excluded)"""
+    accepted = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if name and not re.search(r'q=0(\.0*)?\s*$', params.strip()):
+            accepted.add(name.strip().lower())
+    return accepted
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single 'bytes=' range, None to ignore it, 'unsatisfiable' for 416"""
+    match = RANGE_PATTERN.match((header or '').strip())
+    if not match:
+        return None  # Malformed or multiple ranges: serve the whole file
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if not length:
+            return 'unsatisfiable'
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return 'unsatisfiable'
+    return start, end
+
+def precompress(root):
+    """Write missing or stale .gz (and .br with brotli) siblings for text files; returns the count"""
+    written = 0
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = [name for name in dirs if name not in SKIP_DIRS and not name.startswith('.')]
+        for name in files:
+            if not name.lower().endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            if stat.st_size < MIN_COMPRESS_BYTES:
+                continue
+            data = None
+            for encoding, suffix in ENCODINGS:
+                if encoding == 'br' and brotli is None:
+                    continue
+                target = path + suffix
+                if os.path.exists(target) and os.stat(target).st_mtime_ns >= stat.st_mtime_ns:
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                body = brotli.compress(data, quality=11) if encoding == 'br' else gzip.compress(data, 9, mtime=0)
+                tmp_path = f'{target}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, target)
+                written += 1
+    return written
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive: the browser reuses its few connections
+    server_version = 'MindfolkSite/1.0'
+
+    def log_message(self, format, *args):
+        pass  # RequestLog prints one line per request instead
+
+    def do_GET(self):
+        self.serve(send_body=True)
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def serve(self, send_body):
+        started = time.perf_counter()
+        self.sent_bytes = 0
+        self.encoding = None
+        status = self.respond(send_body)
+        self.server.request_log.add({
+            'method': self.command,
+            'path': self.path,
+            'status': int(status),
+            'bytes': self.sent_bytes,
+            'encoding': self.encoding,
+            'ms': round(1000 * (time.perf_counter() - started), 3),
+        })
+
+    def resolve(self):
+        """(filesystem path, site path) inside the root, or (None, site path)"""
+        site_path = unquote(urlsplit(self.path).path).lstrip('/')
+        root = self.server.root
+        path = os.path.realpath(os.path.join(root, site_path))
+        if path != root and not path.startswith(root + os.sep):
+            return None, site_path
+        if os.path.isdir(path):
+            site_path = site_path.rstrip('/') + '/index.html' if site_path else 'index.html'
+            path = os.path.join(path, 'index.html')
+        return (path if os.path.isfile(path) else None), site_path
+
+    def respond(self, send_body):
+        path, site_path = self.resolve()
+        if path is None:
+            return self.send_error_body(HTTPStatus.NOT_FOUND, send_body)
+
+        # Pick the representation: a precompressed sibling if the client takes it
+        served = path
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+        compressible = path.lower().endswith(COMPRESSIBLE)
+        if compressible:
+            source_mtime = os.stat(path).st_mtime_ns
+            for encoding, suffix in ENCODINGS:
+                candidate = path + suffix
+                if encoding in accepted and os.path.isfile(candidate) and os.stat(candidate).st_mtime_ns >= source_mtime:
+                    served, self.encoding = candidate, encoding
+                    break
+        stat = os.stat(served)
+        etag = self.server.etags.get(served, stat)
+        last_modified = email.utils.formatdate(os.stat(path).st_mtime, usegmt=True)
+
+        headers = {
+            'Content-Type': content_type_for(path),
+            'ETag': etag,
+            'Last-Modified': last_modified,
+            'Accept-Ranges': 'bytes',
+        }
+        cache_control = cache_control_for(site_path, self.server.cache_rules)
+        if cache_control:
+            headers['Cache-Control'] = cache_control
+        if compressible:
+            headers['Vary'] = 'Accept-Encoding'
+        if self.encoding:
+            headers['Content-Encoding'] = self.encoding
+
+        if self.not_modified(etag, os.stat(path).st_mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for name in ('ETag', 'Last-Modified', 'Cache-Control', 'Vary'):
+                if name in headers:
+                    self.send_header(name, headers[name])
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return HTTPStatus.NOT_MODIFIED
+
+        size = stat.st_size
+        start, end = 0, size - 1
+        status = HTTPStatus.OK
+        byte_range = None
+        if 'Range' in self.headers and self.if_range_matches(etag, last_modified):
+            byte_range = parse_range(self.headers['Range'], size)
+        if byte_range == 'unsatisfiable':
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        if byte_range:
+            start, end = byte_range
+            status = HTTPStatus.PARTIAL_CONTENT
+            headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+        length = max(0, end - start + 1)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(length))
+        self.end_headers()
+        if send_body and length:
+            with open(served, 'rb') as f:
+                self.sent_bytes = self.connection.sendfile(f, start, length)
+        return status
+
+    def not_modified(self, etag, mtime):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def if_range_matches(self, etag, last_modified):
+        if_range = self.headers.get('If-Range')
+        return if_range is None or if_range.strip() in (etag, last_modified)
+
+    def send_error_body(self, status, send_body):
+        body = f'{status.value} {status.phrase}\n'.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+            self.sent_bytes = len(body)
+        return status
+
+def stop(signum, frame):
+    raise KeyboardInterrupt  # SIGTERM: stop like Ctrl+C, with the summary
+
+class SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+    def __init__(self, address, root, cache_rules, request_log):
+        self.root = os.path.realpath(root)
+        self.cache_rules = cache_rules
+        self.request_log = request_log
+        self.etags = ETagCache()
+        super().__init__(address, SiteHandler)
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the site with ETags, precompressed files, ranges and cache rules')
+    parser.add_argument('--root', default='.', help='site root (default: current directory)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-rule', type=parse_cache_rule, action='append', default=[], metavar='PATTERN=VALUE',
+                        help='Cache-Control for matching paths, checked before the built-in rules')
+    parser.add_argument('--precompress', action='store_true',
+                        help='write missing/stale .gz (and .br with brotli) siblings of text files first')
+    parser.add_argument('--quiet', action='store_true', help='no line per request, only the summary')
+    parser.add_argument('--log-jsonl', help='append every request as a JSON line to this file')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f"ERROR: Site root not found: {args.root}")
+        sys.exit(1)
+    if args.precompress:
+        written = precompress(args.root)
+        print(f"Precompressed: {written} files written{'' if brotli else ' (gzip only: pip install brotli for .br)'}")
+
+    request_log = RequestLog(quiet=args.quiet, jsonl_path=args.log_jsonl)
+    server = SiteServer((args.host, args.port), args.root, args.cache_rule + CACHE_RULES, request_log)
+    signal.signal(signal.SIGTERM, stop)
+    print(f"Serving {os.path.realpath(args.root)} at http://{args.host}:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        request_log.summary()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Watch source image folders and report changed files in debounced batches.
+
+Uses watchdog (inotify on Linux, ReadDirectoryChangesW on Windows) when it
+is installed, otherwise falls back to polling directory listings.
+
+Requirements (optional):
+    pip install watchdog
+
+Usage:
+    from source_watcher import watch_folders
+
+    watch_folders([IMAGE_DIR, ELDERS_DIR], on_change)  # blocks until Ctrl+C
+"""
+import os
+import threading
+import time
+from pathlib import Path
+
+DEBOUNCE_SECONDS = 0.3  # Wait this long after the last event before firing
+POLL_INTERVAL = 0.5     # Seconds between listings in polling mode
+
+def snapshot(folders, extensions):
+    """Map path -> (mtime_ns, size) for matching files directly in folders"""
+    state = {}
+    for folder in folders:
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if Path(entry.name).suffix.lower() not in extensions:
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    if entry.is_file():
+                        state[Path(folder) / entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            continue
+    return state
+
+class Debouncer:
+    """Collect paths and call on_change(set_of_paths) once events go quiet.
+
+    Batches never overlap: a batch that becomes due while on_change is still
+    running waits, then takes every path queued in the meantime.
+    """
+
+    def __init__(self, on_change, delay=DEBOUNCE_SECONDS):
+        self.on_change = on_change
+        self.delay = delay
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.running = threading.Lock()  # Held while on_change runs
+        self.timer = None
+
+    def add(self, path):
+        with self.lock:
+            self.pending.add(Path(path))
+            if self.timer:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        with self.running:
+            with self.lock:
+                paths, self.pending = self.pending, set()
+                self.timer = None
+            if paths:
+                try:
+                    self.on_change(paths)
+                except Exception as e:
+                    print(f"  [ERROR] Change handler failed: {e}")
+
+def _watch_with_watchdog(folders, debouncer, extensions):
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+                if path and Path(path).suffix.lower() in extensions:
+                    debouncer.add(path)
+
+    observer = Observer()
+    for folder in folders:
+        if os.path.isdir(folder):
+            observer.schedule(Handler(), str(folder), recursive=False)
+    observer.start()
+    try:
+        while observer.is_alive():
+            observer.join(1)
+    finally:
+        observer.stop()
+        observer.join()
+
+def _watch_with_polling(folders, debouncer, extensions, interval):
+    previous = snapshot(folders, extensions)
+    while True:
+        time.sleep(interval)
+        current = snapshot(folders, extensions)
+        for path, state in current.items():
+            if previous.get(path) != state:
+                debouncer.add(path)
+        for path in previous.keys() - current.keys():
+            debouncer.add(path)
+        previous = current
+
+def watch_folders(folders, on_change, extensions=('.png', '.jpg', '.jpeg', '.webp', '.gif'),
+                  delay=DEBOUNCE_SECONDS, poll_interval=POLL_INTERVAL, use_polling=False):
+    """Block and call on_change(paths) for each debounced batch of changes.
+
+    Deleted files are reported too; callers can check path.exists().
+    """
+    extensions = {ext.lower() for ext in extensions}
+    debouncer = Debouncer(on_change, delay)
+    if not use_polling:
+        try:
+            import watchdog  # noqa: F401
+        except ImportError:
+            use_polling = True
+    try:
+        if use_polling:
+            print(f"Watching {len(folders)} folders (polling every {poll_interval}s)...")
+            _watch_with_polling(folders, debouncer, extensions, poll_interval)
+        else:
+            print(f"Watching {len(folders)} folders (native file events)...")
+            _watch_with_watchdog(folders, debouncer, extensions)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
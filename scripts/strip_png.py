@@ -0,0 +1,88 @@
+"""Write a PNG one horizontal strip at a time.
+
+Pillow needs the whole image in memory to save it; for a full-collection
+mosaic (10k tiles at 190 px is ~3.4 GB of RGB) that does not fit. This
+writer emits the IHDR, then compresses each strip of rows straight into
+IDAT chunks, so memory stays at one strip plus the zlib window.
+
+Rows use the PNG "Sub" filter (difference to the pixel on the left),
+computed with NumPy, which compresses photos noticeably better than no
+filter at almost no cost.
+
+Requirements:
+    pip install numpy
+
+Usage:
+    from strip_png import StripPNGWriter
+
+    with StripPNGWriter('mosaic.png', width, height) as png:
+        for strip in strips:          # uint8 arrays of shape (rows, width, 3)
+            png.write(strip)
+"""
+import struct
+import zlib
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+COLOR_TYPE_RGB = 2
+FILTER_SUB = 1
+COMPRESS_LEVEL = 6
+CHUNK_BYTES = 1 << 20  # Flush compressed data as IDAT chunks of about this size
+
+class StripPNGWriter:
+    def __init__(self, path, width, height, compress_level=COMPRESS_LEVEL):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.compressor = zlib.compressobj(compress_level)
+        self.pending = bytearray()
+        self.file = open(path, 'wb')
+        self.file.write(PNG_SIGNATURE)
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, COLOR_TYPE_RGB, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+        return False
+
+    def _chunk(self, kind, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(kind)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+    def write(self, rows):
+        """Append rows, a uint8 array of shape (n, width, 3)"""
+        rows = np.ascontiguousarray(rows, dtype=np.uint8)
+        if rows.ndim != 3 or rows.shape[1:] != (self.width, 3):
+            raise ValueError(f"expected rows of shape (n, {self.width}, 3), got {rows.shape}")
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError(f"more than {self.height} rows written")
+        flat = rows.reshape(len(rows), -1)
+        filtered = np.empty((len(rows), flat.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = FILTER_SUB
+        filtered[:, 1:4] = flat[:, :3]
+        np.subtract(flat[:, 3:], flat[:, :-3], out=filtered[:, 4:])  # uint8 wraps mod 256, as PNG expects
+        self.pending += self.compressor.compress(filtered.tobytes())
+        if len(self.pending) >= CHUNK_BYTES:
+            self._chunk(b'IDAT', bytes(self.pending))
+            self.pending.clear()
+        self.rows_written += len(rows)
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.rows_written != self.height:
+            self.file.close()
+            raise ValueError(f"{self.rows_written} of {self.height} rows written")
+        self.pending += self.compressor.flush()
+        self._chunk(b'IDAT', bytes(self.pending))
+        self._chunk(b'IEND', b'')
+        self.file.close()
@@ -0,0 +1,122 @@
+"""Deterministic synthetic Mindfolk collection for benchmarks and dry runs.
+
+Writes a fake "Mindfolk Images" tree (Founder masters in the root, Elders and
+Mushrooms subfolders) plus a catalog JSON shaped like data/mindfolk-nfts.json.
+The same seed always produces the same names, mints and pixels.
+
+Requirements:
+    pip install Pillow
+
+Usage:
+    from synthetic_corpus import build_corpus
+
+    corpus = build_corpus(tmp_dir, founders=9000, mushrooms=912, elders=40)
+"""
+import json
+import os
+import random
+from collections import namedtuple
+from pathlib import Path
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+ELDER_WORDS = ['Ace', 'Pilot', 'Adam', 'Sleeper', 'Astor', 'City', 'Aurora', 'Sunrise',
+               'Azure', 'Maritime', 'Bloom', 'Flower', 'Bounty', 'Fisher', 'Cedar', 'Stump',
+               'Cosmo', 'Universe', 'Dune', 'Desert', 'Falcon', 'Town', 'Moon', 'Night',
+               'Willow', 'Bark', 'Tempest', 'Storm', 'Wisp', 'Mutant', 'Ragnar', 'Viking']
+
+Corpus = namedtuple('Corpus', ['image_dir', 'catalog_path', 'nfts', 'image_files'])
+
+def base58_mint(rng):
+    """Random 32-byte value encoded as a Solana-style base58 mint address"""
+    value = int.from_bytes(bytes(rng.getrandbits(8) for _ in range(32)), 'big')
+    encoded = ''
+    while value:
+        value, remainder = divmod(value, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    return encoded.rjust(44, '1')[:44]
+
+def draw_master(rng, size):
+    """Draw a character-like master: transparent background, layered shapes"""
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for _ in range(rng.randint(6, 14)):
+        x0, y0 = rng.randint(0, size // 2), rng.randint(0, size // 2)
+        x1, y1 = x0 + rng.randint(size // 8, size // 2), y0 + rng.randint(size // 8, size // 2)
+        colour = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255), 255)
+        if rng.random() < 0.5:
+            draw.ellipse((x0, y0, x1, y1), fill=colour)
+        else:
+            draw.rectangle((x0, y0, x1, y1), fill=colour)
+    # Fine noise so PNG/JPEG sizes are closer to real art than flat shapes
+    noise = Image.effect_noise((size, size), rng.randint(20, 40))
+    textured = Image.blend(img.convert('RGB'), Image.merge('RGB', [noise] * 3), 0.15)
+    textured.putalpha(img.getchannel('A'))
+    return textured
+
+def write_gif(rng, path, size, frames):
+    """Write a small looping animation (Founder/Elder GIFs)"""
+    base = draw_master(rng, size).convert('RGB')
+    sequence = [base.rotate(rng.randint(-8, 8)) for _ in range(frames)]
+    sequence[0].save(path, save_all=True, append_images=sequence[1:], duration=80, loop=0)
+
+def build_corpus(root, founders=9000, mushrooms=912, elders=40, image_size=1024,
+                 rendered=200, gifs=10, seed=1234):
+    """Create the synthetic tree under root and return a Corpus.
+
+    Every NFT gets a source file so indexing and matching see the full
+    collection; only `rendered` files spread evenly over the collection carry
+    real pixels, the rest are empty placeholders to keep setup fast.
+    """
+    rng = random.Random(seed)
+    image_dir = Path(root) / 'Mindfolk Images'
+    (image_dir / 'Elders').mkdir(parents=True, exist_ok=True)
+    (image_dir / 'Mushrooms').mkdir(parents=True, exist_ok=True)
+
+    entries = []  # (nft record, source path)
+    for number in range(1, founders + 1):
+        entries.append(({'Name': f'Mindfolk Founder #{number}', 'Type': 'Founder'},
+                        image_dir / f'Mindfolk_Founder_{number:04d}.png'))
+    for number in range(1, mushrooms + 1):
+        entries.append(({'Name': f'Mindfolk Elder #{number}', 'Type': 'Mushroom Head'},
+                        image_dir / 'Mushrooms' / f'Mindfolk_Mushroom_{number:04d}.png'))
+    used_names = set()
+    while len(used_names) < elders:
+        used_names.add(f"{rng.choice(ELDER_WORDS)} {rng.choice(ELDER_WORDS)} Elder")
+    for name in sorted(used_names):
+        entries.append(({'Name': name, 'Type': 'Elder'}, image_dir / 'Elders' / f'{name}.png'))
+
+    # Spread the real masters over all types: every k-th entry gets pixels
+    step = max(1, len(entries) // max(rendered, 1))
+    rendered_ids = set(range(0, len(entries), step)[:rendered])
+
+    nfts = []
+    image_files = []
+    for i, (nft, path) in enumerate(entries):
+        nft['mintAddress'] = base58_mint(rng)
+        nft['URL'] = f"https://arweave.net/{nft['mintAddress'][:43]}"
+        nfts.append(nft)
+        if i in rendered_ids:
+            draw_master(rng, image_size).save(path, 'PNG')
+            image_files.append(path)
+        else:
+            path.touch()
+
+    for i in range(gifs):
+        _, path = entries[(i * step) % len(entries)]
+        write_gif(rng, path.with_suffix('.gif'), image_size // 2, frames=12)
+
+    rng.shuffle(nfts)  # Catalog order does not follow filename order in practice
+    catalog_path = Path(root) / 'mindfolk-nfts.json'
+    with open(catalog_path, 'w', encoding='utf-8') as f:
+        json.dump(nfts, f, indent=2, ensure_ascii=False)
+
+    return Corpus(image_dir, catalog_path, nfts, image_files)
+
+def corpus_size(corpus):
+    """Total bytes of source images in the corpus"""
+    total = 0
+    for dirpath, _, filenames in os.walk(corpus.image_dir):
+        total += sum(os.path.getsize(os.path.join(dirpath, name)) for name in filenames)
+    return total
@@ -1,7 +1,9 @@
 from pathlib import Path
 import re
 
-img_dir = Path(r'E:\Tralha\Stuff\crypto design\MY MINDFOLK\Mindfolk Images')
+from mindfolk_config import CONFIG
+
+img_dir = Path(CONFIG.image_dir)
 files = [f for f in img_dir.iterdir() if f.is_file() and 'Founder' in f.name and f.suffix.lower() == '.png']
 
 print(f'Founder files found: {len(files)}')
@@ -0,0 +1,174 @@
+"""Deep Zoom (DZI) tile pyramid written from a stream of row strips.
+
+Rows of the full-resolution image are pushed top to bottom. Each level cuts
+256 px tiles as soon as it has a full band of rows, and hands every pair of
+rows, box-downsampled 2x2, to the level above it. So every level is built
+from the one below it in a single pass, and memory stays at about one tile
+band per level, however large the image is.
+
+Layout follows the Deep Zoom convention that OpenSeadragon and similar
+viewers read: <base>.dzi plus <base>_files/<level>/<col>_<row>.<format>,
+where the highest level is the full resolution and level 0 is 1x1.
+
+Requirements:
+    pip install Pillow numpy
+
+Usage:
+    from tile_pyramid import StreamingPyramid
+
+    with StreamingPyramid('img/mosaic/mosaic', width, height) as pyramid:
+        for strip in strips:          # uint8 arrays of shape (rows, width, 3)
+            pyramid.push(strip)
+"""
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+TILE_SIZE = 256
+TILE_FORMAT = 'jpg'
+QUALITY = 85
+ENCODE_WORKERS = min(8, os.cpu_count() or 4)
+MAX_PENDING_TILES = 256  # Tiles queued for encoding before push() waits
+
+PIL_FORMATS = {'jpg': 'JPEG', 'webp': 'WEBP', 'png': 'PNG'}
+
+DZI_TEMPLATE = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" TileSize="{tile_size}" '
+                'Overlap="0" Format="{format}">\n'
+                '  <Size Width="{width}" Height="{height}"/>\n'
+                '</Image>\n')
+
+def level_count(width, height):
+    """Number of DZI levels for an image (down to 1x1)"""
+    return math.ceil(math.log2(max(width, height, 1))) + 1
+
+def downsample(rows):
+    """2x2 box filter of an even number of rows; odd widths repeat the last column"""
+    if rows.shape[1] % 2:
+        rows = np.concatenate([rows, rows[:, -1:]], axis=1)
+    summed = rows[0::2].astype(np.uint16) + rows[1::2]
+    summed = summed[:, 0::2] + summed[:, 1::2]
+    return ((summed + 2) >> 2).astype(np.uint8)
+
+class _Level:
+    def __init__(self, pyramid, level, width, height, parent):
+        self.pyramid = pyramid
+        self.level = level
+        self.width = width
+        self.height = height
+        self.parent = parent
+        self.band = []
+        self.band_rows = 0
+        self.tile_row = 0
+        self.carry = None  # Unpaired last row, waiting for its partner before downsampling
+        os.makedirs(os.path.join(pyramid.files_dir, str(level)), exist_ok=True)
+
+    def push(self, rows):
+        if not len(rows):
+            return
+        tile_size = self.pyramid.tile_size
+        self.band.append(rows)
+        self.band_rows += len(rows)
+        if self.band_rows >= tile_size:
+            band = np.concatenate(self.band)
+            while len(band) >= tile_size:
+                self._emit(band[:tile_size])
+                band = band[tile_size:]
+            self.band = [band] if len(band) else []
+            self.band_rows = len(band)
+
+        if self.parent:
+            if self.carry is not None:
+                rows = np.concatenate([self.carry, rows])
+                self.carry = None
+            if len(rows) % 2:
+                self.carry = rows[-1:]
+                rows = rows[:-1]
+            if len(rows):
+                self.parent.push(downsample(rows))
+
+    def finish(self):
+        if self.band_rows:
+            self._emit(np.concatenate(self.band))
+            self.band = []
+            self.band_rows = 0
+        if self.parent:
+            if self.carry is not None:
+                self.parent.push(downsample(np.concatenate([self.carry, self.carry])))
+                self.carry = None
+            self.parent.finish()
+
+    def _emit(self, band):
+        tile_size = self.pyramid.tile_size
+        for col, x in enumerate(range(0, self.width, tile_size)):
+            path = os.path.join(self.pyramid.files_dir, str(self.level),
+                                f'{col}_{self.tile_row}.{self.pyramid.tile_format}')
+            self.pyramid.save_tile(np.ascontiguousarray(band[:, x:x + tile_size]), path)
+        self.tile_row += 1
+
+class StreamingPyramid:
+    """Build a DZI pyramid while the full-resolution rows stream through"""
+
+    def __init__(self, base_path, width, height, tile_size=TILE_SIZE, tile_format=TILE_FORMAT,
+                 quality=QUALITY, workers=ENCODE_WORKERS):
+        if tile_format not in PIL_FORMATS:
+            raise ValueError(f"tile format must be one of {sorted(PIL_FORMATS)}")
+        self.base_path = base_path
+        self.files_dir = f'{base_path}_files'
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.tile_format = tile_format
+        self.quality = quality
+        self.levels = level_count(width, height)
+        self.tiles_written = 0
+        self.executor = ThreadPoolExecutor(max_workers=workers)  # Pillow releases the GIL while encoding
+        self.pending = deque()
+
+        parent = None
+        sizes = []
+        level_width, level_height = width, height
+        for level in range(self.levels - 1, -1, -1):
+            sizes.append((level, level_width, level_height))
+            level_width, level_height = (level_width + 1) // 2, (level_height + 1) // 2
+        for level, level_width, level_height in reversed(sizes):
+            parent = _Level(self, level, level_width, level_height, parent)
+        self.top = parent
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        return False
+
+    def push(self, rows):
+        """Append full-resolution rows, a uint8 array of shape (n, width, 3)"""
+        self.top.push(rows)
+
+    def save_tile(self, tile, path):
+        while len(self.pending) >= MAX_PENDING_TILES:
+            self.pending.popleft().result()
+        self.pending.append(self.executor.submit(self._encode, tile, path))
+        self.tiles_written += 1
+
+    def _encode(self, tile, path):
+        options = {'quality': self.quality} if self.tile_format != 'png' else {}
+        Image.fromarray(tile).save(path, PIL_FORMATS[self.tile_format], **options)
+
+    def close(self):
+        """Flush partial bands, wait for the encoders and write the .dzi descriptor"""
+        self.top.finish()
+        while self.pending:
+            self.pending.popleft().result()
+        self.executor.shutdown(wait=True)
+        with open(f'{self.base_path}.dzi', 'w', encoding='utf-8') as f:
+            f.write(DZI_TEMPLATE.format(tile_size=self.tile_size, format=self.tile_format,
+                                        width=self.width, height=self.height))
@@ -0,0 +1,144 @@
+// Service worker: serves the files listed in data/precache-manifest.json
+// (built by scripts/build-precache-manifest.py) from Cache Storage.
+//
+// Entries are cached under url + revision, so a rebuild only downloads the
+// entries whose content changed. The "core" tier is cached on install; the
+// "background" tier (the rest of the thumbnails) when the page asks for it
+// after it has loaded. Anything not in the manifest goes to the network.
+
+// Rewritten by build-precache-manifest.py; a new value makes browsers install the new build
+const PRECACHE_VERSION = 'dev';
+const CACHE_NAME = 'mindfolk-precache';
+const MANIFEST_URL = 'data/precache-manifest.json';
+const MANIFEST_KEY = '__precache-manifest';
+const FETCH_CONCURRENCY = 6;
+
+let lookupPromise = null;
+
+/**
+ * Cache key of a manifest entry
+ * @param {Object} entry - Manifest entry ({url, revision})
+ * @returns {string} - Absolute URL with the revision appended
+ */
+function cacheKey(entry) {
+  const url = new URL(entry.url, self.registration.scope);
+  url.searchParams.set('__rev', entry.revision);
+  return url.href;
+}
+
+/**
+ * Map absolute URL -> manifest entry, from the manifest stored with the cache
+ * @returns {Promise<Map>}
+ */
+function manifestLookup() {
+  if (!lookupPromise) {
+    lookupPromise = caches.open(CACHE_NAME)
+      .then(cache => cache.match(MANIFEST_KEY))
+      .then(response => response ? response.json() : { entries: [] })
+      .then(manifest => new Map(manifest.entries.map(entry => [new URL(entry.url, self.registration.scope).href, entry])))
+      .catch(() => new Map());
+  }
+  return lookupPromise;
+}
+
+/**
+ * Cache every entry of a tier that isn't cached at its current revision yet
+ * @param {Object} manifest - The precache manifest
+ * @param {string} tier - 'core' or 'background'
+ * @returns {Promise<number>} - Number of entries downloaded
+ */
+async function precacheTier(manifest, tier) {
+  const cache = await caches.open(CACHE_NAME);
+  const pending = [];
+  for (const entry of manifest.entries) {
+    if (entry.tier === tier && !(await cache.match(cacheKey(entry)))) {
+      pending.push(entry);
+    }
+  }
+  let downloaded = 0;
+  const worker = async () => {
+    while (pending.length) {
+      const entry = pending.shift();
+      try {
+        // The integrity check rejects a file that changed on the server after the manifest was built
+        const response = await fetch(entry.url, { cache: 'no-cache', integrity: entry.integrity });
+        if (response.ok) {
+          await cache.put(cacheKey(entry), response);
+          downloaded++;
+        }
+      } catch (error) {
+        console.warn(`Precache skipped ${entry.url}:`, error);
+      }
+    }
+  };
+  await Promise.all(Array.from({ length: FETCH_CONCURRENCY }, worker));
+  return downloaded;
+}
+
+self.addEventListener('install', event => {
+  event.waitUntil((async () => {
+    const response = await fetch(MANIFEST_URL, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`No precache manifest (${response.status})`);
+    const manifest = await response.clone().json();
+    const downloaded = await precacheTier(manifest, 'core');
+    // Stored under a staging key; the active worker keeps using the old manifest until this one activates
+    const cache = await caches.open(CACHE_NAME);
+    await cache.put(`${MANIFEST_KEY}-${PRECACHE_VERSION}`, response);
+    console.log(`✓ Precached ${downloaded} core files (build ${PRECACHE_VERSION})`);
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil((async () => {
+    const cache = await caches.open(CACHE_NAME);
+    const staged = await cache.match(`${MANIFEST_KEY}-${PRECACHE_VERSION}`);
+    if (staged) {
+      await cache.put(MANIFEST_KEY, staged.clone());
+      lookupPromise = null;
+      const manifest = await staged.json();
+      // Drop entries of earlier builds: anything not at a revision of this manifest
+      const current = new Set(manifest.entries.map(cacheKey));
+      current.add(new URL(MANIFEST_KEY, self.registration.scope).href);
+      await Promise.all((await cache.keys())
+        .filter(request => !current.has(request.url))
+        .map(request => cache.delete(request)));
+    }
+    await self.clients.claim();
+  })());
+});
+
+self.addEventListener('message', event => {
+  if (!event.data || event.data.type !== 'precache-background') return;
+  event.waitUntil((async () => {
+    const cache = await caches.open(CACHE_NAME);
+    const response = await cache.match(MANIFEST_KEY);
+    if (!response) return;
+    const downloaded = await precacheTier(await response.json(), 'background');
+    if (downloaded) {
+      console.log(`✓ Precached ${downloaded} background files`);
+    }
+  })());
+});
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+  url.search = '';
+  url.hash = '';
+
+  event.respondWith((async () => {
+    const entry = (await manifestLookup()).get(url.href);
+    if (!entry) return fetch(request);
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(cacheKey(entry));
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (response.ok && response.status === 200) {
+      cache.put(cacheKey(entry), response.clone()).catch(() => {});
+    }
+    return response;
+  })());
+});
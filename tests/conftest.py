@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+
+# The scripts import their shared modules as top-level names (they are run as scripts/<name>.py)
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+@pytest.fixture
+def load_script():
+    """Import a hyphenated script from scripts/ as a module"""
+    from mindfolk_scripts import load_script
+    return load_script
+
+@pytest.fixture
+def report(tmp_path):
+    from run_report import RunReport
+    with RunReport('test', report_path=str(tmp_path / 'report.jsonl')) as report:
+        yield report
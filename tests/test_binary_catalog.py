@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from binary_catalog import Catalog, open_catalog, write_catalog
+
+RECORDS = [
+    {'mintAddress': 'Mint3', 'Name': 'Mindfolk Founder #8', 'Type': 'Founder',
+     'thumbnailURLs': {'190x190': 'img/thumbnails/190x190/Mindfolk Founder _8.jpg'}},
+    {'mintAddress': 'Mint1', 'Name': 'Ace Pilot Elder', 'Type': 'Elder', 'rank': 12},
+    {'mintAddress': 'Mint2', 'Name': 'Émile Elder', 'Type': 'Elder', 'URL': None, 'class': 'keyword field'},
+]
+
+@pytest.fixture
+def catalog(tmp_path):
+    write_catalog(RECORDS, str(tmp_path / 'catalog.bin'))
+    with Catalog(str(tmp_path / 'catalog.bin')) as catalog:
+        yield catalog
+
+def test_records_round_trip(catalog):
+    assert len(catalog) == len(RECORDS)
+    assert [record.to_dict() for record in catalog] == RECORDS
+    assert catalog[-1]['class'] == 'keyword field'
+
+def test_missing_and_null_fields_differ(catalog):
+    record = catalog[2]
+    assert 'URL' in record and record['URL'] is None
+    assert 'rank' not in record and record.get('rank', 'absent') == 'absent'
+    with pytest.raises(KeyError):
+        catalog[0]['URL']
+    assert catalog[0].URL is None
+
+@pytest.mark.parametrize('record', RECORDS)
+def test_indexed_lookups(catalog, record):
+    assert catalog.get(f" {record['mintAddress']} ").Name == record['Name']
+    assert catalog.lookup('Name', record['Name']).mintAddress == record['mintAddress']
+
+def test_lookup_misses(catalog):
+    assert catalog.get('Mint0') is None
+    assert catalog.get('Mint4') is None
+    assert catalog.lookup('Name', 'Nobody') is None
+    assert catalog.lookup('Type', 'Elder').Name == 'Ace Pilot Elder'  # Unindexed: first in order
+    assert catalog.lookup('Unknown', 'x') is None
+
+def test_column_stream(catalog):
+    assert list(catalog.values('rank', 0)) == [0, 12, 0]
+    assert list(catalog.values('Unknown')) == [None] * 3
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = tmp_path / 'catalog.bin'
+    write_catalog(RECORDS, str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        Catalog(str(path))
+
+def test_open_catalog_prefers_a_fresh_binary(tmp_path):
+    json_path, bin_path = tmp_path / 'catalog.json', tmp_path / 'catalog.bin'
+    json_path.write_text(json.dumps(RECORDS))
+    assert open_catalog(str(json_path), str(bin_path)) == RECORDS
+    write_catalog(RECORDS, str(bin_path))
+    catalog = open_catalog(str(json_path), str(bin_path))
+    assert isinstance(catalog, Catalog)
+    catalog.close()
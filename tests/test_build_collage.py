@@ -0,0 +1,30 @@
+import pytest
+
+@pytest.fixture
+def collage(load_script):
+    return load_script('build-collage.py')
+
+def test_type_order_puts_mushroom_heads_before_founders(collage):
+    tiles = [{'name': name, 'type': nft_type} for name, nft_type in (
+        ('Mindfolk Founder #2', 'Founder'), ('Mindfolk Elder #7', 'Mushroom Head'),
+        ('Ace Pilot Elder', 'Elder'), ('Mindfolk Founder #1', 'Founder'))]
+    ordered = [tile['name'] for tile in sorted(tiles, key=collage.type_sort_key)]
+    assert ordered == ['Ace Pilot Elder', 'Mindfolk Elder #7', 'Mindfolk Founder #1', 'Mindfolk Founder #2']
+
+@pytest.mark.parametrize('name, nft_type', [
+    ('Mindfolk Founder #8', 'Founder'),
+    ('Mindfolk_Founder_0008', 'Founder'),
+    ('Mindfolk Elder #12', 'Mushroom Head'),  # Mushroom Heads carry the old "Elder #N" names
+    ('Mushroom 3', 'Mushroom Head'),
+    ('Ace Pilot Elder', 'Elder'),
+    ('Untitled', ''),
+])
+def test_infer_type(collage, name, nft_type):
+    assert collage.infer_type(name) == nft_type
+
+def test_type_filter_uses_the_catalog_type(collage, tmp_path):
+    catalog = tmp_path / 'catalog.json'
+    catalog.write_text('[{"Name": "Mindfolk Elder #12", "Type": "Mushroom Head", "thumbnailURLs": {"190x190": "a.jpg"}},'
+                       ' {"Name": "Ace Pilot Elder", "Type": "Elder", "thumbnailURLs": {"190x190": "b.jpg"}}]')
+    tiles = collage.collect_tiles('190x190', str(catalog), type_filter='mushroom head')
+    assert [tile['name'] for tile in tiles] == ['Mindfolk Elder #12']
@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import json
+
+import pytest
+
+from mock_services import start_server
+
+DOCUMENTS = {f'image{i}': {'id': i} for i in range(12)}
+
+@pytest.fixture
+def checker(load_script, monkeypatch):
+    module = load_script('check_links.py')
+    monkeypatch.setattr(module, 'BACKOFF_SECONDS', 0.01)
+    return module
+
+def check(checker, report, urls, **server_options):
+    server, base = start_server(documents=DOCUMENTS, **server_options)
+    cache = {}
+    try:
+        asyncio.run(checker.check_all([base + url for url in urls], cache, report, {}))
+    finally:
+        server.shutdown()
+    return server, {url[len(base):]: result for url, result in cache.items()}
+
+def test_head_refused_falls_back_to_ranged_get(checker, report):
+    server, results = check(checker, report, ['image1', 'missing'], reject_head=True)
+    assert results['image1'] == {**results['image1'], 'ok': True, 'status': 206, 'method': 'GET'}
+    assert results['missing'] == {**results['missing'], 'ok': False, 'status': 404, 'method': 'GET'}
+
+def test_transient_errors_are_retried(checker, report):
+    server, results = check(checker, report, list(DOCUMENTS), fail_every=3)
+    assert server.failed
+    assert all(result['ok'] and result['method'] == 'HEAD' for result in results.values())
+
+def test_fresh_results_are_not_checked_again(checker, report, tmp_path):
+    server, base = start_server(documents=DOCUMENTS)
+    catalog = tmp_path / 'catalog.json'
+    catalog.write_text(json.dumps([{'mintAddress': f'Mint{i}', 'Name': f'Mindfolk Founder #{i}',
+                                    'URL': f'{base}image{i}'} for i in range(3)]
+                                  + [{'mintAddress': 'Mint9', 'Name': 'Broken', 'URL': f'{base}gone'}]))
+    args = argparse.Namespace(catalog=str(catalog), popup=str(tmp_path / 'none.json'),
+                              mint_metadata=str(tmp_path / 'none.json'), cache=str(tmp_path / 'cache.json'),
+                              output=str(tmp_path / 'report.json'), ttl_hours=24, host_limit={})
+    try:
+        assert not checker.run(report, args)  # The broken link fails the run
+        first = server.request_count
+        assert not checker.run(report, args)
+        second = server.request_count - first
+    finally:
+        server.shutdown()
+    assert first == 4
+    assert second == 1  # Only the broken link is re-checked
+    broken = json.loads((tmp_path / 'report.json').read_text())
+    assert [entry['mintAddress'] for entry in broken] == ['Mint9']
@@ -0,0 +1,31 @@
+import pytest
+
+from mock_services import das_asset, start_server
+
+@pytest.fixture
+def snapshot(load_script, monkeypatch):
+    module = load_script('build-collection-snapshot.py')
+    monkeypatch.setattr(module, 'BACKOFF_SECONDS', 0.01)
+    return module
+
+def assets(count):
+    return [das_asset({'mintAddress': f'Mint{i:04d}', 'Name': f'Mindfolk Founder #{i}', 'Type': 'Founder',
+                       'URL': f'https://arweave.net/image{i}'}) for i in range(count)]
+
+def test_failed_pages_are_retried(snapshot, report):
+    server, url = start_server(assets(35), fail_every=2)
+    try:
+        items = snapshot.fetch_all_pages(url, 'collection', concurrency=3, limit=10, report=report)
+    finally:
+        server.shutdown()
+    assert [item['id'] for item in items] == [f'Mint{i:04d}' for i in range(35)]
+    assert {'page-2', 'page-4'} <= server.failed
+
+def test_report_total_is_the_asset_count(snapshot, report):
+    server, url = start_server(assets(35))
+    try:
+        report.total = 20  # Estimate from a previous snapshot
+        snapshot.fetch_all_pages(url, 'collection', concurrency=2, limit=10, report=report)
+    finally:
+        server.shutdown()
+    assert report.total == report.done == 35
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageCms, ImageDraw
+
+import compositing
+from compositing import Composite
+
+# Lanczos rings differently before and after flattening; edge pixels may differ by this much,
+# far below the 255 an overflowing uint8 add produces
+EDGE_TOLERANCE = 40
+
+def shape():
+    """Anti-aliased opaque and half-transparent shapes on a transparent canvas"""
+    img = Image.new('RGBA', (1000, 1000), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((100, 100, 900, 900), fill=(20, 30, 200, 255))
+    draw.rectangle((300, 450, 700, 550), fill=(250, 250, 250, 128))
+    return img
+
+@pytest.mark.parametrize('size', [190, 380, 760])
+@pytest.mark.parametrize('background', [(255, 255, 255), (0, 0, 0)])
+def test_fit_then_flatten_matches_flatten_then_resize(size, background):
+    img = shape()
+    fitted = np.asarray(Composite(img).fit_square((size, size)).flatten(background)).astype(int)
+    reference = Composite(img).flatten(background).resize((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    difference = np.abs(fitted - np.asarray(reference).astype(int))
+    assert difference.max() <= EDGE_TOLERANCE
+    assert difference.mean() < 1
+
+@pytest.mark.parametrize('background', [(255, 255, 255), (0, 0, 0), (30, 40, 50)])
+def test_flatten_matches_paste(background):
+    img = shape()
+    reference = Image.new('RGB', img.size, background)
+    reference.paste(img, mask=img.split()[-1])
+    assert np.array_equal(np.asarray(Composite(img).flatten(background)), np.asarray(reference))
+
+def test_flatten_clamps_colour_above_alpha():
+    # A premultiplied pixel with colour > alpha, as resize ringing leaves behind
+    pixels = np.array([[[200, 10, 255, 100]]], dtype=np.uint8)
+    flat = np.asarray(Composite(Image.fromarray(pixels, 'RGBa')).flatten((255, 255, 255)))
+    assert flat.tolist() == [[[255, 165, 255]]]
+
+def test_cmyk_profile_is_applied_to_the_cmyk_pixels(monkeypatch):
+    seen = []
+
+    def profile_to_profile(img, source, target, outputMode):
+        seen.append((img.mode, outputMode))
+        return img.convert(outputMode)
+
+    monkeypatch.setattr(compositing.ImageCms, 'getProfileDescription', lambda profile: 'Coated FOGRA39')
+    monkeypatch.setattr(compositing.ImageCms, 'profileToProfile', profile_to_profile)
+    img = Image.new('CMYK', (4, 4), (0, 255, 255, 0))
+    img.info['icc_profile'] = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+    assert compositing.to_srgb(img).mode == 'RGB'
+    assert seen == [('CMYK', 'RGB')]
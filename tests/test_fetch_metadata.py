@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import json
+
+import pytest
+
+from content_cache import ContentCache
+from mock_services import start_server
+
+DOCUMENTS = {f'doc{i}': {'name': f'Mindfolk Founder #{i}', 'image': f'https://arweave.net/image{i}',
+                         'attributes': [{'trait_type': 'Type', 'value': 'Founder'}]} for i in range(20)}
+
+@pytest.fixture
+def fetcher(load_script, monkeypatch):
+    module = load_script('fetch-metadata.py')
+    monkeypatch.setattr(module, 'BACKOFF_SECONDS', 0.01)
+    return module
+
+@pytest.fixture
+def server():
+    server, url = start_server(documents=DOCUMENTS, fail_every=3)
+    yield server, url
+    server.shutdown()
+
+def test_transient_errors_are_retried(fetcher, server, report, tmp_path):
+    mock, url = server
+    cache = ContentCache(str(tmp_path / 'cache'))
+    urls = [f'https://arweave.net/{path}' for path in DOCUMENTS]
+    failures = asyncio.run(fetcher.crawl(urls, cache, 4, report, gateway=url))
+    assert failures == {}
+    assert mock.failed  # Some first requests did get a 503
+    assert json.loads(cache.get('https://arweave.net/doc5'))['name'] == 'Mindfolk Founder #5'
+
+def test_missing_document_is_not_retried(fetcher, server, report, tmp_path):
+    mock, url = server
+    cache = ContentCache(str(tmp_path / 'cache'))
+    failures = asyncio.run(fetcher.crawl(['https://arweave.net/gone'], cache, 1, report, gateway=url))
+    assert failures == {'https://arweave.net/gone': 'HTTP 404'}
+    assert mock.request_count == 1
+
+def test_rerun_is_served_from_cache(fetcher, server, report, tmp_path):
+    mock, url = server
+    mint_metadata = tmp_path / 'mint-metadata.json'
+    mint_metadata.write_text(json.dumps({f'Mint{i}': f'https://arweave.net/doc{i}' for i in range(20)}))
+    args = argparse.Namespace(input=str(mint_metadata), output=str(tmp_path / 'founder-metadata.json'),
+                              catalog=None, cache_dir=str(tmp_path / 'cache'), gateway=url, concurrency=4)
+    assert fetcher.run(report, args)
+    requests = mock.request_count
+    assert requests >= len(DOCUMENTS)
+
+    assert fetcher.run(report, args)
+    assert mock.request_count == requests
+    output = json.loads((tmp_path / 'founder-metadata.json').read_text())
+    assert len(output) == len(DOCUMENTS)
+
+def test_json_error_rejects_html_pages(fetcher):
+    assert fetcher.json_error(json.dumps(DOCUMENTS['doc1']).encode()) is None
+    assert fetcher.json_error(b'<html><body>Gateway timeout</body></html>')
+    assert fetcher.json_error(b'\xff\xfe')
+    assert fetcher.json_error(b'[]')
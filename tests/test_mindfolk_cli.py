@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+import mindfolk
+
+def test_split_chain():
+    assert mindfolk.split_chain(['audit', 'names', '+', 'stats']) == [['audit', 'names'], ['stats']]
+    assert mindfolk.split_chain(['+', 'stats', '+', '+']) == [['stats']]
+    assert mindfolk.split_chain([]) == []
+
+def test_step_arguments_are_passed_through():
+    assert mindfolk.expand_step(['render', 'popups', '--type', 'Elder', '--force']) == [
+        ('render popups', 'generate-popup-images.py', ['--type', 'Elder', '--force'])]
+
+def test_audit_without_a_target_runs_the_offline_audits():
+    steps = mindfolk.expand_step(['audit'])
+    assert [label for label, _, _ in steps] == [f'audit {target}' for target in mindfolk.OFFLINE_AUDITS]
+    assert 'check_links.py' not in [script for _, script, _ in steps]
+
+def test_builtin_commands():
+    assert mindfolk.expand_step(['stats', '--json']) == [('stats', None, ['--json'])]
+    assert mindfolk.expand_step(['list']) == [('list', None, [])]
+
+@pytest.mark.parametrize('step, message', [
+    (['deploy'], 'unknown command'),
+    (['render'], 'needs a target'),
+    (['render', 'everything'], 'unknown render target'),
+])
+def test_bad_steps(step, message):
+    with pytest.raises(ValueError, match=message):
+        mindfolk.expand_step(step)
+
+def test_every_command_names_an_existing_script():
+    for targets in mindfolk.COMMANDS.values():
+        for script, _ in targets.values():
+            assert os.path.isfile(os.path.join(mindfolk.SCRIPTS_DIR, script)), script
@@ -0,0 +1,94 @@
+from name_matching import NameIndex, load_match_cache, save_match_cache
+
+def make_sources(tmp_path):
+    for name in ('Ace Pilot Elder.png', 'Ace Pilot Elder.gif', 'Mindfolk_Founder_0008.png'):
+        (tmp_path / name).write_bytes(b'')
+    return tmp_path
+
+def test_cache_is_not_shared_between_indexes(tmp_path):
+    source_dir = make_sources(tmp_path)
+    gifs = NameIndex.from_directory(source_dir, extensions=['.gif'])
+    pngs = NameIndex.from_directory(source_dir, extensions=['.png'])
+    cache = {}
+    assert gifs.match('Ace Pilot Elder', cache).path.suffix == '.gif'
+    assert pngs.match('Ace Pilot Elder', cache).path.suffix == '.png'
+    assert gifs.match('Ace Pilot Elder', cache).path.suffix == '.gif'
+
+def test_cached_path_outside_the_index_is_skipped(tmp_path):
+    source_dir = make_sources(tmp_path)
+    pngs = NameIndex.from_directory(source_dir, extensions=['.png'])
+    cache = {'Ace Pilot Elder': str(source_dir / 'Ace Pilot Elder.gif')}
+    assert pngs.match('Ace Pilot Elder', cache).path.suffix == '.png'
+    assert len(cache['Ace Pilot Elder']) == 2  # The .gif stays confirmed for indexes that have it
+
+def test_confirmed_match_survives_other_file_changes(tmp_path):
+    source_dir = make_sources(tmp_path)
+    index = NameIndex.from_directory(source_dir, extensions=['.png'])
+    cache = {}
+    matched = index.match('Ace Pilot Elder', cache).path
+    (source_dir / 'Mindfolk Founder 12.png').write_bytes(b'')
+    index.add(source_dir / 'Mindfolk Founder 12.png')
+    index.remove(source_dir / 'Mindfolk_Founder_0008.png')
+    assert index.match('Ace Pilot Elder', cache).path == matched
+    assert list(cache) == ['Ace Pilot Elder']
+
+def test_manual_entry_settles_an_ambiguous_name(tmp_path):
+    source_dir = make_sources(tmp_path)
+    index = NameIndex.from_directory(source_dir, extensions=['.png'])
+    (source_dir / 'Mindfolk Founder 8.png').write_bytes(b'')
+    index.add(source_dir / 'Mindfolk Founder 8.png')
+    assert index.match('Mindfolk Founder #8', {}).ambiguous
+    cache = {'Mindfolk Founder #8': str(source_dir / 'Mindfolk Founder 8.png')}
+    result = index.match('Mindfolk Founder #8', cache)
+    assert result.path == source_dir / 'Mindfolk Founder 8.png' and not result.ambiguous
+
+def test_missing_cached_path_is_dropped(tmp_path):
+    source_dir = make_sources(tmp_path)
+    index = NameIndex.from_directory(source_dir, extensions=['.png'])
+    cache = {'Ace Pilot Elder': [str(source_dir / 'gone.png')]}
+    assert index.match('Ace Pilot Elder', cache).path.name == 'Ace Pilot Elder.png'
+    assert cache['Ace Pilot Elder'] == [str(source_dir / 'Ace Pilot Elder.png').replace('\\', '/')]
+
+def test_cache_round_trip(tmp_path):
+    path = tmp_path / 'match-cache.json'
+    path.write_text('{"0123456789abcdef": {"Ace Pilot Elder": "Elders/Ace Pilot Elder.png"},'
+                    ' "Mindfolk Founder #8": "Founders/8.png"}', encoding='utf-8')
+    cache = load_match_cache(str(path))
+    assert cache == {'Ace Pilot Elder': ['Elders/Ace Pilot Elder.png'], 'Mindfolk Founder #8': ['Founders/8.png']}
+    cache['Ace Pilot Elder'].append('Elders/Ace Pilot Elder.gif')
+    cache['Empty'] = []
+    save_match_cache(cache, str(path))
+    assert load_match_cache(str(path)) == {'Ace Pilot Elder': ['Elders/Ace Pilot Elder.png', 'Elders/Ace Pilot Elder.gif'],
+                                           'Mindfolk Founder #8': ['Founders/8.png']}
+
+def test_removed_file_no_longer_matches(tmp_path):
+    source_dir = make_sources(tmp_path)
+    index = NameIndex.from_directory(source_dir, extensions=['.png'])
+    old = source_dir / 'Ace Pilot Elder.png'
+    index.remove(old)
+    assert old not in index
+    assert index.match('Ace Pilot Elder').path is None
+    renamed = source_dir / 'Ace Pilot Elder v2.png'
+    index.add(renamed)
+    assert index.match('Ace Pilot Elder').path == renamed
+    assert len(index) == 2
+
+def test_added_sibling_follows_extension_priority(tmp_path):
+    (tmp_path / 'Foo.jpg').write_bytes(b'')
+    index = NameIndex.from_directory(tmp_path)
+    (tmp_path / 'Foo.webp').write_bytes(b'')
+    assert index.add(tmp_path / 'Foo.webp') is None
+    assert tmp_path / 'Foo.webp' not in index
+    (tmp_path / 'Foo.png').write_bytes(b'')
+    assert index.add(tmp_path / 'Foo.png') == tmp_path / 'Foo.jpg'
+    result = index.match('Foo', {})
+    assert not result.ambiguous and result.path == tmp_path / 'Foo.png'
+    assert len(index) == 1
+
+def test_removed_file_falls_back_to_its_sibling(tmp_path):
+    for name in ('Foo.png', 'Foo.jpg'):
+        (tmp_path / name).write_bytes(b'')
+    index = NameIndex.from_directory(tmp_path)
+    (tmp_path / 'Foo.png').unlink()
+    assert index.remove(tmp_path / 'Foo.png') == tmp_path / 'Foo.jpg'
+    assert index.match('Foo', {}).path == tmp_path / 'Foo.jpg'
@@ -0,0 +1,33 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+def animation(path):
+    """A moving dot on a transparent background, with a repeated frame"""
+    frames = []
+    for x in (10, 30, 30, 50):
+        frame = Image.new('RGBA', (80, 60), (0, 0, 0, 0))
+        ImageDraw.Draw(frame).ellipse((x, 20, x + 15, 35), fill=(200, 40, 40, 255))
+        frames.append(frame)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0, disposal=2)
+
+def test_optimized_animation_shows_the_same_frames(load_script, tmp_path):
+    optimizer = load_script('optimize-gifs.py')
+    animation(tmp_path / 'in.gif')
+    frames, _, quantized = optimizer.write_optimized(tmp_path / 'in.gif', tmp_path / 'out.gif')
+    assert frames == 3  # The repeated frame is merged
+    assert quantized == 0
+    assert optimizer.verify(tmp_path / 'in.gif', tmp_path / 'out.gif') == 0
+    with Image.open(tmp_path / 'out.gif') as img:
+        assert img.n_frames == 3
+        assert img.info['loop'] == 0
+
+def test_encode_frame_places_a_local_table_at_the_offset(load_script):
+    optimizer = load_script('optimize-gifs.py')
+    frame = Image.fromarray(np.array([[0, 1], [1, 0]], dtype=np.uint8), 'P')
+    frame.putpalette(bytes([255, 0, 0, 0, 0, 255]))
+    data = optimizer.encode_frame(frame, (7, 9), True, duration=50, disposal=1)
+    descriptor = data.index(b'\x2c')
+    assert data[:2] == b'\x21\xf9'  # Graphic control extension first
+    assert data[descriptor + 1:descriptor + 9] == bytes([7, 0, 9, 0, 2, 0, 2, 0])
+    assert data[descriptor + 9] & 0x80  # Local table follows
+    assert data[descriptor + 10:descriptor + 16] == bytes([255, 0, 0, 0, 0, 255])
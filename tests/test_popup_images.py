@@ -0,0 +1,70 @@
+import argparse
+import io
+import json
+
+import pytest
+from PIL import Image
+
+from content_cache import ContentCache
+
+FILE_ID = '1AbC-dEf_23'
+
+@pytest.fixture
+def popups(load_script):
+    return load_script('generate-popup-images.py')
+
+@pytest.mark.parametrize('url', [
+    f'https://drive.google.com/thumbnail?id={FILE_ID}&sz=w1000',
+    f'https://drive.google.com/uc?export=view&id={FILE_ID}',
+    f'https://drive.google.com/file/d/{FILE_ID}/view?usp=sharing',
+    f'https://drive.usercontent.google.com/download?id={FILE_ID}&export=download',
+])
+def test_drive_file_id_from_every_url_form(popups, url):
+    assert popups.drive_file_id(url) == FILE_ID
+
+def test_drive_file_id_ignores_other_hosts(popups):
+    assert popups.drive_file_id('img/popup/760/Mindfolk Founder _8.jpg') is None
+    assert popups.drive_file_id('https://arweave.net/abc?id=1') is None
+    assert popups.drive_file_id('') is None
+
+def test_rewritten_popup_json_keeps_the_drive_urls(popups, tmp_path):
+    drive = f'https://drive.google.com/uc?export=view&id={FILE_ID}'
+    path = tmp_path / 'popup.json'
+    path.write_text(json.dumps({'byName': {'Ace Pilot Elder': drive}, 'byMint': {'Mint1': drive}}))
+    assert popups.load_popup_json(str(path)) == ({'Ace Pilot Elder': drive}, {'Mint1': drive})
+
+    # After a run the top-level maps point at the local renditions; the Drive URLs move under 'drive'
+    popups.save_popup_json(str(path), {'Ace Pilot Elder': 'img/popup/760/Ace Pilot Elder.jpg'},
+                           {'Mint1': 'img/popup/760/Ace Pilot Elder.jpg'}, {'Ace Pilot Elder': drive}, {'Mint1': drive})
+    assert popups.load_popup_json(str(path)) == ({'Ace Pilot Elder': drive}, {'Mint1': drive})
+
+def jpeg_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGB', (40, 30), (10, 120, 60)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+def test_unrenderable_popups_fall_back_to_drive(popups, report, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    drive = {name: f'https://drive.google.com/uc?export=view&id={name.replace(" ", "")}'
+             for name in ('Mirrored Elder', 'Not Mirrored Elder', 'Quota Page Elder')}
+    (tmp_path / 'catalog.json').write_text(json.dumps(
+        [{'Name': name, 'mintAddress': f'Mint{i}', 'Type': 'Elder'} for i, name in enumerate(drive)]))
+    (tmp_path / 'popup.json').write_text(json.dumps({'byName': drive, 'byMint': {}}))
+    cache = ContentCache(str(tmp_path / 'cache'))
+    download = popups.DRIVE_DOWNLOAD.format
+    cache.put(download(id='MirroredElder'), jpeg_bytes())
+    cache.put(download(id='QuotaPageElder'), b'<html>Quota exceeded</html>')
+    cache.save_index()
+
+    args = argparse.Namespace(type=None, force=False, mirror=False, catalog='catalog.json', popup_json='popup.json',
+                              image_dir=str(tmp_path / 'no-images'), cache_dir=str(tmp_path / 'cache'), concurrency=1)
+    assert not popups.run(report, args)  # The quota page is a render error
+
+    data = json.loads((tmp_path / 'popup.json').read_text())
+    assert data['byName'] == {'Mirrored Elder': 'img/popup/760/Mirrored Elder.jpg',
+                              'Not Mirrored Elder': drive['Not Mirrored Elder'],
+                              'Quota Page Elder': drive['Quota Page Elder']}
+    assert data['drive']['byName'] == drive
+    with Image.open(tmp_path / 'img/popup/380/Mirrored Elder.jpg') as img:
+        assert img.size == (380, 380)
+    assert download(id='QuotaPageElder') not in ContentCache(str(tmp_path / 'cache'))  # Fetched again next run
@@ -0,0 +1,13 @@
+def collect_data(manifest, root):
+    return [url for url, tier in manifest.collect(str(root), [], [], 0, None, 1) if url.endswith('.json')]
+
+def test_fallback_only_when_primary_is_missing(load_script, tmp_path):
+    manifest = load_script('build-precache-manifest.py')
+    assert 'data/mint-metadata.json' not in collect_data(manifest, tmp_path)
+    assert 'merged_mindfolk_data.json' in collect_data(manifest, tmp_path)
+
+    (tmp_path / 'data').mkdir()
+    (tmp_path / 'data' / 'mint-metadata.json').write_text('{}')
+    urls = collect_data(manifest, tmp_path)
+    assert 'data/mint-metadata.json' in urls
+    assert 'merged_mindfolk_data.json' not in urls
@@ -0,0 +1,71 @@
+import email.utils
+import http.client
+import os
+import threading
+
+import pytest
+
+SIZE = 1000
+
+@pytest.fixture
+def site(load_script):
+    return load_script('serve-site.py')
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=900-', (900, 999)),
+    ('bytes=900-5000', (900, 999)),
+    ('bytes=-100', (900, 999)),
+    ('bytes=-5000', (0, 999)),
+    ('bytes=1000-', 'unsatisfiable'),
+    ('bytes=50-10', 'unsatisfiable'),
+    ('bytes=-0', 'unsatisfiable'),
+    ('bytes=-', None),
+    ('bytes=0-1,5-9', None),  # Multiple ranges: the whole file
+    ('items=0-1', None),
+    (None, None),
+])
+def test_parse_range(site, header, expected):
+    assert site.parse_range(header, SIZE) == expected
+
+@pytest.fixture
+def server(site, tmp_path):
+    (tmp_path / 'tile.jpg').write_bytes(bytes(range(256)) * 4)
+    os.utime(tmp_path / 'tile.jpg', (1_700_000_000, 1_700_000_000))
+    server = site.SiteServer(('127.0.0.1', 0), str(tmp_path), site.CACHE_RULES, site.RequestLog(quiet=True))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def get(server, headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+    connection.request('GET', '/tile.jpg', headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+def test_conditional_requests(server):
+    response, body = get(server)
+    assert response.status == 200 and len(body) == 1024
+    etag = response.getheader('ETag')
+
+    assert get(server, {'If-None-Match': etag})[0].status == 304
+    assert get(server, {'If-None-Match': f'"other", W/{etag}'})[0].status == 304
+    assert get(server, {'If-None-Match': '"other"'})[0].status == 200
+    # If-None-Match wins over If-Modified-Since
+    assert get(server, {'If-None-Match': '"other"', 'If-Modified-Since': response.getheader('Last-Modified')})[0].status == 200
+
+    assert get(server, {'If-Modified-Since': email.utils.formatdate(1_700_000_000, usegmt=True)})[0].status == 304
+    assert get(server, {'If-Modified-Since': email.utils.formatdate(1_699_999_999, usegmt=True)})[0].status == 200
+    assert get(server, {'If-Modified-Since': 'not a date'})[0].status == 200
+
+def test_ranges_follow_if_range(server):
+    etag = get(server)[0].getheader('ETag')
+    response, body = get(server, {'Range': 'bytes=10-19', 'If-Range': etag})
+    assert response.status == 206 and body == bytes(range(10, 20))
+    assert response.getheader('Content-Range') == 'bytes 10-19/1024'
+    assert get(server, {'Range': 'bytes=10-19', 'If-Range': '"stale"'})[0].status == 200
+    response, _ = get(server, {'Range': 'bytes=2000-'})
+    assert response.status == 416 and response.getheader('Content-Range') == 'bytes */1024'
@@ -0,0 +1,57 @@
+import argparse
+import json
+import os
+import re
+
+import numpy as np
+from PIL import Image
+
+COUNT = 40
+
+def write_thumbnail(path, seed):
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, 3)
+    pixels = np.clip(base + rng.normal(0, 40, (100, 100, 3)), 0, 255).astype(np.uint8)
+    Image.fromarray(pixels).save(path, 'JPEG')
+
+def similar_args(tmp_path, name, full=False):
+    return argparse.Namespace(input=str(tmp_path / 'catalog.json'), output=str(tmp_path / f'{name}.json'),
+                              index=str(tmp_path / f'{name}.npz'), size='100x100', k=5, block_rows=7,
+                              workers=2, full=full)
+
+def neighbours(path):
+    with open(path, encoding='utf-8') as f:
+        return {nft['mintAddress']: nft.get('similar') for nft in json.load(f)}
+
+def test_incremental_rerun_matches_a_full_rebuild(load_script, report, tmp_path, capsys):
+    similar = load_script('build-similar-index.py')
+    thumbnails = tmp_path / 'thumbnails'
+    thumbnails.mkdir()
+    catalog = []
+    for i in range(COUNT):
+        path = thumbnails / f'{i}.jpg'
+        write_thumbnail(path, i)
+        catalog.append({'mintAddress': f'Mint{i}', 'thumbnailURLs': {'100x100': str(path)}})
+    (tmp_path / 'catalog.json').write_text(json.dumps(catalog))
+    assert similar.run(report, similar_args(tmp_path, 'incremental'))
+
+    # Change some thumbnails, remove one NFT and add two
+    for i in (3, 17, 31):
+        write_thumbnail(thumbnails / f'{i}.jpg', 100 + i)
+        os.utime(thumbnails / f'{i}.jpg', ns=(1, 10 ** 18 + i))
+    del catalog[8]
+    for i in (COUNT, COUNT + 1):
+        write_thumbnail(thumbnails / f'{i}.jpg', i)
+        catalog.append({'mintAddress': f'Mint{i}', 'thumbnailURLs': {'100x100': str(thumbnails / f'{i}.jpg')}})
+    (tmp_path / 'catalog.json').write_text(json.dumps(catalog))
+
+    capsys.readouterr()
+    assert similar.run(report, similar_args(tmp_path, 'incremental'))
+    out = capsys.readouterr().out
+    assert 'Features: 5 extracted, 36 reused' in out
+    assert int(re.search(r'(\d+) updated from the changed vectors', out).group(1)) > 0  # Not all searched in full
+    assert similar.run(report, similar_args(tmp_path, 'full', full=True))
+    incremental = neighbours(tmp_path / 'incremental.json')
+    assert incremental == neighbours(tmp_path / 'full.json')
+    assert 'Mint8' not in incremental
+    assert all(len(value) == 5 and mint not in value and 'Mint8' not in value for mint, value in incremental.items())
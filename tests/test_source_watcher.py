@@ -0,0 +1,30 @@
+import threading
+import time
+
+from source_watcher import Debouncer
+
+def test_batches_never_overlap():
+    running = 0
+    overlaps = []
+    batches = []
+    lock = threading.Lock()
+
+    def on_change(paths):
+        nonlocal running
+        with lock:
+            running += 1
+            overlaps.append(running > 1)
+        time.sleep(0.1)
+        batches.append(paths)
+        with lock:
+            running -= 1
+
+    debouncer = Debouncer(on_change, delay=0.01)
+    debouncer.add('a.png')
+    time.sleep(0.05)  # First batch is running now
+    debouncer.add('b.png')
+    time.sleep(0.02)
+    debouncer.add('c.png')
+    time.sleep(0.4)
+    assert not any(overlaps)
+    assert sorted(path.name for batch in batches for path in batch) == ['a.png', 'b.png', 'c.png']
@@ -0,0 +1,22 @@
+from mindfolk_scripts import fix_urls, has_hash
+
+def themed_urls():
+    return {
+        '190x190': 'img/thumbnails/190x190/Mindfolk Founder #8.jpg',
+        '30x30': 'img/thumbnails/30x30/Mindfolk Founder #8.jpg',
+        'light': {'190x190': 'img/thumbnails/light/190x190/Mindfolk Founder #8.jpg'},
+    }
+
+def test_fix_urls_renames_the_light_set():
+    urls = themed_urls()
+    fixed = fix_urls(urls, 'Mindfolk Founder #8.jpg', 'Mindfolk Founder _8.jpg')
+    assert fixed == 3
+    assert urls['light'] == {'190x190': 'img/thumbnails/light/190x190/Mindfolk Founder _8.jpg'}
+    assert urls['30x30'] == 'img/thumbnails/30x30/Mindfolk Founder _8.jpg'
+
+def test_has_hash_looks_inside_theme_sets():
+    urls = {'190x190': 'img/thumbnails/190x190/Founder_8.jpg',
+            'light': {'190x190': 'img/thumbnails/light/190x190/Founder #8.jpg'}}
+    assert has_hash(urls)
+    urls['light']['190x190'] = 'img/thumbnails/light/190x190/Founder_8.jpg'
+    assert not has_hash(urls)
@@ -0,0 +1,66 @@
+import math
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from tile_pyramid import StreamingPyramid, downsample, level_count
+
+WIDTH, HEIGHT, TILE = 600, 301, 128
+
+@pytest.fixture(scope='module')
+def image():
+    rng = np.random.default_rng(7)
+    return rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+@pytest.fixture(scope='module')
+def pyramid(image, tmp_path_factory):
+    base = str(tmp_path_factory.mktemp('zoom') / 'source')
+    with StreamingPyramid(base, WIDTH, HEIGHT, tile_size=TILE, tile_format='png', workers=2) as pyramid:
+        for start in range(0, HEIGHT, 37):  # Strips that don't line up with tiles or row pairs
+            pyramid.push(image[start:start + 37])
+    return base
+
+def level_size(level):
+    scale = 2 ** (level_count(WIDTH, HEIGHT) - 1 - level)
+    return math.ceil(WIDTH / scale), math.ceil(HEIGHT / scale)
+
+def read_tile(path):
+    with Image.open(path) as tile:
+        return np.asarray(tile)
+
+def read_level(base, level):
+    width, height = level_size(level)
+    rows = []
+    for row in range(math.ceil(height / TILE)):
+        tiles = [read_tile(f'{base}_files/{level}/{col}_{row}.png')
+                 for col in range(math.ceil(width / TILE))]
+        rows.append(np.concatenate(tiles, axis=1))
+    return np.concatenate(rows)
+
+def test_level_count():
+    assert level_count(1, 1) == 1
+    assert level_count(256, 100) == 9
+    assert level_count(257, 100) == 10
+    assert level_count(WIDTH, HEIGHT) == 11
+
+def test_every_level_has_the_dzi_tile_grid(pyramid):
+    for level in range(level_count(WIDTH, HEIGHT)):
+        width, height = level_size(level)
+        names = sorted(os.listdir(f'{pyramid}_files/{level}'))
+        assert len(names) == math.ceil(width / TILE) * math.ceil(height / TILE), level
+        assert read_level(pyramid, level).shape == (height, width, 3), level
+    assert level_size(0) == (1, 1)
+
+def test_full_level_is_the_image_and_the_next_is_its_downsample(pyramid, image):
+    top = level_count(WIDTH, HEIGHT) - 1
+    assert np.array_equal(read_level(pyramid, top), image)
+    padded = np.concatenate([image, image[-1:]])  # The odd last row is paired with itself
+    assert np.array_equal(read_level(pyramid, top - 1), downsample(padded))
+
+def test_descriptor(pyramid):
+    with open(f'{pyramid}.dzi', encoding='utf-8') as f:
+        dzi = f.read()
+    assert f'TileSize="{TILE}"' in dzi and 'Format="png"' in dzi
+    assert f'<Size Width="{WIDTH}" Height="{HEIGHT}"/>' in dzi
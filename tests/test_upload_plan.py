@@ -0,0 +1,38 @@
+import argparse
+import json
+
+from file_hashes import HashStore
+
+def plan_args(tmp_path, images):
+    return argparse.Namespace(images_folder=str(images), mapping=str(tmp_path / 'mapping.json'),
+                              hash_store=str(tmp_path / 'hash-store.json'), output=str(tmp_path / 'plan.json'),
+                              workers=2)
+
+def test_file_renamed_before_its_first_plan_is_an_alias(load_script, report, tmp_path):
+    planner = load_script('plan-irys-upload.py')
+    images = tmp_path / 'images'
+    images.mkdir()
+    (images / 'Old Name.png').write_bytes(b'uploaded bytes')
+    (tmp_path / 'mapping.json').write_text(json.dumps({'Old Name.png': 'https://arweave.net/old'}))
+    store = HashStore(str(tmp_path / 'hash-store.json'))  # Hashed by another script, e.g. the precache build
+    store.hash_files([images / 'Old Name.png'])
+    store.save()
+    (images / 'Old Name.png').rename(images / 'New Name.png')
+
+    assert planner.run(report, plan_args(tmp_path, images))
+    plan = json.loads((tmp_path / 'plan.json').read_text())
+    assert plan['uploads'] == []
+    assert [(alias['fileName'], alias['url']) for alias in plan['aliases']] == [
+        ('New Name.png', 'https://arweave.net/old')]
+    assert not (tmp_path / 'plan.json.tmp').exists()
+
+def test_new_content_is_uploaded_once(load_script, report, tmp_path):
+    planner = load_script('plan-irys-upload.py')
+    images = tmp_path / 'images'
+    images.mkdir()
+    for name in ('A.png', 'B.png'):
+        (images / name).write_bytes(b'same bytes')
+    assert planner.run(report, plan_args(tmp_path, images))
+    plan = json.loads((tmp_path / 'plan.json').read_text())
+    assert [entry['fileName'] for entry in plan['uploads']] == ['A.png']
+    assert [(alias['fileName'], alias['url']) for alias in plan['aliases']] == [('B.png', None)]
@@ -12,6 +12,8 @@ const __dirname = path.dirname(__filename);
 // Configuration
 const IMAGES_FOLDER = "E:\\Tralha\\Stuff\\crypto design\\MY MINDFOLK\\Mindfolk Images";
 const OUTPUT_JSON = path.join(__dirname, "arweave_image_mapping.json");
+// Written by scripts/plan-irys-upload.py: unique new blobs + aliases for duplicate content
+const PLAN_JSON = path.join(__dirname, "data", "upload-plan.json");
 const BATCH_SIZE = 10; // Upload 10 images at a time
 const NETWORK = "mainnet"; // or "devnet" for testing
 const TOKEN = "solana";
@@ -30,6 +32,62 @@ if (fs.existsSync(OUTPUT_JSON)) {
   }
 }
 
+// Load the content-deduplicated upload plan, if one was generated
+let uploadPlan = null;
+if (fs.existsSync(PLAN_JSON)) {
+  try {
+    uploadPlan = JSON.parse(fs.readFileSync(PLAN_JSON, "utf8"));
+    console.log(`Loaded upload plan: ${uploadPlan.uploads.length} uploads, ${uploadPlan.aliases.length} aliases`);
+  } catch (e) {
+    console.log("Could not read upload plan, uploading by filename");
+  }
+}
+
+// Point alias filenames at the URL of their content (already on Arweave or uploaded this run)
+function applyPlanAliases() {
+  if (!uploadPlan) return 0;
+  const urlBySha = {};
+  uploadPlan.uploads.forEach((entry) => {
+    if (existingMapping[entry.fileName]) {
+      urlBySha[entry.sha256] = existingMapping[entry.fileName];
+    }
+  });
+  let applied = 0;
+  uploadPlan.aliases.forEach((alias) => {
+    const url = alias.url || urlBySha[alias.sha256];
+    if (url && !existingMapping[alias.fileName]) {
+      existingMapping[alias.fileName] = url;
+      applied++;
+    }
+  });
+  if (applied > 0) {
+    fs.writeFileSync(OUTPUT_JSON, JSON.stringify(existingMapping, null, 2));
+  }
+  return applied;
+}
+
+// Files the plan doesn't account for: new since it was written, modified after it, or gone
+function findPlanDrift(plan) {
+  const planned = new Set();
+  plan.uploads.forEach((entry) => planned.add(path.resolve(entry.path)));
+  plan.aliases.forEach((alias) => planned.add(path.resolve(alias.path)));
+  const createdMs = new Date(plan.created).getTime(); // Local time, whole seconds
+
+  const unplanned = [];
+  const modified = [];
+  getAllImageFiles(plan.imagesFolder || IMAGES_FOLDER).forEach((filePath) => {
+    const resolved = path.resolve(filePath);
+    if (!planned.has(resolved)) {
+      if (!existingMapping[path.basename(filePath)]) unplanned.push(filePath);
+    } else if (Math.floor(fs.statSync(filePath).mtimeMs / 1000) * 1000 > createdMs) {
+      modified.push(filePath);
+    }
+    planned.delete(resolved);
+  });
+  const missing = plan.uploads.map((entry) => entry.path).filter((filePath) => planned.has(path.resolve(filePath)));
+  return { unplanned, modified, missing };
+}
+
 // Get all image files recursively
 function getAllImageFiles(dir, fileList = []) {
   const files = fs.readdirSync(dir);
@@ -259,10 +317,34 @@ async function main() {
     console.log(`📁 Images folder: ${IMAGES_FOLDER}`);
     console.log(`💾 Output JSON: ${OUTPUT_JSON}\n`);
 
-    // Get all image files
-    console.log("📋 Scanning for image files...");
-    const allFiles = getAllImageFiles(IMAGES_FOLDER);
-    console.log(`Found ${allFiles.length} image files\n`);
+    // Get all image files (only the plan's unique new blobs when a plan exists)
+    let allFiles;
+    if (uploadPlan) {
+      allFiles = uploadPlan.uploads.map((entry) => entry.path);
+      console.log(`📋 Using upload plan from ${uploadPlan.created}`);
+      console.log(`   ${uploadPlan.totals.uploads} unique new files, ${(uploadPlan.totals.uploadBytes / (1024 * 1024)).toFixed(1)} MB`);
+      console.log(`   ${uploadPlan.totals.aliases} duplicate names will reuse existing URLs\n`);
+
+      // The plan is a snapshot: refuse it once the folder has moved on, rather than silently skip new files
+      console.log("📋 Checking the plan against the images folder...");
+      const drift = findPlanDrift(uploadPlan);
+      const stale = [
+        [drift.unplanned, "not in the plan and not uploaded"],
+        [drift.modified, "modified after the plan was written"],
+        [drift.missing, "planned for upload but no longer there"],
+      ].filter(([files]) => files.length > 0);
+      if (stale.length > 0) {
+        stale.forEach(([files, reason]) => {
+          console.error(`❌ ${files.length} image files ${reason}, e.g. ${path.basename(files[0])}`);
+        });
+        throw new Error(`Upload plan from ${uploadPlan.created} is out of date: run python scripts/plan-irys-upload.py again`);
+      }
+      console.log("✅ Plan matches the images folder\n");
+    } else {
+      console.log("📋 Scanning for image files...");
+      allFiles = getAllImageFiles(IMAGES_FOLDER);
+      console.log(`Found ${allFiles.length} image files\n`);
+    }
 
     // Filter out already uploaded files
     const filesToUpload = allFiles.filter((filePath) => {
@@ -274,6 +356,10 @@ async function main() {
     console.log(`✅ Already uploaded: ${allFiles.length - filesToUpload.length}\n`);
 
     if (filesToUpload.length === 0) {
+      const aliasCount = applyPlanAliases();
+      if (aliasCount > 0) {
+        console.log(`🔗 Added ${aliasCount} alias entries to the mapping`);
+      }
       console.log("✨ All files already uploaded!");
       return;
     }
@@ -358,6 +444,11 @@ async function main() {
       console.log(`\n📊 Progress: ${uploaded}/${filesToUpload.length} (${progress}%)`);
     }
 
+    const aliasCount = applyPlanAliases();
+    if (aliasCount > 0) {
+      console.log(`\n🔗 Added ${aliasCount} alias entries to the mapping`);
+    }
+
     console.log("\n✨ Upload complete!");
     console.log(`📄 Mapping saved to: ${OUTPUT_JSON}`);
     console.log(`📊 Total files mapped: ${Object.keys(existingMapping).length}`);